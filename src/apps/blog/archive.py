@@ -0,0 +1,220 @@
+"""Streaming export and import of posts (`blog export` / `blog import`).
+
+An archive is a PAX tar stream, gzip-compressed when its name ends in .gz
+or .tgz, holding:
+
+- posts/<post_id>/<path> for every file of each exported post
+- chunks/<sha256> for each snapshot blob the exported manifests
+  reference, once per archive, right after the first post using it
+
+Every member carries its sha256 in a BLOG.sha256 PAX header. Export reads
+each post under its write lock and reads files on a thread pool; import
+verifies and writes members on a thread pool as they stream in, stages
+each post in a hidden directory and moves it into place once all of its
+files and blobs are written, then rebuilds the post and search indexes
+once. Memory is bounded by one post plus a window of in-flight blobs.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+import os
+import secrets
+import shutil
+import tarfile
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path, PurePosixPath
+from typing import Iterable
+
+from apps.blog import chunk_store, post_index, post_layout, search_index
+from apps.blog.paths import POSTS_ROOT
+
+DIGEST_HEADER = "BLOG.sha256"
+IO_WORKERS = 8
+IO_WINDOW = 64
+
+
+@dataclass
+class ArchiveResult:
+    posts: int = 0
+    files: int = 0
+    blobs: int = 0
+    skipped: list[str] = field(default_factory=list)
+
+
+def _tar_mode(path: Path, direction: str) -> str:
+    if direction == "r":
+        return "r|*"
+    return "w|gz" if path.suffix in (".gz", ".tgz") else "w|"
+
+
+def _add_member(tar: tarfile.TarFile, name: str, data: bytes) -> None:
+    info = tarfile.TarInfo(name)
+    info.size = len(data)
+    info.mtime = int(time.time())
+    info.pax_headers = {DIGEST_HEADER: hashlib.sha256(data).hexdigest()}
+    tar.addfile(info, io.BytesIO(data))
+
+
+def _post_files(post_dir: Path) -> list[Path]:
+    # Dot-files are locks and temporaries.
+    return sorted(
+        path
+        for path in post_dir.rglob("*")
+        if path.is_file() and not any(part.startswith(".") for part in path.relative_to(post_dir).parts)
+    )
+
+
+def _manifest_blobs(post_dir: Path) -> list[str]:
+    digests: list[str] = []
+    for manifest in sorted(post_dir.glob("revisions/*.manifest.json")):
+        payload = json.loads(manifest.read_text())
+        digests.extend(entry["hash"] for entry in payload.get("chunks", []))
+    return digests
+
+
+def export_posts(
+    archive_path: str | Path,
+    *,
+    post_ids: Iterable[str] | None = None,
+    posts_root: str | Path | None = None,
+    workers: int = IO_WORKERS,
+) -> ArchiveResult:
+    """Write the selected posts (all by default) with their history to one archive."""
+    resolved_root = Path(posts_root) if posts_root is not None else POSTS_ROOT
+    archive_path = Path(archive_path)
+    if post_ids is None:
+        post_dirs = sorted(post_layout.iter_post_dirs(resolved_root), key=lambda path: path.name)
+    else:
+        post_dirs = [post_layout.post_dir(resolved_root, post_id) for post_id in post_ids]
+    result = ArchiveResult()
+    exported_blobs: set[str] = set()
+    with (
+        tarfile.open(str(archive_path), _tar_mode(archive_path, "w"), format=tarfile.PAX_FORMAT) as tar,
+        ThreadPoolExecutor(max_workers=workers) as pool,
+    ):
+        for post_dir in post_dirs:
+            if not (post_dir / "meta.yaml").exists():
+                raise FileNotFoundError(f"meta.yaml not found for post {post_dir.name}")
+            with post_layout.locked_post_dir(resolved_root, post_dir.name) as post_dir:
+                files = _post_files(post_dir)
+                contents = list(pool.map(Path.read_bytes, files))
+                referenced = dict.fromkeys(_manifest_blobs(post_dir))
+                blobs = [digest for digest in referenced if digest not in exported_blobs]
+            for path, data in zip(files, contents):
+                _add_member(tar, f"posts/{post_dir.name}/{path.relative_to(post_dir).as_posix()}", data)
+            result.posts += 1
+            result.files += len(files)
+            # Blobs are immutable, so they are read outside the post's lock.
+            for start in range(0, len(blobs), IO_WINDOW):
+                window = blobs[start : start + IO_WINDOW]
+                paths = [chunk_store.blob_path(resolved_root, digest) for digest in window]
+                for digest, data in zip(window, pool.map(Path.read_bytes, paths)):
+                    _add_member(tar, f"chunks/{digest}", data)
+                    exported_blobs.add(digest)
+            result.blobs += len(blobs)
+    return result
+
+
+def _verify(name: str, data: bytes, expected: str | None) -> None:
+    digest = hashlib.sha256(data).hexdigest()
+    if expected is None or digest != expected:
+        raise ValueError(f"Digest mismatch for archive member {name}")
+
+
+def _write_verified(name: str, data: bytes, expected: str | None, path: Path) -> None:
+    _verify(name, data, expected)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+
+
+def _write_blob(name: str, data: bytes, expected: str | None, posts_root: Path, digest: str) -> None:
+    _verify(name, data, expected)
+    if expected != digest:
+        raise ValueError(f"Blob {name} is not named by its digest")
+    path = chunk_store.blob_path(posts_root, digest)
+    if not path.exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_name(f".{digest}.{secrets.token_hex(4)}.tmp")
+        temp_path.write_bytes(data)
+        os.replace(temp_path, path)
+
+
+def _member_parts(name: str) -> tuple[str, ...]:
+    path = PurePosixPath(name)
+    if path.is_absolute() or any(part in ("", ".", "..") for part in path.parts):
+        raise ValueError(f"Unsafe archive member name: {name}")
+    return path.parts
+
+
+def import_posts(
+    archive_path: str | Path,
+    *,
+    posts_root: str | Path | None = None,
+    workers: int = IO_WORKERS,
+) -> ArchiveResult:
+    """Restore posts from an archive; posts that already exist are skipped."""
+    resolved_root = Path(posts_root) if posts_root is not None else POSTS_ROOT
+    archive_path = Path(archive_path)
+    scheme = post_layout.read_scheme(resolved_root)
+    staging_root = resolved_root / f".import-{secrets.token_hex(4)}"
+    result = ArchiveResult()
+    pending: deque[Future] = deque()
+    current_post: str | None = None
+
+    def drain(limit: int) -> None:
+        while len(pending) > limit:
+            pending.popleft().result()
+
+    def finish_post(post_id: str | None) -> None:
+        drain(0)
+        if post_id is None or post_id in result.skipped:
+            return
+        target = post_layout.layout_path(resolved_root, post_id, scheme)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        os.rename(staging_root / post_id, target)
+        result.posts += 1
+
+    try:
+        with (
+            tarfile.open(str(archive_path), _tar_mode(archive_path, "r")) as tar,
+            ThreadPoolExecutor(max_workers=workers) as pool,
+        ):
+            for member in tar:
+                if not member.isfile():
+                    continue
+                parts = _member_parts(member.name)
+                data = tar.extractfile(member).read()
+                expected = member.pax_headers.get(DIGEST_HEADER)
+                if parts[0] == "posts" and len(parts) >= 3:
+                    post_id = parts[1]
+                    if post_id != current_post:
+                        finish_post(current_post)
+                        current_post = post_id
+                        if post_layout.post_dir(resolved_root, post_id).exists():
+                            result.skipped.append(post_id)
+                    if post_id in result.skipped:
+                        continue
+                    path = staging_root.joinpath(*parts[1:])
+                    pending.append(pool.submit(_write_verified, member.name, data, expected, path))
+                    result.files += 1
+                elif parts[0] == "chunks" and len(parts) == 2:
+                    digest = parts[1]
+                    pending.append(pool.submit(_write_blob, member.name, data, expected, resolved_root, digest))
+                    result.blobs += 1
+                else:
+                    raise ValueError(f"Unexpected archive member: {member.name}")
+                drain(IO_WINDOW)
+            finish_post(current_post)
+    finally:
+        shutil.rmtree(staging_root, ignore_errors=True)
+        # Posts moved in before a failure are live; index them either way.
+        if result.posts:
+            post_index.rebuild(resolved_root)
+            search_index.rebuild(resolved_root)
+    return result
@@ -0,0 +1,273 @@
+"""Write-behind autosave for manual edits.
+
+Autosaves of a post replace each other in a draft file, autosave.json in
+the post directory. It is written under the post's lock, so every worker
+process shares one slot and a crash keeps what was typed. The draft is
+committed as one content_free_edit revision once no save has arrived for
+quiet_seconds, or when flush() is called (explicit save, editor reload,
+shutdown). The revision's content is the last save's, byte for byte; its
+before_hash is the content the window started from and coalesced_saves
+records how many saves it replaced.
+
+Each save names the revision its content was edited from, and the draft
+keeps the revision it builds on. A commit is conditional on that
+revision still being the post's latest. If another writer got in first,
+the draft keeps its content and is marked conflicted, and saves and
+flushes report the conflict until a save based on the post's latest
+revision replaces it. After a commit the draft stays behind, no longer
+pending, recording the revision that now holds its content.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import secrets
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from apps.blog import post_layout, storage
+from apps.blog.chunk_diff import diff_markdown
+from apps.blog.hashing import text_digest
+from apps.blog.post_revision_writer import PostRevisionWriter
+from apps.blog.storage import RevisionConflictError, read_last_revision_id, read_post_content
+
+DRAFT_NAME = "autosave.json"
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class AutosaveState:
+    # While pending, the revision the draft was edited from; after a commit, the one holding it.
+    base_revision_id: int
+    pending: bool
+    conflict: bool = False
+
+
+def _read_draft(post_dir: Path) -> dict | None:
+    path = post_dir / DRAFT_NAME
+    if not path.exists():
+        return None
+    return json.loads(path.read_text())
+
+
+def _write_draft(post_dir: Path, draft: dict) -> None:
+    path = post_dir / DRAFT_NAME
+    temp_path = path.with_name(f".{path.name}.{secrets.token_hex(4)}.tmp")
+    temp_path.write_text(json.dumps(draft))
+    os.replace(temp_path, path)
+
+
+def _state(draft: dict) -> AutosaveState:
+    return AutosaveState(draft["base_revision_id"], draft["pending"], draft["conflict"])
+
+
+class AutosaveBuffer:
+    def __init__(self, quiet_seconds: float) -> None:
+        if quiet_seconds <= 0:
+            raise ValueError("quiet_seconds must be positive")
+        self.quiet_seconds = quiet_seconds
+        # Quiet-window deadlines of the drafts this process saw; the drafts live on disk.
+        self._deadlines: dict[str, float] = {}
+        self._cond = threading.Condition()
+        self._thread: threading.Thread | None = None
+        self._closed = False
+
+    def _locked_post_dir(self, post_id: str):
+        return post_layout.locked_post_dir(storage.POSTS_ROOT, post_id)
+
+    def save(
+        self,
+        post_id: str,
+        content: str,
+        *,
+        actor: Any,
+        base_revision_id: int | None = None,
+    ) -> AutosaveState:
+        """Store content as the post's draft and restart its quiet window.
+
+        base_revision_id is the revision the content was edited from; by
+        default the draft's own. A save from an older revision is not
+        stored and comes back as a conflict.
+        """
+        with self._cond:
+            if self._closed:
+                raise ValueError("Autosave buffer is closed")
+        with self._locked_post_dir(post_id) as post_dir:
+            if not (post_dir / "meta.yaml").exists():
+                raise FileNotFoundError(f"meta.yaml not found for post {post_id}")
+            draft = _read_draft(post_dir)
+            last_revision_id = read_last_revision_id(post_id) or 0
+            lineage: set[int] = set()
+            if draft is not None and not draft["conflict"]:
+                lineage = {draft["base_revision_id"], draft["committed_from"]} - {None}
+            if base_revision_id is None:
+                base_revision_id = draft["base_revision_id"] if draft is not None else last_revision_id
+            if base_revision_id in lineage and draft["base_revision_id"] != last_revision_id:
+                # Another writer got in after the draft's base; keep the text, but as a conflict.
+                draft = {**draft, "content": content, "actor": actor, "pending": True, "conflict": True}
+            elif base_revision_id in lineage:
+                # Continues the draft, possibly from before its last commit.
+                draft = {
+                    **draft,
+                    "content": content,
+                    "actor": actor,
+                    "saves": draft["saves"] + 1 if draft["pending"] else 1,
+                    "pending": True,
+                }
+            elif base_revision_id == last_revision_id:
+                draft = {
+                    "content": content,
+                    "actor": actor,
+                    "base_revision_id": last_revision_id,
+                    "committed_from": None,
+                    "saves": 1,
+                    "pending": True,
+                    "conflict": False,
+                }
+            elif draft is not None and draft["conflict"] and base_revision_id == draft["base_revision_id"]:
+                # Keep the latest text of a conflicted draft on disk, still conflicted.
+                draft = {**draft, "content": content, "actor": actor}
+            else:
+                return AutosaveState(last_revision_id, pending=False, conflict=True)
+            draft["saved_at"] = time.time()
+            _write_draft(post_dir, draft)
+        with self._cond:
+            self._deadlines[post_id] = time.monotonic() + self.quiet_seconds
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="blog-autosave", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+        return _state(draft)
+
+    def state(self, post_id: str) -> AutosaveState | None:
+        with self._locked_post_dir(post_id) as post_dir:
+            draft = _read_draft(post_dir)
+        return None if draft is None else _state(draft)
+
+    def pending(self, post_id: str) -> str | None:
+        with self._locked_post_dir(post_id) as post_dir:
+            draft = _read_draft(post_dir)
+        return draft["content"] if draft is not None and draft["pending"] else None
+
+    def discard(self, post_id: str) -> None:
+        """Drop the post's draft, e.g. after an explicit save superseded it."""
+        with self._locked_post_dir(post_id) as post_dir:
+            (post_dir / DRAFT_NAME).unlink(missing_ok=True)
+        with self._cond:
+            self._deadlines.pop(post_id, None)
+
+    def flush(self, post_id: str) -> int | None:
+        """Commit the post's draft now; return the new revision id, if any."""
+        with self._locked_post_dir(post_id) as post_dir:
+            draft = _read_draft(post_dir)
+            if draft is None or not draft["pending"]:
+                return None
+            base_revision_id = draft["base_revision_id"]
+            if draft["conflict"]:
+                raise RevisionConflictError(f"Post {post_id} changed since revision {base_revision_id}")
+            try:
+                revision_id = self._commit(
+                    post_id, draft["content"], draft["actor"], base_revision_id, draft["saves"]
+                )
+            except RevisionConflictError:
+                _write_draft(post_dir, {**draft, "conflict": True})
+                raise
+            _write_draft(
+                post_dir,
+                {
+                    **draft,
+                    "base_revision_id": revision_id or base_revision_id,
+                    "committed_from": base_revision_id,
+                    "saves": 0,
+                    "pending": False,
+                },
+            )
+            return revision_id
+
+    def flush_all(self) -> None:
+        with self._cond:
+            post_ids = list(self._deadlines)
+        for post_id in post_ids:
+            try:
+                self.flush(post_id)
+            except Exception:
+                logger.exception("Autosave flush failed for post %s", post_id)
+
+    def close(self) -> None:
+        """Commit everything buffered and stop the background thread."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+            thread = self._thread
+        if thread is not None:
+            thread.join()
+        self.flush_all()
+
+    def _commit(
+        self, post_id: str, content: str, actor: Any, base_revision_id: int, saves: int
+    ) -> int | None:
+        if (read_last_revision_id(post_id) or 0) != base_revision_id:
+            raise RevisionConflictError(f"Post {post_id} changed since revision {base_revision_id}")
+        before_content = read_post_content(post_id)
+        if before_content == content:
+            return None
+        diff = diff_markdown(before_content, content)
+        return PostRevisionWriter().apply_delta(
+            post_id,
+            actor=actor,
+            delta_type="content_free_edit",
+            delta_payload={
+                "changed_chunks": diff.changed_chunks,
+                "deleted_chunks": diff.deleted_chunks,
+                "before_hash": text_digest(before_content),
+                "after_hash": text_digest(content),
+                "coalesced_saves": saves,
+            },
+            new_content=content,
+            expected_revision_id=base_revision_id,
+        )
+
+    def _settle(self, post_id: str, deadline: float) -> None:
+        # Another worker may have taken a later save; commit only once the draft itself is quiet.
+        with self._locked_post_dir(post_id) as post_dir:
+            draft = _read_draft(post_dir)
+            wait = 0.0
+            if draft is not None and draft["pending"] and not draft["conflict"]:
+                wait = draft["saved_at"] + self.quiet_seconds - time.time()
+        try:
+            if wait <= 0 and draft is not None and draft["pending"] and not draft["conflict"]:
+                self.flush(post_id)
+        finally:
+            with self._cond:
+                if self._deadlines.get(post_id) == deadline:
+                    if wait > 0:
+                        self._deadlines[post_id] = time.monotonic() + wait
+                    else:
+                        del self._deadlines[post_id]
+
+    def _due(self) -> tuple[list[tuple[str, float]], float | None]:
+        now = time.monotonic()
+        due = [(post_id, deadline) for post_id, deadline in self._deadlines.items() if deadline <= now]
+        upcoming = [deadline - now for deadline in self._deadlines.values() if deadline > now]
+        return due, min(upcoming) if upcoming else None
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                due, timeout = self._due()
+                while not due and not self._closed:
+                    self._cond.wait(timeout)
+                    due, timeout = self._due()
+                if self._closed:
+                    return
+            for post_id, deadline in due:
+                try:
+                    self._settle(post_id, deadline)
+                except Exception:
+                    logger.exception("Autosave commit failed for post %s", post_id)
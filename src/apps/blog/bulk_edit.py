@@ -0,0 +1,260 @@
+"""Apply one editing policy across many posts through a shared work queue.
+
+Every eligible chunk from every selected post goes into one bounded work
+queue served by a thread pool. A post's revision is committed through
+PostRevisionWriter as soon as its last chunk finishes, and each finished
+post is appended to a progress journal so an interrupted run can resume.
+Journal records carry the post's revision id after the edit, so a post
+that changed since is edited again rather than skipped.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable
+
+from agentic_framework.agent_dispatcher import AgentDispatcherBase
+from document_writer.domain.editor import make_editor_agent
+from document_writer.domain.editor.chunking import Chunk
+
+from apps.blog.edit_service import (
+    EditResult,
+    PolicyEditTarget,
+    commit_policy_edit,
+    edit_chunk,
+    load_policy_edit_target,
+    record_policy_edit_failure,
+)
+from apps.blog.hashing import text_digest
+from apps.blog.policy import compile_policy
+from apps.blog.post_revision_writer import PostRevisionWriter
+from apps.blog.post_store import get_post_store
+from apps.blog.types import BlogPostMeta, PostStatus
+
+SELECT_PAGE_SIZE = 200
+
+
+@dataclass(frozen=True)
+class PostFilter:
+    status: PostStatus | None = "draft"
+    author: str | None = None
+    created_after: datetime | None = None
+    created_before: datetime | None = None
+
+    def matches(self, meta: BlogPostMeta) -> bool:
+        if self.status is not None and meta.status != self.status:
+            return False
+        if self.author is not None and meta.author != self.author:
+            return False
+        created_at = _as_utc(meta.created_at)
+        if self.created_after is not None and created_at < _as_utc(self.created_after):
+            return False
+        if self.created_before is not None and created_at >= _as_utc(self.created_before):
+            return False
+        return True
+
+
+@dataclass
+class BulkEditResult:
+    edited: list[EditResult] = field(default_factory=list)
+    unchanged: list[str] = field(default_factory=list)
+    resumed: list[str] = field(default_factory=list)
+    skipped: dict[str, str] = field(default_factory=dict)
+    failed: dict[str, str] = field(default_factory=dict)
+
+
+@dataclass
+class _PostWork:
+    target: PolicyEditTarget
+    updated: list[Chunk | None]
+    remaining: int
+    error: str | None = None
+
+
+def _as_utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def select_posts(post_filter: PostFilter) -> list[BlogPostMeta]:
+    store = get_post_store()
+    selected: list[BlogPostMeta] = []
+    cursor = None
+    while True:
+        page = store.list_posts_page(
+            visibility="editor",
+            status=post_filter.status,
+            author=post_filter.author,
+            cursor=cursor,
+            limit=SELECT_PAGE_SIZE,
+        )
+        selected.extend(meta for meta in page.posts if post_filter.matches(meta))
+        if page.next_cursor is None:
+            return selected
+        cursor = page.next_cursor
+
+
+def _read_progress(progress_path: Path | None, policy_hash: str) -> dict[str, int]:
+    """post_id -> the revision id a finished post was left at."""
+    if progress_path is None or not progress_path.exists():
+        return {}
+    completed: dict[str, int] = {}
+    for line in progress_path.read_text().splitlines():
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            # A torn final line from an interrupted run is simply redone.
+            continue
+        if record.get("policy_hash") != policy_hash or record.get("outcome") not in ("edited", "unchanged"):
+            continue
+        if isinstance(record.get("revision_id"), int):
+            completed[record["post_id"]] = record["revision_id"]
+    return completed
+
+
+def apply_policy_edit_all(
+    policy_text: str,
+    *,
+    post_filter: PostFilter,
+    actor_id: str | None = None,
+    max_workers: int = 8,
+    max_pending: int | None = None,
+    progress_path: str | Path | None = None,
+    on_post_done: Callable[[str, str], None] | None = None,
+) -> BulkEditResult:
+    if max_workers < 1:
+        raise ValueError("max_workers must be at least 1")
+    policy_hash = text_digest(policy_text)
+    policy = compile_policy(policy_text)
+    agent = make_editor_agent() if policy.requires_agent else None
+    dispatcher = AgentDispatcherBase()
+    writer = PostRevisionWriter()
+    resolved_progress = Path(progress_path) if progress_path is not None else None
+    already_done = _read_progress(resolved_progress, policy_hash)
+
+    result = BulkEditResult()
+    lock = threading.Lock()
+    # Bounds chunks in flight so memory stays flat regardless of corpus size.
+    pending = threading.BoundedSemaphore(max_pending or max_workers * 4)
+
+    def _finish(
+        post_id: str,
+        outcome: str,
+        detail: str | None = None,
+        revision_id: int | None = None,
+    ) -> None:
+        with lock:
+            if resolved_progress is not None:
+                record = {
+                    "post_id": post_id,
+                    "policy_hash": policy_hash,
+                    "outcome": outcome,
+                    "revision_id": revision_id,
+                }
+                with resolved_progress.open("a", encoding="utf-8") as handle:
+                    handle.write(json.dumps(record) + "\n")
+        if on_post_done is not None:
+            on_post_done(post_id, outcome if detail is None else f"{outcome}: {detail}")
+
+    def _commit(work: _PostWork) -> None:
+        target = work.target
+        if work.error is not None:
+            try:
+                record_policy_edit_failure(
+                    target,
+                    policy_hash=policy_hash,
+                    actor_id=actor_id,
+                    reason=work.error,
+                    writer=writer,
+                )
+            finally:
+                with lock:
+                    result.failed[target.post_id] = work.error
+                _finish(target.post_id, "failed", work.error)
+            return
+        try:
+            edit_result = commit_policy_edit(
+                target,
+                [chunk for chunk in work.updated if chunk is not None],
+                policy_hash=policy_hash,
+                actor_id=actor_id,
+                writer=writer,
+            )
+        except Exception as exc:
+            with lock:
+                result.failed[target.post_id] = str(exc)
+            _finish(target.post_id, "failed", str(exc))
+            return
+        with lock:
+            if edit_result.revision_id:
+                result.edited.append(edit_result)
+            else:
+                result.unchanged.append(target.post_id)
+        if edit_result.revision_id:
+            _finish(target.post_id, "edited", revision_id=edit_result.revision_id)
+        else:
+            _finish(target.post_id, "unchanged", revision_id=target.last_revision_id)
+
+    def _run_chunk(work: _PostWork, chunk: Chunk) -> None:
+        try:
+            if work.error is None:
+                edited = edit_chunk(
+                    chunk,
+                    policy,
+                    work.target.intent,
+                    dispatcher=dispatcher,
+                    agent=agent,
+                )
+                work.updated[chunk.index] = edited
+        except Exception as exc:
+            with lock:
+                if work.error is None:
+                    work.error = str(exc)
+        finally:
+            pending.release()
+        with lock:
+            work.remaining -= 1
+            is_last = work.remaining == 0
+        if is_last:
+            _commit(work)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for meta in select_posts(post_filter):
+            post_id = meta.post_id
+            if post_id in already_done and already_done[post_id] == (
+                writer.store.read_last_revision_id(post_id) or 0
+            ):
+                result.resumed.append(post_id)
+                continue
+            if meta.status != "draft":
+                result.skipped[post_id] = "Post is not draft"
+                continue
+            try:
+                target = load_policy_edit_target(post_id)
+            except (FileNotFoundError, RuntimeError, ValueError) as exc:
+                result.skipped[post_id] = str(exc)
+                continue
+            if not target.chunks:
+                result.unchanged.append(post_id)
+                _finish(post_id, "unchanged", revision_id=target.last_revision_id)
+                continue
+            work = _PostWork(
+                target=target,
+                updated=[None] * len(target.chunks),
+                remaining=len(target.chunks),
+            )
+            for chunk in target.chunks:
+                pending.acquire()
+                executor.submit(_run_chunk, work, chunk)
+
+    result.edited.sort(key=lambda item: item.post_id)
+    result.unchanged.sort()
+    return result
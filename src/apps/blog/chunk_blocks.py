@@ -0,0 +1,107 @@
+"""Group a post's chunks into blocks that render on their own.
+
+Chunks are split at blank lines, but markdown does not always end a
+block there: a fenced code block may contain blank lines, a loose list
+spans several chunks, and an indented chunk continues whatever precedes
+it. A block is a run of chunks that starts where the document's block
+structure allows rendering to restart. Link reference definitions are
+document-wide, so each block is rendered with all of them appended.
+chunk_store records the layout (block starts and references) in each
+manifest, so a window of a stored revision renders without re-splitting.
+
+Joining chunks is always safe; the rules below err on that side.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+
+from document_writer.domain.editor.chunking import Chunk, join_chunks, split_markdown
+
+_FENCE = re.compile(r"^ {0,3}(`{3,}|~{3,})")
+_LIST_ITEM = re.compile(r"^ {0,3}([*+-]|\d{1,9}[.)])(\s|$)")
+_QUOTE = re.compile(r"^ {0,3}>")
+_REFERENCE = re.compile(r"^ {0,3}\[[^\]]+\]:\s*\S")
+
+
+@dataclass(frozen=True)
+class ChunkBlocks:
+    chunks: list[Chunk]
+    # starts[i] is the index of the first chunk of chunk i's block.
+    starts: list[int]
+    references: str
+
+    def markdown(self, start: int) -> str:
+        """Markdown for the block starting at chunk start, with the document's references."""
+        return block_markdown(self.chunks[start : block_end(self.starts, start)], self.references)
+
+
+def block_end(starts: list[int], start: int) -> int:
+    """Index one past the last chunk of the block starting at start."""
+    end = start + 1
+    while end < len(starts) and starts[end] == start:
+        end += 1
+    return end
+
+
+def block_markdown(chunks: list[Chunk], references: str) -> str:
+    source = join_chunks(chunks)
+    if references:
+        source = f"{source.rstrip()}\n\n{references}\n"
+    return source
+
+
+def _closes(line: str, fence: str) -> bool:
+    stripped = line.strip()
+    return (
+        len(line) - len(line.lstrip(" ")) <= 3
+        and len(stripped) >= len(fence)
+        and set(stripped) == {fence[0]}
+    )
+
+
+def chunk_blocks(content: str) -> ChunkBlocks:
+    chunks = split_markdown(content)
+    starts, references = block_layout(chunks)
+    return ChunkBlocks(chunks=chunks, starts=starts, references=references)
+
+
+def block_layout(chunks: list[Chunk]) -> tuple[list[int], str]:
+    """(starts, references) for chunks; see ChunkBlocks."""
+    starts: list[int] = []
+    references: list[str] = []
+    fence: str | None = None
+    kind: str | None = None
+    start = 0
+    for index, chunk in enumerate(chunks):
+        lines = chunk.text.splitlines()
+        first = lines[0] if lines else ""
+        previous = chunks[index - 1] if index else None
+        if previous is None:
+            joins = False
+        elif fence is not None or first[:1] in (" ", "\t"):
+            joins = True
+        elif not previous.trailing_separator and not chunk.leading_separator and previous.text.strip():
+            # No blank line in between, e.g. a setext underline after its heading.
+            joins = True
+        else:
+            joins = (kind == "list" and _LIST_ITEM.match(first) is not None) or (
+                kind == "quote" and _QUOTE.match(first) is not None
+            )
+        if not joins:
+            start = index
+            kind = "list" if _LIST_ITEM.match(first) else "quote" if _QUOTE.match(first) else None
+        starts.append(start)
+        for line in lines:
+            if fence is not None:
+                if _closes(line, fence):
+                    fence = None
+                continue
+            opening = _FENCE.match(line)
+            if opening:
+                fence = opening.group(1)
+            elif _REFERENCE.match(line):
+                references.append(line)
+    return starts, "\n".join(references)
+
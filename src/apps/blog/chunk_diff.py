@@ -0,0 +1,166 @@
+"""Hash-aligned chunk diff between two versions of a post body."""
+
+from __future__ import annotations
+
+import difflib
+import hashlib
+from dataclasses import dataclass
+
+from document_writer.domain.editor.chunking import Chunk, split_markdown
+
+
+def chunk_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+@dataclass(frozen=True)
+class ChunkMove:
+    before_index: int
+    after_index: int
+
+
+@dataclass(frozen=True)
+class ChunkDiff:
+    """Alignment of two chunk lists by chunk text hash.
+
+    Invariants:
+    - inserted indices refer to the after document.
+    - deleted indices refer to the before document.
+    - modified and unchanged entries are (before_index, after_index) pairs.
+    - Moved chunks keep their text and are not reported as changed.
+    """
+
+    unchanged: tuple[tuple[int, int], ...]
+    modified: tuple[tuple[int, int], ...]
+    inserted: tuple[int, ...]
+    deleted: tuple[int, ...]
+    moved: tuple[ChunkMove, ...]
+
+    @property
+    def changed_chunks(self) -> list[int]:
+        """After-document indices whose text did not exist at the aligned position."""
+        changed = set(self.inserted)
+        changed.update(after_index for _, after_index in self.modified)
+        return sorted(changed)
+
+    @property
+    def deleted_chunks(self) -> list[int]:
+        """Before-document indices whose text is gone from the after document."""
+        return sorted(self.deleted)
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.modified or self.inserted or self.deleted or self.moved)
+
+
+def _alignment_key(text: str) -> str:
+    # The last chunk of a document carries no line break; ignore it so moves align.
+    return chunk_hash(text.rstrip("\r\n"))
+
+
+def normalize_last_chunks(
+    before_hashes: list[str], before_last: str, after_hashes: list[str], after_last: str
+) -> tuple[list[str], list[str]]:
+    """Hash both last chunks as if they ended in a line break when neither does.
+
+    A chunk that stops or starts being last then compares equal, while an
+    edit that adds or drops the document's final line break still shows.
+    """
+    if not before_hashes or not after_hashes or before_last.endswith("\n") or after_last.endswith("\n"):
+        return before_hashes, after_hashes
+    return (
+        [*before_hashes[:-1], chunk_hash(before_last + "\n")],
+        [*after_hashes[:-1], chunk_hash(after_last + "\n")],
+    )
+
+
+def diff_chunks(before: list[Chunk], after: list[Chunk]) -> ChunkDiff:
+    before_hashes, after_hashes = normalize_last_chunks(
+        [chunk_hash(chunk.text) for chunk in before],
+        before[-1].text if before else "",
+        [chunk_hash(chunk.text) for chunk in after],
+        after[-1].text if after else "",
+    )
+    return diff_chunk_hashes(
+        before_hashes,
+        after_hashes,
+        before_keys=[_alignment_key(chunk.text) for chunk in before],
+        after_keys=[_alignment_key(chunk.text) for chunk in after],
+    )
+
+
+def diff_markdown(before: str, after: str) -> ChunkDiff:
+    return diff_chunks(split_markdown(before), split_markdown(after))
+
+
+def diff_chunk_hashes(
+    before_hashes: list[str],
+    after_hashes: list[str],
+    *,
+    before_keys: list[str] | None = None,
+    after_keys: list[str] | None = None,
+) -> ChunkDiff:
+    """Align chunks by key (the hash by default), then compare their hashes.
+
+    Chunks paired by alignment whose hashes differ are modified, not
+    unchanged or moved.
+    """
+    before_keys = before_hashes if before_keys is None else before_keys
+    after_keys = after_hashes if after_keys is None else after_keys
+    matcher = difflib.SequenceMatcher(a=before_keys, b=after_keys, autojunk=False)
+    opcodes = matcher.get_opcodes()
+
+    unchanged: list[tuple[int, int]] = []
+    modified: list[tuple[int, int]] = []
+    unmatched_before: list[int] = []
+    unmatched_after: list[int] = []
+    for tag, i1, i2, j1, j2 in opcodes:
+        if tag == "equal":
+            for before_index, after_index in zip(range(i1, i2), range(j1, j2)):
+                if before_hashes[before_index] == after_hashes[after_index]:
+                    unchanged.append((before_index, after_index))
+                else:
+                    modified.append((before_index, after_index))
+            continue
+        unmatched_before.extend(range(i1, i2))
+        unmatched_after.extend(range(j1, j2))
+
+    # A chunk that left one position and reappeared verbatim elsewhere is a move.
+    available_by_key: dict[str, list[int]] = {}
+    for before_index in unmatched_before:
+        available_by_key.setdefault(before_keys[before_index], []).append(before_index)
+    moved: list[ChunkMove] = []
+    moved_before: set[int] = set()
+    moved_after: set[int] = set()
+    for after_index in unmatched_after:
+        candidates = available_by_key.get(after_keys[after_index])
+        if not candidates:
+            continue
+        before_index = candidates.pop(0)
+        if before_hashes[before_index] == after_hashes[after_index]:
+            moved.append(ChunkMove(before_index=before_index, after_index=after_index))
+        else:
+            modified.append((before_index, after_index))
+        moved_before.add(before_index)
+        moved_after.add(after_index)
+
+    # Remaining replaced ranges pair up positionally as in-place modifications.
+    inserted: list[int] = []
+    deleted: list[int] = []
+    for tag, i1, i2, j1, j2 in opcodes:
+        if tag == "equal":
+            continue
+        before_left = [i for i in range(i1, i2) if i not in moved_before]
+        after_left = [j for j in range(j1, j2) if j not in moved_after]
+        paired = min(len(before_left), len(after_left))
+        modified.extend(zip(before_left[:paired], after_left[:paired]))
+        deleted.extend(before_left[paired:])
+        inserted.extend(after_left[paired:])
+
+    return ChunkDiff(
+        unchanged=tuple(unchanged),
+        modified=tuple(sorted(modified, key=lambda pair: pair[1])),
+        inserted=tuple(inserted),
+        deleted=tuple(deleted),
+        moved=tuple(moved),
+    )
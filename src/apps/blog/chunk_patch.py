@@ -0,0 +1,170 @@
+"""Apply chunk-level operations to a post body.
+
+Operations address chunks of the base document, either by index or by
+chunk hash, and are applied together against that base. Indices in the
+result are exact, so callers can record changed_chunks without diffing.
+changed_chunks lists every result chunk whose bytes differ from the base,
+including untouched neighbours that gained a line break.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Literal, Self
+
+from pydantic import BaseModel, ConfigDict, model_validator
+
+from apps.blog.chunk_diff import chunk_hash
+from document_writer.domain.editor.chunking import Chunk, join_chunks, split_markdown
+
+
+class ChunkOperation(BaseModel):
+    """Replace, insert or delete one chunk of the base document.
+
+    - replace/delete target the base chunk at index or with chunk_hash.
+    - insert places text before the base chunk at index (or chunk_hash);
+      index equal to the base chunk count appends.
+    """
+
+    model_config = ConfigDict(extra="forbid")
+
+    op: Literal["replace", "insert", "delete"]
+    index: int | None = None
+    chunk_hash: str | None = None
+    text: str | None = None
+
+    @model_validator(mode="after")
+    def validate_operation(self) -> Self:
+        if self.index is None and self.chunk_hash is None:
+            raise ValueError("Chunk operation requires index or chunk_hash.")
+        if self.index is not None and self.index < 0:
+            raise ValueError("Chunk index must be non-negative.")
+        if self.op == "delete":
+            if self.text is not None:
+                raise ValueError("delete operations must not carry text.")
+        elif not self.text or not self.text.strip():
+            raise ValueError(f"{self.op} operations require non-empty text.")
+        return self
+
+
+@dataclass(frozen=True)
+class ChunkPatchResult:
+    content: str
+    changed_chunks: list[int]
+    deleted_chunks: list[int]
+
+
+def _resolve_index(operation: ChunkOperation, base_hashes: list[str], *, allow_end: bool) -> int:
+    upper = len(base_hashes) + (1 if allow_end else 0)
+    if operation.chunk_hash is not None:
+        matches = [i for i, value in enumerate(base_hashes) if value == operation.chunk_hash]
+        if operation.index is not None:
+            if operation.index not in matches:
+                raise ValueError(f"Chunk hash does not match chunk {operation.index}")
+            return operation.index
+        if len(matches) != 1:
+            raise ValueError(
+                f"Chunk hash {operation.chunk_hash} must identify exactly one chunk"
+            )
+        return matches[0]
+    assert operation.index is not None
+    if operation.index >= upper:
+        raise ValueError(f"Chunk index {operation.index} is out of range")
+    return operation.index
+
+
+def _bound_chunks(chunks: list[Chunk], touched: set[int]) -> list[Chunk]:
+    # Edited neighbours may lack a blank line between them; add one so chunking is stable.
+    bounded: list[Chunk] = []
+    for position, chunk in enumerate(chunks):
+        text = chunk.text
+        trailing = chunk.trailing_separator
+        is_last = position == len(chunks) - 1
+        if not is_last and (position in touched or position + 1 in touched):
+            if not text.endswith("\n"):
+                text += "\n"
+            separator = trailing + chunks[position + 1].leading_separator
+            trailing += "\n" * max(0, 1 - separator.count("\n"))
+        bounded.append(
+            Chunk(
+                index=position,
+                text=text,
+                leading_separator=chunk.leading_separator,
+                trailing_separator=trailing,
+            )
+        )
+    return bounded
+
+
+def apply_chunk_operations(base: str, operations: list[ChunkOperation]) -> ChunkPatchResult:
+    if not operations:
+        raise ValueError("At least one chunk operation is required.")
+    base_chunks = split_markdown(base)
+    base_hashes = [chunk_hash(chunk.text) for chunk in base_chunks]
+
+    replacements: dict[int, str] = {}
+    deletions: set[int] = set()
+    insertions: dict[int, list[str]] = {}
+    for operation in operations:
+        if operation.op == "insert":
+            position = _resolve_index(operation, base_hashes, allow_end=True)
+            insertions.setdefault(position, []).append(operation.text or "")
+            continue
+        index = _resolve_index(operation, base_hashes, allow_end=False)
+        if index in replacements or index in deletions:
+            raise ValueError(f"Chunk {index} is targeted by more than one operation")
+        if operation.op == "replace":
+            replacements[index] = operation.text or ""
+        else:
+            deletions.add(index)
+
+    result_chunks: list[Chunk] = []
+    changed: list[int] = []
+    touched: set[int] = set()
+
+    def _append_new(text: str) -> None:
+        changed.append(len(result_chunks))
+        result_chunks.append(Chunk(index=len(result_chunks), text=text))
+
+    for index, chunk in enumerate(base_chunks):
+        for text in insertions.get(index, []):
+            _append_new(text)
+        if index in deletions:
+            touched.add(len(result_chunks) - 1)
+            touched.add(len(result_chunks))
+            continue
+        if index in replacements and replacements[index] != chunk.text:
+            changed.append(len(result_chunks))
+            result_chunks.append(
+                Chunk(
+                    index=len(result_chunks),
+                    text=replacements[index],
+                    leading_separator=chunk.leading_separator,
+                    trailing_separator=chunk.trailing_separator,
+                )
+            )
+            continue
+        result_chunks.append(chunk)
+    for text in insertions.get(len(base_chunks), []):
+        _append_new(text)
+
+    if not result_chunks:
+        raise ValueError("Chunk operations must not remove all content.")
+    touched.update(changed)
+    bounded = _bound_chunks(result_chunks, touched)
+    content = join_chunks(bounded)
+    resplit = split_markdown(content)
+    if [chunk.text for chunk in resplit] != [chunk.text for chunk in bounded]:
+        raise ValueError("Chunk text must not span multiple chunks.")
+    # Bounding may add a line break to an untouched neighbour; that is a change too.
+    changed_set = set(changed)
+    changed_set.update(
+        position
+        for position, (chunk, bound) in enumerate(zip(result_chunks, bounded))
+        if (chunk.text, chunk.trailing_separator) != (bound.text, bound.trailing_separator)
+    )
+    return ChunkPatchResult(
+        content=content,
+        changed_chunks=sorted(changed_set),
+        deleted_chunks=sorted(deletions),
+    )
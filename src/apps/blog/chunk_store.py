@@ -0,0 +1,125 @@
+"""Content-addressed storage for revision snapshots.
+
+Chunk texts are stored once per posts root as blobs named by their sha256
+(.chunks/ab/<hash>). Each content revision gets a small manifest
+(revisions/<rev>.manifest.json) listing chunk hashes and separators, so
+joining the manifest reproduces the revision content exactly. Manifests
+also carry the revision's block layout (see chunk_blocks); older ones
+without it are still valid.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import secrets
+import time
+from pathlib import Path
+
+from apps.blog import chunk_blocks
+from apps.blog.chunk_diff import chunk_hash
+from document_writer.domain.editor.chunking import Chunk
+
+CHUNKS_DIR_NAME = ".chunks"
+
+
+def blob_path(posts_root: Path, digest: str) -> Path:
+    return posts_root / CHUNKS_DIR_NAME / digest[:2] / digest
+
+
+def manifest_path(post_dir: Path, revision_id: int) -> Path:
+    return post_dir / "revisions" / f"{revision_id}.manifest.json"
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_name(f".{path.name}.{secrets.token_hex(4)}.tmp")
+    temp_path.write_bytes(data)
+    os.replace(temp_path, path)
+
+
+def put_blob(posts_root: Path, text: str) -> str:
+    digest = chunk_hash(text)
+    path = blob_path(posts_root, digest)
+    try:
+        # Refresh mtime so a concurrent prune treats the blob as recently used.
+        os.utime(path)
+    except FileNotFoundError:
+        # Missing, or pruned between our check and the touch: write it again.
+        _write_atomic(path, text.encode("utf-8"))
+    return digest
+
+
+def get_blob(posts_root: Path, digest: str) -> str:
+    path = blob_path(posts_root, digest)
+    if not path.exists():
+        raise FileNotFoundError(f"Chunk blob {digest} not found")
+    text = path.read_bytes().decode("utf-8")
+    if chunk_hash(text) != digest:
+        raise ValueError(f"Chunk blob {digest} is corrupt")
+    return text
+
+
+def write_manifest(posts_root: Path, post_dir: Path, revision_id: int, chunks: list[Chunk]) -> None:
+    entries = [
+        {
+            "hash": put_blob(posts_root, chunk.text),
+            "leading": chunk.leading_separator,
+            "trailing": chunk.trailing_separator,
+        }
+        for chunk in chunks
+    ]
+    starts, references = chunk_blocks.block_layout(chunks)
+    payload = {"revision_id": revision_id, "chunks": entries, "starts": starts, "references": references}
+    _write_atomic(manifest_path(post_dir, revision_id), json.dumps(payload).encode("utf-8"))
+
+
+def read_manifest_payload(post_dir: Path, revision_id: int) -> dict | None:
+    path = manifest_path(post_dir, revision_id)
+    if not path.exists():
+        return None
+    payload = json.loads(path.read_text())
+    entries = payload.get("chunks") if isinstance(payload, dict) else None
+    if not isinstance(entries, list):
+        raise ValueError(f"Invalid manifest {path}")
+    starts = payload.get("starts")
+    if starts is not None and (not isinstance(starts, list) or len(starts) != len(entries)):
+        raise ValueError(f"Invalid manifest {path}")
+    return payload
+
+
+def read_manifest(post_dir: Path, revision_id: int) -> list[dict] | None:
+    payload = read_manifest_payload(post_dir, revision_id)
+    return None if payload is None else payload["chunks"]
+
+
+def load_manifest_chunks(posts_root: Path, post_dir: Path, revision_id: int) -> list[Chunk] | None:
+    entries = read_manifest(post_dir, revision_id)
+    if entries is None:
+        return None
+    return [
+        Chunk(
+            index=index,
+            text=get_blob(posts_root, entry["hash"]),
+            leading_separator=entry.get("leading", ""),
+            trailing_separator=entry.get("trailing", ""),
+        )
+        for index, entry in enumerate(entries)
+    ]
+
+
+def prune_blobs(posts_root: Path, referenced: set[str], *, grace_seconds: float = 3600) -> int:
+    """Delete unreferenced blobs older than grace_seconds; return the count removed."""
+    chunks_dir = posts_root / CHUNKS_DIR_NAME
+    if not chunks_dir.exists():
+        return 0
+    cutoff = time.time() - grace_seconds
+    removed = 0
+    for path in chunks_dir.glob("*/*"):
+        if path.name.startswith(".") or path.name in referenced:
+            continue
+        if path.stat().st_mtime > cutoff:
+            continue
+        path.unlink(missing_ok=True)
+        removed += 1
+    return removed
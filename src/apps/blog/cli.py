@@ -1,15 +1,27 @@
 import argparse
 import os
+from datetime import datetime
 from dotenv import load_dotenv
 
 from document_writer.apps.service import generate_document
 from document_writer.domain.intent import load_intent_from_yaml
 
+from apps.blog.archive import export_posts, import_posts
+from apps.blog.bulk_edit import PostFilter, apply_policy_edit_all, select_posts
+from apps.blog.compaction import collect_garbage
 from apps.blog.edit_service import apply_policy_edit
-from apps.blog.post import BlogPost
+from apps.blog.fsck import fsck
+from apps.blog.hashing import text_digest
+from apps.blog.paths import POSTS_ROOT
+from apps.blog.post_layout import LAYOUT_SCHEMES, migrate
+from apps.blog.post_store import get_post_store, storage_backend
+from apps.blog.types import POST_STATUS_VALUES
 
 load_dotenv(override=True)
 
+# These work on post directories and need the filesystem store.
+FILESYSTEM_COMMANDS = ("gc", "layout", "export", "import", "fsck")
+
 
 def main():
     parser = argparse.ArgumentParser(prog="blog")
@@ -25,12 +37,59 @@ def main():
     edit.add_argument("--post-id", required=True)
     edit.add_argument("--policy", required=True)
 
+    edit_all = sub.add_parser("edit-all")
+    edit_all.add_argument("--policy", required=True)
+    edit_all.add_argument("--status", default="draft", choices=POST_STATUS_VALUES)
+    edit_all.add_argument("--author")
+    edit_all.add_argument("--created-after", type=datetime.fromisoformat)
+    edit_all.add_argument("--created-before", type=datetime.fromisoformat)
+    edit_all.add_argument("--workers", type=int, default=8)
+    edit_all.add_argument("--progress-file")
+
+    gc = sub.add_parser("gc")
+    gc.add_argument("--no-delta", action="store_true")
+    gc.add_argument("--grace-seconds", type=float, default=3600)
+
+    layout = sub.add_parser("layout")
+    layout.add_argument("scheme", choices=LAYOUT_SCHEMES)
+
+    export = sub.add_parser("export")
+    export.add_argument("archive")
+    export.add_argument("--status", choices=POST_STATUS_VALUES)
+    export.add_argument("--author")
+    export.add_argument("--created-after", type=datetime.fromisoformat)
+    export.add_argument("--created-before", type=datetime.fromisoformat)
+    export.add_argument("--workers", type=int, default=8)
+
+    fsck_ = sub.add_parser("fsck")
+    fsck_.add_argument("--repair", action="store_true")
+    fsck_.add_argument("--workers", type=int)
+
+    import_ = sub.add_parser("import")
+    import_.add_argument("archive")
+    import_.add_argument("--workers", type=int, default=8)
+
     args = parser.parse_args()
+    backend = storage_backend()
+    if args.cmd in FILESYSTEM_COMMANDS and backend != "filesystem":
+        parser.error(f"{args.cmd} needs the filesystem storage backend, not {backend}")
 
     if args.cmd == "generate":
         generate(args)
     elif args.cmd == "edit":
         edit_post(args)
+    elif args.cmd == "edit-all":
+        edit_all_posts(args)
+    elif args.cmd == "gc":
+        gc_posts(args)
+    elif args.cmd == "layout":
+        migrate_layout(args)
+    elif args.cmd == "export":
+        export_archive(args)
+    elif args.cmd == "import":
+        import_archive(args)
+    elif args.cmd == "fsck":
+        check_posts(args)
 
 
 # ---------- generate ----------
@@ -44,17 +103,16 @@ def generate(args):
         trace=False,
     )
 
-    post = BlogPost(
+    store = get_post_store()
+    post_id = store.create_post(
         title=args.title,
         author=args.author,
         intent=intent.model_dump(),
         content=result.markdown,
-        status=args.status,
     )
-
-    post_id, path = post.persist()
+    if args.status != "draft":
+        store.update_post_status(post_id, args.status)
     print(f"Blog post created: {post_id}")
-    print(f"Blog post created at: {path}")
 
 
 # ---------- edit ----------
@@ -72,12 +130,113 @@ def edit_post(args):
     for rejected in result.rejected_chunks:
         print(f"Chunk {rejected.chunk_index} rejected: {rejected.reason}")
 
-    if not result.changed_chunks:
+    if not result.revision_id:
         print(f"No changes applied for post: {args.post_id}")
         return
     print(f"Post edited: {args.post_id}")
     print(f"Revision id: {result.revision_id}")
     print(f"Chunks changed: {len(result.changed_chunks)}")
+    print(f"Chunks deleted: {len(result.deleted_chunks)}")
+
+
+# ---------- edit-all ----------
+
+def edit_all_posts(args):
+    with open(args.policy, "r", encoding="utf-8") as handle:
+        editing_policy = handle.read()
+
+    progress_file = args.progress_file
+    if progress_file is None:
+        policy_hash = text_digest(editing_policy)
+        progress_dir = POSTS_ROOT / ".edit-all"
+        progress_dir.mkdir(exist_ok=True)
+        progress_file = progress_dir / f"{policy_hash[:12]}.jsonl"
+    print(f"Progress file: {progress_file}")
+
+    result = apply_policy_edit_all(
+        editing_policy,
+        post_filter=PostFilter(
+            status=args.status,
+            author=args.author,
+            created_after=args.created_after,
+            created_before=args.created_before,
+        ),
+        actor_id=os.path.basename(args.policy),
+        max_workers=args.workers,
+        progress_path=progress_file,
+        on_post_done=lambda post_id, outcome: print(f"{post_id}: {outcome}"),
+    )
+
+    for post_id, reason in sorted(result.skipped.items()):
+        print(f"Post skipped: {post_id} ({reason})")
+    print(f"Posts edited: {len(result.edited)}")
+    print(f"Posts unchanged: {len(result.unchanged)}")
+    print(f"Posts already done: {len(result.resumed)}")
+    print(f"Posts failed: {len(result.failed)}")
+
+
+# ---------- gc ----------
+
+def gc_posts(args):
+    result = collect_garbage(delta=not args.no_delta, grace_seconds=args.grace_seconds)
+    print(f"Posts compacted: {result.posts_compacted}")
+    print(f"Revisions packed: {result.revisions_packed}")
+    print(f"Snapshot files removed: {result.files_removed}")
+    print(f"Blobs pruned: {result.blobs_pruned}")
+
+
+# ---------- layout ----------
+
+def migrate_layout(args):
+    moved = migrate(POSTS_ROOT, args.scheme)
+    print(f"Post layout: {args.scheme}")
+    print(f"Posts moved: {moved}")
+
+
+# ---------- fsck ----------
+
+def check_posts(args):
+    result = fsck(repair=args.repair, workers=args.workers)
+    for post_id, problems in sorted(result.problems.items()):
+        for problem in problems:
+            print(f"{post_id}: {problem}")
+    for post_id, revision_id in sorted(result.repaired.items()):
+        print(f"{post_id}: content.md restored from revision {revision_id}")
+    for post_id, moved in sorted(result.moved_rejected.items()):
+        print(f"{post_id}: {moved} rejected revisions moved to the rejected log")
+    print(f"Posts checked: {result.posts_checked}")
+    print(f"Posts with problems: {len(result.problems)}")
+    print(f"Posts repaired: {len(result.repaired)}")
+    if result.unresolved:
+        raise SystemExit(1)
+
+
+# ---------- export / import ----------
+
+def export_archive(args):
+    post_filter = PostFilter(
+        status=args.status,
+        author=args.author,
+        created_after=args.created_after,
+        created_before=args.created_before,
+    )
+    post_ids = None
+    if post_filter != PostFilter(status=None):
+        post_ids = [meta.post_id for meta in select_posts(post_filter)]
+
+    result = export_posts(args.archive, post_ids=post_ids, workers=args.workers)
+    print(f"Posts exported: {result.posts}")
+    print(f"Files exported: {result.files}")
+    print(f"Blobs exported: {result.blobs}")
+
+
+def import_archive(args):
+    result = import_posts(args.archive, workers=args.workers)
+    for post_id in result.skipped:
+        print(f"Post skipped: {post_id} (already exists)")
+    print(f"Posts imported: {result.posts}")
+    print(f"Files imported: {result.files}")
+    print(f"Blobs imported: {result.blobs}")
 
 
 if __name__ == "__main__":
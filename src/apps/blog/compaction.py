@@ -0,0 +1,124 @@
+"""Revision compaction (`blog gc`).
+
+Old content snapshots of each post are appended to one compressed pack
+(see revision_pack) and their loose manifests or legacy chunk files are
+removed, all under the post's lock. The latest content revision stays loose so replaying the
+current content never touches the pack. Blobs no longer referenced by
+any manifest are pruned afterwards.
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from pathlib import Path
+
+from apps.blog import chunk_store, post_layout, revision_pack
+from apps.blog.paths import POSTS_ROOT
+from apps.blog.storage import (
+    is_applied_content_revision,
+    load_revision_chunks,
+    read_revision_metadata,
+)
+from document_writer.domain.editor.chunking import join_chunks
+
+
+@dataclass
+class CompactionResult:
+    posts_compacted: int = 0
+    revisions_packed: int = 0
+    files_removed: int = 0
+    blobs_pruned: int = 0
+
+
+def _loose_snapshot_files(post_dir: Path, revision_id: int) -> list[Path]:
+    files: list[Path] = []
+    manifest = chunk_store.manifest_path(post_dir, revision_id)
+    if manifest.exists():
+        files.append(manifest)
+    index = 0
+    while (post_dir / "revisions" / f"{revision_id}_{index}.md").exists():
+        files.append(post_dir / "revisions" / f"{revision_id}_{index}.md")
+        index += 1
+    return files
+
+
+def compact_post(post_id: str, posts_root: Path, *, delta: bool = True) -> tuple[int, int]:
+    """Pack all but the latest content revision; return (packed, files_removed).
+
+    Runs under the post lock. Only revisions that are not packed yet are
+    read and added to the pack.
+    """
+    with post_layout.locked_post_dir(posts_root, post_id) as post_dir:
+        content_revision_ids = [
+            entry["revision_id"]
+            for entry in read_revision_metadata(post_id, posts_root)
+            if is_applied_content_revision(entry)
+        ]
+        loose = {
+            revision_id: files
+            for revision_id in content_revision_ids[:-1]
+            if (files := _loose_snapshot_files(post_dir, revision_id))
+        }
+        if not loose:
+            return 0, 0
+        # Loose files of an already packed revision are leftovers of an interrupted run.
+        already_packed = set(revision_pack.packed_revision_ids(post_dir))
+
+        chunks_by_revision = {}
+        for revision_id in loose:
+            chunks = load_revision_chunks(posts_root, post_dir, revision_id)
+            if chunks is not None:
+                chunks_by_revision[revision_id] = chunks
+        fresh = {
+            revision_id: chunks
+            for revision_id, chunks in chunks_by_revision.items()
+            if revision_id not in already_packed
+        }
+        if fresh:
+            revision_pack.append_to_pack(post_dir, fresh, delta=delta)
+
+        for revision_id, chunks in chunks_by_revision.items():
+            unpacked = revision_pack.read_packed_chunks(post_dir, revision_id) or []
+            if join_chunks(unpacked) != join_chunks(chunks):
+                raise ValueError(
+                    f"Revision pack verification failed for post {post_id} at revision {revision_id}"
+                )
+
+        removed = 0
+        for revision_id in chunks_by_revision:
+            for path in loose[revision_id]:
+                path.unlink(missing_ok=True)
+                removed += 1
+    return len(fresh), removed
+
+
+def _referenced_blobs(posts_root: Path) -> set[str]:
+    referenced: set[str] = set()
+    for post_dir in post_layout.iter_post_dirs(posts_root):
+        for manifest in post_dir.glob("revisions/*.manifest.json"):
+            payload = json.loads(manifest.read_text())
+            referenced.update(entry["hash"] for entry in payload.get("chunks", []))
+    return referenced
+
+
+def collect_garbage(
+    posts_root: str | Path | None = None,
+    *,
+    delta: bool = True,
+    grace_seconds: float = 3600,
+) -> CompactionResult:
+    resolved_root = Path(posts_root) if posts_root is not None else POSTS_ROOT
+    result = CompactionResult()
+    for post_dir in sorted(post_layout.iter_post_dirs(resolved_root)):
+        packed, removed = compact_post(post_dir.name, resolved_root, delta=delta)
+        if packed:
+            result.posts_compacted += 1
+        result.revisions_packed += packed
+        result.files_removed += removed
+    result.blobs_pruned = chunk_store.prune_blobs(
+        resolved_root,
+        _referenced_blobs(resolved_root),
+        grace_seconds=grace_seconds,
+    )
+    return result
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-import hashlib
+from dataclasses import dataclass
+from typing import Any, Callable
 
 from pydantic import BaseModel, ConfigDict
 
@@ -8,9 +9,10 @@ from agentic_framework.agent_dispatcher import AgentDispatcherBase
 from document_writer.domain.editor import edit_document, make_editor_agent, AgentEditorRequest
 from document_writer.domain.editor.chunking import Chunk, split_markdown, join_chunks
 
-from apps.blog.storage import read_post_content, read_post_intent, read_post_meta
+from apps.blog.chunk_diff import diff_chunks
+from apps.blog.hashing import text_digest
+from apps.blog.policy import CompiledPolicy, compile_policy
 from apps.blog.post_revision_writer import PostRevisionWriter
-from apps.blog.paths import POSTS_ROOT
 
 
 class RejectedChunk(BaseModel):
@@ -28,133 +30,208 @@ class EditResult(BaseModel):
     changed_chunks: list[int]
     rejected_chunks: list[RejectedChunk]
     content: str
+    deleted_chunks: list[int] = []
 
 
-def _hash_text(text: str) -> str:
-    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+ProgressCallback = Callable[[dict[str, Any]], None]
 
 
-def apply_policy_edit(
-    post_id: str,
-    policy_text: str,
-    *,
-    actor_id: str | None = None,
-) -> EditResult:
-    post_dir = POSTS_ROOT / post_id
-    if not post_dir.exists():
-        raise FileNotFoundError(f"Post not found: {post_dir}")
+@dataclass(frozen=True)
+class PolicyEditTarget:
+    """A draft post loaded for policy editing, split into its chunks."""
 
-    content_path = post_dir / "content.md"
-    meta = read_post_meta(post_id)
-    if meta.status != "draft":
-        raise RuntimeError(f"Cannot edit non-draft post: {post_id}")
+    post_id: str
+    document: str
+    before_hash: str
+    intent: dict
+    chunks: list[Chunk]
+    last_revision_id: int = 0
 
-    document = read_post_content(post_id)
-    before_hash = _hash_text(document)
-    intent = read_post_intent(post_id)
-    policy_hash = hashlib.sha256(policy_text.encode("utf-8")).hexdigest()
 
-    agent = make_editor_agent()
-    dispatcher = AgentDispatcherBase()
+def load_policy_edit_target(post_id: str) -> PolicyEditTarget:
     writer = PostRevisionWriter()
-    # Policy edits are clients of the canonical revision mechanism.
+    store = writer.store
+    store.read_post_meta(post_id)
 
-    chunks = split_markdown(document)
-    original_chunks = chunks
-    changed_indices: list[int] = []
-    rejected_chunks: list[RejectedChunk] = []
-    updated_chunks: list[Chunk] = []
-    try:
-        for chunk in chunks:
-            response = edit_document(
-                AgentEditorRequest(
-                    document=chunk.text,
-                    editing_policy=policy_text,
-                    intent=intent,
-                ),
-                dispatcher=dispatcher,
-                editor_agent=agent,
-            )
-            if response.edited_document != chunk.text:
-                changed_indices.append(chunk.index)
-                updated_chunks.append(
-                    Chunk(
-                        index=chunk.index,
-                        text=response.edited_document,
-                        leading_separator=chunk.leading_separator,
-                        trailing_separator=chunk.trailing_separator,
-                    )
-                )
-            else:
-                updated_chunks.append(chunk)
-    except ValueError as exc:
-        writer.apply_delta(
-            post_id,
-            actor={"type": "policy", "id": actor_id or "policy"},
-            delta_type="content_policy_edit",
-            delta_payload={
-                "changed_chunks": [],
-                "before_hash": before_hash,
-                "after_hash": before_hash,
-                "policy_hash": policy_hash,
-                "rejected_chunks": [],
-            },
-            new_content=document,
-            reason=str(exc),
-            status="rejected",
-        )
-        raise
-    except Exception as exc:
-        writer.apply_delta(
-            post_id,
-            actor={"type": "policy", "id": actor_id or "policy"},
-            delta_type="content_policy_edit",
-            delta_payload={
-                "changed_chunks": [],
-                "before_hash": before_hash,
-                "after_hash": before_hash,
-                "policy_hash": policy_hash,
-                "rejected_chunks": [],
-            },
-            new_content=document,
-            reason=str(exc),
-            status="rejected",
+    state = writer.get_current_state(post_id)
+    if state.status != "draft":
+        raise RuntimeError(f"Cannot edit non-draft post: {post_id}")
+
+    # Read the revision id first: a concurrent edit then surfaces as a conflict at commit.
+    last_revision_id = store.read_last_revision_id(post_id) or 0
+    document = store.read_post_content(post_id)
+    return PolicyEditTarget(
+        post_id=post_id,
+        document=document,
+        before_hash=text_digest(document),
+        intent=store.read_post_intent(post_id),
+        chunks=split_markdown(document),
+        last_revision_id=last_revision_id,
+    )
+
+
+def edit_chunk(
+    chunk: Chunk,
+    policy: CompiledPolicy,
+    intent: dict,
+    *,
+    dispatcher: AgentDispatcherBase,
+    agent: Any | None,
+) -> Chunk:
+    edited_text = policy.apply_rules(chunk.text)
+    if agent is not None:
+        response = edit_document(
+            AgentEditorRequest(
+                document=edited_text,
+                editing_policy=policy.residual_text,
+                intent=intent,
+            ),
+            dispatcher=dispatcher,
+            editor_agent=agent,
         )
-        raise
+        edited_text = response.edited_document
+    if edited_text == chunk.text:
+        return chunk
+    return Chunk(
+        index=chunk.index,
+        text=edited_text,
+        leading_separator=chunk.leading_separator,
+        trailing_separator=chunk.trailing_separator,
+    )
+
 
-    if not changed_indices:
+def record_policy_edit_failure(
+    target: PolicyEditTarget,
+    *,
+    policy_hash: str,
+    actor_id: str | None,
+    reason: str,
+    writer: PostRevisionWriter,
+) -> None:
+    writer.apply_delta(
+        target.post_id,
+        actor={"type": "policy", "id": actor_id or "policy"},
+        delta_type="content_policy_edit",
+        delta_payload={
+            "changed_chunks": [],
+            "before_hash": target.before_hash,
+            "after_hash": target.before_hash,
+            "policy_hash": policy_hash,
+            "rejected_chunks": [],
+        },
+        new_content=target.document,
+        reason=reason,
+        status="rejected",
+    )
+
+
+def commit_policy_edit(
+    target: PolicyEditTarget,
+    updated_chunks: list[Chunk],
+    *,
+    policy_hash: str,
+    actor_id: str | None,
+    writer: PostRevisionWriter,
+    rejected_chunks: list[RejectedChunk] | None = None,
+) -> EditResult:
+    rejected_chunks = rejected_chunks or []
+    assert [c.index for c in updated_chunks] == list(range(len(updated_chunks)))
+    updated_document = join_chunks(updated_chunks)
+    # Compare content, not chunk alignment: deletions, moves and line-break
+    # changes leave changed_chunks empty but are still edits.
+    if updated_document == target.document:
         return EditResult(
-            post_id=post_id,
+            post_id=target.post_id,
             revision_id=0,
             changed_chunks=[],
             rejected_chunks=rejected_chunks,
-            content=document,
+            content=target.document,
         )
-
-    assert [c.index for c in updated_chunks] == list(range(len(updated_chunks)))
-    updated_document = join_chunks(updated_chunks)
-    after_hash = _hash_text(updated_document)
+    diff = diff_chunks(target.chunks, updated_chunks)
+    changed_indices = diff.changed_chunks
+    after_hash = text_digest(updated_document)
     revision_id = writer.apply_delta(
-        post_id,
+        target.post_id,
         actor={"type": "policy", "id": actor_id or "policy"},
         delta_type="content_policy_edit",
         delta_payload={
             "changed_chunks": changed_indices,
-            "before_hash": before_hash,
+            "deleted_chunks": diff.deleted_chunks,
+            "before_hash": target.before_hash,
             "after_hash": after_hash,
             "policy_hash": policy_hash,
             "rejected_chunks": [chunk.model_dump() for chunk in rejected_chunks],
         },
         new_content=updated_document,
+        expected_revision_id=target.last_revision_id,
     )
     if not isinstance(revision_id, int):
         raise ValueError("Revision id must be an int")
-    content_path.write_text(updated_document)
 
     return EditResult(
-        post_id=post_id,
+        post_id=target.post_id,
         revision_id=revision_id,
         changed_chunks=changed_indices,
         rejected_chunks=rejected_chunks,
         content=updated_document,
+        deleted_chunks=diff.deleted_chunks,
+    )
+
+
+def apply_policy_edit(
+    post_id: str,
+    policy_text: str,
+    *,
+    actor_id: str | None = None,
+    on_progress: ProgressCallback | None = None,
+) -> EditResult:
+    target = load_policy_edit_target(post_id)
+    policy_hash = text_digest(policy_text)
+    policy = compile_policy(policy_text)
+
+    # Purely mechanical policies never reach the editor agent.
+    agent = make_editor_agent() if policy.requires_agent else None
+    dispatcher = AgentDispatcherBase()
+    writer = PostRevisionWriter()
+    # Policy edits are clients of the canonical revision mechanism.
+
+    updated_chunks: list[Chunk] = []
+    try:
+        for chunk in target.chunks:
+            updated_chunk = edit_chunk(
+                chunk,
+                policy,
+                target.intent,
+                dispatcher=dispatcher,
+                agent=agent,
+            )
+            updated_chunks.append(updated_chunk)
+            if on_progress is not None:
+                on_progress(
+                    {
+                        "event": "chunk",
+                        "chunk_index": chunk.index,
+                        "completed": len(updated_chunks),
+                        "total": len(target.chunks),
+                        "changed": updated_chunk is not chunk,
+                        "agent_call": agent is not None,
+                        "text": updated_chunk.text,
+                    }
+                )
+    except Exception as exc:
+        record_policy_edit_failure(
+            target,
+            policy_hash=policy_hash,
+            actor_id=actor_id,
+            reason=str(exc),
+            writer=writer,
+        )
+        raise
+
+    return commit_policy_edit(
+        target,
+        updated_chunks,
+        policy_hash=policy_hash,
+        actor_id=actor_id,
+        writer=writer,
     )
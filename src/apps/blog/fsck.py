@@ -0,0 +1,218 @@
+"""Corpus integrity check (`blog fsck`).
+
+Each post is checked under its write lock, in a worker process:
+
+- meta.yaml parses and neither revision log has a torn tail
+- revision ids increase along each log, run 1..N across both, and every
+  parent is an earlier revision
+- rejected revisions sit in the rejected log, not the hot log
+- every applied content revision has a complete snapshot (contiguous
+  legacy chunk files, or a manifest or pack entry whose blobs exist and
+  match their digests) that replays to the revision's after_hash
+- content.md matches the latest applied content revision
+
+With repair, rejected revisions are moved out of the hot log, and a
+missing or mismatched content.md is rewritten from the latest content
+revision that replays correctly. content.md is left alone when the
+latest content revision neither replays nor records an after_hash, since
+nothing says what it should hold.
+"""
+
+from __future__ import annotations
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable
+
+from apps.blog import post_index, post_layout, revision_log
+from apps.blog.hashing import file_digest, text_digest
+from apps.blog.paths import POSTS_ROOT
+from apps.blog.storage import is_applied_content_revision, load_revision_chunks, write_post_content
+from document_writer.domain.editor.chunking import join_chunks
+
+
+@dataclass
+class PostCheck:
+    post_id: str
+    problems: list[str] = field(default_factory=list)
+    repaired: list[str] = field(default_factory=list)
+    repaired_from: int | None = None
+    moved_rejected: int = 0
+
+
+@dataclass
+class FsckResult:
+    posts_checked: int = 0
+    problems: dict[str, list[str]] = field(default_factory=dict)
+    unresolved: dict[str, list[str]] = field(default_factory=dict)
+    repaired: dict[str, int] = field(default_factory=dict)
+    moved_rejected: dict[str, int] = field(default_factory=dict)
+
+
+def _legacy_snapshot_gaps(post_dir: Path, revision_id: int) -> list[int]:
+    indices = sorted(
+        int(path.stem.split("_", 1)[1])
+        for path in (post_dir / "revisions").glob(f"{revision_id}_*.md")
+        if path.stem.split("_", 1)[1].isdigit()
+    )
+    return sorted(set(range(indices[-1] + 1)) - set(indices)) if indices else []
+
+
+def _replay(posts_root: Path, post_dir: Path, entry: dict) -> tuple[str | None, str | None]:
+    """(content, problem) for one applied content revision."""
+    revision_id = entry["revision_id"]
+    gaps = _legacy_snapshot_gaps(post_dir, revision_id)
+    if gaps:
+        return None, f"revision {revision_id}: snapshot chunks missing at {gaps}"
+    try:
+        chunks = load_revision_chunks(posts_root, post_dir, revision_id)
+    except (FileNotFoundError, ValueError) as exc:
+        return None, f"revision {revision_id}: {exc}"
+    if chunks is None:
+        return None, f"revision {revision_id}: snapshot missing"
+    content = join_chunks(chunks)
+    payload = entry.get("delta_payload")
+    after_hash = payload.get("after_hash") if isinstance(payload, dict) else None
+    if isinstance(after_hash, str) and text_digest(content) != after_hash:
+        return None, f"revision {revision_id}: replay does not match after_hash"
+    return content, None
+
+
+def _check_order(entries: list[dict], label: str) -> list[str]:
+    revision_ids = [entry.get("revision_id") for entry in entries]
+    if not all(isinstance(revision_id, int) for revision_id in revision_ids):
+        return []
+    for previous, revision_id in zip(revision_ids, revision_ids[1:]):
+        if revision_id <= previous:
+            return [f"{label}: revision {revision_id} follows revision {previous}"]
+    return []
+
+
+def _check_chain(entries: list[dict]) -> list[str]:
+    problems: list[str] = []
+    for position, entry in enumerate(entries, start=1):
+        revision_id = entry.get("revision_id")
+        if revision_id != position:
+            problems.append(f"revision log: expected revision {position}, found {revision_id!r}")
+            break
+        parent = entry.get("parent_revision_id")
+        if parent is None and position > 1:
+            problems.append(f"revision {revision_id}: missing parent_revision_id")
+        elif parent is not None and not (isinstance(parent, int) and 1 <= parent < revision_id):
+            problems.append(f"revision {revision_id}: invalid parent_revision_id {parent!r}")
+    return problems
+
+
+def _has_torn_tail(path: Path) -> bool:
+    with path.open("rb") as log_file:
+        log_file.seek(0, os.SEEK_END)
+        if log_file.tell() == 0:
+            return False
+        log_file.seek(-1, os.SEEK_END)
+        return log_file.read(1) != b"\n"
+
+
+def check_post(posts_root: Path, post_id: str, *, repair: bool = False) -> PostCheck:
+    check = PostCheck(post_id=post_id)
+    with post_layout.locked_post_dir(posts_root, post_id) as post_dir:
+        try:
+            post_index.load_meta_file(post_dir / "meta.yaml")
+        except Exception as exc:
+            check.problems.append(f"meta.yaml: {exc}")
+            return check
+        if not revision_log.has_log(post_dir):
+            return check
+        if _has_torn_tail(revision_log.log_path(post_dir)):
+            check.problems.append("revision log: torn final entry")
+        rejected_log = revision_log.rejected_log_path(post_dir)
+        if rejected_log.exists() and _has_torn_tail(rejected_log):
+            check.problems.append("rejected log: torn final entry")
+        misplaced = sum(entry.get("status") == "rejected" for entry in revision_log.read_revisions(post_dir))
+        if misplaced and repair:
+            check.moved_rejected = revision_log.split_rejected(post_dir)
+        elif misplaced:
+            check.problems.append(f"revision log: {misplaced} rejected revisions outside the rejected log")
+        entries = revision_log.read_revisions(post_dir)
+        rejected = revision_log.read_rejected_revisions(post_dir)
+        check.problems.extend(_check_order(entries, "revision log"))
+        check.problems.extend(_check_order(rejected, "rejected log"))
+        check.problems.extend(_check_chain(revision_log.merge_history(entries, rejected)))
+
+        # content.md must hash to the latest content revision's replay, or to
+        # its recorded after_hash when that revision cannot be replayed.
+        expected: tuple[int, str | None] | None = None
+        latest_valid: tuple[int, str] | None = None
+        for entry in entries:
+            if not is_applied_content_revision(entry) or not isinstance(entry.get("revision_id"), int):
+                continue
+            content, problem = _replay(posts_root, post_dir, entry)
+            if problem is None:
+                latest_valid = (entry["revision_id"], content)
+                expected = (entry["revision_id"], text_digest(content))
+                continue
+            check.problems.append(problem)
+            payload = entry.get("delta_payload")
+            after_hash = payload.get("after_hash") if isinstance(payload, dict) else None
+            expected = (entry["revision_id"], after_hash if isinstance(after_hash, str) else None)
+        if expected is None:
+            return check
+
+        content_path = post_dir / "content.md"
+        if expected[1] is None:
+            check.problems.append(
+                f"content.md: cannot be verified; revision {expected[0]} does not replay"
+                " and records no after_hash"
+            )
+            return check
+        if not content_path.exists():
+            problem = "content.md: missing"
+        elif file_digest(content_path) != expected[1]:
+            problem = f"content.md: does not match revision {expected[0]}"
+        else:
+            return check
+        check.problems.append(problem)
+        if repair and latest_valid is not None:
+            write_post_content(post_id, latest_valid[1], posts_root=posts_root)
+            check.repaired.append(problem)
+            check.repaired_from = latest_valid[0]
+    return check
+
+
+def _check_worker(args: tuple[Path, str, bool]) -> PostCheck:
+    posts_root, post_id, repair = args
+    return check_post(posts_root, post_id, repair=repair)
+
+
+def _collect(checks: Iterable[PostCheck]) -> FsckResult:
+    result = FsckResult()
+    for check in checks:
+        result.posts_checked += 1
+        if check.problems:
+            result.problems[check.post_id] = check.problems
+        unresolved = [problem for problem in check.problems if problem not in check.repaired]
+        if unresolved:
+            result.unresolved[check.post_id] = unresolved
+        if check.repaired_from is not None:
+            result.repaired[check.post_id] = check.repaired_from
+        if check.moved_rejected:
+            result.moved_rejected[check.post_id] = check.moved_rejected
+    return result
+
+
+def fsck(
+    posts_root: str | Path | None = None,
+    *,
+    repair: bool = False,
+    workers: int | None = None,
+) -> FsckResult:
+    """Check every post, on a process pool unless workers is 1."""
+    resolved_root = Path(posts_root) if posts_root is not None else POSTS_ROOT
+    work = [(resolved_root, post_dir.name, repair) for post_dir in post_layout.iter_post_dirs(resolved_root)]
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        return _collect(map(_check_worker, work))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        chunksize = max(1, len(work) // (workers * 8))
+        return _collect(pool.map(_check_worker, work, chunksize=chunksize))
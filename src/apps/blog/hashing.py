@@ -0,0 +1,68 @@
+"""Shared sha256 digests for post files and texts.
+
+file_digest() memoizes by (st_dev, st_ino, st_mtime_ns, st_size), so
+checking that a file is unchanged costs one stat call. text_digest()
+memoizes by object identity, so a document hashed several times while
+one request is handled (before/after hashes, payloads, derived state) is
+hashed once. Entries hold a reference to their text, which keeps ids
+from being reused while an entry is alive. Both memos are small LRUs.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+FILE_MEMO_SIZE = 4096
+TEXT_MEMO_SIZE = 64
+
+_FileKey = tuple[str, int, int, int, int]
+
+_file_memo: OrderedDict[_FileKey, str] = OrderedDict()
+_text_memo: OrderedDict[int, tuple[str, str]] = OrderedDict()
+_lock = threading.Lock()
+
+
+def _remember(memo: OrderedDict, key: object, value: object, max_size: int) -> None:
+    with _lock:
+        memo[key] = value
+        memo.move_to_end(key)
+        while len(memo) > max_size:
+            memo.popitem(last=False)
+
+
+def text_digest(text: str) -> str:
+    key = id(text)
+    with _lock:
+        entry = _text_memo.get(key)
+        if entry is not None and entry[0] is text:
+            _text_memo.move_to_end(key)
+            return entry[1]
+    digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    _remember(_text_memo, key, (text, digest), TEXT_MEMO_SIZE)
+    return digest
+
+
+def file_digest(path: Path) -> str:
+    stat = os.stat(path)
+    key = (str(path), stat.st_dev, stat.st_ino, stat.st_mtime_ns, stat.st_size)
+    with _lock:
+        digest = _file_memo.get(key)
+        if digest is not None:
+            _file_memo.move_to_end(key)
+            return digest
+    digest = hashlib.sha256(Path(path).read_bytes()).hexdigest()
+    # Only memoize if the file did not change while it was read.
+    stat = os.stat(path)
+    if key == (str(path), stat.st_dev, stat.st_ino, stat.st_mtime_ns, stat.st_size):
+        _remember(_file_memo, key, digest, FILE_MEMO_SIZE)
+    return digest
+
+
+def clear() -> None:
+    with _lock:
+        _file_memo.clear()
+        _text_memo.clear()
@@ -0,0 +1,135 @@
+"""Editing policies with optional deterministic rewrite rules.
+
+A policy file is free text for the editor agent, optionally preceded by a
+YAML rules block delimited by ``---`` lines whose first key is ``rules:``:
+
+    ---
+    rules:
+      - literal: "colour"
+        replace: "color"
+      - regex: '\\butilise\\b'
+        replace: "utilize"
+        ignore_case: true
+    ---
+    Remaining free-text policy for the editor agent.
+
+A leading ``---`` without a closing line or a ``rules:`` key is left as
+free text. Rules run locally on every chunk before the agent is
+consulted. The agent is only called when free text remains after the
+rules block.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Self
+
+import yaml
+from pydantic import BaseModel, ConfigDict, ValidationError, model_validator
+
+_RULES_DELIMITER = "---"
+_RULES_KEY = "rules:"
+
+
+class PolicyRule(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    literal: str | None = None
+    regex: str | None = None
+    replace: str
+    ignore_case: bool = False
+
+    @model_validator(mode="after")
+    def validate_pattern(self) -> Self:
+        if (self.literal is None) == (self.regex is None):
+            raise ValueError("Exactly one of literal or regex must be provided.")
+        if self.literal == "" or self.regex == "":
+            raise ValueError("Rule pattern must be non-empty.")
+        return self
+
+
+class PolicyRules(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    rules: list[PolicyRule] = []
+
+
+@dataclass(frozen=True)
+class _CompiledRule:
+    pattern: re.Pattern[str]
+    replacement: str
+    literal: bool
+
+    def apply(self, text: str) -> str:
+        if self.literal:
+            # Literal replacements must not interpret backslashes or group references.
+            return self.pattern.sub(lambda _match: self.replacement, text)
+        return self.pattern.sub(self.replacement, text)
+
+
+@dataclass(frozen=True)
+class CompiledPolicy:
+    """Parsed policy: deterministic rules plus the free-text residual for the agent."""
+
+    rules: tuple[_CompiledRule, ...]
+    residual_text: str
+
+    @property
+    def requires_agent(self) -> bool:
+        return bool(self.residual_text.strip())
+
+    def apply_rules(self, text: str) -> str:
+        for rule in self.rules:
+            text = rule.apply(text)
+        return text
+
+
+def _split_rules_block(policy_text: str) -> tuple[str | None, str]:
+    lines = policy_text.splitlines(keepends=True)
+    if not lines or lines[0].strip() != _RULES_DELIMITER:
+        return None, policy_text
+    for end, line in enumerate(lines[1:], start=1):
+        if line.strip() == _RULES_DELIMITER:
+            block = "".join(lines[1:end])
+            if not block.lstrip().startswith(_RULES_KEY):
+                break
+            return block, "".join(lines[end + 1:])
+    return None, policy_text
+
+
+@lru_cache(maxsize=64)
+def compile_policy(policy_text: str) -> CompiledPolicy:
+    rules_text, residual_text = _split_rules_block(policy_text)
+    if rules_text is None:
+        return CompiledPolicy(rules=(), residual_text=policy_text)
+    try:
+        payload = yaml.safe_load(rules_text) or {}
+        parsed = PolicyRules.model_validate(payload)
+    except (yaml.YAMLError, ValidationError) as exc:
+        raise ValueError(f"Invalid policy rules: {exc}") from exc
+    compiled: list[_CompiledRule] = []
+    for rule in parsed.rules:
+        flags = re.IGNORECASE if rule.ignore_case else 0
+        source = re.escape(rule.literal) if rule.literal is not None else rule.regex
+        try:
+            pattern = re.compile(source, flags)
+        except re.error as exc:
+            raise ValueError(f"Invalid policy rule pattern {source!r}: {exc}") from exc
+        if rule.literal is None:
+            # sub() parses the template even without a match, so bad group
+            # references fail here instead of on the first matching chunk.
+            try:
+                pattern.sub(rule.replace, "")
+            except (re.error, IndexError) as exc:
+                # IndexError: a named group the pattern does not define.
+                raise ValueError(f"Invalid policy rule replacement {rule.replace!r}: {exc}") from exc
+        compiled.append(
+            _CompiledRule(
+                pattern=pattern,
+                replacement=rule.replace,
+                literal=rule.literal is not None,
+            )
+        )
+    return CompiledPolicy(rules=tuple(compiled), residual_text=residual_text.strip())
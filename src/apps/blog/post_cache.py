@@ -0,0 +1,90 @@
+"""Process-level cache for parsed post files.
+
+Entries are keyed by path and validated on every read by one stat call:
+a hit requires the same (inode, mtime_ns, size) as when the value was
+cached, so edits from other processes or by hand are picked up. Storage
+writes call remember() so this process sees its own writes without a
+re-parse. Mutable values are copied on the way out.
+"""
+
+from __future__ import annotations
+
+import copy
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, TypeVar
+
+T = TypeVar("T")
+
+MAX_ENTRIES = 2048
+
+_Signature = tuple[int, int, int]
+
+
+def _signature(path: Path) -> _Signature | None:
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+
+def _copy_out(value: Any) -> Any:
+    if isinstance(value, (dict, list)):
+        return copy.deepcopy(value)
+    if hasattr(value, "model_copy"):
+        return value.model_copy()
+    return value
+
+
+class StatCache:
+    def __init__(self, max_entries: int = MAX_ENTRIES) -> None:
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[_Signature, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, path: Path, loader: Callable[[Path], T]) -> T:
+        key = str(path)
+        signature = _signature(path)
+        if signature is not None:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None and entry[0] == signature:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return _copy_out(entry[1])
+                self.misses += 1
+        value = loader(path)
+        # Re-stat after loading; cache only if the file did not change underneath us.
+        if signature is not None and _signature(path) == signature:
+            self._store(key, signature, value)
+        return _copy_out(value)
+
+    def remember(self, path: Path, value: Any) -> None:
+        signature = _signature(path)
+        if signature is None:
+            self.forget(path)
+            return
+        self._store(str(path), signature, _copy_out(value))
+
+    def forget(self, path: Path) -> None:
+        with self._lock:
+            self._entries.pop(str(path), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def _store(self, key: str, signature: _Signature, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (signature, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+post_cache = StatCache()
@@ -0,0 +1,235 @@
+"""Persistent SQLite index of post metadata.
+
+The index lives in POSTS_ROOT/.index/posts.sqlite3 and mirrors the fields
+of each meta.yaml that listings need. Storage writes update it directly;
+reads re-sync from the filesystem whenever the mtimes of the posts root
+and its shard directories differ from those recorded at the last sync (a
+post directory was added or removed), and at least every
+MTIME_RECHECK_SECONDS otherwise, so a meta.yaml written without its index
+update (a crash between the two, an edit by hand) is picked up. A sync
+stats every meta.yaml but only re-parses those whose mtime changed.
+"""
+
+from __future__ import annotations
+
+import base64
+import json
+import sqlite3
+import time
+from contextlib import closing
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterable
+
+import yaml
+
+from apps.blog import post_layout
+from apps.blog.types import BlogPostMeta
+
+INDEX_DIR_NAME = ".index"
+INDEX_FILE_NAME = "posts.sqlite3"
+MTIME_RECHECK_SECONDS = 30.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS posts (
+    post_id TEXT PRIMARY KEY,
+    title TEXT,
+    author TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    created_key TEXT NOT NULL,
+    status TEXT NOT NULL,
+    meta_mtime_ns INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS posts_by_created ON posts (created_key DESC, post_id DESC);
+CREATE INDEX IF NOT EXISTS posts_by_status ON posts (status, created_key DESC, post_id DESC);
+CREATE INDEX IF NOT EXISTS posts_by_author ON posts (author, created_key DESC, post_id DESC);
+CREATE TABLE IF NOT EXISTS state (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+def index_path(posts_root: Path) -> Path:
+    return posts_root / INDEX_DIR_NAME / INDEX_FILE_NAME
+
+
+def created_key(created_at: datetime) -> str:
+    """Sortable UTC key for created_at; naive datetimes are treated as UTC."""
+    if created_at.tzinfo is None:
+        created_at = created_at.replace(tzinfo=timezone.utc)
+    return created_at.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%f")
+
+
+def load_meta_file(meta_path: Path) -> BlogPostMeta:
+    meta_data = yaml.safe_load(meta_path.read_text())
+    if isinstance(meta_data, dict) and meta_data.get("status") is None:
+        meta_data["status"] = "draft"
+    return BlogPostMeta.model_validate(meta_data)
+
+
+def _connect(posts_root: Path) -> sqlite3.Connection:
+    path = index_path(posts_root)
+    path.parent.mkdir(exist_ok=True)
+    conn = sqlite3.connect(path, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+def _upsert(conn: sqlite3.Connection, meta: BlogPostMeta, meta_mtime_ns: int) -> None:
+    conn.execute(
+        """
+        INSERT INTO posts (post_id, title, author, created_at, created_key, status, meta_mtime_ns)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT (post_id) DO UPDATE SET
+            title = excluded.title,
+            author = excluded.author,
+            created_at = excluded.created_at,
+            created_key = excluded.created_key,
+            status = excluded.status,
+            meta_mtime_ns = excluded.meta_mtime_ns
+        """,
+        (
+            meta.post_id,
+            meta.title,
+            meta.author,
+            meta.created_at.isoformat(),
+            created_key(meta.created_at),
+            meta.status,
+            meta_mtime_ns,
+        ),
+    )
+
+
+def upsert_post(posts_root: Path, meta: BlogPostMeta) -> None:
+    meta_path = post_layout.post_dir(posts_root, meta.post_id) / "meta.yaml"
+    with closing(_connect(posts_root)) as conn, conn:
+        _upsert(conn, meta, meta_path.stat().st_mtime_ns)
+
+
+def _sync(conn: sqlite3.Connection, posts_root: Path, *, force: bool = False) -> None:
+    # Take the signature before scanning so changes made mid-scan trigger another sync.
+    signature = post_layout.listing_signature(posts_root)
+    now = time.time()
+    stored = dict(
+        conn.execute("SELECT key, value FROM state WHERE key IN ('listing_signature', 'synced_at')")
+    )
+    if (
+        not force
+        and stored.get("listing_signature") == signature
+        and now - float(stored.get("synced_at", 0)) < MTIME_RECHECK_SECONDS
+    ):
+        return
+    known = dict(conn.execute("SELECT post_id, meta_mtime_ns FROM posts"))
+    seen: set[str] = set()
+    with conn:
+        for entry in post_layout.iter_post_dirs(posts_root):
+            meta_path = entry / "meta.yaml"
+            try:
+                meta_mtime_ns = meta_path.stat().st_mtime_ns
+            except FileNotFoundError:
+                continue
+            if known.get(entry.name) == meta_mtime_ns:
+                seen.add(entry.name)
+                continue
+            try:
+                meta = load_meta_file(meta_path)
+            except Exception:
+                continue
+            _upsert(conn, meta, meta_mtime_ns)
+            seen.add(entry.name)
+        stale = [(post_id,) for post_id in known if post_id not in seen]
+        conn.executemany("DELETE FROM posts WHERE post_id = ?", stale)
+        conn.executemany(
+            "INSERT OR REPLACE INTO state (key, value) VALUES (?, ?)",
+            [("listing_signature", signature), ("synced_at", repr(now))],
+        )
+
+
+def rebuild(posts_root: Path) -> None:
+    """Re-check every meta.yaml against the index regardless of the root mtime."""
+    with closing(_connect(posts_root)) as conn:
+        _sync(conn, posts_root, force=True)
+
+
+def row_to_meta(row: tuple) -> BlogPostMeta:
+    post_id, title, author, created_at, status = row[:5]
+    return BlogPostMeta(
+        post_id=post_id,
+        title=title,
+        author=author,
+        created_at=datetime.fromisoformat(created_at),
+        status=status,
+    )
+
+
+def encode_cursor(created: str, post_id: str) -> str:
+    raw = json.dumps([created, post_id], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[str, str]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created, post_id = json.loads(raw)
+    except (ValueError, TypeError) as exc:
+        raise ValueError("Invalid cursor") from exc
+    if not isinstance(created, str) or not isinstance(post_id, str):
+        raise ValueError("Invalid cursor")
+    return created, post_id
+
+
+def query_posts(
+    posts_root: Path,
+    *,
+    statuses: Iterable[str] | None = None,
+    author: str | None = None,
+    after: tuple[str, str] | None = None,
+    limit: int | None = None,
+) -> list[tuple[BlogPostMeta, str]]:
+    """Return (meta, cursor) pairs newest first, starting after the keyset position."""
+    statement = posts_query(statuses=statuses, author=author, after=after, limit=limit)
+    if statement is None:
+        return []
+    with closing(_connect(posts_root)) as conn:
+        _sync(conn, posts_root)
+        rows = conn.execute(*statement).fetchall()
+    return [(row_to_meta(row), encode_cursor(row[5], row[0])) for row in rows]
+
+
+def posts_query(
+    *,
+    statuses: Iterable[str] | None = None,
+    author: str | None = None,
+    after: tuple[str, str] | None = None,
+    limit: int | None = None,
+) -> tuple[str, list[object]] | None:
+    """Keyset listing SQL over a posts table; None when nothing can match."""
+    query = "SELECT post_id, title, author, created_at, status, created_key FROM posts"
+    clauses: list[str] = []
+    params: list[object] = []
+    if statuses is not None:
+        status_list = list(statuses)
+        if not status_list:
+            return None
+        clauses.append(f"status IN ({', '.join('?' for _ in status_list)})")
+        params.extend(status_list)
+    if author is not None:
+        clauses.append("author = ?")
+        params.append(author)
+    if after is not None:
+        clauses.append("(created_key < ? OR (created_key = ? AND post_id < ?))")
+        params.extend([after[0], after[0], after[1]])
+    if clauses:
+        query += " WHERE " + " AND ".join(clauses)
+    query += " ORDER BY created_key DESC, post_id DESC"
+    if limit is not None:
+        query += " LIMIT ?"
+        params.append(limit)
+    return query, params
+
+
+def list_indexed_posts(posts_root: Path, *, statuses: Iterable[str] | None = None) -> list[BlogPostMeta]:
+    """Return indexed posts newest first, optionally limited to statuses."""
+    return [meta for meta, _cursor in query_posts(posts_root, statuses=statuses)]
@@ -0,0 +1,165 @@
+"""Directory layout of posts under POSTS_ROOT.
+
+Posts live either directly under the root ("flat", the original layout)
+or in shard directories derived from the post id alone:
+
+- "date": YYYY/MM/<post_id>, from the creation timestamp that starts the id
+- "hash": <first two hex digits of sha256(post_id)>/<post_id>
+
+The scheme of a tree is recorded in POSTS_ROOT/.layout.json and defaults
+to flat. post_dir() resolves an id without scanning any directory. While
+migrate() is moving a tree, posts not yet moved are found at their path
+under the other schemes; migrate() moves each post under its lock, so
+writers take the lock through locked_post_dir(), which resolves the
+directory again once the lock is held.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+from contextlib import ExitStack, contextmanager
+from pathlib import Path
+from typing import Iterator, Literal
+
+from apps.blog.post_cache import post_cache
+from apps.blog.post_lock import post_locks
+
+LayoutScheme = Literal["flat", "date", "hash"]
+LAYOUT_SCHEMES: tuple[LayoutScheme, ...] = ("flat", "date", "hash")
+LAYOUT_FILE_NAME = ".layout.json"
+
+_DATE_ID = re.compile(r"^(\d{4})-(\d{2})-\d{2}T")
+_SHARD_NAME = re.compile(r"^(\d{4}|[0-9a-f]{2})$")
+
+
+def _load_scheme(path: Path) -> LayoutScheme:
+    scheme = json.loads(path.read_text()).get("scheme")
+    if scheme not in LAYOUT_SCHEMES:
+        raise ValueError(f"Unknown post layout scheme: {scheme}")
+    return scheme
+
+
+def read_scheme(posts_root: Path) -> LayoutScheme:
+    path = posts_root / LAYOUT_FILE_NAME
+    if not path.exists():
+        return "flat"
+    return post_cache.get(path, _load_scheme)
+
+
+def write_scheme(posts_root: Path, scheme: LayoutScheme) -> None:
+    if scheme not in LAYOUT_SCHEMES:
+        raise ValueError(f"Unknown post layout scheme: {scheme}")
+    path = posts_root / LAYOUT_FILE_NAME
+    temp_path = path.with_suffix(".json.tmp")
+    temp_path.write_text(json.dumps({"scheme": scheme}))
+    os.replace(temp_path, path)
+    post_cache.remember(path, scheme)
+
+
+def shard_parts(post_id: str, scheme: LayoutScheme) -> tuple[str, ...]:
+    if scheme == "date":
+        # Ids that do not start with a timestamp stay at the root.
+        match = _DATE_ID.match(post_id)
+        return match.groups() if match else ()
+    if scheme == "hash":
+        return (hashlib.sha256(post_id.encode("utf-8")).hexdigest()[:2],)
+    return ()
+
+
+def layout_path(posts_root: Path, post_id: str, scheme: LayoutScheme) -> Path:
+    return posts_root.joinpath(*shard_parts(post_id, scheme), post_id)
+
+
+def new_post_dir(posts_root: Path, post_id: str) -> Path:
+    """Directory a new post should be created in under the tree's scheme."""
+    return layout_path(posts_root, post_id, read_scheme(posts_root))
+
+
+def post_dir(posts_root: Path, post_id: str) -> Path:
+    """Directory of an existing post; the scheme's path if the post is missing."""
+    scheme = read_scheme(posts_root)
+    primary = layout_path(posts_root, post_id, scheme)
+    if primary.exists():
+        return primary
+    for other in LAYOUT_SCHEMES:
+        candidate = layout_path(posts_root, post_id, other)
+        if candidate != primary and candidate.exists():
+            return candidate
+    return primary
+
+
+@contextmanager
+def locked_post_dir(posts_root: Path, post_id: str) -> Iterator[Path]:
+    """Hold the post's lock and yield its directory as resolved under the lock."""
+    with ExitStack() as stack:
+        while True:
+            directory = post_dir(posts_root, post_id)
+            try:
+                stack.enter_context(post_locks.lock_post_dir(directory))
+            except FileNotFoundError:
+                if post_dir(posts_root, post_id) == directory:
+                    raise
+                continue
+            # migrate() may have moved the post while this waited for the lock.
+            if post_dir(posts_root, post_id) == directory:
+                break
+            stack.close()
+        yield directory
+
+
+def _shard_dirs(posts_root: Path) -> Iterator[Path]:
+    pending = [(posts_root, 0)]
+    while pending:
+        directory, depth = pending.pop()
+        if depth == 2:
+            continue
+        for entry in directory.iterdir():
+            if _SHARD_NAME.match(entry.name) and entry.is_dir() and not (entry / "meta.yaml").exists():
+                yield entry
+                pending.append((entry, depth + 1))
+
+
+def iter_post_dirs(posts_root: Path) -> Iterator[Path]:
+    """Yield every post directory (one holding meta.yaml) in any scheme."""
+    for directory in (posts_root, *_shard_dirs(posts_root)):
+        for entry in directory.iterdir():
+            if entry.name.startswith(".") or not entry.is_dir():
+                continue
+            if (entry / "meta.yaml").exists():
+                yield entry
+
+
+def listing_signature(posts_root: Path) -> str:
+    """Changes whenever a post directory is added to or removed from the tree."""
+    mtimes = [str(posts_root.stat().st_mtime_ns)]
+    if read_scheme(posts_root) != "flat":
+        for shard in sorted(_shard_dirs(posts_root)):
+            mtimes.append(f"{shard.relative_to(posts_root)}={shard.stat().st_mtime_ns}")
+    return ";".join(mtimes)
+
+
+def migrate(posts_root: Path, scheme: LayoutScheme) -> int:
+    """Move every post to its path under scheme; return the number moved.
+
+    The new scheme is recorded first, so posts created during the move
+    land at their final path and post_dir() keeps finding the rest.
+    """
+    write_scheme(posts_root, scheme)
+    moved = 0
+    for current in list(iter_post_dirs(posts_root)):
+        target = layout_path(posts_root, current.name, scheme)
+        if current == target:
+            continue
+        if target.exists():
+            raise FileExistsError(f"Post directory already exists: {target}")
+        target.parent.mkdir(parents=True, exist_ok=True)
+        with post_locks.lock_post_dir(current):
+            os.rename(current, target)
+        moved += 1
+    for shard in sorted(_shard_dirs(posts_root), key=lambda path: len(path.parts), reverse=True):
+        if not any(shard.iterdir()):
+            shard.rmdir()
+    return moved
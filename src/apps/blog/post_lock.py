@@ -0,0 +1,72 @@
+"""Per-post write locks.
+
+Writers to the same post are serialized; writers to different posts never
+wait on each other. A lock is taken in two layers: a per-key RLock
+serializes threads of this process without touching the filesystem, and
+the thread holding it then takes an fcntl.flock on the post's lock file
+to exclude other processes. Locks are reentrant within a thread, so a
+flow that holds a post's lock can call storage functions that take it
+again.
+"""
+
+from __future__ import annotations
+
+import fcntl
+import os
+import threading
+from contextlib import AbstractContextManager, contextmanager
+from pathlib import Path
+from typing import Iterator
+
+LOCK_FILE_NAME = ".lock"
+
+
+class _PostLock:
+    def __init__(self) -> None:
+        self.rlock = threading.RLock()
+        self.users = 0
+        self.depth = 0
+        self.fd: int | None = None
+
+
+class PostLockManager:
+    def __init__(self) -> None:
+        self._locks: dict[str, _PostLock] = {}
+        self._guard = threading.Lock()
+
+    @contextmanager
+    def lock(self, key: str, lock_path: Path | None = None) -> Iterator[None]:
+        """Hold the lock for key; lock_path, if given, also excludes other processes."""
+        with self._guard:
+            entry = self._locks.setdefault(key, _PostLock())
+            entry.users += 1
+        try:
+            with entry.rlock:
+                if entry.depth == 0 and lock_path is not None:
+                    fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+                    try:
+                        fcntl.flock(fd, fcntl.LOCK_EX)
+                    except BaseException:
+                        os.close(fd)
+                        raise
+                    entry.fd = fd
+                entry.depth += 1
+                try:
+                    yield
+                finally:
+                    entry.depth -= 1
+                    if entry.depth == 0 and entry.fd is not None:
+                        fcntl.flock(entry.fd, fcntl.LOCK_UN)
+                        os.close(entry.fd)
+                        entry.fd = None
+        finally:
+            with self._guard:
+                entry.users -= 1
+                if entry.users == 0:
+                    del self._locks[key]
+
+    def lock_post_dir(self, post_dir: Path) -> AbstractContextManager[None]:
+        return self.lock(str(post_dir), post_dir / LOCK_FILE_NAME)
+
+
+post_locks = PostLockManager()
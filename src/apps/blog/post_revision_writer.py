@@ -4,7 +4,8 @@ from pathlib import Path
 from typing import Any
 
 from apps.blog.paths import POSTS_ROOT
-from apps.blog.storage import apply_blog_update, read_post_content
+from apps.blog.post_state import PostDerivedState
+from apps.blog.post_store import PostStore, get_post_store
 
 
 class PostRevisionWriter:
@@ -14,8 +15,9 @@ class PostRevisionWriter:
     single-writer authority.
     """
 
-    def __init__(self, posts_root: str | None = None) -> None:
+    def __init__(self, posts_root: str | None = None, store: PostStore | None = None) -> None:
         self.posts_root = Path(posts_root) if posts_root is not None else POSTS_ROOT
+        self.store = store if store is not None else get_post_store(posts_root)
 
     def load_post(self, post_id: str) -> Any:
         """Load a post into the writer's authority context for revision."""
@@ -31,8 +33,15 @@ class PostRevisionWriter:
         new_content: str | None = None,
         reason: str | None = None,
         status: str = "applied",  # TEMP: supports explicit rejected deltas until formal validation exists.
+        expected_revision_id: int | None = None,
     ) -> Any:
-        """Apply a delta under single-writer authority and record intent."""
+        """Apply a delta under single-writer authority and record intent.
+
+        The store records the revision and, for applied content deltas, the
+        new content under the post's lock. With expected_revision_id the delta
+        is only recorded if that is still the post's last revision id;
+        otherwise RevisionConflictError is raised.
+        """
         forbidden_keys = {"status", "_content", "_snapshot_chunks"}
         present_forbidden = forbidden_keys.intersection(delta_payload.keys())
         if present_forbidden:
@@ -81,30 +90,31 @@ class PostRevisionWriter:
             source = "manual"
         else:
             source = "future"
-        resolved_content = (
-            new_content
-            if new_content is not None
-            else read_post_content(post_id, self.posts_root)
-        )
-        revision_result = apply_blog_update(
-            post_id=post_id,
-            new_content=resolved_content,
-            delta_type=delta_type,
-            source=source,
-            parent_revision_id=None,
-            delta_payload=record_payload,
-            actor=actor,
-            status=status,
-            reason=reason,
-            meta_updates=meta_updates,
-            posts_root=self.posts_root,
-        )
+        with self.store.lock(post_id):
+            resolved_content = (
+                new_content
+                if new_content is not None
+                else self.store.read_post_content(post_id)
+            )
+            revision_result = self.store.apply_blog_update(
+                post_id=post_id,
+                new_content=resolved_content,
+                delta_type=delta_type,
+                source=source,
+                parent_revision_id=None,
+                delta_payload=record_payload,
+                actor=actor,
+                status=status,
+                reason=reason,
+                meta_updates=meta_updates,
+                expected_last_revision_id=expected_revision_id,
+            )
         return revision_result.revision_id
 
-    def get_current_state(self, post_id: str) -> Any:
+    def get_current_state(self, post_id: str) -> PostDerivedState:
         """Return the current authoritative state for a post."""
-        raise NotImplementedError
+        return self.store.read_derived_state(post_id)
 
-    def get_revision_log(self, post_id: str) -> Any:
+    def get_revision_log(self, post_id: str) -> list[dict]:
         """Return the authoritative revision log for a post."""
-        raise NotImplementedError
+        return self.store.read_revision_metadata(post_id)
@@ -24,8 +24,8 @@ class PostDerivedState:
 
     Invariants:
     - Derived-only state, no persistence or I/O.
-    - Rejected deltas do not change state.
-    - Applied deltas advance revision_id exactly once.
+    - Rejected deltas do not change state (but still consume a revision id).
+    - Applied deltas advance revision_id exactly once, to the delta's id.
     """
 
     post_id: str
@@ -43,7 +43,7 @@ class PostDerivedState:
             raise ValueError(f"Unknown delta status: {delta['status']}")
 
         next_revision_id = delta["revision_id"]
-        if next_revision_id != self.revision_id + 1:
+        if next_revision_id <= self.revision_id:
             raise ValueError(
                 f"Delta revision_id {next_revision_id} does not advance state "
                 f"from {self.revision_id}"
@@ -52,7 +52,12 @@ class PostDerivedState:
         delta_type = delta["delta_type"]
         payload = delta["delta_payload"]
 
-        if delta_type in ("content_chunks_modified", "content_free_edit", "content_policy_edit"):
+        if delta_type in (
+            "content_chunks_modified",
+            "content_free_edit",
+            "content_policy_edit",
+            "revert",
+        ):
             content_ref = _require_str(payload, "after_hash")
             return replace(self, content_ref=content_ref, revision_id=next_revision_id)
         if delta_type == "title_changed":
@@ -0,0 +1,224 @@
+"""Pluggable persistence for blog posts.
+
+PostStore is the interface the web app, the CLI and the revision writer
+read and write posts through. The filesystem store wraps the functions
+in apps.blog.storage; the SQLite store (apps.blog.sqlite_store) keeps
+posts, revisions and snapshot chunks in one WAL-mode database under the
+posts root; the S3 store (apps.blog.s3_store) keeps them in a bucket
+named by AGENTIC_BLOG_S3_BUCKET, under AGENTIC_BLOG_S3_PREFIX, at
+AGENTIC_BLOG_S3_ENDPOINT_URL for S3-compatible services, and has no
+search. AGENTIC_BLOG_STORAGE_BACKEND selects the store returned by
+get_post_store(). Maintenance that works on post directories (fsck, gc,
+layout migration, archives, autosave drafts) needs the filesystem store.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from contextlib import AbstractContextManager
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Literal, Protocol
+
+import boto3
+
+from apps.blog import storage
+from apps.blog.post_state import PostDerivedState
+from apps.blog.s3_store import S3PostStore
+from apps.blog.sqlite_store import SqlitePostStore, database_path
+from apps.blog.state_checkpoint import load_derived_state
+from apps.blog.storage import (
+    CONTENT_DELTA_TYPES,
+    ContentChunkWindow,
+    PostBundle,
+    PostPage,
+    PostPart,
+    RevisionResult,
+)
+from apps.blog.types import BlogPostMeta, PostStatus
+
+STORAGE_BACKEND_ENV = "AGENTIC_BLOG_STORAGE_BACKEND"
+STORAGE_BACKENDS = ("filesystem", "sqlite", "s3")
+S3_BUCKET_ENV = "AGENTIC_BLOG_S3_BUCKET"
+S3_PREFIX_ENV = "AGENTIC_BLOG_S3_PREFIX"
+S3_ENDPOINT_URL_ENV = "AGENTIC_BLOG_S3_ENDPOINT_URL"
+
+
+class PostStore(Protocol):
+    def create_post(self, *, title: str | None, author: str, intent: dict, content: str) -> str: ...
+
+    def read_post_meta(self, post_id: str) -> BlogPostMeta: ...
+
+    def read_post_content(self, post_id: str) -> str: ...
+
+    def read_post_intent(self, post_id: str) -> dict: ...
+
+    def load_post_bundle(self, post_id: str, parts: Iterable[PostPart] = ("content",)) -> PostBundle: ...
+
+    def write_post_content(self, post_id: str, content: str) -> None: ...
+
+    def update_post_status(self, post_id: str, new_status: str) -> PostStatus: ...
+
+    def apply_blog_update(
+        self,
+        *,
+        post_id: str,
+        new_content: str,
+        delta_type: str,
+        source: Literal["policy", "manual", "future"],
+        parent_revision_id: int | None,
+        delta_payload: dict,
+        actor: Any,
+        status: str = "applied",
+        reason: str | None = None,
+        meta_updates: dict | None = None,
+        expected_last_revision_id: int | None = None,
+    ) -> RevisionResult: ...
+
+    def list_posts_page(
+        self,
+        *,
+        visibility: Literal["public", "editor"],
+        status: PostStatus | None = None,
+        author: str | None = None,
+        cursor: str | None = None,
+        limit: int = 50,
+    ) -> PostPage: ...
+
+    def search_posts(self, query: str, *, limit: int = 20) -> list[tuple[BlogPostMeta, float]]: ...
+
+    def read_revision_metadata(self, post_id: str, *, include_rejected: bool = True) -> list[dict]: ...
+
+    def read_revision_entry(self, post_id: str, revision_id: int) -> dict | None: ...
+
+    def read_last_revision_id(self, post_id: str) -> int | None: ...
+
+    def read_revision_content(self, post_id: str, revision_id: int) -> str: ...
+
+    def read_content_chunks(
+        self, post_id: str, *, offset: int = 0, limit: int = 50
+    ) -> ContentChunkWindow: ...
+
+    def diff_revisions(self, post_id: str, from_revision_id: int, to_revision_id: int) -> Iterator[dict]: ...
+
+    def read_derived_state(self, post_id: str) -> PostDerivedState: ...
+
+    def lock(self, post_id: str) -> AbstractContextManager[None]: ...
+
+
+class FilesystemPostStore:
+    """Posts as directories of YAML/markdown files under a posts root."""
+
+    def __init__(self, posts_root: str | Path | None = None) -> None:
+        self.posts_root = Path(posts_root) if posts_root is not None else None
+
+    def create_post(self, *, title: str | None, author: str, intent: dict, content: str) -> str:
+        post_id, _ = storage.create_post(
+            title=title,
+            author=author,
+            intent=intent,
+            content=content,
+            posts_root=self.posts_root,
+        )
+        return post_id
+
+    def read_post_meta(self, post_id: str) -> BlogPostMeta:
+        return storage.read_post_meta(post_id, self.posts_root)
+
+    def read_post_content(self, post_id: str) -> str:
+        return storage.read_post_content(post_id, self.posts_root)
+
+    def read_post_intent(self, post_id: str) -> dict:
+        return storage.read_post_intent(post_id, self.posts_root)
+
+    def load_post_bundle(self, post_id: str, parts: Iterable[PostPart] = ("content",)) -> PostBundle:
+        return storage.load_post_bundle(post_id, parts, self.posts_root)
+
+    def write_post_content(self, post_id: str, content: str) -> None:
+        storage.write_post_content(post_id, content, self.posts_root)
+
+    def update_post_status(self, post_id: str, new_status: str) -> PostStatus:
+        return storage.update_post_status(post_id, new_status, self.posts_root)
+
+    def apply_blog_update(self, **kwargs: Any) -> RevisionResult:
+        # The revision log does not carry content.md; write it under the same lock.
+        with storage.lock_post(kwargs["post_id"], self.posts_root):
+            result = storage.apply_blog_update(**kwargs, posts_root=self.posts_root)
+            if kwargs.get("status", "applied") == "applied" and kwargs["delta_type"] in CONTENT_DELTA_TYPES:
+                storage.write_post_content(kwargs["post_id"], kwargs["new_content"], self.posts_root)
+        return result
+
+    def list_posts_page(self, **kwargs: Any) -> PostPage:
+        return storage.list_posts_page(**kwargs, posts_root=self.posts_root)
+
+    def search_posts(self, query: str, *, limit: int = 20) -> list[tuple[BlogPostMeta, float]]:
+        return storage.search_posts(query, limit=limit, posts_root=self.posts_root)
+
+    def read_revision_metadata(self, post_id: str, *, include_rejected: bool = True) -> list[dict]:
+        return storage.read_revision_metadata(post_id, self.posts_root, include_rejected=include_rejected)
+
+    def read_revision_entry(self, post_id: str, revision_id: int) -> dict | None:
+        return storage.read_revision_entry(post_id, revision_id, self.posts_root)
+
+    def read_last_revision_id(self, post_id: str) -> int | None:
+        return storage.read_last_revision_id(post_id, self.posts_root)
+
+    def read_revision_content(self, post_id: str, revision_id: int) -> str:
+        return storage.read_revision_content(post_id, revision_id, self.posts_root)
+
+    def read_content_chunks(self, post_id: str, *, offset: int = 0, limit: int = 50) -> ContentChunkWindow:
+        return storage.read_content_chunks(post_id, offset=offset, limit=limit, posts_root=self.posts_root)
+
+    def diff_revisions(self, post_id: str, from_revision_id: int, to_revision_id: int) -> Iterator[dict]:
+        return storage.diff_revisions(post_id, from_revision_id, to_revision_id, self.posts_root)
+
+    def read_derived_state(self, post_id: str) -> PostDerivedState:
+        storage.ensure_revision_log(post_id, self.posts_root)
+        return load_derived_state(post_id, self.posts_root or storage.POSTS_ROOT)
+
+    def lock(self, post_id: str) -> AbstractContextManager[None]:
+        return storage.lock_post(post_id, self.posts_root)
+
+
+_stores: dict[tuple[str, str], PostStore] = {}
+_stores_lock = threading.Lock()
+
+
+def storage_backend() -> str:
+    backend = os.environ.get(STORAGE_BACKEND_ENV, "filesystem")
+    if backend not in STORAGE_BACKENDS:
+        raise ValueError(f"{STORAGE_BACKEND_ENV} must be one of {', '.join(STORAGE_BACKENDS)}")
+    return backend
+
+
+def _s3_store() -> S3PostStore:
+    bucket = os.environ.get(S3_BUCKET_ENV)
+    if not bucket:
+        raise ValueError(f"{S3_BUCKET_ENV} must be set for the s3 storage backend")
+    client = boto3.client("s3", endpoint_url=os.environ.get(S3_ENDPOINT_URL_ENV) or None)
+    return S3PostStore(bucket, prefix=os.environ.get(S3_PREFIX_ENV, ""), client=client)
+
+
+def get_post_store(posts_root: str | Path | None = None) -> PostStore:
+    """The store selected by AGENTIC_BLOG_STORAGE_BACKEND, shared per backend and location.
+
+    posts_root only applies to the filesystem and sqlite stores.
+    """
+    backend = storage_backend()
+    if backend == "filesystem":
+        return FilesystemPostStore(posts_root)
+    if backend == "s3":
+        location = (S3_ENDPOINT_URL_ENV, S3_BUCKET_ENV, S3_PREFIX_ENV)
+        key = (backend, " ".join(os.environ.get(name, "") for name in location))
+    else:
+        resolved_root = Path(posts_root) if posts_root is not None else storage.POSTS_ROOT
+        key = (backend, str(resolved_root))
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            if backend == "s3":
+                store = _s3_store()
+            else:
+                store = SqlitePostStore(database_path(resolved_root))
+            _stores[key] = store
+    return store
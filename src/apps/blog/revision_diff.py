@@ -0,0 +1,120 @@
+"""Chunk- and line-level diff between two revisions of a post.
+
+Revisions are aligned by the chunk hashes in their manifests, so unchanged
+and moved chunks cost nothing beyond the manifest read; only chunks that
+differ (and each revision's last chunk) have their blobs loaded, and
+modified chunks are diffed line by line. The diff is produced as a
+stream of records: a summary first, then one record per changed chunk in
+after-document order (deletions in before order last).
+"""
+
+from __future__ import annotations
+
+import difflib
+from pathlib import Path
+from typing import Iterator
+
+from apps.blog import chunk_store
+from apps.blog.chunk_diff import chunk_hash, diff_chunk_hashes, normalize_last_chunks
+
+
+class _ChunkTexts:
+    """Loads chunk texts on demand, each blob at most once per diff."""
+
+    def __init__(self, posts_root: Path | None) -> None:
+        self.posts_root = posts_root
+        self._texts: dict[str, str] = {}
+
+    def __call__(self, entry: dict) -> str:
+        text = entry.get("text")
+        if isinstance(text, str):
+            return text
+        digest = entry["hash"]
+        if digest not in self._texts:
+            self._texts[digest] = chunk_store.get_blob(self.posts_root, digest)
+        return self._texts[digest]
+
+
+def line_diff(before: str, after: str) -> list[dict]:
+    """Line operations turning before into after: equal, delete and insert."""
+    before_lines = before.splitlines()
+    after_lines = after.splitlines()
+    matcher = difflib.SequenceMatcher(a=before_lines, b=after_lines, autojunk=False)
+    ops: list[dict] = []
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            ops.extend({"op": "equal", "text": line} for line in before_lines[i1:i2])
+            continue
+        ops.extend({"op": "delete", "text": line} for line in before_lines[i1:i2])
+        ops.extend({"op": "insert", "text": line} for line in after_lines[j1:j2])
+    return ops
+
+
+def _alignment_keys(entries: list[dict], texts: _ChunkTexts) -> list[str]:
+    keys = [entry["hash"] for entry in entries]
+    # Only the last chunk of a document may lack its line break; key it as if
+    # it had one, so a paragraph that stops or starts being last still aligns.
+    if entries:
+        last = texts(entries[-1])
+        if not last.endswith("\n"):
+            keys[-1] = chunk_hash(last + "\n")
+    return keys
+
+
+def iter_revision_diff(
+    posts_root: Path | None,
+    before: list[dict],
+    after: list[dict],
+    *,
+    from_revision_id: int,
+    to_revision_id: int,
+) -> Iterator[dict]:
+    """Yield the diff records for two revisions' chunk entries.
+
+    posts_root may be None when every entry carries its "text".
+    """
+    texts = _ChunkTexts(posts_root)
+    before_hashes, after_hashes = normalize_last_chunks(
+        [entry["hash"] for entry in before],
+        texts(before[-1]) if before else "",
+        [entry["hash"] for entry in after],
+        texts(after[-1]) if after else "",
+    )
+    alignment = diff_chunk_hashes(
+        before_hashes,
+        after_hashes,
+        before_keys=_alignment_keys(before, texts),
+        after_keys=_alignment_keys(after, texts),
+    )
+    yield {
+        "type": "summary",
+        "from_revision_id": from_revision_id,
+        "to_revision_id": to_revision_id,
+        "before_chunks": len(before),
+        "after_chunks": len(after),
+        "unchanged": len(alignment.unchanged),
+        "modified": len(alignment.modified),
+        "inserted": len(alignment.inserted),
+        "deleted": len(alignment.deleted),
+        "moved": len(alignment.moved),
+    }
+    changes = [
+        {"type": "modified", "before_index": before_index, "after_index": after_index}
+        for before_index, after_index in alignment.modified
+    ]
+    changes.extend({"type": "inserted", "after_index": after_index} for after_index in alignment.inserted)
+    changes.extend(
+        {"type": "moved", "before_index": move.before_index, "after_index": move.after_index}
+        for move in alignment.moved
+    )
+    for change in sorted(changes, key=lambda change: change["after_index"]):
+        if change["type"] == "modified":
+            before_text = texts(before[change["before_index"]])
+            after_text = texts(after[change["after_index"]])
+            change["lines"] = line_diff(before_text, after_text)
+        elif change["type"] == "inserted":
+            change["text"] = texts(after[change["after_index"]])
+        yield change
+    for before_index in alignment.deleted:
+        text = texts(before[before_index])
+        yield {"type": "deleted", "before_index": before_index, "text": text}
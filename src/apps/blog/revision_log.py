@@ -0,0 +1,323 @@
+"""Append-only revision log for a single post directory.
+
+Revisions are stored one JSON object per line in revisions.jsonl. A
+fixed-width offset index (revisions.idx) maps log position to byte range,
+so appends are O(1) and a revision is read with a single seek.
+
+Rejected revisions are kept out of that hot log, in an unindexed cold
+log (revisions.rejected.jsonl) that only audit reads and id lookups that
+miss the hot log scan. Reading and replaying a post therefore costs its
+applied history only.
+
+Invariants:
+- Both logs are append-only; entries are never rewritten, except when
+  split_rejected() moves rejected entries out of an older hot log.
+- Index entry k describes log line k.
+- Revision ids are allocated from one counter across both logs, so
+  together they run 1..N, and ids increase along each log. Revision r
+  lives at hot position r - 1 unless rejected revisions precede it; lookups
+  check that position first and bisect otherwise.
+- The index is derived: when it disagrees with the log it is rebuilt.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import struct
+from pathlib import Path
+from typing import Iterator
+
+REVISION_LOG_NAME = "revisions.jsonl"
+REVISION_INDEX_NAME = "revisions.idx"
+REJECTED_LOG_NAME = "revisions.rejected.jsonl"
+
+_INDEX_ENTRY = struct.Struct("<QI")
+
+
+def log_path(post_dir: Path) -> Path:
+    return post_dir / REVISION_LOG_NAME
+
+
+def index_path(post_dir: Path) -> Path:
+    return post_dir / REVISION_INDEX_NAME
+
+
+def rejected_log_path(post_dir: Path) -> Path:
+    return post_dir / REJECTED_LOG_NAME
+
+
+def has_log(post_dir: Path) -> bool:
+    return log_path(post_dir).exists()
+
+
+def create_log(post_dir: Path, entries: list[dict] | None = None) -> None:
+    """Create the log (and index) for a post, optionally seeded with entries."""
+    lines = [_encode(entry) for entry in entries or []]
+    index = bytearray()
+    offset = 0
+    for line in lines:
+        index += _INDEX_ENTRY.pack(offset, len(line))
+        offset += len(line)
+    temp_log = log_path(post_dir).with_suffix(".jsonl.tmp")
+    temp_log.write_bytes(b"".join(lines))
+    index_path(post_dir).write_bytes(bytes(index))
+    os.replace(temp_log, log_path(post_dir))
+
+
+def _encode(entry: dict) -> bytes:
+    return (json.dumps(entry, sort_keys=False, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+def _read_index_entry(index_file, position: int) -> tuple[int, int]:
+    index_file.seek(position * _INDEX_ENTRY.size)
+    raw = index_file.read(_INDEX_ENTRY.size)
+    if len(raw) != _INDEX_ENTRY.size:
+        raise ValueError(f"Revision index entry {position} is truncated")
+    return _INDEX_ENTRY.unpack(raw)
+
+
+def _rebuild_index(post_dir: Path) -> None:
+    data = log_path(post_dir).read_bytes()
+    index = bytearray()
+    offset = 0
+    while offset < len(data):
+        end = data.find(b"\n", offset)
+        if end == -1:
+            # An unterminated tail is an interrupted append that was never acknowledged.
+            with log_path(post_dir).open("r+b") as handle:
+                handle.truncate(offset)
+            break
+        index += _INDEX_ENTRY.pack(offset, end + 1 - offset)
+        offset = end + 1
+    temp_index = index_path(post_dir).with_suffix(".idx.tmp")
+    temp_index.write_bytes(bytes(index))
+    os.replace(temp_index, index_path(post_dir))
+
+
+def _ensure_index(post_dir: Path) -> int:
+    """Return the number of indexed revisions, rebuilding the index if stale."""
+    log_size = log_path(post_dir).stat().st_size
+    idx = index_path(post_dir)
+    index_size = idx.stat().st_size if idx.exists() else -1
+    if index_size >= 0 and index_size % _INDEX_ENTRY.size == 0:
+        count = index_size // _INDEX_ENTRY.size
+        if count == 0 and log_size == 0:
+            return 0
+        if count:
+            with idx.open("rb") as index_file:
+                offset, length = _read_index_entry(index_file, count - 1)
+            if offset + length == log_size:
+                return count
+    _rebuild_index(post_dir)
+    return index_path(post_dir).stat().st_size // _INDEX_ENTRY.size
+
+
+def revision_count(post_dir: Path) -> int:
+    if not has_log(post_dir):
+        return 0
+    return _ensure_index(post_dir)
+
+
+def _read_entry(index_file, log_file, position: int) -> dict:
+    offset, length = _read_index_entry(index_file, position)
+    log_file.seek(offset)
+    entry = json.loads(log_file.read(length))
+    if not isinstance(entry, dict):
+        raise ValueError(f"Invalid revision entry at position {position} in {log_file.name}")
+    return entry
+
+
+def _read_at(post_dir: Path, position: int) -> dict:
+    with index_path(post_dir).open("rb") as index_file, log_path(post_dir).open("rb") as log_file:
+        return _read_entry(index_file, log_file, position)
+
+
+def _position(post_dir: Path, revision_id: int, count: int) -> int:
+    """Hot position of the last entry with an id <= revision_id, or -1."""
+    # Ids start at 1 and increase, so the entry at position p has an id > p.
+    high = min(revision_id, count)
+    if high <= 0:
+        return -1
+    with index_path(post_dir).open("rb") as index_file, log_path(post_dir).open("rb") as log_file:
+
+        def id_at(position: int) -> int:
+            return _read_entry(index_file, log_file, position).get("revision_id", 0)
+
+        if id_at(high - 1) <= revision_id:
+            return high - 1
+        low, high = 0, high - 1
+        while low < high:
+            middle = (low + high) // 2
+            if id_at(middle) <= revision_id:
+                low = middle + 1
+            else:
+                high = middle
+        return low - 1
+
+
+def last_revision(post_dir: Path) -> dict | None:
+    count = revision_count(post_dir)
+    if count == 0:
+        return None
+    return _read_at(post_dir, count - 1)
+
+
+def last_revision_id(post_dir: Path) -> int:
+    """The id of the newest revision, applied or rejected."""
+    entry = last_revision(post_dir)
+    revision_id = 0 if entry is None else entry.get("revision_id")
+    if not isinstance(revision_id, int):
+        raise ValueError(f"Invalid revision_id in {post_dir}")
+    return max(revision_id, _last_rejected_id(post_dir))
+
+
+def read_revision(post_dir: Path, revision_id: int) -> dict | None:
+    position = _position(post_dir, revision_id, revision_count(post_dir))
+    if position >= 0:
+        entry = _read_at(post_dir, position)
+        if entry.get("revision_id") == revision_id:
+            return entry
+    for entry in read_rejected_revisions(post_dir):
+        if entry.get("revision_id") == revision_id:
+            return entry
+    return None
+
+
+def _read_lines(path: Path) -> list[dict]:
+    if not path.exists():
+        return []
+    entries: list[dict] = []
+    with path.open("rb") as log_file:
+        for line in log_file:
+            if not line.endswith(b"\n"):
+                break
+            entry = json.loads(line)
+            if not isinstance(entry, dict):
+                raise ValueError(f"Invalid revision entry in {path}")
+            entries.append(entry)
+    return entries
+
+
+def read_revisions(post_dir: Path) -> list[dict]:
+    """Entries of the hot log: every revision except rejected ones."""
+    return _read_lines(log_path(post_dir))
+
+
+def read_rejected_revisions(post_dir: Path) -> list[dict]:
+    return _read_lines(rejected_log_path(post_dir))
+
+
+def merge_history(applied: list[dict], rejected: list[dict]) -> list[dict]:
+    """Both logs' entries in id order; the hot copy wins if an entry is in both."""
+    merged = {entry.get("revision_id"): entry for entry in rejected}
+    merged.update((entry.get("revision_id"), entry) for entry in applied)
+    return sorted(merged.values(), key=lambda entry: entry.get("revision_id") or 0)
+
+
+def iter_revisions_backward(post_dir: Path, start_revision_id: int | None = None) -> Iterator[dict]:
+    """Yield entries from start_revision_id (default: latest) down to the first."""
+    count = revision_count(post_dir)
+    position = count - 1 if start_revision_id is None else _position(post_dir, start_revision_id, count)
+    while position >= 0:
+        yield _read_at(post_dir, position)
+        position -= 1
+
+
+def iter_revisions_after(post_dir: Path, after_revision_id: int) -> Iterator[dict]:
+    """Yield entries with ids above after_revision_id, oldest first, in one read."""
+    count = revision_count(post_dir)
+    position = _position(post_dir, after_revision_id, count) + 1
+    if position >= count:
+        return
+    with index_path(post_dir).open("rb") as index_file:
+        offset, _length = _read_index_entry(index_file, position)
+    with log_path(post_dir).open("rb") as log_file:
+        log_file.seek(offset)
+        for line in log_file:
+            if not line.endswith(b"\n"):
+                break
+            entry = json.loads(line)
+            if not isinstance(entry, dict):
+                raise ValueError(f"Invalid revision entry in {post_dir}")
+            if entry.get("revision_id", 0) > after_revision_id:
+                yield entry
+
+
+def _tail(path: Path) -> tuple[int, bytes]:
+    """(length of the file's complete lines, its last complete line)."""
+    with path.open("rb") as log_file:
+        base = log_file.seek(0, os.SEEK_END)
+        tail = b""
+        while base > 0:
+            start = max(0, base - 4096)
+            log_file.seek(start)
+            tail = log_file.read(base - start) + tail
+            base = start
+            end = tail.rfind(b"\n")
+            if end != -1 and (base == 0 or tail.rfind(b"\n", 0, end) != -1):
+                break
+    end = tail.rfind(b"\n")
+    if end == -1:
+        return 0, b""
+    return base + end + 1, tail[tail.rfind(b"\n", 0, end) + 1 : end + 1]
+
+
+def _last_rejected_id(post_dir: Path) -> int:
+    path = rejected_log_path(post_dir)
+    if not path.exists():
+        return 0
+    _size, line = _tail(path)
+    if not line:
+        return 0
+    entry = json.loads(line)
+    revision_id = entry.get("revision_id") if isinstance(entry, dict) else None
+    if not isinstance(revision_id, int):
+        raise ValueError(f"Invalid revision_id in {path}")
+    return revision_id
+
+
+def _append_rejected(post_dir: Path, entry: dict) -> None:
+    path = rejected_log_path(post_dir)
+    with path.open("a+b") as log_file:
+        # An unterminated tail is an interrupted append that was never acknowledged.
+        size, _line = _tail(path)
+        if log_file.seek(0, os.SEEK_END) != size:
+            log_file.truncate(size)
+        log_file.write(_encode(entry))
+
+
+def append_revision(post_dir: Path, entry: dict) -> None:
+    """Append to the hot log, or to the cold log if the entry is rejected."""
+    if entry.get("status") == "rejected":
+        _append_rejected(post_dir, entry)
+        return
+    if not has_log(post_dir):
+        create_log(post_dir)
+    count = _ensure_index(post_dir)
+    line = _encode(entry)
+    with log_path(post_dir).open("ab") as log_file:
+        offset = log_file.tell()
+        log_file.write(line)
+    with index_path(post_dir).open("r+b") as index_file:
+        index_file.seek(count * _INDEX_ENTRY.size)
+        index_file.write(_INDEX_ENTRY.pack(offset, len(line)))
+
+
+def split_rejected(post_dir: Path) -> int:
+    """Move rejected entries of an older hot log into the cold log; return how many."""
+    if not has_log(post_dir):
+        return 0
+    entries = read_revisions(post_dir)
+    rejected = [entry for entry in entries if entry.get("status") == "rejected"]
+    if not rejected:
+        return 0
+    # The cold log is written first; until the hot log is replaced,
+    # merge_history() prefers the hot copy of an entry.
+    cold = {entry.get("revision_id"): entry for entry in read_rejected_revisions(post_dir)}
+    cold.update((entry.get("revision_id"), entry) for entry in rejected)
+    temp_cold = rejected_log_path(post_dir).with_suffix(".jsonl.tmp")
+    temp_cold.write_bytes(b"".join(_encode(cold[key]) for key in sorted(cold)))
+    os.replace(temp_cold, rejected_log_path(post_dir))
+    create_log(post_dir, [entry for entry in entries if entry.get("status") != "rejected"])
+    return len(rejected)
@@ -0,0 +1,164 @@
+"""Compressed pack files for old revision snapshots.
+
+A post's packed history lives in one file, revisions/pack.bin:
+
+    <u32 index length> <JSON index> <zlib records...>
+
+The index maps revision id to [offset, length] of its record, relative to
+the end of the index. A record is either a full chunk list or a list of
+ops against a base revision in the same pack ("copy" a base chunk range,
+"add" new chunks). Delta chains are capped so reads stay bounded. New
+revisions are appended: existing records are never re-encoded.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import struct
+import zlib
+from difflib import SequenceMatcher
+from pathlib import Path
+from typing import BinaryIO
+
+from document_writer.domain.editor.chunking import Chunk
+
+PACK_NAME = "pack.bin"
+MAX_DELTA_CHAIN = 16
+
+_HEADER = struct.Struct("<I")
+
+
+def pack_path(post_dir: Path) -> Path:
+    return post_dir / "revisions" / PACK_NAME
+
+
+def _chunk_key(chunk: Chunk) -> tuple[str, str, str]:
+    return (chunk.leading_separator, chunk.text, chunk.trailing_separator)
+
+
+def _chunks_from_keys(keys: list[list[str]]) -> list[Chunk]:
+    return [
+        Chunk(index=index, text=text, leading_separator=leading, trailing_separator=trailing)
+        for index, (leading, text, trailing) in enumerate(keys)
+    ]
+
+
+def _delta_ops(base: list[Chunk], target: list[Chunk]) -> list[list]:
+    base_keys = [_chunk_key(chunk) for chunk in base]
+    target_keys = [_chunk_key(chunk) for chunk in target]
+    matcher = SequenceMatcher(a=base_keys, b=target_keys, autojunk=False)
+    ops: list[list] = []
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            ops.append(["copy", i1, i2])
+        elif j2 > j1:
+            ops.append(["add", [list(key) for key in target_keys[j1:j2]]])
+    return ops
+
+
+def _read_index(handle: BinaryIO) -> tuple[dict[int, list[int]], int]:
+    raw = handle.read(_HEADER.size)
+    if len(raw) != _HEADER.size:
+        raise ValueError("Revision pack header is truncated")
+    (index_length,) = _HEADER.unpack(raw)
+    index = json.loads(handle.read(index_length))
+    entries = {int(revision_id): value for revision_id, value in index["entries"].items()}
+    return entries, _HEADER.size + index_length
+
+
+def packed_revision_ids(post_dir: Path) -> list[int]:
+    path = pack_path(post_dir)
+    if not path.exists():
+        return []
+    with path.open("rb") as handle:
+        entries, _data_start = _read_index(handle)
+    return sorted(entries)
+
+
+def _decode(
+    handle: BinaryIO,
+    entries: dict[int, list[int]],
+    data_start: int,
+    revision_id: int,
+    depth: int = 0,
+) -> list[Chunk]:
+    if depth > MAX_DELTA_CHAIN:
+        raise ValueError(f"Revision pack delta chain too long at revision {revision_id}")
+    offset, length = entries[revision_id]
+    handle.seek(data_start + offset)
+    record = json.loads(zlib.decompress(handle.read(length)))
+    if record.get("base") is None:
+        return _chunks_from_keys(record["chunks"])
+    base = _decode(handle, entries, data_start, record["base"], depth + 1)
+    keys: list[list[str]] = []
+    for op in record["ops"]:
+        if op[0] == "copy":
+            keys.extend(list(_chunk_key(chunk)) for chunk in base[op[1]:op[2]])
+        else:
+            keys.extend(op[1])
+    return _chunks_from_keys(keys)
+
+
+def read_packed_chunks(post_dir: Path, revision_id: int) -> list[Chunk] | None:
+    path = pack_path(post_dir)
+    if not path.exists():
+        return None
+    with path.open("rb") as handle:
+        entries, data_start = _read_index(handle)
+        if revision_id not in entries:
+            return None
+        return _decode(handle, entries, data_start, revision_id)
+
+
+def _chain_length(handle: BinaryIO, entries: dict[int, list[int]], data_start: int, revision_id: int) -> int:
+    depth = 0
+    while True:
+        offset, length = entries[revision_id]
+        handle.seek(data_start + offset)
+        base = json.loads(zlib.decompress(handle.read(length))).get("base")
+        if base is None:
+            return depth
+        depth += 1
+        revision_id = base
+
+
+def append_to_pack(post_dir: Path, revisions: dict[int, list[Chunk]], *, delta: bool = True) -> None:
+    """Add revisions to the post's pack.
+
+    Records already in the pack are copied byte for byte; only the new
+    revisions are encoded, as deltas continuing from the last packed one.
+    """
+    path = pack_path(post_dir)
+    records = bytearray()
+    entries: dict[str, list[int]] = {}
+    previous: tuple[int, list[Chunk]] | None = None
+    chain = 0
+    if path.exists():
+        with path.open("rb") as handle:
+            packed, data_start = _read_index(handle)
+            if packed:
+                last = max(packed)
+                previous = (last, _decode(handle, packed, data_start, last))
+                chain = _chain_length(handle, packed, data_start, last)
+            handle.seek(data_start)
+            records += handle.read()
+        entries = {str(revision_id): value for revision_id, value in packed.items()}
+    for revision_id in sorted(revisions):
+        chunks = revisions[revision_id]
+        if delta and previous is not None and chain < MAX_DELTA_CHAIN:
+            record = {"base": previous[0], "ops": _delta_ops(previous[1], chunks)}
+            chain += 1
+        else:
+            record = {"base": None, "chunks": [list(_chunk_key(chunk)) for chunk in chunks]}
+            chain = 0
+        payload = zlib.compress(json.dumps(record).encode("utf-8"), 9)
+        entries[str(revision_id)] = [len(records), len(payload)]
+        records += payload
+        previous = (revision_id, chunks)
+
+    index = json.dumps({"version": 1, "entries": entries}).encode("utf-8")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_suffix(".bin.tmp")
+    temp_path.write_bytes(_HEADER.pack(len(index)) + index + bytes(records))
+    os.replace(temp_path, path)
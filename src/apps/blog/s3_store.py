@@ -0,0 +1,613 @@
+"""S3-compatible implementation of PostStore.
+
+Object layout under the store prefix:
+
+- posts/<post_id>/head.json: meta, intent, last folded revision id, the
+  id of the latest applied content revision and the derived state
+- posts/<post_id>/content.md: content at creation, written once
+- posts/<post_id>/revisions/<revision_id>.json: one revision entry with
+  its meta updates and snapshot manifest
+- chunks/<sha256>: snapshot chunk texts, shared by all posts
+- index/posts/<listing key>.json: one post's meta, for listing. The
+  listing key is the post id with its hex digits complemented, so S3's
+  ascending key order is newest first and a page of posts is one
+  ListObjectsV2 call plus a GET per post.
+
+Current content is the snapshot of the head's latest content revision,
+or content.md before the first one, so it can never disagree with the
+log.
+
+A revision is committed by creating its object with If-None-Match: *, so
+exactly one writer wins each id and the revision carries everything
+needed to replay it. The head is then advanced with If-Match on its
+ETag, folding in any committed revisions it has not seen yet, including
+those of a writer that died before advancing it. Readers probe past the
+head for such revisions, so they are never lost.
+
+Every head write bumps the head's version. A post's listing entry is
+brought up to its head after every head change that touches meta, with
+a conditional write on that entry alone, and an entry is never replaced
+by one from an older head. The entries are rebuilt from the heads when
+there are none; rebuild_listing_index() also repairs them after a
+writer died between the two writes.
+
+Reads go through a bounded in-process cache: immutable objects (chunks,
+revisions) are served from it directly, mutable ones are revalidated
+with If-None-Match on the cached ETag.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import AbstractContextManager
+from dataclasses import asdict
+from datetime import datetime, timezone
+from typing import Any, Iterable, Iterator, Literal
+
+import boto3
+from botocore.exceptions import ClientError
+
+from apps.blog import post_index, revision_diff
+from apps.blog.hashing import text_digest
+from apps.blog.post_lock import post_locks
+from apps.blog.post_state import PostDerivedState
+from apps.blog.storage import (
+    ContentChunkWindow,
+    PostBundle,
+    PostPage,
+    PostPart,
+    RevisionConflictError,
+    RevisionResult,
+    chunk_entries,
+    content_chunk_window,
+    is_applied_content_revision,
+    new_post_id,
+    page_statuses,
+)
+from apps.blog.types import (
+    BlogPostMeta,
+    PostStatus,
+    require_post_status,
+    validate_status_transition,
+)
+from document_writer.domain.editor.chunking import Chunk, join_chunks, split_markdown
+
+CACHE_MAX_BYTES = 64 * 1024 * 1024
+UPLOAD_WORKERS = 8
+MAX_COMMIT_ATTEMPTS = 10
+# Complementing every hex digit reverses the order of post ids, whose
+# other characters sit at fixed positions; applying it twice is a no-op.
+_NEWEST_FIRST = str.maketrans("0123456789abcdef", "fedcba9876543210")
+
+
+def _error_code(exc: ClientError) -> str:
+    return str(exc.response.get("Error", {}).get("Code", ""))
+
+
+def _is_missing(exc: ClientError) -> bool:
+    return _error_code(exc) in ("NoSuchKey", "404", "NotFound")
+
+
+def _is_precondition_failure(exc: ClientError) -> bool:
+    return _error_code(exc) in ("PreconditionFailed", "412", "ConditionalRequestConflict", "409")
+
+
+class ObjectCache:
+    """LRU of object bodies bounded by total size, keyed by (key, ETag)."""
+
+    def __init__(self, max_bytes: int = CACHE_MAX_BYTES) -> None:
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[str, tuple[str, bytes]] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> tuple[str, bytes] | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: str, etag: str, body: bytes) -> None:
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous[1])
+            self._entries[key] = (etag, body)
+            self._size += len(body)
+            while self._size > self.max_bytes:
+                _key, (_etag, evicted) = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+    def forget(self, key: str) -> None:
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous[1])
+
+
+class S3PostStore:
+    def __init__(
+        self,
+        bucket: str,
+        *,
+        prefix: str = "",
+        client: Any = None,
+        cache_max_bytes: int = CACHE_MAX_BYTES,
+        upload_workers: int = UPLOAD_WORKERS,
+    ) -> None:
+        self.bucket = bucket
+        self.prefix = prefix.rstrip("/") + "/" if prefix else ""
+        self.client = client if client is not None else boto3.client("s3")
+        self.cache = ObjectCache(cache_max_bytes)
+        self.upload_workers = upload_workers
+
+    # ---------- keys ----------
+
+    def _post_key(self, post_id: str, name: str) -> str:
+        return f"{self.prefix}posts/{post_id}/{name}"
+
+    def _revision_key(self, post_id: str, revision_id: int) -> str:
+        return self._post_key(post_id, f"revisions/{revision_id:010d}.json")
+
+    def _chunk_key(self, digest: str) -> str:
+        return f"{self.prefix}chunks/{digest}"
+
+    def _listing_prefix(self) -> str:
+        return f"{self.prefix}index/posts/"
+
+    def _listing_key(self, post_id: str) -> str:
+        return f"{self._listing_prefix()}{post_id.translate(_NEWEST_FIRST)}.json"
+
+    # ---------- object access ----------
+
+    def _get(self, key: str, *, immutable: bool = False) -> tuple[str, bytes] | None:
+        cached = self.cache.get(key)
+        if cached is not None and immutable:
+            return cached
+        params: dict[str, Any] = {"Bucket": self.bucket, "Key": key}
+        if cached is not None:
+            params["IfNoneMatch"] = cached[0]
+        try:
+            response = self.client.get_object(**params)
+        except ClientError as exc:
+            if cached is not None and _error_code(exc) in ("304", "NotModified"):
+                return cached
+            if _is_missing(exc):
+                self.cache.forget(key)
+                return None
+            raise
+        etag, body = response["ETag"], response["Body"].read()
+        self.cache.put(key, etag, body)
+        return etag, body
+
+    def _put(self, key: str, body: bytes, **conditions: str) -> str:
+        response = self.client.put_object(Bucket=self.bucket, Key=key, Body=body, **conditions)
+        etag = response["ETag"]
+        self.cache.put(key, etag, body)
+        return etag
+
+    def _get_json(self, key: str, *, immutable: bool = False) -> tuple[str, dict] | None:
+        found = self._get(key, immutable=immutable)
+        if found is None:
+            return None
+        return found[0], json.loads(found[1])
+
+    def _require_head(self, post_id: str) -> tuple[str, dict]:
+        head = self._get_json(self._post_key(post_id, "head.json"))
+        if head is None:
+            raise FileNotFoundError(f"Post not found: {post_id}")
+        return head
+
+    def _read_revision_object(self, post_id: str, revision_id: int) -> dict | None:
+        found = self._get_json(self._revision_key(post_id, revision_id), immutable=True)
+        return None if found is None else found[1]
+
+    def _upload_chunks(self, chunks: list[Chunk]) -> list[dict]:
+        manifest = []
+        pending: dict[str, bytes] = {}
+        for chunk in chunks:
+            digest = text_digest(chunk.text)
+            manifest.append(
+                {
+                    "digest": digest,
+                    "leading_separator": chunk.leading_separator,
+                    "trailing_separator": chunk.trailing_separator,
+                }
+            )
+            if self.cache.get(self._chunk_key(digest)) is None:
+                pending[digest] = chunk.text.encode("utf-8")
+        if pending:
+            with ThreadPoolExecutor(max_workers=self.upload_workers) as pool:
+                list(pool.map(lambda item: self._put(self._chunk_key(item[0]), item[1]), pending.items()))
+        return manifest
+
+    # ---------- head ----------
+
+    def _advance_head(self, post_id: str) -> dict:
+        """Fold committed revisions past the head into it; return the new head."""
+        for _attempt in range(MAX_COMMIT_ATTEMPTS):
+            etag, head = self._require_head(post_id)
+            state = PostDerivedState(post_id=post_id, status=head["meta"]["status"], **head["state"])
+            last_revision_id = head["last_revision_id"]
+            original_meta = dict(head["meta"])
+            while True:
+                record = self._read_revision_object(post_id, last_revision_id + 1)
+                if record is None:
+                    break
+                last_revision_id += 1
+                state = state.apply_delta(record["entry"])
+                if record.get("manifest") is not None:
+                    head["content_revision_id"] = last_revision_id
+                if record.get("meta_updates") and record["entry"]["status"] == "applied":
+                    head["meta"].update(record["meta_updates"])
+            if last_revision_id == head["last_revision_id"]:
+                return head
+            head["last_revision_id"] = last_revision_id
+            head["version"] = head.get("version", 0) + 1
+            head["state"] = {
+                key: value for key, value in asdict(state).items() if key not in ("post_id", "status")
+            }
+            try:
+                self._put(
+                    self._post_key(post_id, "head.json"),
+                    json.dumps(head).encode("utf-8"),
+                    IfMatch=etag,
+                )
+            except ClientError as exc:
+                if not _is_precondition_failure(exc):
+                    raise
+                continue
+            if head["meta"] != original_meta:
+                self._update_listing(post_id, head)
+            return head
+        raise ValueError(f"Could not advance head for post {post_id}: too much contention")
+
+    # ---------- listing index ----------
+
+    def _update_listing(self, post_id: str, head: dict) -> None:
+        """Bring the post's listing entry up to head; an entry from a newer head is kept."""
+        key = self._listing_key(post_id)
+        listing = {"meta": head["meta"], "version": head.get("version", 0)}
+        for _attempt in range(MAX_COMMIT_ATTEMPTS):
+            found = self._get_json(key)
+            if found is not None and (found[1] == listing or found[1]["version"] > listing["version"]):
+                return
+            condition = {"IfMatch": found[0]} if found is not None else {"IfNoneMatch": "*"}
+            try:
+                self._put(key, json.dumps(listing).encode("utf-8"), **condition)
+            except ClientError as exc:
+                if not _is_precondition_failure(exc):
+                    raise
+                continue
+            return
+        raise ValueError(f"Could not update the listing entry for post {post_id}: too much contention")
+
+    def rebuild_listing_index(self) -> int:
+        """Bring every post's listing entry up to its head; return the number of posts."""
+        post_ids = self._post_ids()
+
+        def rebuild(post_id: str) -> None:
+            self._update_listing(post_id, self._advance_head(post_id))
+
+        with ThreadPoolExecutor(max_workers=self.upload_workers) as pool:
+            list(pool.map(rebuild, post_ids))
+        return len(post_ids)
+
+    def _listing_keys(self, start_after: str | None, max_keys: int) -> tuple[list[str], bool]:
+        params: dict[str, Any] = {
+            "Bucket": self.bucket,
+            "Prefix": self._listing_prefix(),
+            "MaxKeys": max_keys,
+        }
+        if start_after is not None:
+            params["StartAfter"] = start_after
+        response = self.client.list_objects_v2(**params)
+        keys = [item["Key"] for item in response.get("Contents", [])]
+        return keys, bool(response.get("IsTruncated"))
+
+    # ---------- PostStore ----------
+
+    def create_post(self, *, title: str | None, author: str, intent: dict, content: str) -> str:
+        timestamp = datetime.now(timezone.utc).replace(microsecond=0)
+        post_id = new_post_id(timestamp)
+        meta = BlogPostMeta(
+            post_id=post_id,
+            title=title,
+            author=author,
+            created_at=timestamp,
+            status="draft",
+        )
+        head = {
+            "meta": meta.model_dump(mode="json"),
+            "intent": intent,
+            "last_revision_id": 0,
+            "content_revision_id": 0,
+            "version": 0,
+            "state": {"title": title, "author": author, "content_ref": text_digest(content), "revision_id": 0},
+        }
+        self._put(self._post_key(post_id, "content.md"), content.encode("utf-8"))
+        self._put(
+            self._post_key(post_id, "head.json"),
+            json.dumps(head).encode("utf-8"),
+            IfNoneMatch="*",
+        )
+        self._update_listing(post_id, head)
+        return post_id
+
+    def read_post_meta(self, post_id: str) -> BlogPostMeta:
+        return BlogPostMeta.model_validate(self._advance_head(post_id)["meta"])
+
+    def read_post_content(self, post_id: str) -> str:
+        return self._head_content(post_id, self._advance_head(post_id))
+
+    def _head_content(self, post_id: str, head: dict) -> str:
+        content_revision_id = head.get("content_revision_id", 0)
+        if content_revision_id:
+            record = self._read_revision_object(post_id, content_revision_id)
+            if record is None:
+                raise ValueError(f"Revision {content_revision_id} missing for post {post_id}")
+            return self._snapshot_content(post_id, record)
+        found = self._get(self._post_key(post_id, "content.md"), immutable=True)
+        if found is None:
+            raise FileNotFoundError(f"content.md not found for post {post_id}")
+        return found[1].decode("utf-8")
+
+    def read_post_intent(self, post_id: str) -> dict:
+        return self._require_head(post_id)[1]["intent"]
+
+    def load_post_bundle(self, post_id: str, parts: Iterable[PostPart] = ("content",)) -> PostBundle:
+        requested = set(parts)
+        head = self._advance_head(post_id)
+        bundle = PostBundle(meta=BlogPostMeta.model_validate(head["meta"]))
+        if "content" in requested:
+            bundle.content = self._head_content(post_id, head)
+        if "intent" in requested:
+            bundle.intent = head["intent"]
+        if "revisions" in requested:
+            bundle.revisions = self._revision_entries(post_id, head, include_rejected=False)
+        if "revisions" in requested or "last_revision_id" in requested:
+            bundle.last_revision_id = head["last_revision_id"] or None
+        return bundle
+
+    def write_post_content(self, post_id: str, content: str) -> None:
+        # Content follows the head's latest content revision, which
+        # apply_blog_update has already committed; there is nothing to write.
+        self._require_head(post_id)
+
+    def update_post_status(self, post_id: str, new_status: str) -> PostStatus:
+        resolved_status = require_post_status(new_status, field="new status")
+        for _attempt in range(MAX_COMMIT_ATTEMPTS):
+            self._advance_head(post_id)
+            etag, head = self._require_head(post_id)
+            validate_status_transition(head["meta"]["status"], resolved_status)
+            head["meta"]["status"] = resolved_status
+            head["version"] = head.get("version", 0) + 1
+            try:
+                self._put(
+                    self._post_key(post_id, "head.json"),
+                    json.dumps(head).encode("utf-8"),
+                    IfMatch=etag,
+                )
+            except ClientError as exc:
+                if not _is_precondition_failure(exc):
+                    raise
+                continue
+            self._update_listing(post_id, head)
+            return resolved_status
+        raise ValueError(f"Could not update status for post {post_id}: too much contention")
+
+    def apply_blog_update(
+        self,
+        *,
+        post_id: str,
+        new_content: str,
+        delta_type: str,
+        source: Literal["policy", "manual", "future"],
+        parent_revision_id: int | None,
+        delta_payload: dict,
+        actor: Any,
+        status: str = "applied",
+        reason: str | None = None,
+        meta_updates: dict | None = None,
+        expected_last_revision_id: int | None = None,
+    ) -> RevisionResult:
+        head = self._advance_head(post_id)
+        last_revision_id = head["last_revision_id"]
+        if expected_last_revision_id is not None and last_revision_id != expected_last_revision_id:
+            raise RevisionConflictError(
+                f"Post {post_id} is at revision {last_revision_id}, expected {expected_last_revision_id}"
+            )
+        next_revision_id = last_revision_id + 1
+        resolved_parent_revision_id = (
+            last_revision_id if parent_revision_id is None and last_revision_id else parent_revision_id
+        )
+        if resolved_parent_revision_id is not None and not 1 <= resolved_parent_revision_id <= last_revision_id:
+            raise ValueError(f"Invalid parent_revision_id for post {post_id}")
+        revision_entry: dict[str, Any] = {
+            "revision_id": next_revision_id,
+            "parent_revision_id": resolved_parent_revision_id,
+            "timestamp": datetime.now(timezone.utc).replace(microsecond=0).isoformat(),
+            "delta_type": delta_type,
+            "delta_payload": dict(delta_payload),
+            "actor": actor,
+            "status": status,
+            "source": source,
+        }
+        if reason is not None:
+            revision_entry["reason"] = reason
+        # Refuse deltas that would not fold into the head's derived state.
+        state = PostDerivedState(post_id=post_id, status=head["meta"]["status"], **head["state"])
+        state.apply_delta(revision_entry)
+        manifest = None
+        if is_applied_content_revision(revision_entry):
+            if not isinstance(new_content, str) or not new_content:
+                raise ValueError(f"Applied content delta requires non-empty content for post {post_id}")
+            manifest = self._upload_chunks(split_markdown(new_content))
+        record = {"entry": revision_entry, "meta_updates": meta_updates, "manifest": manifest}
+        try:
+            self._put(
+                self._revision_key(post_id, next_revision_id),
+                json.dumps(record).encode("utf-8"),
+                IfNoneMatch="*",
+            )
+        except ClientError as exc:
+            if _is_precondition_failure(exc):
+                raise RevisionConflictError(
+                    f"Revision {next_revision_id} of post {post_id} was committed concurrently"
+                ) from exc
+            raise
+        self._advance_head(post_id)
+        return RevisionResult(
+            revision_id=next_revision_id,
+            parent_revision_id=resolved_parent_revision_id,
+        )
+
+    def _post_ids(self) -> list[str]:
+        paginator = self.client.get_paginator("list_objects_v2")
+        post_ids: list[str] = []
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=f"{self.prefix}posts/", Delimiter="/"):
+            for common in page.get("CommonPrefixes", []):
+                post_ids.append(common["Prefix"].rstrip("/").rsplit("/", 1)[-1])
+        return post_ids
+
+    def list_posts_page(
+        self,
+        *,
+        visibility: Literal["public", "editor"],
+        status: PostStatus | None = None,
+        author: str | None = None,
+        cursor: str | None = None,
+        limit: int = 50,
+    ) -> PostPage:
+        # Post ids start with their creation time, so id order is (created_at, post_id) order.
+        statuses = page_statuses(visibility, status)
+        if limit < 1:
+            raise ValueError("limit must be at least 1")
+        after = post_index.decode_cursor(cursor) if cursor else None
+        if statuses == []:
+            return PostPage(posts=[], next_cursor=None)
+        start_after = self._listing_key(after[1]) if after is not None else None
+        matches: list[BlogPostMeta] = []
+        rebuilt = False
+        while len(matches) <= limit:
+            keys, truncated = self._listing_keys(start_after, limit + 1 - len(matches))
+            if not keys and after is None and not matches and not rebuilt and self._post_ids():
+                # No listing entries yet, e.g. a bucket written before they existed.
+                self.rebuild_listing_index()
+                rebuilt = True
+                continue
+            with ThreadPoolExecutor(max_workers=self.upload_workers) as pool:
+                listings = list(pool.map(self._get_json, keys))
+            for found in listings:
+                if found is None:
+                    continue
+                meta = BlogPostMeta.model_validate(found[1]["meta"])
+                if statuses is not None and meta.status not in statuses:
+                    continue
+                if author is not None and meta.author != author:
+                    continue
+                matches.append(meta)
+            if not truncated or not keys:
+                break
+            start_after = keys[-1]
+        page = matches[:limit]
+        next_cursor = None
+        if len(matches) > limit:
+            last = page[-1]
+            next_cursor = post_index.encode_cursor(post_index.created_key(last.created_at), last.post_id)
+        return PostPage(posts=page, next_cursor=next_cursor)
+
+    def search_posts(self, query: str, *, limit: int = 20) -> list[tuple[BlogPostMeta, float]]:
+        raise NotImplementedError("The S3 post store has no search index")
+
+    def read_revision_metadata(self, post_id: str, *, include_rejected: bool = True) -> list[dict]:
+        return self._revision_entries(post_id, self._advance_head(post_id), include_rejected=include_rejected)
+
+    def _revision_entries(self, post_id: str, head: dict, *, include_rejected: bool) -> list[dict]:
+        entries = []
+        for revision_id in range(1, head["last_revision_id"] + 1):
+            record = self._read_revision_object(post_id, revision_id)
+            if record is None:
+                raise ValueError(f"Revision {revision_id} missing for post {post_id}")
+            if include_rejected or record["entry"].get("status") != "rejected":
+                entries.append(record["entry"])
+        return entries
+
+    def read_revision_entry(self, post_id: str, revision_id: int) -> dict | None:
+        head = self._advance_head(post_id)
+        if not 1 <= revision_id <= head["last_revision_id"]:
+            return None
+        record = self._read_revision_object(post_id, revision_id)
+        return None if record is None else record["entry"]
+
+    def read_last_revision_id(self, post_id: str) -> int | None:
+        return self._advance_head(post_id)["last_revision_id"] or None
+
+    def read_revision_content(self, post_id: str, revision_id: int) -> str:
+        return self._snapshot_content(post_id, self._snapshot_record(post_id, revision_id))
+
+    def _snapshot_record(self, post_id: str, revision_id: int) -> dict:
+        """The record of the content revision whose snapshot holds the content at revision_id."""
+        head = self._advance_head(post_id)
+        if not 1 <= revision_id <= head["last_revision_id"]:
+            raise FileNotFoundError(f"Revision {revision_id} not found for post {post_id}")
+        for candidate in range(revision_id, 0, -1):
+            record = self._read_revision_object(post_id, candidate)
+            if record is not None and record.get("manifest") is not None:
+                return record
+        raise FileNotFoundError(
+            f"No content snapshots available for revision {revision_id} in post {post_id}"
+        )
+
+    def read_content_chunks(self, post_id: str, *, offset: int = 0, limit: int = 50) -> ContentChunkWindow:
+        head = self._advance_head(post_id)
+        return content_chunk_window(
+            self._head_content(post_id, head),
+            offset=offset,
+            limit=limit,
+            revision_id=head["last_revision_id"] or None,
+        )
+
+    def diff_revisions(self, post_id: str, from_revision_id: int, to_revision_id: int) -> Iterator[dict]:
+        before = self._snapshot_chunks(post_id, self._snapshot_record(post_id, from_revision_id))
+        after = self._snapshot_chunks(post_id, self._snapshot_record(post_id, to_revision_id))
+        return revision_diff.iter_revision_diff(
+            None,
+            chunk_entries(before),
+            chunk_entries(after),
+            from_revision_id=from_revision_id,
+            to_revision_id=to_revision_id,
+        )
+
+    def _snapshot_content(self, post_id: str, record: dict) -> str:
+        return join_chunks(self._snapshot_chunks(post_id, record))
+
+    def _snapshot_chunks(self, post_id: str, record: dict) -> list[Chunk]:
+        chunks = []
+        for index, item in enumerate(record["manifest"]):
+            found = self._get(self._chunk_key(item["digest"]), immutable=True)
+            if found is None:
+                raise ValueError(f"Missing chunk {item['digest']} for post {post_id}")
+            chunks.append(
+                Chunk(
+                    index=index,
+                    text=found[1].decode("utf-8"),
+                    leading_separator=item["leading_separator"],
+                    trailing_separator=item["trailing_separator"],
+                )
+            )
+        return chunks
+
+    def read_derived_state(self, post_id: str) -> PostDerivedState:
+        head = self._advance_head(post_id)
+        return PostDerivedState(post_id=post_id, status=head["meta"]["status"], **head["state"])
+
+    def lock(self, post_id: str) -> AbstractContextManager[None]:
+        # Other nodes are excluded by the conditional writes, not by this lock.
+        return post_locks.lock(f"s3://{self.bucket}/{self.prefix}{post_id}")
@@ -0,0 +1,386 @@
+"""Incremental full-text index over published posts.
+
+The index lives in POSTS_ROOT/.index/search as immutable JSON segments
+listed, oldest first, in manifest.json. A segment maps token -> post_id ->
+positions for the posts it holds and lists posts it deletes; for any post
+the newest segment mentioning it wins. Storage writes call mark_dirty(),
+which only drops a marker file in the dirty/ directory, so writers never
+wait on the index lock. The next search re-indexes the marked posts in
+one segment; whenever MERGE_FACTOR segments of the same level sit at the
+tail they are merged into one segment of the next level, so a tree of N
+posts has O(log N) segments. Searches also re-sync when a post directory
+was added or removed, the same trigger post_index uses; that sync only
+indexes or drops the ids that entered or left the published listing.
+
+Only published posts are indexed. Title and content are indexed as one
+token stream, title first, and results are ranked by BM25; quoted
+phrases must match at consecutive positions.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import math
+import os
+import re
+import secrets
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable
+
+from apps.blog import post_index, post_layout
+from apps.blog.hashing import file_digest
+from apps.blog.post_lock import post_locks
+
+SEARCH_DIR_NAME = "search"
+MANIFEST_FILE_NAME = "manifest.json"
+DIRTY_DIR_NAME = "dirty"
+MERGE_FACTOR = 4
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# token -> post_id -> positions; post_id -> (text, digest), or None to delete.
+_Postings = dict[str, dict[str, list[int]]]
+_Documents = dict[str, tuple[str, str] | None]
+
+_TOKEN_RE = re.compile(r"\w+")
+_PHRASE_RE = re.compile(r'"([^"]*)"')
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class SearchHit:
+    post_id: str
+    score: float
+
+
+def tokenize(text: str) -> list[str]:
+    return _TOKEN_RE.findall(text.lower())
+
+
+def index_dir(posts_root: Path) -> Path:
+    return posts_root / post_index.INDEX_DIR_NAME / SEARCH_DIR_NAME
+
+
+def _write_json(path: Path, payload: dict) -> None:
+    temp_path = path.with_name(f".{path.name}.{secrets.token_hex(4)}.tmp")
+    temp_path.write_text(json.dumps(payload, separators=(",", ":")))
+    os.replace(temp_path, path)
+
+
+def _read_manifest(directory: Path) -> dict:
+    path = directory / MANIFEST_FILE_NAME
+    if not path.exists():
+        return {"generation": 0, "segments": [], "listing_signature": None}
+    return json.loads(path.read_text())
+
+
+def _segment(docs: dict[str, dict], postings: _Postings, deleted: Iterable[str], level: int) -> dict:
+    return {"level": level, "docs": docs, "deleted": sorted(deleted), "postings": postings}
+
+
+def _document_segment(documents: _Documents) -> dict:
+    """Build a level-0 segment holding or deleting each given post."""
+    docs: dict[str, dict] = {}
+    postings: _Postings = {}
+    deleted = [post_id for post_id, document in documents.items() if document is None]
+    for post_id, document in documents.items():
+        if document is None:
+            continue
+        text, digest = document
+        tokens = tokenize(text)
+        docs[post_id] = {"length": len(tokens), "digest": digest}
+        for position, token in enumerate(tokens):
+            postings.setdefault(token, {}).setdefault(post_id, []).append(position)
+    return _segment(docs, postings, deleted, 0)
+
+
+def _merge(segments: list[dict], *, bottom: bool) -> dict:
+    """Merge consecutive segments, oldest first; bottom drops deletes nothing older can need."""
+    owner: dict[str, int] = {}
+    for position, segment in enumerate(segments):
+        for post_id in segment["docs"]:
+            owner[post_id] = position
+        for post_id in segment["deleted"]:
+            owner[post_id] = -1
+    docs: dict[str, dict] = {}
+    postings: _Postings = {}
+    for position, segment in enumerate(segments):
+        for post_id, doc in segment["docs"].items():
+            if owner[post_id] == position:
+                docs[post_id] = doc
+        for token, entries in segment["postings"].items():
+            for post_id, positions in entries.items():
+                if owner[post_id] == position:
+                    postings.setdefault(token, {})[post_id] = positions
+    deleted = [] if bottom else [post_id for post_id, position in owner.items() if position == -1]
+    return _segment(docs, postings, deleted, segments[-1]["level"] + 1)
+
+
+class _Snapshot:
+    """The live view of one manifest generation."""
+
+    def __init__(self, segments: list[dict]) -> None:
+        self.segments = segments
+        self.owner: dict[str, int] = {}
+        for position in range(len(segments) - 1, -1, -1):
+            segment = segments[position]
+            for post_id in segment["deleted"]:
+                self.owner.setdefault(post_id, -1)
+            for post_id in segment["docs"]:
+                self.owner.setdefault(post_id, position)
+        self.docs = {
+            post_id: segments[position]["docs"][post_id]
+            for post_id, position in self.owner.items()
+            if position >= 0
+        }
+        total = sum(doc["length"] for doc in self.docs.values())
+        self.average_length = total / len(self.docs) if self.docs else 0.0
+
+    def postings(self, token: str) -> dict[str, list[int]]:
+        found: dict[str, list[int]] = {}
+        for position, segment in enumerate(self.segments):
+            for post_id, positions in segment["postings"].get(token, {}).items():
+                if self.owner.get(post_id) == position:
+                    found[post_id] = positions
+        return found
+
+
+_segment_cache: dict[str, dict] = {}
+_snapshots: dict[str, tuple[tuple, _Snapshot]] = {}
+_cache_lock = threading.Lock()
+
+
+def _load_segment(path: Path) -> dict:
+    key = str(path)
+    with _cache_lock:
+        segment = _segment_cache.get(key)
+    if segment is None:
+        segment = json.loads(path.read_text())
+        with _cache_lock:
+            _segment_cache[key] = segment
+    return segment
+
+
+def _load_snapshot(directory: Path) -> _Snapshot:
+    manifest_path = directory / MANIFEST_FILE_NAME
+    for _attempt in range(3):
+        try:
+            stat = manifest_path.stat()
+        except FileNotFoundError:
+            return _Snapshot([])
+        signature = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        with _cache_lock:
+            cached = _snapshots.get(str(directory))
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        manifest = _read_manifest(directory)
+        try:
+            segments = [_load_segment(directory / name) for name in manifest["segments"]]
+        except FileNotFoundError:
+            # A merge in another process replaced the manifest under us.
+            continue
+        snapshot = _Snapshot(segments)
+        with _cache_lock:
+            _snapshots[str(directory)] = (signature, snapshot)
+            live = {str(directory / name) for name in manifest["segments"]}
+            for key in [key for key in _segment_cache if key.startswith(str(directory)) and key not in live]:
+                del _segment_cache[key]
+        return snapshot
+    raise ValueError(f"Search index at {directory} is changing too fast to load")
+
+
+def _commit(posts_root: Path, documents: _Documents, listing_signature: str | None = None) -> None:
+    directory = index_dir(posts_root)
+    directory.mkdir(parents=True, exist_ok=True)
+    manifest = _read_manifest(directory)
+    names = list(manifest["segments"])
+    segments = [_load_segment(directory / name) for name in names]
+    removed: list[str] = []
+
+    def add(segment: dict) -> None:
+        manifest["generation"] += 1
+        name = f"seg-{manifest['generation']:08d}.json"
+        _write_json(directory / name, segment)
+        with _cache_lock:
+            _segment_cache[str(directory / name)] = segment
+        names.append(name)
+        segments.append(segment)
+
+    if documents:
+        add(_document_segment(documents))
+    while len(segments) >= MERGE_FACTOR and len({tail["level"] for tail in segments[-MERGE_FACTOR:]}) == 1:
+        run = segments[-MERGE_FACTOR:]
+        removed.extend(names[-MERGE_FACTOR:])
+        del names[-MERGE_FACTOR:], segments[-MERGE_FACTOR:]
+        add(_merge(run, bottom=not segments))
+    manifest["segments"] = names
+    if listing_signature is not None:
+        manifest["listing_signature"] = listing_signature
+    _write_json(directory / MANIFEST_FILE_NAME, manifest)
+    for name in removed:
+        (directory / name).unlink(missing_ok=True)
+
+
+def _lock(posts_root: Path):
+    directory = index_dir(posts_root)
+    directory.mkdir(parents=True, exist_ok=True)
+    return post_locks.lock(str(directory), directory / ".lock")
+
+
+def _published_digest(post_dir: Path) -> tuple[str, str] | None:
+    """(title, digest) for a published post from its meta and content stat, without reading the body."""
+    try:
+        meta = post_index.load_meta_file(post_dir / "meta.yaml")
+        if meta.status != "published":
+            return None
+        digest = file_digest(post_dir / "content.md")
+    except FileNotFoundError:
+        return None
+    return meta.title or "", f"{digest}:{meta.title or ''}"
+
+
+def _published_document(post_dir: Path, current: dict | None = None) -> tuple[str, str] | None:
+    """(text, digest) for a published post, or None if it must not be indexed.
+
+    When current is the indexed entry and its digest still matches, the
+    content is not read and current's digest comes back with empty text;
+    callers skip those.
+    """
+    found = _published_digest(post_dir)
+    if found is None:
+        return None
+    title, digest = found
+    if current is not None and current["digest"] == digest:
+        return "", digest
+    try:
+        content = (post_dir / "content.md").read_text()
+    except FileNotFoundError:
+        return None
+    return f"{title}\n{content}", digest
+
+
+def mark_dirty(posts_root: Path, post_id: str) -> None:
+    """Queue one post for re-indexing after its content, title or status changed."""
+    try:
+        directory = index_dir(posts_root) / DIRTY_DIR_NAME
+        directory.mkdir(parents=True, exist_ok=True)
+        (directory / post_id).touch()
+    except OSError:
+        logger.exception("Could not queue post %s for search re-indexing", post_id)
+
+
+def _flush_dirty(posts_root: Path) -> None:
+    directory = index_dir(posts_root) / DIRTY_DIR_NAME
+    if not directory.exists() or not any(directory.iterdir()):
+        return
+    with _lock(posts_root):
+        # Markers go before the posts are read, so a write racing this re-marks its post.
+        post_ids = []
+        for marker in directory.iterdir():
+            marker.unlink(missing_ok=True)
+            post_ids.append(marker.name)
+        try:
+            snapshot = _load_snapshot(index_dir(posts_root))
+            changes: _Documents = {}
+            for post_id in post_ids:
+                current = snapshot.docs.get(post_id)
+                document = _published_document(post_layout.post_dir(posts_root, post_id), current)
+                if document is None and current is None:
+                    continue
+                if document is not None and current is not None and current["digest"] == document[1]:
+                    continue
+                changes[post_id] = document
+            if changes:
+                _commit(posts_root, changes)
+        except Exception:
+            logger.exception("Search re-indexing failed; serving the previous index")
+            for post_id in post_ids:
+                mark_dirty(posts_root, post_id)
+
+
+def _sync(posts_root: Path, *, force: bool = False) -> None:
+    """Index posts added to or dropped from the published listing.
+
+    Content edits reach the index through the dirty markers, so a listing
+    change only reads the posts whose ids appeared; force re-checks every
+    published post, reading only those whose stat-based digest moved.
+    """
+    signature = post_layout.listing_signature(posts_root)
+    directory = index_dir(posts_root)
+    if not force and _read_manifest(directory)["listing_signature"] == signature:
+        return
+    with _lock(posts_root):
+        snapshot = _load_snapshot(directory)
+        published = {
+            meta.post_id for meta in post_index.list_indexed_posts(posts_root, statuses=("published",))
+        }
+        changes: _Documents = {
+            post_id: None for post_id in snapshot.docs if post_id not in published
+        }
+        candidates = published if force else published - snapshot.docs.keys()
+        for post_id in candidates:
+            current = snapshot.docs.get(post_id)
+            document = _published_document(post_layout.post_dir(posts_root, post_id), current)
+            if document is None:
+                if current is not None:
+                    changes[post_id] = None
+            elif current is None or current["digest"] != document[1]:
+                changes[post_id] = document
+        _commit(posts_root, changes, listing_signature=signature)
+
+
+def rebuild(posts_root: Path) -> None:
+    """Re-check every published post against the index regardless of the root mtime."""
+    _sync(posts_root, force=True)
+
+
+def parse_query(query: str) -> tuple[list[str], list[list[str]]]:
+    """(terms, phrases): every distinct token, and the token lists of quoted phrases."""
+    phrases = [tokens for tokens in (tokenize(phrase) for phrase in _PHRASE_RE.findall(query)) if tokens]
+    terms = tokenize(_PHRASE_RE.sub(" ", query))
+    terms.extend(token for phrase in phrases for token in phrase)
+    return list(dict.fromkeys(terms)), phrases
+
+
+def _has_phrase(postings: _Postings, post_id: str, phrase: list[str]) -> bool:
+    starts = set(postings[phrase[0]].get(post_id, ()))
+    for offset, token in enumerate(phrase[1:], start=1):
+        positions = set(postings[token].get(post_id, ()))
+        starts = {start for start in starts if start + offset in positions}
+        if not starts:
+            return False
+    return bool(starts)
+
+
+def search(posts_root: Path, query: str, *, limit: int = 20) -> list[SearchHit]:
+    """Rank published posts against query; cost scales with the matching postings."""
+    if limit < 1:
+        raise ValueError("limit must be at least 1")
+    terms, phrases = parse_query(query)
+    if not terms or not posts_root.exists():
+        return []
+    _sync(posts_root)
+    _flush_dirty(posts_root)
+    snapshot = _load_snapshot(index_dir(posts_root))
+    postings = {term: snapshot.postings(term) for term in terms}
+    total = len(snapshot.docs)
+    scores: dict[str, float] = {}
+    for term, entries in postings.items():
+        idf = math.log(1 + (total - len(entries) + 0.5) / (len(entries) + 0.5))
+        for post_id, positions in entries.items():
+            length = snapshot.docs[post_id]["length"]
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * length / (snapshot.average_length or 1))
+            frequency = len(positions)
+            scores[post_id] = scores.get(post_id, 0.0) + idf * frequency * (BM25_K1 + 1) / (frequency + norm)
+    if phrases:
+        scores = {
+            post_id: score
+            for post_id, score in scores.items()
+            if all(_has_phrase(postings, post_id, phrase) for phrase in phrases)
+        }
+    ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:limit]
+    return [SearchHit(post_id=post_id, score=score) for post_id, score in ranked]
@@ -0,0 +1,459 @@
+"""SQLite implementation of PostStore.
+
+Posts, revisions and snapshot chunks live in one database in WAL mode, so
+readers never block the writer and several processes can share it. Every
+write runs in a BEGIN IMMEDIATE transaction: a revision, its snapshot,
+any meta updates and the post's derived state are committed together or
+not at all, and a delta that does not fold into the derived state is
+refused. Chunk texts are stored once per sha256 digest. An FTS5 table
+kept in step with posts by triggers serves search_posts().
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+from contextlib import AbstractContextManager, closing, contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Literal
+
+from apps.blog import post_index, revision_diff, search_index
+from apps.blog.hashing import text_digest
+from apps.blog.post_lock import post_locks
+from apps.blog.post_state import PostDerivedState
+from apps.blog.storage import (
+    ContentChunkWindow,
+    PostBundle,
+    PostPage,
+    PostPart,
+    RevisionConflictError,
+    RevisionResult,
+    chunk_entries,
+    content_chunk_window,
+    is_applied_content_revision,
+    new_post_id,
+    page_statuses,
+)
+from apps.blog.types import (
+    BlogPostMeta,
+    PostStatus,
+    require_post_status,
+    validate_status_transition,
+)
+from document_writer.domain.editor.chunking import Chunk, join_chunks, split_markdown
+
+STORE_DIR_NAME = ".store"
+DATABASE_NAME = "blog.sqlite3"
+LOCKS_DIR_NAME = "locks"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS posts (
+    post_id TEXT PRIMARY KEY,
+    title TEXT,
+    author TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    created_key TEXT NOT NULL,
+    status TEXT NOT NULL,
+    intent TEXT NOT NULL,
+    content TEXT NOT NULL,
+    last_revision_id INTEGER NOT NULL DEFAULT 0,
+    state TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS posts_by_created ON posts (created_key DESC, post_id DESC);
+CREATE INDEX IF NOT EXISTS posts_by_status ON posts (status, created_key DESC, post_id DESC);
+CREATE INDEX IF NOT EXISTS posts_by_author ON posts (author, created_key DESC, post_id DESC);
+CREATE TABLE IF NOT EXISTS revisions (
+    post_id TEXT NOT NULL,
+    revision_id INTEGER NOT NULL,
+    entry TEXT NOT NULL,
+    is_content INTEGER NOT NULL,
+    PRIMARY KEY (post_id, revision_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS chunks (
+    digest TEXT PRIMARY KEY,
+    text TEXT NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS snapshot_chunks (
+    post_id TEXT NOT NULL,
+    revision_id INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    digest TEXT NOT NULL,
+    leading_separator TEXT NOT NULL,
+    trailing_separator TEXT NOT NULL,
+    PRIMARY KEY (post_id, revision_id, position)
+) WITHOUT ROWID;
+CREATE VIRTUAL TABLE IF NOT EXISTS posts_fts USING fts5(
+    title, content, content='posts', content_rowid='rowid'
+);
+CREATE TRIGGER IF NOT EXISTS posts_fts_insert AFTER INSERT ON posts BEGIN
+    INSERT INTO posts_fts (rowid, title, content) VALUES (new.rowid, new.title, new.content);
+END;
+CREATE TRIGGER IF NOT EXISTS posts_fts_update AFTER UPDATE OF title, content ON posts BEGIN
+    INSERT INTO posts_fts (posts_fts, rowid, title, content)
+    VALUES ('delete', old.rowid, old.title, old.content);
+    INSERT INTO posts_fts (rowid, title, content) VALUES (new.rowid, new.title, new.content);
+END;
+"""
+
+_META_COLUMNS = "post_id, title, author, created_at, status"
+
+
+def database_path(posts_root: Path) -> Path:
+    return posts_root / STORE_DIR_NAME / DATABASE_NAME
+
+
+def _dump_state(state: PostDerivedState) -> str:
+    return json.dumps(
+        {
+            "title": state.title,
+            "author": state.author,
+            "content_ref": state.content_ref,
+            "revision_id": state.revision_id,
+        }
+    )
+
+
+class SqlitePostStore:
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        (self.path.parent / LOCKS_DIR_NAME).mkdir(exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            indexed = conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'posts_fts'").fetchone()
+            conn.executescript(_SCHEMA)
+            if indexed is None:
+                # Databases from before the search table: index the posts already there.
+                conn.execute("INSERT INTO posts_fts (posts_fts) VALUES ('rebuild')")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    @contextmanager
+    def _read(self) -> Iterator[sqlite3.Connection]:
+        with closing(self._connect()) as conn:
+            yield conn
+
+    @contextmanager
+    def _write(self) -> Iterator[sqlite3.Connection]:
+        with closing(self._connect()) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    def _require_post(self, conn: sqlite3.Connection, post_id: str, columns: str) -> tuple:
+        row = conn.execute(f"SELECT {columns} FROM posts WHERE post_id = ?", (post_id,)).fetchone()
+        if row is None:
+            raise FileNotFoundError(f"Post not found: {post_id}")
+        return row
+
+    def create_post(self, *, title: str | None, author: str, intent: dict, content: str) -> str:
+        timestamp = datetime.now(timezone.utc).replace(microsecond=0)
+        post_id = new_post_id(timestamp)
+        state = PostDerivedState(
+            post_id=post_id,
+            title=title,
+            author=author,
+            status="draft",
+            content_ref=text_digest(content),
+            revision_id=0,
+        )
+        with self._write() as conn:
+            conn.execute(
+                """
+                INSERT INTO posts (
+                    post_id, title, author, created_at, created_key, status, intent, content, state
+                )
+                VALUES (?, ?, ?, ?, ?, 'draft', ?, ?, ?)
+                """,
+                (
+                    post_id,
+                    title,
+                    author,
+                    timestamp.isoformat(),
+                    post_index.created_key(timestamp),
+                    json.dumps(intent),
+                    content,
+                    _dump_state(state),
+                ),
+            )
+        return post_id
+
+    def read_post_meta(self, post_id: str) -> BlogPostMeta:
+        with self._read() as conn:
+            row = self._require_post(conn, post_id, _META_COLUMNS)
+        return post_index.row_to_meta(row)
+
+    def read_post_content(self, post_id: str) -> str:
+        with self._read() as conn:
+            return self._require_post(conn, post_id, "content")[0]
+
+    def read_post_intent(self, post_id: str) -> dict:
+        with self._read() as conn:
+            return json.loads(self._require_post(conn, post_id, "intent")[0])
+
+    def load_post_bundle(self, post_id: str, parts: Iterable[PostPart] = ("content",)) -> PostBundle:
+        requested = set(parts)
+        with self._read() as conn:
+            row = self._require_post(conn, post_id, f"{_META_COLUMNS}, content, intent, last_revision_id")
+        bundle = PostBundle(meta=post_index.row_to_meta(row))
+        content, intent, last_revision_id = row[5:]
+        if "content" in requested:
+            bundle.content = content
+        if "intent" in requested:
+            bundle.intent = json.loads(intent)
+        if "revisions" in requested:
+            bundle.revisions = self.read_revision_metadata(post_id, include_rejected=False)
+        if "revisions" in requested or "last_revision_id" in requested:
+            bundle.last_revision_id = last_revision_id or None
+        return bundle
+
+    def write_post_content(self, post_id: str, content: str) -> None:
+        with self._write() as conn:
+            self._require_post(conn, post_id, "post_id")
+            conn.execute("UPDATE posts SET content = ? WHERE post_id = ?", (content, post_id))
+
+    def update_post_status(self, post_id: str, new_status: str) -> PostStatus:
+        resolved_status = require_post_status(new_status, field="new status")
+        with self._write() as conn:
+            (current_status,) = self._require_post(conn, post_id, "status")
+            validate_status_transition(current_status, resolved_status)
+            conn.execute("UPDATE posts SET status = ? WHERE post_id = ?", (resolved_status, post_id))
+        return resolved_status
+
+    def apply_blog_update(
+        self,
+        *,
+        post_id: str,
+        new_content: str,
+        delta_type: str,
+        source: Literal["policy", "manual", "future"],
+        parent_revision_id: int | None,
+        delta_payload: dict,
+        actor: Any,
+        status: str = "applied",
+        reason: str | None = None,
+        meta_updates: dict | None = None,
+        expected_last_revision_id: int | None = None,
+    ) -> RevisionResult:
+        with self._write() as conn:
+            last_revision_id, state_json = self._require_post(conn, post_id, "last_revision_id, state")
+            if expected_last_revision_id is not None and last_revision_id != expected_last_revision_id:
+                raise RevisionConflictError(
+                    f"Post {post_id} is at revision {last_revision_id}, expected {expected_last_revision_id}"
+                )
+            next_revision_id = last_revision_id + 1
+            resolved_parent_revision_id = (
+                last_revision_id if parent_revision_id is None and last_revision_id else parent_revision_id
+            )
+            if resolved_parent_revision_id is not None:
+                exists = conn.execute(
+                    "SELECT 1 FROM revisions WHERE post_id = ? AND revision_id = ?",
+                    (post_id, resolved_parent_revision_id),
+                ).fetchone()
+                if exists is None:
+                    raise ValueError(f"Invalid parent_revision_id for post {post_id}")
+            revision_entry: dict[str, Any] = {
+                "revision_id": next_revision_id,
+                "parent_revision_id": resolved_parent_revision_id,
+                "timestamp": datetime.now(timezone.utc).replace(microsecond=0).isoformat(),
+                "delta_type": delta_type,
+                "delta_payload": dict(delta_payload),
+                "actor": actor,
+                "status": status,
+                "source": source,
+            }
+            if reason is not None:
+                revision_entry["reason"] = reason
+            is_content = is_applied_content_revision(revision_entry)
+            if is_content and (not isinstance(new_content, str) or not new_content):
+                raise ValueError(f"Applied content delta requires non-empty content for post {post_id}")
+
+            state = PostDerivedState(post_id=post_id, status="draft", **json.loads(state_json))
+            state = state.apply_delta(revision_entry)
+            conn.execute(
+                "INSERT INTO revisions (post_id, revision_id, entry, is_content) VALUES (?, ?, ?, ?)",
+                (post_id, next_revision_id, json.dumps(revision_entry), int(is_content)),
+            )
+            conn.execute(
+                "UPDATE posts SET last_revision_id = ?, state = ? WHERE post_id = ?",
+                (next_revision_id, _dump_state(state), post_id),
+            )
+            if meta_updates and status == "applied":
+                for field in ("title", "author"):
+                    if field in meta_updates:
+                        conn.execute(
+                            f"UPDATE posts SET {field} = ? WHERE post_id = ?",
+                            (meta_updates[field], post_id),
+                        )
+            if is_content:
+                self._write_snapshot(conn, post_id, next_revision_id, split_markdown(new_content))
+                conn.execute("UPDATE posts SET content = ? WHERE post_id = ?", (new_content, post_id))
+        return RevisionResult(
+            revision_id=next_revision_id,
+            parent_revision_id=resolved_parent_revision_id,
+        )
+
+    def _write_snapshot(
+        self,
+        conn: sqlite3.Connection,
+        post_id: str,
+        revision_id: int,
+        chunks: list[Chunk],
+    ) -> None:
+        rows = []
+        for position, chunk in enumerate(chunks):
+            digest = text_digest(chunk.text)
+            conn.execute(
+                "INSERT OR IGNORE INTO chunks (digest, text) VALUES (?, ?)",
+                (digest, chunk.text),
+            )
+            rows.append(
+                (post_id, revision_id, position, digest, chunk.leading_separator, chunk.trailing_separator)
+            )
+        conn.executemany("INSERT INTO snapshot_chunks VALUES (?, ?, ?, ?, ?, ?)", rows)
+
+    def list_posts_page(
+        self,
+        *,
+        visibility: Literal["public", "editor"],
+        status: PostStatus | None = None,
+        author: str | None = None,
+        cursor: str | None = None,
+        limit: int = 50,
+    ) -> PostPage:
+        statuses = page_statuses(visibility, status)
+        if limit < 1:
+            raise ValueError("limit must be at least 1")
+        after = post_index.decode_cursor(cursor) if cursor else None
+        statement = post_index.posts_query(
+            statuses=statuses,
+            author=author,
+            after=after,
+            limit=limit + 1,
+        )
+        if statement is None:
+            return PostPage(posts=[], next_cursor=None)
+        with self._read() as conn:
+            rows = conn.execute(*statement).fetchall()
+        page = rows[:limit]
+        next_cursor = post_index.encode_cursor(page[-1][5], page[-1][0]) if len(rows) > limit else None
+        return PostPage(posts=[post_index.row_to_meta(row) for row in page], next_cursor=next_cursor)
+
+    def search_posts(self, query: str, *, limit: int = 20) -> list[tuple[BlogPostMeta, float]]:
+        """Published posts matching any query term and every quoted phrase, best BM25 first."""
+        if limit < 1:
+            raise ValueError("limit must be at least 1")
+        terms, phrases = search_index.parse_query(query)
+        if not terms:
+            return []
+        expression = "(" + " OR ".join(f'"{term}"' for term in terms) + ")"
+        expression += "".join(f' AND "{" ".join(phrase)}"' for phrase in phrases)
+        with self._read() as conn:
+            rows = conn.execute(
+                """
+                SELECT posts.post_id, posts.title, posts.author, posts.created_at, posts.status,
+                       -bm25(posts_fts) AS score
+                FROM posts_fts JOIN posts ON posts.rowid = posts_fts.rowid
+                WHERE posts_fts MATCH ? AND posts.status = 'published'
+                ORDER BY score DESC, posts.post_id
+                LIMIT ?
+                """,
+                (expression, limit),
+            ).fetchall()
+        return [(post_index.row_to_meta(row), row[5]) for row in rows]
+
+    def read_revision_metadata(self, post_id: str, *, include_rejected: bool = True) -> list[dict]:
+        with self._read() as conn:
+            self._require_post(conn, post_id, "post_id")
+            rows = conn.execute(
+                "SELECT entry FROM revisions WHERE post_id = ? ORDER BY revision_id",
+                (post_id,),
+            ).fetchall()
+        entries = [json.loads(entry) for (entry,) in rows]
+        if include_rejected:
+            return entries
+        return [entry for entry in entries if entry.get("status") != "rejected"]
+
+    def read_revision_entry(self, post_id: str, revision_id: int) -> dict | None:
+        with self._read() as conn:
+            self._require_post(conn, post_id, "post_id")
+            row = conn.execute(
+                "SELECT entry FROM revisions WHERE post_id = ? AND revision_id = ?",
+                (post_id, revision_id),
+            ).fetchone()
+        return None if row is None else json.loads(row[0])
+
+    def read_last_revision_id(self, post_id: str) -> int | None:
+        with self._read() as conn:
+            return self._require_post(conn, post_id, "last_revision_id")[0] or None
+
+    def read_revision_content(self, post_id: str, revision_id: int) -> str:
+        with self._read() as conn:
+            self._require_post(conn, post_id, "post_id")
+            exists = conn.execute(
+                "SELECT 1 FROM revisions WHERE post_id = ? AND revision_id = ?",
+                (post_id, revision_id),
+            ).fetchone()
+            if exists is None:
+                raise FileNotFoundError(f"Revision {revision_id} not found for post {post_id}")
+            row = conn.execute(
+                """
+                SELECT revision_id FROM revisions
+                WHERE post_id = ? AND revision_id <= ? AND is_content = 1
+                ORDER BY revision_id DESC LIMIT 1
+                """,
+                (post_id, revision_id),
+            ).fetchone()
+            if row is None:
+                raise FileNotFoundError(
+                    f"No content snapshots available for revision {revision_id} in post {post_id}"
+                )
+            rows = conn.execute(
+                """
+                SELECT snapshot_chunks.position, chunks.text,
+                       snapshot_chunks.leading_separator, snapshot_chunks.trailing_separator
+                FROM snapshot_chunks JOIN chunks USING (digest)
+                WHERE snapshot_chunks.post_id = ? AND snapshot_chunks.revision_id = ?
+                ORDER BY snapshot_chunks.position
+                """,
+                (post_id, row[0]),
+            ).fetchall()
+        return join_chunks(
+            [
+                Chunk(index=index, text=text, leading_separator=leading, trailing_separator=trailing)
+                for index, text, leading, trailing in rows
+            ]
+        )
+
+    def read_content_chunks(self, post_id: str, *, offset: int = 0, limit: int = 50) -> ContentChunkWindow:
+        with self._read() as conn:
+            content, last_revision_id = self._require_post(conn, post_id, "content, last_revision_id")
+        return content_chunk_window(content, offset=offset, limit=limit, revision_id=last_revision_id or None)
+
+    def diff_revisions(self, post_id: str, from_revision_id: int, to_revision_id: int) -> Iterator[dict]:
+        before = chunk_entries(split_markdown(self.read_revision_content(post_id, from_revision_id)))
+        after = chunk_entries(split_markdown(self.read_revision_content(post_id, to_revision_id)))
+        return revision_diff.iter_revision_diff(
+            None,
+            before,
+            after,
+            from_revision_id=from_revision_id,
+            to_revision_id=to_revision_id,
+        )
+
+    def read_derived_state(self, post_id: str) -> PostDerivedState:
+        with self._read() as conn:
+            status, state_json = self._require_post(conn, post_id, "status, state")
+        return PostDerivedState(post_id=post_id, status=status, **json.loads(state_json))
+
+    def lock(self, post_id: str) -> AbstractContextManager[None]:
+        lock_path = self.path.parent / LOCKS_DIR_NAME / f"{post_id}.lock"
+        return post_locks.lock(f"{self.path}:{post_id}", lock_path)
@@ -0,0 +1,105 @@
+"""Checkpointed PostDerivedState.
+
+The derived state of a post is materialized in state_checkpoint.json
+together with the last revision id folded into it. Loading the current
+state replays only the revisions after that id; when that tail grows to
+CHECKPOINT_INTERVAL entries a fresh checkpoint is written.
+
+Status is not recorded as revisions; it is always taken from meta.yaml.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import secrets
+from dataclasses import asdict, replace
+from pathlib import Path
+
+from apps.blog import post_layout, revision_log
+from apps.blog.hashing import text_digest
+from apps.blog.post_cache import post_cache
+from apps.blog.post_index import load_meta_file
+from apps.blog.post_state import PostDerivedState
+from apps.blog.types import BlogPostMeta
+
+CHECKPOINT_NAME = "state_checkpoint.json"
+CHECKPOINT_INTERVAL = 64
+
+
+def checkpoint_path(post_dir: Path) -> Path:
+    return post_dir / CHECKPOINT_NAME
+
+
+def write_checkpoint(post_dir: Path, state: PostDerivedState, through_revision_id: int) -> None:
+    payload = {"through_revision_id": through_revision_id, "state": asdict(state)}
+    path = checkpoint_path(post_dir)
+    temp_path = path.with_name(f".{path.name}.{secrets.token_hex(4)}.tmp")
+    temp_path.write_text(json.dumps(payload))
+    os.replace(temp_path, path)
+
+
+def read_checkpoint(post_dir: Path) -> tuple[PostDerivedState, int] | None:
+    path = checkpoint_path(post_dir)
+    if not path.exists():
+        return None
+    payload = json.loads(path.read_text())
+    return PostDerivedState(**payload["state"]), payload["through_revision_id"]
+
+
+def write_genesis_checkpoint(post_dir: Path, meta: BlogPostMeta, content: str) -> None:
+    state = PostDerivedState(
+        post_id=meta.post_id,
+        title=meta.title,
+        author=meta.author,
+        status=meta.status,
+        content_ref=text_digest(content),
+        revision_id=0,
+    )
+    write_checkpoint(post_dir, state, 0)
+
+
+def load_derived_state(
+    post_id: str,
+    posts_root: Path,
+    *,
+    interval: int = CHECKPOINT_INTERVAL,
+) -> PostDerivedState:
+    post_dir = post_layout.post_dir(posts_root, post_id)
+    meta_path = post_dir / "meta.yaml"
+    if not meta_path.exists():
+        raise FileNotFoundError(f"meta.yaml not found for post {post_id}")
+    meta = post_cache.get(meta_path, load_meta_file)
+
+    checkpoint = read_checkpoint(post_dir)
+    if checkpoint is None:
+        # Posts created before checkpoints: title/author deltas replay onto current meta.
+        state = PostDerivedState(
+            post_id=post_id,
+            title=meta.title,
+            author=meta.author,
+            status=meta.status,
+            content_ref=None,
+            revision_id=0,
+        )
+        through_revision_id = 0
+    else:
+        state, through_revision_id = checkpoint
+
+    replayed = 0
+    for entry in revision_log.iter_revisions_after(post_dir, through_revision_id):
+        state = state.apply_delta(entry)
+        through_revision_id = entry["revision_id"]
+        replayed += 1
+
+    if state.content_ref is None:
+        content_path = post_dir / "content.md"
+        if content_path.exists():
+            state = replace(state, content_ref=text_digest(post_cache.get(content_path, Path.read_text)))
+    if checkpoint is None or replayed >= interval:
+        # Readers race each other and writers here; never replace a newer checkpoint.
+        with post_layout.locked_post_dir(posts_root, post_id) as locked_dir:
+            current = read_checkpoint(locked_dir)
+            if current is None or current[1] < through_revision_id:
+                write_checkpoint(locked_dir, state, through_revision_id)
+    return replace(state, status=meta.status)
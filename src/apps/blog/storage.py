@@ -1,15 +1,28 @@
+from contextlib import contextmanager
 from dataclasses import dataclass
 from datetime import datetime, timezone
-import copy
-import hashlib
 import os
 import secrets
 from pathlib import Path
-from typing import Any, Literal
+from typing import Any, Iterable, Iterator, Literal
 
 import yaml
 
+from apps.blog import (
+    chunk_blocks,
+    chunk_store,
+    post_index,
+    post_layout,
+    revision_log,
+    revision_diff,
+    revision_pack,
+    search_index,
+    state_checkpoint,
+)
+from apps.blog.chunk_diff import chunk_hash
+from apps.blog.hashing import file_digest, text_digest
 from apps.blog.paths import POSTS_ROOT
+from apps.blog.post_cache import post_cache
 from apps.blog.types import (
     BlogPostMeta,
     PostStatus,
@@ -20,14 +33,84 @@ from apps.blog.types import (
 from document_writer.domain.editor.chunking import Chunk, join_chunks, split_markdown
 
 
+CONTENT_DELTA_TYPES = (
+    "content_chunks_modified",
+    "content_free_edit",
+    "content_policy_edit",
+    "revert",
+)
+
+
 @dataclass
 class RevisionResult:
     revision_id: int
     parent_revision_id: int | None
 
 
-def _hash_file(path: Path) -> str:
-    return hashlib.sha256(path.read_bytes()).hexdigest()
+@dataclass
+class PostPage:
+    posts: list[BlogPostMeta]
+    next_cursor: str | None
+
+
+@dataclass
+class ContentChunkWindow:
+    chunks: list[dict]
+    total: int
+    # The content the window was cut from; a reader paging through compares these.
+    revision_id: int | None
+    content_hash: str
+    # Markdown to render for each block starting in the window, keyed by chunk index.
+    blocks: dict[int, str]
+
+
+class RevisionConflictError(ValueError):
+    """The post's last revision is not the one the writer based its change on."""
+
+
+PostPart = Literal["content", "intent", "revisions", "last_revision_id"]
+
+
+@dataclass
+class PostBundle:
+    meta: BlogPostMeta
+    content: str | None = None
+    intent: dict | None = None
+    revisions: list[dict] | None = None
+    last_revision_id: int | None = None
+
+
+def is_applied_content_revision(entry: dict) -> bool:
+    return entry.get("status") == "applied" and entry.get("delta_type") in CONTENT_DELTA_TYPES
+
+
+def _ensure_revision_log(post_dir: Path, post_id: str) -> None:
+    # Older posts kept revisions inline in meta.yaml; move them into the log once.
+    if revision_log.has_log(post_dir):
+        return
+    meta_path = post_dir / "meta.yaml"
+    if not meta_path.exists():
+        raise FileNotFoundError(f"meta.yaml not found for post {post_id}")
+    meta_payload = yaml.safe_load(meta_path.read_text()) or {}
+    if not isinstance(meta_payload, dict):
+        raise ValueError(f"Invalid meta.yaml for post {post_id}")
+    revisions = meta_payload.get("revisions")
+    if revisions is None:
+        revisions = []
+    elif not isinstance(revisions, list):
+        raise ValueError(f"Invalid revisions for post {post_id}")
+    for entry in revisions:
+        if not isinstance(entry, dict):
+            raise ValueError(f"Invalid revision entry for post {post_id}")
+        if not isinstance(entry.get("revision_id"), int):
+            raise ValueError(f"Invalid revision_id for post {post_id}")
+    revision_log.create_log(post_dir, revisions)
+    revision_log.split_rejected(post_dir)
+    if "revisions" in meta_payload:
+        del meta_payload["revisions"]
+        temp_path = meta_path.with_suffix(".yaml.tmp")
+        temp_path.write_text(yaml.safe_dump(meta_payload, sort_keys=False, default_flow_style=False))
+        os.replace(temp_path, meta_path)
 
 
 def create_post(
@@ -44,12 +127,10 @@ def create_post(
     Returns (post_id, absolute_path).
     """
     timestamp = datetime.now(timezone.utc).replace(microsecond=0)
-    ts_str = timestamp.strftime("%Y-%m-%dT%H-%M-%SZ")
-    suffix = secrets.token_hex(3)
-    post_id = f"{ts_str}__{suffix}"
+    post_id = new_post_id(timestamp)
 
     resolved_root = Path(posts_root) if posts_root is not None else POSTS_ROOT
-    post_dir = resolved_root / post_id
+    post_dir = post_layout.new_post_dir(resolved_root, post_id)
     if post_dir.exists():
         raise FileExistsError(f"Post directory already exists: {post_dir}")
 
@@ -70,55 +151,163 @@ def create_post(
     meta_path.write_text(yaml.safe_dump(meta.model_dump(), sort_keys=False, default_flow_style=False))
     intent_path.write_text(yaml.safe_dump(intent, sort_keys=False, default_flow_style=False))
     content_path.write_text(content)
+    revision_log.create_log(post_dir)
+    post_index.upsert_post(resolved_root, meta)
+    state_checkpoint.write_genesis_checkpoint(post_dir, meta, content)
+    post_cache.remember(meta_path, meta)
+    post_cache.remember(intent_path, intent)
+    post_cache.remember(content_path, content)
 
     return post_id, str(post_dir.resolve())
 
 
+def new_post_id(timestamp: datetime) -> str:
+    ts_str = timestamp.strftime("%Y-%m-%dT%H-%M-%SZ")
+    suffix = secrets.token_hex(3)
+    return f"{ts_str}__{suffix}"
+
+
 def list_posts(*, visibility: Literal["public", "editor"]) -> list[BlogPostMeta]:
     if visibility not in ("public", "editor"):
         raise ValueError("visibility must be 'public' or 'editor'")
-    posts: list[BlogPostMeta] = []
     if not POSTS_ROOT.exists() or not POSTS_ROOT.is_dir():
         return []
-    for entry in POSTS_ROOT.iterdir():
-        if not entry.is_dir():
-            continue
-        meta_path = entry / "meta.yaml"
-        if not meta_path.exists():
-            continue
-        try:
-            meta_data = yaml.safe_load(meta_path.read_text())
-            if isinstance(meta_data, dict) and meta_data.get("status") is None:
-                meta_data["status"] = "draft"
-            meta = BlogPostMeta.model_validate(meta_data)
-        except Exception:
-            continue
-        if visibility == "public" and meta.status != "published":
-            continue
-        posts.append(meta)
-    posts.sort(key=lambda m: m.created_at, reverse=True)
-    return posts
+    statuses = ("published",) if visibility == "public" else None
+    return post_index.list_indexed_posts(POSTS_ROOT, statuses=statuses)
+
+
+def list_posts_page(
+    *,
+    visibility: Literal["public", "editor"],
+    status: PostStatus | None = None,
+    author: str | None = None,
+    cursor: str | None = None,
+    limit: int = 50,
+    posts_root: str | Path | None = None,
+) -> PostPage:
+    """Keyset-paginated listing on (created_at, post_id), newest first."""
+    statuses = page_statuses(visibility, status)
+    if limit < 1:
+        raise ValueError("limit must be at least 1")
+    after = post_index.decode_cursor(cursor) if cursor else None
+    resolved_root = Path(posts_root) if posts_root is not None else POSTS_ROOT
+    if not resolved_root.exists() or not resolved_root.is_dir():
+        return PostPage(posts=[], next_cursor=None)
+    rows = post_index.query_posts(
+        resolved_root,
+        statuses=statuses,
+        author=author,
+        after=after,
+        limit=limit + 1,
+    )
+    page = rows[:limit]
+    next_cursor = page[-1][1] if len(rows) > limit else None
+    return PostPage(posts=[meta for meta, _cursor in page], next_cursor=next_cursor)
 
 
-def read_post_meta(post_id: str) -> BlogPostMeta:
-    post_dir = POSTS_ROOT / post_id
+def search_posts(
+    query: str,
+    *,
+    limit: int = 20,
+    posts_root: str | Path | None = None,
+) -> list[tuple[BlogPostMeta, float]]:
+    """Published posts matching query with their scores, best first."""
+    resolved_root = Path(posts_root) if posts_root is not None else POSTS_ROOT
+    # Hits can be stale; over-fetch so filtering them out still fills the limit.
+    fetch = limit * 2
+    while True:
+        hits = search_index.search(resolved_root, query, limit=fetch)
+        results: list[tuple[BlogPostMeta, float]] = []
+        for hit in hits:
+            try:
+                meta = read_post_meta(hit.post_id, resolved_root)
+            except FileNotFoundError:
+                continue
+            if meta.status == "published":
+                results.append((meta, hit.score))
+                if len(results) == limit:
+                    return results
+        if len(hits) < fetch:
+            return results
+        fetch *= 2
+
+
+def page_statuses(
+    visibility: Literal["public", "editor"],
+    status: PostStatus | None = None,
+) -> list[str] | None:
+    """Statuses a listing may show; None means any."""
+    if visibility not in ("public", "editor"):
+        raise ValueError("visibility must be 'public' or 'editor'")
+    if visibility == "public":
+        return ["published"] if status in (None, "published") else []
+    return [status] if status is not None else None
+
+
+def read_post_meta(post_id: str, posts_root: str | Path | None = None) -> BlogPostMeta:
+    resolved_root = Path(posts_root) if posts_root is not None else POSTS_ROOT
+    post_dir = post_layout.post_dir(resolved_root, post_id)
     meta_path = post_dir / "meta.yaml"
     if not meta_path.exists():
         raise FileNotFoundError(f"meta.yaml not found for post {post_id}")
     try:
-        meta_data = yaml.safe_load(meta_path.read_text())
-        if isinstance(meta_data, dict) and meta_data.get("status") is None:
-            meta_data["status"] = "draft"
-        return BlogPostMeta.model_validate(meta_data)
+        return post_cache.get(meta_path, post_index.load_meta_file)
     except Exception as exc:
         raise ValueError(f"Invalid meta.yaml for post {post_id}: {exc}") from exc
 
 
-def update_post_status(post_id: str, new_status: str) -> PostStatus:
-    post_dir = POSTS_ROOT / post_id
+def load_post_bundle(
+    post_id: str,
+    parts: Iterable[PostPart] = ("content",),
+    posts_root: str | Path | None = None,
+) -> PostBundle:
+    """Load meta plus the requested parts, reading each file at most once.
+
+    A missing intent.yaml yields an empty intent. last_revision_id is read
+    from the revision log whenever revisions or last_revision_id are requested.
+    """
+    requested = set(parts)
+    resolved_root = Path(posts_root) if posts_root is not None else POSTS_ROOT
+    post_dir = post_layout.post_dir(resolved_root, post_id)
+    bundle = PostBundle(meta=read_post_meta(post_id, resolved_root))
+    if "content" in requested:
+        bundle.content = read_post_content(post_id, resolved_root)
+    if "intent" in requested:
+        intent_path = post_dir / "intent.yaml"
+        if intent_path.exists():
+            bundle.intent = read_post_intent(post_id, resolved_root)
+        else:
+            bundle.intent = {}
+    if "revisions" in requested:
+        bundle.revisions = read_revision_metadata(post_id, resolved_root)
+    if "revisions" in requested or "last_revision_id" in requested:
+        # Rejected revisions take ids too, so the last one may not be in the applied list.
+        bundle.last_revision_id = read_last_revision_id(post_id, resolved_root)
+    return bundle
+
+
+def update_post_status(
+    post_id: str,
+    new_status: str,
+    posts_root: str | Path | None = None,
+) -> PostStatus:
+    resolved_root = Path(posts_root) if posts_root is not None else POSTS_ROOT
+    post_dir = post_layout.post_dir(resolved_root, post_id)
     meta_path = post_dir / "meta.yaml"
     if not meta_path.exists():
         raise FileNotFoundError(f"meta.yaml not found for post {post_id}")
+    with post_layout.locked_post_dir(resolved_root, post_id) as post_dir:
+        return _update_post_status_locked(post_id, post_dir, new_status, resolved_root)
+
+
+def _update_post_status_locked(
+    post_id: str,
+    post_dir: Path,
+    new_status: str,
+    resolved_root: Path,
+) -> PostStatus:
+    meta_path = post_dir / "meta.yaml"
+    _ensure_revision_log(post_dir, post_id)
     meta_payload = yaml.safe_load(meta_path.read_text()) or {}
     if not isinstance(meta_payload, dict):
         raise ValueError(f"Invalid meta.yaml for post {post_id}")
@@ -130,13 +319,15 @@ def update_post_status(post_id: str, new_status: str) -> PostStatus:
     intent_path = post_dir / "intent.yaml"
     if not intent_path.exists():
         raise FileNotFoundError(f"intent.yaml not found for post {post_id}")
-    intent_hash = _hash_file(intent_path)
+    intent_hash = file_digest(intent_path)
 
     content_path = post_dir / "content.md"
     content_exists = content_path.exists()
-    content_hash = _hash_file(content_path) if content_exists else None
+    content_hash = file_digest(content_path) if content_exists else None
 
-    revisions_before = copy.deepcopy(meta_payload.get("revisions"))
+    log_path = revision_log.log_path(post_dir)
+    log_stat = log_path.stat()
+    revisions_before = (log_stat.st_size, log_stat.st_mtime_ns)
 
     meta_payload["status"] = resolved_status
     temp_path = meta_path.with_suffix(".yaml.tmp")
@@ -149,21 +340,26 @@ def update_post_status(post_id: str, new_status: str) -> PostStatus:
     persisted_status = reloaded.get("status")
     if persisted_status != resolved_status:
         raise ValueError(f"Failed to persist status update for post {post_id}")
-    if reloaded.get("revisions") != revisions_before:
+    log_stat = log_path.stat()
+    if (log_stat.st_size, log_stat.st_mtime_ns) != revisions_before:
         raise ValueError("Status update must not modify revisions metadata")
 
     if content_exists:
         if not content_path.exists():
             raise ValueError("Status update must not remove content")
-        if _hash_file(content_path) != content_hash:
+        if file_digest(content_path) != content_hash:
             raise ValueError("Status update must not modify content")
     else:
         if content_path.exists():
             raise ValueError("Status update must not create content")
 
-    if _hash_file(intent_path) != intent_hash:
+    if file_digest(intent_path) != intent_hash:
         raise ValueError("Status update must not modify intent")
 
+    updated_meta = post_index.load_meta_file(meta_path)
+    post_index.upsert_post(resolved_root, updated_meta)
+    post_cache.remember(meta_path, updated_meta)
+    search_index.mark_dirty(resolved_root, post_id)
     return resolved_status
 
 
@@ -176,17 +372,20 @@ def set_post_status(post_id: str, target_status: PostStatus) -> tuple[PostStatus
 
 def read_post_content(post_id: str, posts_root: str | Path | None = None) -> str:
     resolved_root = Path(posts_root) if posts_root is not None else POSTS_ROOT
-    post_dir = resolved_root / post_id
+    post_dir = post_layout.post_dir(resolved_root, post_id)
     content_path = post_dir / "content.md"
     if not content_path.exists():
         return _replay_post_content(post_id, resolved_root)
-    return content_path.read_text()
+    return post_cache.get(content_path, Path.read_text)
 
 
-def write_post_content(post_id: str, content: str) -> None:
-    post_dir = POSTS_ROOT / post_id
-    content_path = post_dir / "content.md"
-    content_path.write_text(content)
+def write_post_content(post_id: str, content: str, posts_root: str | Path | None = None) -> None:
+    resolved_root = Path(posts_root) if posts_root is not None else POSTS_ROOT
+    with post_layout.locked_post_dir(resolved_root, post_id) as post_dir:
+        content_path = post_dir / "content.md"
+        content_path.write_text(content)
+        post_cache.remember(content_path, content)
+        search_index.mark_dirty(resolved_root, post_id)
 
 
 def write_revision_snapshots(
@@ -195,15 +394,19 @@ def write_revision_snapshots(
     snapshot_chunks: list[dict],
     posts_root: str | Path | None = None,
 ) -> None:
-    # Snapshots are artifacts; revision history is authoritative in meta.yaml.
+    # Snapshots are artifacts; revision history is authoritative in the revision log.
     resolved_root = Path(posts_root) if posts_root is not None else POSTS_ROOT
-    revisions_dir = resolved_root / post_id / "revisions"
-    revisions_dir.mkdir(parents=True, exist_ok=True)
-    for snapshot in snapshot_chunks:
-        index = snapshot["index"]
-        text = snapshot["text"]
-        snapshot_path = revisions_dir / f"{revision_id}_{index}.md"
-        snapshot_path.write_text(text)
+    chunks = [
+        Chunk(
+            index=snapshot["index"],
+            text=snapshot["text"],
+            leading_separator=snapshot.get("leading_separator", ""),
+            trailing_separator=snapshot.get("trailing_separator", ""),
+        )
+        for snapshot in sorted(snapshot_chunks, key=lambda item: item["index"])
+    ]
+    post_dir = post_layout.post_dir(resolved_root, post_id)
+    chunk_store.write_manifest(resolved_root, post_dir, revision_id, chunks)
 
 
 def apply_blog_update(
@@ -219,98 +422,136 @@ def apply_blog_update(
     reason: str | None = None,
     meta_updates: dict | None = None,
     posts_root: str | Path | None = None,
+    expected_last_revision_id: int | None = None,
 ) -> RevisionResult:
     # A “revert” never changes history.
     # It creates a new revision whose content equals a previous revision.
     resolved_root = Path(posts_root) if posts_root is not None else POSTS_ROOT
-    post_dir = resolved_root / post_id
+    post_dir = post_layout.post_dir(resolved_root, post_id)
     meta_path = post_dir / "meta.yaml"
     if not meta_path.exists():
         raise FileNotFoundError(f"meta.yaml not found for post {post_id}")
-    meta_payload = yaml.safe_load(meta_path.read_text()) or {}
-    if not isinstance(meta_payload, dict):
-        raise ValueError(f"Invalid meta.yaml for post {post_id}")
-    revisions = meta_payload.get("revisions")
-    if revisions is None:
-        revisions = []
-    elif not isinstance(revisions, list):
-        raise ValueError(f"Invalid revisions for post {post_id}")
-    existing_revision_ids: list[int] = []
-    for entry in revisions:
-        if not isinstance(entry, dict):
-            raise ValueError(f"Invalid revision entry for post {post_id}")
-        revision_id = entry.get("revision_id")
-        if not isinstance(revision_id, int):
-            raise ValueError(f"Invalid revision_id for post {post_id}")
-        existing_revision_ids.append(revision_id)
-    last_revision_id = max(existing_revision_ids, default=0)
-    next_revision_id = last_revision_id + 1
-    if next_revision_id <= last_revision_id:
-        raise ValueError(f"Revision id must increase for post {post_id}")
-    resolved_parent_revision_id = (
-        last_revision_id if parent_revision_id is None and last_revision_id else parent_revision_id
-    )
-    if (
-        resolved_parent_revision_id is not None
-        and resolved_parent_revision_id not in existing_revision_ids
-    ):
-        raise ValueError(f"Invalid parent_revision_id for post {post_id}")
-    if last_revision_id and resolved_parent_revision_id is None:
-        raise ValueError(f"Missing parent_revision_id for post {post_id}")
-    if resolved_parent_revision_id is not None and resolved_parent_revision_id >= next_revision_id:
-        raise ValueError(f"Invalid parent_revision_id order for post {post_id}")
-    revision_entry: dict[str, Any] = {
-        "revision_id": next_revision_id,
-        "parent_revision_id": resolved_parent_revision_id,
-        "timestamp": datetime.now(timezone.utc).replace(microsecond=0).isoformat(),
-        "delta_type": delta_type,
-        "delta_payload": dict(delta_payload),
-        "actor": actor,
-        "status": status,
-        "source": source,
-    }
-    if reason is not None:
-        revision_entry["reason"] = reason
-    revisions.append(revision_entry)
-    meta_payload["revisions"] = revisions
-    if revisions[-1].get("revision_id") != next_revision_id:
-        raise ValueError(f"Revision append mismatch for post {post_id}")
-    if meta_updates and status == "applied":
-        meta_payload.update(meta_updates)
-    temp_path = meta_path.with_suffix(".yaml.tmp")
-    temp_path.write_text(yaml.safe_dump(meta_payload, sort_keys=False, default_flow_style=False))
-    os.replace(temp_path, meta_path)
-    if status == "applied" and delta_type in (
-        "content_chunks_modified",
-        "content_free_edit",
-        "content_policy_edit",
-        "revert",
-    ):
-        if not isinstance(new_content, str) or not new_content:
-            raise ValueError(f"Applied content delta requires non-empty content for post {post_id}")
-        snapshot_chunks = [
-            {"index": chunk.index, "text": chunk.text}
-            for chunk in split_markdown(new_content)
-        ]
-        write_revision_snapshots(
-            post_id,
-            next_revision_id,
-            snapshot_chunks,
-            posts_root=resolved_root,
+    with post_layout.locked_post_dir(resolved_root, post_id) as post_dir:
+        meta_path = post_dir / "meta.yaml"
+        _ensure_revision_log(post_dir, post_id)
+        last_revision_id = revision_log.last_revision_id(post_dir)
+        if expected_last_revision_id is not None and last_revision_id != expected_last_revision_id:
+            raise RevisionConflictError(
+                f"Post {post_id} is at revision {last_revision_id}, expected {expected_last_revision_id}"
+            )
+        next_revision_id = last_revision_id + 1
+        resolved_parent_revision_id = (
+            last_revision_id if parent_revision_id is None and last_revision_id else parent_revision_id
         )
+        # The default parent is the last revision, which may be a rejected one
+        # in the cold log; only explicit parents need the lookup.
+        if parent_revision_id is not None and (
+            revision_log.read_revision(post_dir, parent_revision_id) is None
+        ):
+            raise ValueError(f"Invalid parent_revision_id for post {post_id}")
+        if last_revision_id and resolved_parent_revision_id is None:
+            raise ValueError(f"Missing parent_revision_id for post {post_id}")
+        if resolved_parent_revision_id is not None and resolved_parent_revision_id >= next_revision_id:
+            raise ValueError(f"Invalid parent_revision_id order for post {post_id}")
+        revision_entry: dict[str, Any] = {
+            "revision_id": next_revision_id,
+            "parent_revision_id": resolved_parent_revision_id,
+            "timestamp": datetime.now(timezone.utc).replace(microsecond=0).isoformat(),
+            "delta_type": delta_type,
+            "delta_payload": dict(delta_payload),
+            "actor": actor,
+            "status": status,
+            "source": source,
+        }
+        if reason is not None:
+            revision_entry["reason"] = reason
+        revision_log.append_revision(post_dir, revision_entry)
+        if meta_updates and status == "applied":
+            meta_payload = yaml.safe_load(meta_path.read_text()) or {}
+            if not isinstance(meta_payload, dict):
+                raise ValueError(f"Invalid meta.yaml for post {post_id}")
+            meta_payload.update(meta_updates)
+            temp_path = meta_path.with_suffix(".yaml.tmp")
+            temp_path.write_text(yaml.safe_dump(meta_payload, sort_keys=False, default_flow_style=False))
+            os.replace(temp_path, meta_path)
+            updated_meta = post_index.load_meta_file(meta_path)
+            post_index.upsert_post(resolved_root, updated_meta)
+            post_cache.remember(meta_path, updated_meta)
+            search_index.mark_dirty(resolved_root, post_id)
+        if is_applied_content_revision(revision_entry):
+            if not isinstance(new_content, str) or not new_content:
+                raise ValueError(f"Applied content delta requires non-empty content for post {post_id}")
+            snapshot_chunks = [
+                {
+                    "index": chunk.index,
+                    "text": chunk.text,
+                    "leading_separator": chunk.leading_separator,
+                    "trailing_separator": chunk.trailing_separator,
+                }
+                for chunk in split_markdown(new_content)
+            ]
+            write_revision_snapshots(
+                post_id,
+                next_revision_id,
+                snapshot_chunks,
+                posts_root=resolved_root,
+            )
     return RevisionResult(
         revision_id=next_revision_id,
         parent_revision_id=resolved_parent_revision_id,
     )
 
 
-def read_revision_metadata(post_id: str) -> list[dict]:
-    meta_path = POSTS_ROOT / post_id / "meta.yaml"
-    meta_payload = yaml.safe_load(meta_path.read_text()) or {}
-    revisions = meta_payload.get("revisions")
-    if revisions is None:
-        return []
-    return revisions
+@contextmanager
+def lock_post(post_id: str, posts_root: str | Path | None = None) -> Iterator[None]:
+    """Hold the post's write lock across a read-modify-write flow."""
+    resolved_root = Path(posts_root) if posts_root is not None else POSTS_ROOT
+    with post_layout.locked_post_dir(resolved_root, post_id):
+        yield
+
+
+def read_revision_metadata(
+    post_id: str,
+    posts_root: str | Path | None = None,
+    *,
+    include_rejected: bool = False,
+) -> list[dict]:
+    """The post's applied revisions in id order.
+
+    include_rejected merges in the cold log of rejected revisions, for
+    audits that need the full history.
+    """
+    resolved_root = Path(posts_root) if posts_root is not None else POSTS_ROOT
+    post_dir = post_layout.post_dir(resolved_root, post_id)
+    _ensure_revision_log(post_dir, post_id)
+    applied = post_cache.get(
+        revision_log.log_path(post_dir),
+        lambda _path: revision_log.read_revisions(post_dir),
+    )
+    if not include_rejected:
+        return applied
+    return revision_log.merge_history(applied, revision_log.read_rejected_revisions(post_dir))
+
+
+def ensure_revision_log(post_id: str, posts_root: str | Path | None = None) -> None:
+    resolved_root = Path(posts_root) if posts_root is not None else POSTS_ROOT
+    _ensure_revision_log(post_layout.post_dir(resolved_root, post_id), post_id)
+
+
+def read_revision_entry(
+    post_id: str, revision_id: int, posts_root: str | Path | None = None
+) -> dict | None:
+    resolved_root = Path(posts_root) if posts_root is not None else POSTS_ROOT
+    post_dir = post_layout.post_dir(resolved_root, post_id)
+    _ensure_revision_log(post_dir, post_id)
+    return revision_log.read_revision(post_dir, revision_id)
+
+
+def read_last_revision_id(post_id: str, posts_root: str | Path | None = None) -> int | None:
+    resolved_root = Path(posts_root) if posts_root is not None else POSTS_ROOT
+    post_dir = post_layout.post_dir(resolved_root, post_id)
+    _ensure_revision_log(post_dir, post_id)
+    return revision_log.last_revision_id(post_dir) or None
 
 
 def read_revision_content(
@@ -319,52 +560,209 @@ def read_revision_content(
     posts_root: str | Path | None = None,
 ) -> str:
     resolved_root = Path(posts_root) if posts_root is not None else POSTS_ROOT
-    post_dir = resolved_root / post_id
+    post_dir = post_layout.post_dir(resolved_root, post_id)
     meta_path = post_dir / "meta.yaml"
     if not meta_path.exists():
         raise FileNotFoundError(f"meta.yaml not found for post {post_id}")
-    meta_payload = yaml.safe_load(meta_path.read_text()) or {}
-    if not isinstance(meta_payload, dict):
-        raise ValueError(f"Invalid meta.yaml for post {post_id}")
-    revisions = meta_payload.get("revisions")
-    if not isinstance(revisions, list):
-        raise ValueError(f"Invalid revisions for post {post_id}")
-    revision_ids: set[int] = set()
-    content_revision_id: int | None = None
-    for entry in revisions:
-        if not isinstance(entry, dict):
-            raise ValueError(f"Invalid revision entry for post {post_id}")
-        entry_id = entry.get("revision_id")
-        if not isinstance(entry_id, int):
-            raise ValueError(f"Invalid revision_id for post {post_id}")
-        revision_ids.add(entry_id)
-        if entry_id > revision_id:
-            continue
-        if entry.get("status") != "applied":
-            continue
-        if entry.get("delta_type") not in (
-            "content_chunks_modified",
-            "content_free_edit",
-            "content_policy_edit",
-            "revert",
-        ):
-            continue
-        content_revision_id = entry_id
-    if revision_id not in revision_ids:
-        raise FileNotFoundError(f"Revision {revision_id} not found for post {post_id}")
-    if content_revision_id is None:
+    content_revision_id = _content_revision_id(post_dir, post_id, revision_id)
+    content = _load_revision_content(resolved_root, post_dir, content_revision_id)
+    if content is None:
         raise FileNotFoundError(
-            f"No content snapshots available for revision {revision_id} in post {post_id}"
+            f"Missing snapshots for revision {content_revision_id} in post {post_id}"
         )
+    return content
 
-    snapshots_by_revision = _load_snapshot_groups(post_dir, [content_revision_id])
-    snapshot_chunks = snapshots_by_revision.get(content_revision_id)
-    if not snapshot_chunks:
+
+def read_content_chunks(
+    post_id: str,
+    *,
+    offset: int = 0,
+    limit: int = 50,
+    posts_root: str | Path | None = None,
+) -> ContentChunkWindow:
+    """A window of the current content's chunks (index, hash, text, separators).
+
+    When content.md matches the latest content revision, the window is
+    served from that revision's manifest: its stored block layout says
+    where blocks start, and only the blobs of the window and of blocks
+    running past its end are read. Otherwise content.md is split. The
+    window also carries the markdown of every block (see chunk_blocks)
+    that starts in it, in full.
+    """
+    if offset < 0:
+        raise ValueError("offset must not be negative")
+    if limit < 1:
+        raise ValueError("limit must be at least 1")
+    resolved_root = Path(posts_root) if posts_root is not None else POSTS_ROOT
+    post_dir = post_layout.post_dir(resolved_root, post_id)
+    if not (post_dir / "meta.yaml").exists():
+        raise FileNotFoundError(f"meta.yaml not found for post {post_id}")
+    revision_id = read_last_revision_id(post_id, resolved_root)
+    content_path = post_dir / "content.md"
+    if content_path.exists():
+        content_hash = file_digest(content_path)
+        manifest = _current_manifest(post_id, post_dir, content_hash)
+        if manifest is not None and "starts" in manifest:
+            return _manifest_chunk_window(resolved_root, manifest, offset, limit, revision_id, content_hash)
+    content = read_post_content(post_id, resolved_root)
+    return content_chunk_window(content, offset=offset, limit=limit, revision_id=revision_id)
+
+
+def content_chunk_window(
+    content: str, *, offset: int = 0, limit: int = 50, revision_id: int | None = None
+) -> ContentChunkWindow:
+    """A window of content's chunks, splitting it; stores without a block layout serve this."""
+    if offset < 0:
+        raise ValueError("offset must not be negative")
+    if limit < 1:
+        raise ValueError("limit must be at least 1")
+    blocks = chunk_blocks.chunk_blocks(content)
+    window = blocks.chunks[offset : offset + limit]
+    chunks = [{"index": chunk.index, **entry} for chunk, entry in zip(window, chunk_entries(window))]
+    return ContentChunkWindow(
+        chunks=chunks,
+        total=len(blocks.chunks),
+        revision_id=revision_id,
+        content_hash=text_digest(content),
+        blocks={
+            chunk["index"]: blocks.markdown(chunk["index"])
+            for chunk in chunks
+            if blocks.starts[chunk["index"]] == chunk["index"]
+        },
+    )
+
+
+def chunk_entries(chunks: list[Chunk]) -> list[dict]:
+    """Chunk entries (hash, leading, trailing) carrying their text, as revision_diff reads them."""
+    return [
+        {
+            "hash": chunk_hash(chunk.text),
+            "leading": chunk.leading_separator,
+            "trailing": chunk.trailing_separator,
+            "text": chunk.text,
+        }
+        for chunk in chunks
+    ]
+
+
+def _current_manifest(post_id: str, post_dir: Path, content_hash: str) -> dict | None:
+    """The manifest of the latest content revision, if content_hash is its content."""
+    _ensure_revision_log(post_dir, post_id)
+    for entry in revision_log.iter_revisions_backward(post_dir):
+        if not is_applied_content_revision(entry):
+            continue
+        payload = entry.get("delta_payload")
+        after_hash = payload.get("after_hash") if isinstance(payload, dict) else None
+        if after_hash == content_hash:
+            return chunk_store.read_manifest_payload(post_dir, entry["revision_id"])
+        return None
+    return None
+
+
+def _manifest_chunk_window(
+    posts_root: Path, manifest: dict, offset: int, limit: int, revision_id: int | None, content_hash: str
+) -> ContentChunkWindow:
+    entries = manifest["chunks"]
+    starts = manifest["starts"]
+    texts: dict[int, str] = {}
+
+    def chunk_at(index: int) -> Chunk:
+        entry = entries[index]
+        if index not in texts:
+            texts[index] = (
+                entry["text"] if "text" in entry else chunk_store.get_blob(posts_root, entry["hash"])
+            )
+        return Chunk(
+            index=index,
+            text=texts[index],
+            leading_separator=entry.get("leading", ""),
+            trailing_separator=entry.get("trailing", ""),
+        )
+
+    window = [chunk_at(index) for index in range(offset, min(offset + limit, len(entries)))]
+    blocks = {
+        chunk.index: chunk_blocks.block_markdown(
+            [chunk_at(index) for index in range(chunk.index, chunk_blocks.block_end(starts, chunk.index))],
+            manifest.get("references", ""),
+        )
+        for chunk in window
+        if starts[chunk.index] == chunk.index
+    }
+    return ContentChunkWindow(
+        chunks=[
+            {
+                "index": chunk.index,
+                "hash": entries[chunk.index]["hash"],
+                "text": chunk.text,
+                "leading": chunk.leading_separator,
+                "trailing": chunk.trailing_separator,
+            }
+            for chunk in window
+        ],
+        total=len(entries),
+        revision_id=revision_id,
+        content_hash=content_hash,
+        blocks=blocks,
+    )
+
+
+def read_revision_chunk_entries(
+    post_id: str,
+    revision_id: int,
+    posts_root: str | Path | None = None,
+) -> list[dict]:
+    """Chunk entries (hash, leading, trailing) of the content at revision_id.
+
+    Manifest revisions are answered from the manifest alone; packed and
+    legacy revisions carry their chunk "text" as well.
+    """
+    resolved_root = Path(posts_root) if posts_root is not None else POSTS_ROOT
+    post_dir = post_layout.post_dir(resolved_root, post_id)
+    if not (post_dir / "meta.yaml").exists():
+        raise FileNotFoundError(f"meta.yaml not found for post {post_id}")
+    content_revision_id = _content_revision_id(post_dir, post_id, revision_id)
+    if not _load_legacy_snapshots(post_dir, content_revision_id):
+        entries = chunk_store.read_manifest(post_dir, content_revision_id)
+        if entries is not None:
+            return entries
+    chunks = load_revision_chunks(resolved_root, post_dir, content_revision_id)
+    if chunks is None:
         raise FileNotFoundError(
             f"Missing snapshots for revision {content_revision_id} in post {post_id}"
         )
-    content, _after_hash = _build_content_from_snapshots(snapshot_chunks)
-    return content
+    return chunk_entries(chunks)
+
+
+def diff_revisions(
+    post_id: str,
+    from_revision_id: int,
+    to_revision_id: int,
+    posts_root: str | Path | None = None,
+) -> Iterator[dict]:
+    """Diff records between two revisions; missing revisions raise before the first record."""
+    resolved_root = Path(posts_root) if posts_root is not None else POSTS_ROOT
+    before = read_revision_chunk_entries(post_id, from_revision_id, resolved_root)
+    after = read_revision_chunk_entries(post_id, to_revision_id, resolved_root)
+    return revision_diff.iter_revision_diff(
+        resolved_root,
+        before,
+        after,
+        from_revision_id=from_revision_id,
+        to_revision_id=to_revision_id,
+    )
+
+
+def _content_revision_id(post_dir: Path, post_id: str, revision_id: int) -> int:
+    """The applied content revision whose snapshot holds the content at revision_id."""
+    _ensure_revision_log(post_dir, post_id)
+    if revision_log.read_revision(post_dir, revision_id) is None:
+        raise FileNotFoundError(f"Revision {revision_id} not found for post {post_id}")
+    for entry in revision_log.iter_revisions_backward(post_dir, revision_id):
+        if is_applied_content_revision(entry):
+            return entry.get("revision_id")
+    raise FileNotFoundError(
+        f"No content snapshots available for revision {revision_id} in post {post_id}"
+    )
 
 
 def ensure_draft(post_id: str) -> None:
@@ -381,47 +779,40 @@ def append_revision_meta(post_id: str, revision_entry: dict) -> None:
     raise ValueError("Revisions must be appended via apply_blog_update only.")
 
 
-def read_post_intent(post_id: str) -> dict:
-    post_dir = POSTS_ROOT / post_id
+def read_post_intent(post_id: str, posts_root: str | Path | None = None) -> dict:
+    resolved_root = Path(posts_root) if posts_root is not None else POSTS_ROOT
+    post_dir = post_layout.post_dir(resolved_root, post_id)
     intent_path = post_dir / "intent.yaml"
     if not intent_path.exists():
         raise FileNotFoundError(f"intent.yaml not found for post {post_id}")
     try:
-        data = yaml.safe_load(intent_path.read_text())
-        if not isinstance(data, dict):
-            raise ValueError("Intent YAML must be a mapping.")
-        return data
+        return post_cache.get(intent_path, _load_intent_file)
     except Exception as exc:
         raise ValueError(f"Invalid intent.yaml for post {post_id}: {exc}") from exc
 
 
+def _load_intent_file(intent_path: Path) -> dict:
+    data = yaml.safe_load(intent_path.read_text())
+    if not isinstance(data, dict):
+        raise ValueError("Intent YAML must be a mapping.")
+    return data
+
+
 def _replay_post_content(post_id: str, posts_root: str | Path | None = None) -> str:
     resolved_root = Path(posts_root) if posts_root is not None else POSTS_ROOT
-    post_dir = resolved_root / post_id
+    post_dir = post_layout.post_dir(resolved_root, post_id)
     meta_path = post_dir / "meta.yaml"
     if not meta_path.exists():
         raise FileNotFoundError(f"meta.yaml not found for post {post_id}")
-    meta_payload = yaml.safe_load(meta_path.read_text()) or {}
-    if not isinstance(meta_payload, dict):
-        raise ValueError(f"Invalid meta.yaml for post {post_id}")
-    revisions = meta_payload.get("revisions")
-    if not isinstance(revisions, list) or not revisions:
+    _ensure_revision_log(post_dir, post_id)
+    if not revision_log.revision_count(post_dir):
         raise ValueError(f"No revisions available to replay content for post {post_id}")
 
     current_revision_id: int | None = None
     current_payload: dict | None = None
 
-    for entry in revisions:
-        if not isinstance(entry, dict):
-            raise ValueError(f"Invalid revision entry for post {post_id}")
-        if entry.get("status") != "applied":
-            continue
-        if entry.get("delta_type") not in (
-            "content_chunks_modified",
-            "content_free_edit",
-            "content_policy_edit",
-            "revert",
-        ):
+    for entry in revision_log.iter_revisions_backward(post_dir):
+        if not is_applied_content_revision(entry):
             continue
         revision_id = entry.get("revision_id")
         if not isinstance(revision_id, int):
@@ -431,47 +822,18 @@ def _replay_post_content(post_id: str, posts_root: str | Path | None = None) ->
             raise ValueError(f"Invalid delta_payload for post {post_id}")
         current_revision_id = revision_id
         current_payload = payload
+        break
 
     if current_revision_id is None:
         raise ValueError(f"No content deltas available to replay content for post {post_id}")
 
-    revisions_dir = post_dir / "revisions"
-    snapshots = sorted(
-        revisions_dir.glob(f"{current_revision_id}_*.md"),
-        key=lambda p: p.name,
-    )
-    if not snapshots:
+    content = _load_revision_content(resolved_root, post_dir, current_revision_id)
+    if content is None:
         raise ValueError(f"Missing snapshots for revision {current_revision_id} in post {post_id}")
-
-    chunks_by_index: dict[int, str] = {}
-    for snapshot_path in snapshots:
-        stem = snapshot_path.stem
-        if "_" not in stem:
-            raise ValueError(f"Invalid snapshot filename {snapshot_path}")
-        revision_str, index_str = stem.split("_", 1)
-        if revision_str != str(current_revision_id) or not index_str.isdigit():
-            raise ValueError(f"Invalid snapshot filename {snapshot_path}")
-        index = int(index_str)
-        chunks_by_index[index] = snapshot_path.read_text()
-
-    max_index = max(chunks_by_index)
-    expected_indices = list(range(max_index + 1))
-    if sorted(chunks_by_index.keys()) != expected_indices:
-        raise ValueError(f"Snapshot indices must be contiguous for post {post_id}")
-
-    chunks = [
-        Chunk(
-            index=i,
-            text=chunks_by_index[i],
-            trailing_separator="\n\n" if i < max_index else "",
-        )
-        for i in range(max_index + 1)
-    ]
-    content = join_chunks(chunks)
     content_path = post_dir / "content.md"
-    replay_hash = hashlib.sha256(content.encode("utf-8")).hexdigest()
+    replay_hash = text_digest(content)
     if content_path.exists():
-        on_disk_hash = hashlib.sha256(content_path.read_text().encode("utf-8")).hexdigest()
+        on_disk_hash = file_digest(content_path)
         if on_disk_hash != replay_hash:
             raise ValueError(
                 f"Revision replay content mismatch for post {post_id} at revision {current_revision_id}"
@@ -482,14 +844,18 @@ def _replay_post_content(post_id: str, posts_root: str | Path | None = None) ->
             raise ValueError(
                 f"Revision replay hash mismatch for post {post_id} at revision {current_revision_id}"
             )
-    content_path.write_text(content)
+    with post_layout.locked_post_dir(resolved_root, post_id) as post_dir:
+        content_path = post_dir / "content.md"
+        content_path.write_text(content)
+        post_cache.remember(content_path, content)
+        search_index.mark_dirty(resolved_root, post_id)
     return content
 
 
 def _migrate_legacy_revisions(post_id: str) -> None:
     # Revision files are non-authoritative artifacts; do not infer metadata.
     return
-    post_dir = POSTS_ROOT / post_id
+    post_dir = post_layout.post_dir(POSTS_ROOT, post_id)
     meta_path = post_dir / "meta.yaml"
     if not meta_path.exists():
         raise FileNotFoundError(f"meta.yaml not found for post {post_id}")
@@ -554,6 +920,44 @@ def _migrate_legacy_revisions(post_id: str) -> None:
     meta_path.write_text(yaml.safe_dump(meta_payload, sort_keys=False, default_flow_style=False))
 
 
+def _load_legacy_snapshots(post_dir: Path, revision_id: int) -> dict[int, str]:
+    snapshot_chunks: dict[int, str] = {}
+    for snapshot_path in (post_dir / "revisions").glob(f"{revision_id}_*.md"):
+        index_str = snapshot_path.stem.split("_", 1)[1]
+        if not index_str.isdigit():
+            raise ValueError(f"Invalid snapshot filename {snapshot_path}")
+        snapshot_chunks[int(index_str)] = snapshot_path.read_text()
+    if snapshot_chunks and sorted(snapshot_chunks) != list(range(max(snapshot_chunks) + 1)):
+        raise ValueError(f"Snapshot indices must be contiguous for revision {revision_id} in {post_dir}")
+    return snapshot_chunks
+
+
+def load_revision_chunks(posts_root: Path, post_dir: Path, revision_id: int) -> list[Chunk] | None:
+    # Snapshots written before manifests existed are one file per chunk.
+    legacy_chunks = _load_legacy_snapshots(post_dir, revision_id)
+    if legacy_chunks:
+        max_index = max(legacy_chunks)
+        return [
+            Chunk(
+                index=i,
+                text=legacy_chunks[i],
+                trailing_separator="\n\n" if i < max_index else "",
+            )
+            for i in range(max_index + 1)
+        ]
+    chunks = chunk_store.load_manifest_chunks(posts_root, post_dir, revision_id)
+    if chunks is not None:
+        return chunks
+    return revision_pack.read_packed_chunks(post_dir, revision_id)
+
+
+def _load_revision_content(posts_root: Path, post_dir: Path, revision_id: int) -> str | None:
+    chunks = load_revision_chunks(posts_root, post_dir, revision_id)
+    if chunks is None:
+        return None
+    return join_chunks(chunks)
+
+
 def _load_snapshot_groups(post_dir: Path, revision_ids: list[int]) -> dict[int, dict[int, str]]:
     revisions_dir = post_dir / "revisions"
     if not revisions_dir.exists():
@@ -588,5 +992,5 @@ def _build_content_from_snapshots(snapshot_chunks: dict[int, str]) -> tuple[str,
         for i in range(max_index + 1)
     ]
     content = join_chunks(chunks)
-    after_hash = hashlib.sha256(content.encode("utf-8")).hexdigest()
+    after_hash = text_digest(content)
     return content, after_hash
@@ -9,7 +9,7 @@ from document_writer.domain.document.schemas import DocumentPlannerOutput
 from document_writer.domain.document.types import DocumentNode, DocumentTree
 from document_writer.domain.intent.types import IntentEnvelope
 from document_writer.domain.writer import make_agent_dispatcher as make_writer_dispatcher, make_tool_registry as make_writer_tool_registry
-from document_writer.domain.writer.api import execute_document
+from document_writer.domain.writer.api import ProgressCallback, execute_document
 
 
 def _assemble_markdown(node: DocumentNode, store: ContentStore, depth: int = 0) -> list[str]:
@@ -49,6 +49,7 @@ def generate_document(
     *,
     intent: IntentEnvelope,
     trace: bool,
+    on_progress: ProgressCallback | None = None,
 ) -> DocumentGenerationResult:
     # Planner-only dispatcher and analysis
     planner = make_planner(model="gpt-4.1-mini")
@@ -64,6 +65,8 @@ def generate_document(
 
     planner_output = DocumentPlannerOutput.model_validate(analysis.plan)
     planned_tree: DocumentTree = planner_output.document_tree
+    if on_progress is not None:
+        on_progress({"event": "planned"})
 
     # Writer execution
     writer_dispatcher = make_writer_dispatcher(model="gpt-4.1-mini", max_retries=3)
@@ -76,6 +79,7 @@ def generate_document(
         tool_registry=writer_tool_registry,
         intent=intent,
         applies_thesis_rule=bool(planner_output.applies_thesis_rule),
+        on_progress=on_progress,
     )
 
     markdown_lines = _assemble_markdown(planned_tree.root, writer_result.content_store)
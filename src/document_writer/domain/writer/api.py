@@ -9,7 +9,10 @@ from document_writer.domain.writer.emission import emit_writer_tasks
 from document_writer.domain.intent.types import IntentEnvelope
 from document_writer.domain.writer.intent_audit import audit_intent_satisfaction, IntentAuditResult
 from dataclasses import dataclass
-from typing import Any
+from typing import Any, Callable
+
+
+ProgressCallback = Callable[[dict[str, Any]], None]
 
 
 @dataclass
@@ -58,6 +61,7 @@ def execute_document(
     max_refine_attempts: int = 1,
     intent: IntentEnvelope | None = None,
     applies_thesis_rule: bool = False,
+    on_progress: ProgressCallback | None = None,
 ) -> WriterExecutionResult:
     # Invariant: The writer never introduces conceptual authority. All definition authority is planned upstream.
     validate_definition_authority(document_tree)
@@ -70,8 +74,9 @@ def execute_document(
     for task in tasks:
         if getattr(task, "defines", None) is None or getattr(task, "assumes", None) is None:
             raise ValueError("Writer task must include defines and assumes.")
-    for task in tasks:
+    for completed, task in enumerate(tasks, start=1):
         attempts = 0
+        accepted = False
         current_task: WriterTask = task
         while attempts <= max_refine_attempts:
             response = run(
@@ -87,6 +92,7 @@ def execute_document(
                 text = result.get("text") if isinstance(result, dict) else getattr(result, "text", "")
                 if text:
                     content_store.by_node_id[current_task.node_id] = text
+                accepted = True
                 break
             attempts += 1
             if attempts > max_refine_attempts:
@@ -98,6 +104,18 @@ def execute_document(
                 requirements=current_task.requirements,
                 applies_thesis_rule=current_task.applies_thesis_rule,
             )
+        if on_progress is not None:
+            on_progress(
+                {
+                    "event": "section",
+                    "section": task.section_name,
+                    "completed": completed,
+                    "total": len(tasks),
+                    "accepted": accepted,
+                    "rejections": attempts,
+                    "text": content_store.by_node_id.get(task.node_id),
+                }
+            )
     intent_audit = audit_intent_satisfaction(
         document_tree=document_tree,
         content_store=content_store,
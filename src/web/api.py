@@ -1,10 +1,15 @@
 import web.bootstrap
-import hashlib
+import asyncio
+import json
 import logging
 import os
+import queue
+import threading
 from io import BytesIO
-from fastapi import FastAPI, HTTPException, Request, Depends
-from fastapi.responses import HTMLResponse, StreamingResponse, RedirectResponse
+from typing import Callable
+from fastapi import FastAPI, HTTPException, Query, Request, Depends
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import HTMLResponse, JSONResponse, StreamingResponse, RedirectResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 import markdown
@@ -15,23 +20,20 @@ from document_writer.apps.service import generate_document as generate_blog_post
 from document_writer.domain.editor.agent import make_editor_agent
 from document_writer.domain.editor.api import AgentEditorRequest
 from document_writer.domain.editor.service import edit_document
-from document_writer.domain.editor.chunking import split_markdown
 from document_writer.apps.title_suggester import suggest_title
-from apps.blog.edit_service import apply_policy_edit
+from apps.blog.autosave import AutosaveBuffer
+from apps.blog.chunk_diff import diff_markdown
+from apps.blog.chunk_patch import apply_chunk_operations
+from apps.blog.edit_service import ProgressCallback, apply_policy_edit
+from apps.blog.hashing import text_digest
+from apps.blog.policy import compile_policy
 from apps.blog.post_revision_writer import PostRevisionWriter
-from apps.blog.storage import (
-    create_post,
-    list_posts,
-    read_post_meta,
-    read_post_content,
-    read_post_intent,
-    write_post_content,
-    read_revision_metadata,
-    read_revision_content,
-    apply_blog_update,
-    set_post_status,
-)
+from apps.blog.post_store import get_post_store, storage_backend
+from apps.blog.types import PostStatus
+from apps.blog.storage import RevisionConflictError
 from web.schemas import (
+    AutosaveRequest,
+    AutosaveResponse,
     DocumentGenerateRequest,
     DocumentSaveRequest,
     EditContentRequest,
@@ -39,6 +41,8 @@ from web.schemas import (
     BlogEditResponse,
     BlogStatusRequest,
     BlogStatusResponse,
+    ChunkPatchRequest,
+    ChunkPatchResponse,
     TitleSetRequest,
     TitleSuggestRequest,
 )
@@ -52,6 +56,14 @@ static_dir = os.path.join(BASE_DIR, "static")
 templates_dir = os.path.join(BASE_DIR, "templates")
 
 BLOG_MARKDOWN_EXTENSIONS = ["fenced_code", "tables"]
+SSE_KEEPALIVE_SECONDS = 15
+SSE_POLL_SECONDS = 0.5
+POSTS_PAGE_SIZE = 50
+MAX_POSTS_PAGE_SIZE = 200
+CHUNKS_PAGE_SIZE = 20
+MAX_CHUNKS_PAGE_SIZE = 200
+# Manual-edit autosave is opt-in: a positive quiet window enables it.
+AUTOSAVE_QUIET_SECONDS = float(os.environ.get("AGENTIC_BLOG_AUTOSAVE_QUIET_SECONDS", "0"))
 
 app = FastAPI()
 app.mount("/static", StaticFiles(directory=static_dir), name="static")
@@ -59,23 +71,82 @@ templates = Jinja2Templates(directory=templates_dir)
 logger = logging.getLogger(__name__)
 editor_agent = make_editor_agent()
 editor_dispatcher = AgentDispatcherBase()
+# Autosave drafts live in post directories, so other storage backends run without them.
+autosaves = (
+    AutosaveBuffer(AUTOSAVE_QUIET_SECONDS)
+    if AUTOSAVE_QUIET_SECONDS > 0 and storage_backend() == "filesystem"
+    else None
+)
 
 
-def _hash_text(text: str) -> str:
-    return hashlib.sha256(text.encode("utf-8")).hexdigest()
-
-
-def _changed_chunk_indices(before: str, after: str) -> list[int]:
-    before_chunks = split_markdown(before)
-    after_chunks = split_markdown(after)
-    max_len = max(len(before_chunks), len(after_chunks))
-    changed: list[int] = []
-    for index in range(max_len):
-        before_text = before_chunks[index].text if index < len(before_chunks) else None
-        after_text = after_chunks[index].text if index < len(after_chunks) else None
-        if before_text != after_text:
-            changed.append(index)
-    return changed
+def _chunk_changes(before: str, after: str) -> dict[str, list[int]]:
+    # Hash-aligned: an inserted paragraph does not mark every later chunk as changed.
+    diff = diff_markdown(before, after)
+    return {"changed_chunks": diff.changed_chunks, "deleted_chunks": diff.deleted_chunks}
+
+
+def _sse_event(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+class _StreamClosed(Exception):
+    """Raised from a progress callback once the client has gone away."""
+
+
+def _stream_progress(request: Request, work: Callable[[ProgressCallback], dict]) -> StreamingResponse:
+    """Run a long blog job in the background and stream its progress as SSE.
+
+    If the client disconnects, the job stops at its next progress report.
+    """
+    events: queue.Queue[tuple[str, dict] | None] = queue.Queue()
+    closed = threading.Event()
+
+    def _on_progress(event: dict) -> None:
+        if closed.is_set():
+            raise _StreamClosed()
+        payload = dict(event)
+        events.put((payload.pop("event", "progress"), payload))
+
+    def _run() -> None:
+        try:
+            events.put(("done", work(_on_progress)))
+        except _StreamClosed:
+            logger.info("Streamed blog job stopped: client disconnected")
+        except HTTPException as exc:
+            events.put(("error", {"status_code": exc.status_code, "detail": exc.detail}))
+        except Exception as exc:
+            logger.exception("Streamed blog job failed")
+            events.put(("error", {"status_code": 500, "detail": str(exc)}))
+        finally:
+            events.put(None)
+
+    threading.Thread(target=_run, daemon=True).start()
+
+    async def _iter_events():
+        idle = 0.0
+        try:
+            while not await request.is_disconnected():
+                try:
+                    item = await asyncio.to_thread(events.get, True, SSE_POLL_SECONDS)
+                except queue.Empty:
+                    idle += SSE_POLL_SECONDS
+                    if idle >= SSE_KEEPALIVE_SECONDS:
+                        # Comment lines keep idle proxies from closing the stream.
+                        idle = 0.0
+                        yield ": keep-alive\n\n"
+                    continue
+                if item is None:
+                    return
+                idle = 0.0
+                yield _sse_event(*item)
+        finally:
+            closed.set()
+
+    return StreamingResponse(
+        _iter_events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 async def _parse_blog_edit_request(request: Request) -> BlogEditRequest:
@@ -101,6 +172,34 @@ def validate_generated_dir() -> None:
     web.bootstrap.validate_generated_dir()
 
 
+@app.on_event("shutdown")
+def flush_autosaves() -> None:
+    if autosaves is not None:
+        autosaves.close()
+
+
+def _flush_autosave(post_id: str) -> None:
+    # Editor pages show committed content, so buffered autosaves land first.
+    if autosaves is None:
+        return
+    try:
+        autosaves.flush(post_id)
+    except Exception:
+        logger.exception("Autosave flush failed for post %s", post_id)
+
+
+def _discard_autosave(post_id: str) -> None:
+    # An explicit save carries the editor's latest content and supersedes the buffer.
+    if autosaves is not None:
+        autosaves.discard(post_id)
+
+
+def _next_page_url(request: Request, next_cursor: str | None) -> str | None:
+    if next_cursor is None:
+        return None
+    return str(request.url.include_query_params(cursor=next_cursor))
+
+
 @app.get("/", response_class=HTMLResponse)
 def read_home(request: Request):
     return templates.TemplateResponse("home.html", {"request": request})
@@ -109,19 +208,33 @@ def read_home(request: Request):
 @app.get("/blog/editor")
 def read_editor_entry(
     request: Request,
+    status: PostStatus | None = None,
+    author: str | None = None,
+    cursor: str | None = None,
+    limit: int = Query(POSTS_PAGE_SIZE, ge=1, le=MAX_POSTS_PAGE_SIZE),
     creds = Depends(security),
 ):
     require_admin(creds)
     accept = request.headers.get("accept", "")
     if "application/json" in accept.lower():
         raise HTTPException(status_code=406, detail="Editor renders HTML only")
-    posts = list_posts(visibility="editor")
+    try:
+        page = get_post_store().list_posts_page(
+            visibility="editor",
+            status=status,
+            author=author,
+            cursor=cursor,
+            limit=limit,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
     return templates.TemplateResponse(
         "blog_editor_entry.html",
         {
             "request": request,
-            "posts": posts,
+            "posts": page.posts,
             "post_id": None,
+            "next_url": _next_page_url(request, page.next_cursor),
         },
     )
 
@@ -132,11 +245,10 @@ def set_blog_status(
     creds = Depends(security),
 ) -> BlogStatusResponse:
     require_admin(creds)
+    store = get_post_store()
     try:
-        previous_status, new_status = set_post_status(
-            payload.post_id,
-            payload.target_status,
-        )
+        previous_status = store.read_post_meta(payload.post_id).status
+        new_status = store.update_post_status(payload.post_id, payload.target_status)
     except FileNotFoundError:
         raise HTTPException(status_code=404, detail="Post not found")
     except ValueError as exc:
@@ -176,49 +288,63 @@ def read_editor_edit(
     accept = request.headers.get("accept", "")
     if "application/json" in accept.lower():
         raise HTTPException(status_code=406, detail="Editor renders HTML only")
+    _flush_autosave(post_id)
     try:
-        meta = read_post_meta(post_id)
-        content = read_post_content(post_id)
+        bundle = get_post_store().load_post_bundle(post_id, parts=("intent", "last_revision_id"))
     except FileNotFoundError:
         raise HTTPException(status_code=404, detail="Post not found")
-    try:
-        intent = read_post_intent(post_id)
-    except FileNotFoundError:
-        intent = {}
-    revisions = read_revision_metadata(post_id)
-    if not isinstance(revisions, list):
+    except ValueError:
         raise HTTPException(status_code=500, detail="Invalid revision metadata")
-    last_revision_id = None
-    if revisions:
-        revision_ids: list[int] = []
-        for entry in revisions:
-            if not isinstance(entry, dict):
-                raise HTTPException(status_code=500, detail="Invalid revision metadata")
-            revision_id = entry.get("revision_id")
-            if not isinstance(revision_id, int):
-                raise HTTPException(status_code=500, detail="Invalid revision metadata")
-            revision_ids.append(revision_id)
-        last_revision_id = max(revision_ids) if revision_ids else None
-    if last_revision_id is not None and not isinstance(last_revision_id, int):
-        raise HTTPException(status_code=500, detail="Invalid revision metadata")
-    content_html = markdown.markdown(
-        content,
-        extensions=BLOG_MARKDOWN_EXTENSIONS,
-    )
+    # Content is fetched chunk by chunk from /blog/{post_id}/chunks as the editor scrolls.
     return templates.TemplateResponse(
         "blog_editor_edit.html",
         {
             "request": request,
             "post_id": post_id,
-            "meta": meta,
-            "content": content,
-            "content_html": content_html,
-            "intent": intent,
-            "last_revision_id": last_revision_id,
+            "meta": bundle.meta,
+            "intent": bundle.intent,
+            "last_revision_id": bundle.last_revision_id,
+            "chunks_page_size": CHUNKS_PAGE_SIZE,
         },
     )
 
 
+@app.get("/blog/{post_id}/chunks")
+def read_blog_chunks(
+    post_id: str,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(CHUNKS_PAGE_SIZE, ge=1, le=MAX_CHUNKS_PAGE_SIZE),
+    creds = Depends(security),
+) -> dict[str, object]:
+    require_admin(creds)
+    try:
+        window = get_post_store().read_content_chunks(post_id, offset=offset, limit=limit)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Post not found")
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    # A block spanning several chunks is rendered whole on its first chunk; the rest render empty.
+    chunks = [
+        {
+            **chunk,
+            "html": markdown.markdown(window.blocks[chunk["index"]], extensions=BLOG_MARKDOWN_EXTENSIONS)
+            if chunk["index"] in window.blocks
+            else "",
+        }
+        for chunk in window.chunks
+    ]
+    next_offset = offset + len(chunks)
+    return {
+        "post_id": post_id,
+        "revision_id": window.revision_id,
+        "content_hash": window.content_hash,
+        "offset": offset,
+        "total": window.total,
+        "next_offset": next_offset if next_offset < window.total else None,
+        "chunks": chunks,
+    }
+
+
 @app.get("/blog/edit/{post_id}")
 def redirect_manual_edit_entry(
     post_id: str,
@@ -238,9 +364,9 @@ def read_manual_edit(
     accept = request.headers.get("accept", "")
     if "application/json" in accept.lower():
         raise HTTPException(status_code=406, detail="Editor renders HTML only")
+    _flush_autosave(post_id)
     try:
-        meta = read_post_meta(post_id)
-        content = read_post_content(post_id)
+        bundle = get_post_store().load_post_bundle(post_id, parts=("content", "last_revision_id"))
     except FileNotFoundError:
         raise HTTPException(status_code=404, detail="Post not found")
     return templates.TemplateResponse(
@@ -248,8 +374,10 @@ def read_manual_edit(
         {
             "request": request,
             "post_id": post_id,
-            "meta": meta,
-            "content": content,
+            "meta": bundle.meta,
+            "content": bundle.content,
+            "last_revision_id": bundle.last_revision_id,
+            "autosave_enabled": autosaves is not None,
         },
     )
 
@@ -265,7 +393,7 @@ def read_policy_edit(
     if "application/json" in accept.lower():
         raise HTTPException(status_code=406, detail="Editor renders HTML only")
     try:
-        meta = read_post_meta(post_id)
+        meta = get_post_store().read_post_meta(post_id)
     except FileNotFoundError:
         raise HTTPException(status_code=404, detail="Post not found")
     return templates.TemplateResponse(
@@ -286,17 +414,17 @@ async def submit_manual_edit(
 ) -> RedirectResponse:
     require_admin(creds)
     form = await request.form()
-    before_content = read_post_content(post_id)
-    after_content = form.get("content") or ""
     writer = PostRevisionWriter()
-    before_hash = _hash_text(before_content)
-    after_hash = _hash_text(after_content)
+    before_content = writer.store.read_post_content(post_id)
+    after_content = form.get("content") or ""
+    before_hash = text_digest(before_content)
+    after_hash = text_digest(after_content)
     revision_id = writer.apply_delta(
         post_id,
         actor={"type": "human", "id": creds.username or "editor"},
         delta_type="content_free_edit",
         delta_payload={
-            "changed_chunks": _changed_chunk_indices(before_content, after_content),
+            **_chunk_changes(before_content, after_content),
             "before_hash": before_hash,
             "after_hash": after_hash,
         },
@@ -304,10 +432,132 @@ async def submit_manual_edit(
     )
     if not isinstance(revision_id, int):
         raise HTTPException(status_code=500, detail="Failed to record revision")
-    write_post_content(post_id, after_content)
+    _discard_autosave(post_id)
     return RedirectResponse(f"/blog/editor/{post_id}", status_code=303)
 
 
+@app.post("/blog/edit/{post_id}/autosave", status_code=202)
+def autosave_manual_edit(
+    post_id: str,
+    payload: AutosaveRequest,
+    creds = Depends(security),
+) -> AutosaveResponse:
+    require_admin(creds)
+    if autosaves is None:
+        raise HTTPException(status_code=404, detail="Autosave is disabled")
+    try:
+        state = autosaves.save(
+            post_id,
+            payload.content,
+            actor={"type": "human", "id": creds.username or "editor"},
+            base_revision_id=payload.base_revision_id,
+        )
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Post not found")
+    if state.conflict:
+        raise HTTPException(
+            status_code=409,
+            detail={
+                "reason": "Post changed since autosave started",
+                "base_revision_id": payload.base_revision_id,
+                "last_revision_id": get_post_store().read_last_revision_id(post_id),
+            },
+        )
+    return AutosaveResponse(post_id=post_id, pending=state.pending, revision_id=state.base_revision_id)
+
+
+@app.post("/blog/edit/{post_id}/autosave/flush")
+def flush_manual_autosave(
+    post_id: str,
+    creds = Depends(security),
+) -> AutosaveResponse:
+    require_admin(creds)
+    if autosaves is None:
+        raise HTTPException(status_code=404, detail="Autosave is disabled")
+    try:
+        revision_id = autosaves.flush(post_id)
+    except RevisionConflictError:
+        raise HTTPException(
+            status_code=409,
+            detail={
+                "reason": "Post changed since autosave started",
+                "last_revision_id": get_post_store().read_last_revision_id(post_id),
+            },
+        )
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Post not found")
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    state = autosaves.state(post_id)
+    return AutosaveResponse(
+        post_id=post_id,
+        pending=False,
+        revision_id=revision_id if state is None else state.base_revision_id,
+    )
+
+
+
+
+@app.patch("/blog/edit/{post_id}/chunks")
+def patch_manual_edit_chunks(
+    post_id: str,
+    payload: ChunkPatchRequest,
+    creds = Depends(security),
+) -> ChunkPatchResponse:
+    require_admin(creds)
+    try:
+        bundle = get_post_store().load_post_bundle(post_id, parts=("content", "last_revision_id"))
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Post not found")
+    before_content = bundle.content
+    last_revision_id = bundle.last_revision_id
+    if payload.base_revision_id != last_revision_id:
+        raise HTTPException(
+            status_code=409,
+            detail={
+                "reason": "Base revision is not the latest revision",
+                "base_revision_id": payload.base_revision_id,
+                "last_revision_id": last_revision_id,
+            },
+        )
+    try:
+        patch = apply_chunk_operations(before_content, payload.operations)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    if patch.content == before_content:
+        return ChunkPatchResponse(post_id=post_id, revision_id=last_revision_id or 0, changed_chunks=[])
+    writer = PostRevisionWriter()
+    try:
+        revision_id = writer.apply_delta(
+            post_id,
+            actor={"type": "human", "id": creds.username or "editor"},
+            delta_type="content_chunks_modified",
+            delta_payload={
+                "changed_chunks": patch.changed_chunks,
+                "deleted_chunks": patch.deleted_chunks,
+                "before_hash": text_digest(before_content),
+                "after_hash": text_digest(patch.content),
+            },
+            new_content=patch.content,
+            expected_revision_id=last_revision_id or 0,
+        )
+    except RevisionConflictError:
+        raise HTTPException(
+            status_code=409,
+            detail={
+                "reason": "Base revision is not the latest revision",
+                "base_revision_id": payload.base_revision_id,
+                "last_revision_id": get_post_store().read_last_revision_id(post_id),
+            },
+        )
+    if not isinstance(revision_id, int):
+        raise HTTPException(status_code=500, detail="Failed to record revision")
+    _discard_autosave(post_id)
+    return ChunkPatchResponse(
+        post_id=post_id,
+        revision_id=revision_id,
+        changed_chunks=patch.changed_chunks,
+    )
 
 
 @app.get("/blog/writer")
@@ -336,38 +586,39 @@ def read_me(request: Request):
     )
 
 
-@app.post("/blog/generate")
-def generate_blog_post_route(
-    payload: DocumentGenerateRequest,
-    creds = Depends(security),
-    ) -> dict[str, str | None]:
-    require_admin(creds)
-    intent = payload.intent
-    author = (creds.username or "").strip()
-    if not author:
-        raise HTTPException(status_code=400, detail="Author must be set via /blog/set-author")
+def _generate_post(
+    *,
+    intent: IntentEnvelope,
+    intent_payload: dict,
+    author: str,
+    actor_id: str,
+    on_progress: ProgressCallback | None = None,
+) -> tuple[str, str, int]:
     # content-only authority: writer generates content, metadata remains blog-owned
-    post_id, _ = create_post(
+    writer = PostRevisionWriter()
+    post_id = writer.store.create_post(
         title=None,
         author=author,
-        intent=intent.model_dump(),
+        intent=intent_payload,
         content="",
     )
+    if on_progress is not None:
+        on_progress({"event": "post_created", "post_id": post_id})
     blog_result = generate_blog_post(
         intent=intent,
         trace=False,
+        on_progress=on_progress,
     )
     markdown = blog_result.markdown
-    before_content = read_post_content(post_id)
-    before_hash = _hash_text(before_content)
-    after_hash = _hash_text(markdown)
-    writer = PostRevisionWriter()
+    before_content = writer.store.read_post_content(post_id)
+    before_hash = text_digest(before_content)
+    after_hash = text_digest(markdown)
     revision_id = writer.apply_delta(
         post_id,
-        actor={"type": "generator", "id": author},
+        actor={"type": "generator", "id": actor_id},
         delta_type="content_free_edit",
         delta_payload={
-            "changed_chunks": _changed_chunk_indices(before_content, markdown),
+            **_chunk_changes(before_content, markdown),
             "before_hash": before_hash,
             "after_hash": after_hash,
         },
@@ -378,7 +629,29 @@ def generate_blog_post_route(
         raise HTTPException(status_code=500, detail="Failed to record revision")
     if not revision_recorded:
         raise HTTPException(status_code=500, detail="Revision required before content write")
-    write_post_content(post_id, markdown)
+    return post_id, markdown, revision_id
+
+
+def _generate_author(creds) -> str:
+    author = (creds.username or "").strip()
+    if not author:
+        raise HTTPException(status_code=400, detail="Author must be set via /blog/set-author")
+    return author
+
+
+@app.post("/blog/generate")
+def generate_blog_post_route(
+    payload: DocumentGenerateRequest,
+    creds = Depends(security),
+    ) -> dict[str, str | None]:
+    require_admin(creds)
+    author = _generate_author(creds)
+    post_id, markdown, _revision_id = _generate_post(
+        intent=payload.intent,
+        intent_payload=payload.intent.model_dump(),
+        author=author,
+        actor_id=author,
+    )
     suggested_title = None
     if isinstance(markdown, str) and markdown.strip():
         suggested_title = suggest_title(markdown)
@@ -389,6 +662,36 @@ def generate_blog_post_route(
     }
 
 
+@app.post("/blog/generate/stream")
+def stream_generate_blog_post_route(
+    request: Request,
+    payload: DocumentGenerateRequest,
+    creds = Depends(security),
+) -> StreamingResponse:
+    require_admin(creds)
+    author = _generate_author(creds)
+
+    def _work(on_progress: ProgressCallback) -> dict[str, object]:
+        post_id, markdown, revision_id = _generate_post(
+            intent=payload.intent,
+            intent_payload=payload.intent.model_dump(),
+            author=author,
+            actor_id=author,
+            on_progress=on_progress,
+        )
+        suggested_title = None
+        if isinstance(markdown, str) and markdown.strip():
+            suggested_title = suggest_title(markdown)
+        return {
+            "post_id": post_id,
+            "revision_id": revision_id,
+            "content": markdown,
+            "suggested_title": suggested_title,
+        }
+
+    return _stream_progress(request, _work)
+
+
 @app.post("/blog/suggest-title")
 def suggest_blog_title_route(
     payload: TitleSuggestRequest,
@@ -399,13 +702,7 @@ def suggest_blog_title_route(
     return {"suggested_title": title}
 
 
-@app.post("/blog/create")
-async def create_blog_post_route(
-    request: Request,
-    creds = Depends(security),
-) -> RedirectResponse:
-    require_admin(creds)
-    form = await request.form()
+def _intent_from_create_form(form) -> tuple[IntentEnvelope, dict]:
     if "intent" in form:
         logger.warning("Ignoring legacy intent field in form data; intent is built server-side only.")
     document_goal_raw = form.get("document_goal")
@@ -479,41 +776,52 @@ async def create_blog_post_route(
         intent = IntentEnvelope.model_validate(intent_dict)
     except Exception as exc:
         raise HTTPException(status_code=400, detail=str(exc))
-    post_id, _ = create_post(
-        title=None,
-        author=(creds.username or "unknown"),
-        intent=intent_dict,
-        content="",
-    )
-    blog_result = generate_blog_post(
+    return intent, intent_dict
+
+
+@app.post("/blog/create")
+async def create_blog_post_route(
+    request: Request,
+    creds = Depends(security),
+) -> RedirectResponse:
+    require_admin(creds)
+    form = await request.form()
+    intent, intent_dict = _intent_from_create_form(form)
+    post_id, _markdown, _revision_id = _generate_post(
         intent=intent,
-        trace=False,
-    )
-    markdown = blog_result.markdown
-    before_content = read_post_content(post_id)
-    before_hash = _hash_text(before_content)
-    after_hash = _hash_text(markdown)
-    writer = PostRevisionWriter()
-    revision_id = writer.apply_delta(
-        post_id,
-        actor={"type": "generator", "id": creds.username or "editor"},
-        delta_type="content_free_edit",
-        delta_payload={
-            "changed_chunks": _changed_chunk_indices(before_content, markdown),
-            "before_hash": before_hash,
-            "after_hash": after_hash,
-        },
-        new_content=markdown,
+        intent_payload=intent_dict,
+        author=(creds.username or "unknown"),
+        actor_id=creds.username or "editor",
     )
-    revision_recorded = True
-    if not isinstance(revision_id, int):
-        raise HTTPException(status_code=500, detail="Failed to record revision")
-    if not revision_recorded:
-        raise HTTPException(status_code=500, detail="Revision required before content write")
-    write_post_content(post_id, markdown)
     return RedirectResponse(f"/blog/editor?post_id={post_id}", status_code=303)
 
 
+@app.post("/blog/create/stream")
+async def stream_create_blog_post_route(
+    request: Request,
+    creds = Depends(security),
+) -> StreamingResponse:
+    require_admin(creds)
+    form = await request.form()
+    intent, intent_dict = _intent_from_create_form(form)
+
+    def _work(on_progress: ProgressCallback) -> dict[str, object]:
+        post_id, _markdown, revision_id = _generate_post(
+            intent=intent,
+            intent_payload=intent_dict,
+            author=(creds.username or "unknown"),
+            actor_id=creds.username or "editor",
+            on_progress=on_progress,
+        )
+        return {
+            "post_id": post_id,
+            "revision_id": revision_id,
+            "redirect": f"/blog/editor?post_id={post_id}",
+        }
+
+    return _stream_progress(request, _work)
+
+
 @app.post("/blog/set-title")
 def set_blog_title_route(
     payload: TitleSetRequest,
@@ -521,11 +829,11 @@ def set_blog_title_route(
 ) -> dict[str, str]:
     require_admin(creds)
     # UI state is non-authoritative; metadata mutations are revision-led only.
+    writer = PostRevisionWriter()
     try:
-        read_post_meta(payload.post_id)
+        writer.store.read_post_meta(payload.post_id)
     except FileNotFoundError:
         raise HTTPException(status_code=404, detail="Post not found")
-    writer = PostRevisionWriter()
     new_title = (payload.title or "").strip()
     if not new_title:
         reason = "Title must be a non-empty string"
@@ -554,11 +862,11 @@ def set_blog_author_route(
 ) -> dict[str, str]:
     require_admin(creds)
     # UI state is non-authoritative; metadata mutations are revision-led only.
+    writer = PostRevisionWriter()
     try:
-        read_post_meta(payload.post_id)
+        writer.store.read_post_meta(payload.post_id)
     except FileNotFoundError:
         raise HTTPException(status_code=404, detail="Post not found")
-    writer = PostRevisionWriter()
     writer.apply_delta(
         payload.post_id,
         actor={"type": "human", "id": creds.username or "editor"},
@@ -568,23 +876,20 @@ def set_blog_author_route(
     return {"post_id": payload.post_id, "author": payload.author}
 
 
-@app.post("/blog/edit-content")
-def edit_blog_content_route(
+def _edit_post_content(
     payload: EditContentRequest,
-    creds = Depends(security),
-) -> RedirectResponse:
-    require_admin(creds)
+    actor_id: str,
+    on_progress: ProgressCallback | None = None,
+) -> dict[str, object]:
     # UI state is non-authoritative; content mutations are revision-led only.
+    writer = PostRevisionWriter()
     try:
-        before_content = read_post_content(payload.post_id)
+        bundle = writer.store.load_post_bundle(payload.post_id, parts=("content", "intent"))
     except FileNotFoundError:
         raise HTTPException(status_code=404, detail="Post not found")
-    try:
-        intent = read_post_intent(payload.post_id)
-    except FileNotFoundError:
-        intent = {}
-    writer = PostRevisionWriter()
-    before_hash = _hash_text(before_content)
+    before_content = bundle.content
+    intent = bundle.intent
+    before_hash = text_digest(before_content)
     try:
         response = edit_document(
             AgentEditorRequest(
@@ -597,12 +902,12 @@ def edit_blog_content_route(
     except ValueError as exc:
         writer.apply_delta(
             payload.post_id,
-            actor={"type": "human", "id": creds.username or "editor"},
+            actor={"type": "human", "id": actor_id},
             delta_type="content_free_edit",
             delta_payload={
-                "changed_chunks": _changed_chunk_indices(before_content, payload.content),
+                **_chunk_changes(before_content, payload.content),
                 "before_hash": before_hash,
-                "after_hash": _hash_text(payload.content),
+                "after_hash": text_digest(payload.content),
             },
             new_content=payload.content,
             reason=str(exc),
@@ -612,22 +917,24 @@ def edit_blog_content_route(
     except Exception as exc:
         writer.apply_delta(
             payload.post_id,
-            actor={"type": "human", "id": creds.username or "editor"},
+            actor={"type": "human", "id": actor_id},
             delta_type="content_free_edit",
             delta_payload={
-                "changed_chunks": _changed_chunk_indices(before_content, payload.content),
+                **_chunk_changes(before_content, payload.content),
                 "before_hash": before_hash,
-                "after_hash": _hash_text(payload.content),
+                "after_hash": text_digest(payload.content),
             },
             new_content=payload.content,
             reason=str(exc),
             status="rejected",
         )
         raise HTTPException(status_code=500, detail="Edit failed")
+    if on_progress is not None:
+        on_progress({"event": "chunk", "completed": 1, "total": 1})
     if response.edited_document == before_content:
         writer.apply_delta(
             payload.post_id,
-            actor={"type": "human", "id": creds.username or "editor"},
+            actor={"type": "human", "id": actor_id},
             delta_type="content_free_edit",
             delta_payload={
                 "changed_chunks": [],
@@ -645,12 +952,12 @@ def edit_blog_content_route(
         }
     revision_id = writer.apply_delta(
         payload.post_id,
-        actor={"type": "human", "id": creds.username or "editor"},
+        actor={"type": "human", "id": actor_id},
         delta_type="content_free_edit",
         delta_payload={
-            "changed_chunks": _changed_chunk_indices(before_content, response.edited_document),
+            **_chunk_changes(before_content, response.edited_document),
             "before_hash": before_hash,
-            "after_hash": _hash_text(response.edited_document),
+            "after_hash": text_digest(response.edited_document),
         },
         new_content=response.edited_document,
     )
@@ -659,23 +966,44 @@ def edit_blog_content_route(
         raise HTTPException(status_code=500, detail="Failed to record revision")
     if not revision_recorded:
         raise HTTPException(status_code=500, detail="Revision required before content write")
-    write_post_content(payload.post_id, response.edited_document)
+    return {"post_id": payload.post_id, "revision_id": revision_id}
+
+
+@app.post("/blog/edit-content")
+def edit_blog_content_route(
+    payload: EditContentRequest,
+    creds = Depends(security),
+) -> RedirectResponse:
+    require_admin(creds)
+    result = _edit_post_content(payload, creds.username or "editor")
+    if "rejection_reason" in result:
+        return result
     return RedirectResponse(url=f"/blog/editor/{payload.post_id}", status_code=303)
 
 
-@app.post("/blog/edit")
-async def edit_blog_post_route(
+@app.post("/blog/edit-content/stream")
+def stream_edit_blog_content_route(
     request: Request,
+    payload: EditContentRequest,
     creds = Depends(security),
-) -> RedirectResponse:
+) -> StreamingResponse:
     require_admin(creds)
-    payload = await _parse_blog_edit_request(request)
+    actor_id = creds.username or "editor"
+    return _stream_progress(
+        request,
+        lambda on_progress: _edit_post_content(payload, actor_id, on_progress),
+    )
+
+
+def _resolve_policy_text(payload: BlogEditRequest) -> str:
     # UI state is non-authoritative; policy edits are revision-led only.
     try:
-        meta = read_post_meta(payload.post_id)
+        state = PostRevisionWriter().get_current_state(payload.post_id)
     except FileNotFoundError:
         raise HTTPException(status_code=404, detail="Post not found")
-    if meta.status != "draft":
+    except ValueError as exc:
+        raise HTTPException(status_code=409, detail=f"Post revision history cannot be replayed: {exc}")
+    if state.status != "draft":
         raise HTTPException(status_code=409, detail="Post is not draft")
     if payload.policy_text is not None:
         policy_text = payload.policy_text
@@ -688,6 +1016,21 @@ async def edit_blog_post_route(
             policy_text = handle.read()
     if not policy_text.strip():
         raise HTTPException(status_code=400, detail="Policy text must be non-empty")
+    try:
+        compile_policy(policy_text)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    return policy_text
+
+
+@app.post("/blog/edit")
+async def edit_blog_post_route(
+    request: Request,
+    creds = Depends(security),
+) -> RedirectResponse:
+    require_admin(creds)
+    payload = await _parse_blog_edit_request(request)
+    policy_text = _resolve_policy_text(payload)
     apply_policy_edit(
         payload.post_id,
         policy_text,
@@ -696,6 +1039,33 @@ async def edit_blog_post_route(
     return RedirectResponse(url=f"/blog/editor/{payload.post_id}", status_code=303)
 
 
+@app.post("/blog/edit/stream")
+async def stream_edit_blog_post_route(
+    request: Request,
+    creds = Depends(security),
+) -> StreamingResponse:
+    require_admin(creds)
+    payload = await _parse_blog_edit_request(request)
+    policy_text = _resolve_policy_text(payload)
+
+    def _work(on_progress: ProgressCallback) -> dict[str, object]:
+        result = apply_policy_edit(
+            payload.post_id,
+            policy_text,
+            actor_id=payload.policy_id or "inline",
+            on_progress=on_progress,
+        )
+        return {
+            "post_id": result.post_id,
+            "revision_id": result.revision_id or None,
+            "changed_chunks": result.changed_chunks,
+            "deleted_chunks": result.deleted_chunks,
+            "rejected_chunks": [chunk.model_dump() for chunk in result.rejected_chunks],
+        }
+
+    return _stream_progress(request, _work)
+
+
 @app.post("/blog/{post_id}/revisions/{source_revision_id}/copy")
 def copy_blog_revision(
     post_id: str,
@@ -703,49 +1073,39 @@ def copy_blog_revision(
     creds = Depends(security),
 ) -> dict[str, int]:
     require_admin(creds)
+    store = get_post_store()
     try:
-        read_post_meta(post_id)
+        store.read_post_meta(post_id)
     except FileNotFoundError:
         raise HTTPException(status_code=404, detail="Post not found")
-    revisions = read_revision_metadata(post_id)
-    if not isinstance(revisions, list):
-        raise HTTPException(status_code=500, detail="Invalid revisions")
-    revision_ids: list[int] = []
-    for entry in revisions:
-        if not isinstance(entry, dict):
-            raise HTTPException(status_code=500, detail="Invalid revision entry")
-        revision_id = entry.get("revision_id")
-        if not isinstance(revision_id, int):
-            raise HTTPException(status_code=500, detail="Invalid revision id")
-        revision_ids.append(revision_id)
-    if not revision_ids or source_revision_id not in revision_ids:
+    if store.read_revision_entry(post_id, source_revision_id) is None:
         raise HTTPException(status_code=404, detail="Revision not found")
 
     try:
-        source_content = read_revision_content(post_id, source_revision_id)
+        source_content = store.read_revision_content(post_id, source_revision_id)
     except FileNotFoundError:
         raise HTTPException(status_code=404, detail="Revision content not found")
 
-    current_content = read_post_content(post_id)
-    delta_payload = {
-        "reverted_to_revision_id": source_revision_id,
-        "before_hash": _hash_text(current_content),
-        "after_hash": _hash_text(source_content),
-    }
     actor_id = getattr(creds, "username", None) or "editor"
-    result = apply_blog_update(
-        post_id=post_id,
-        new_content=source_content,
-        delta_type="revert",
-        source="manual",
-        parent_revision_id=None,
-        delta_payload=delta_payload,
-        actor={"type": "human", "id": actor_id},
-        status="applied",
-        reason=None,
-        meta_updates=None,
-    )
-    write_post_content(post_id, source_content)
+    with store.lock(post_id):
+        current_content = store.read_post_content(post_id)
+        delta_payload = {
+            "reverted_to_revision_id": source_revision_id,
+            "before_hash": text_digest(current_content),
+            "after_hash": text_digest(source_content),
+        }
+        result = store.apply_blog_update(
+            post_id=post_id,
+            new_content=source_content,
+            delta_type="revert",
+            source="manual",
+            parent_revision_id=None,
+            delta_payload=delta_payload,
+            actor={"type": "human", "id": actor_id},
+            status="applied",
+            reason=None,
+            meta_updates=None,
+        )
     return {"revision_id": result.revision_id}
 
 
@@ -756,27 +1116,16 @@ def read_blog_revision(
     creds = Depends(security),
 ) -> dict[str, object]:
     require_admin(creds)
+    store = get_post_store()
     try:
-        read_post_meta(post_id)
+        store.read_post_meta(post_id)
     except FileNotFoundError:
         raise HTTPException(status_code=404, detail="Post not found")
-    revisions = read_revision_metadata(post_id)
-    if not isinstance(revisions, list):
-        raise HTTPException(status_code=500, detail="Invalid revisions")
-    revision_entry = None
-    for entry in revisions:
-        if not isinstance(entry, dict):
-            raise HTTPException(status_code=500, detail="Invalid revision entry")
-        entry_id = entry.get("revision_id")
-        if not isinstance(entry_id, int):
-            raise HTTPException(status_code=500, detail="Invalid revision id")
-        if entry_id == revision_id:
-            revision_entry = entry
-            break
+    revision_entry = store.read_revision_entry(post_id, revision_id)
     if revision_entry is None:
         raise HTTPException(status_code=404, detail="Revision not found")
     try:
-        content = read_revision_content(post_id, revision_id)
+        content = store.read_revision_content(post_id, revision_id)
     except FileNotFoundError:
         raise HTTPException(status_code=404, detail="Revision content not found")
     return {
@@ -788,6 +1137,26 @@ def read_blog_revision(
     }
 
 
+@app.get("/blog/{post_id}/revisions/{from_revision_id}/diff/{to_revision_id}")
+def diff_blog_revisions(
+    post_id: str,
+    from_revision_id: int,
+    to_revision_id: int,
+    creds = Depends(security),
+) -> StreamingResponse:
+    require_admin(creds)
+    try:
+        records = get_post_store().diff_revisions(post_id, from_revision_id, to_revision_id)
+    except FileNotFoundError as exc:
+        raise HTTPException(status_code=404, detail=str(exc))
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    return StreamingResponse(
+        (json.dumps(record) + "\n" for record in records),
+        media_type="application/x-ndjson",
+    )
+
+
 @app.get("/blog/revisions")
 def list_blog_revisions(
     post_id: str,
@@ -795,10 +1164,9 @@ def list_blog_revisions(
 ) -> list[dict[str, object]]:
     require_admin(creds)
     try:
-        read_post_meta(post_id)
+        revisions = get_post_store().read_revision_metadata(post_id, include_rejected=True)
     except FileNotFoundError:
         raise HTTPException(status_code=404, detail="Post not found")
-    revisions = read_revision_metadata(post_id)
     if not isinstance(revisions, list):
         raise HTTPException(status_code=500, detail="Invalid revisions")
     summaries: list[dict[str, object]] = []
@@ -821,14 +1189,14 @@ def list_blog_revisions(
 @app.get("/blog/{post_id}/revisions")
 def list_blog_revisions_for_post(
     post_id: str,
+    include_rejected: bool = True,
     creds = Depends(security),
 ) -> list[dict[str, object]]:
     require_admin(creds)
     try:
-        read_post_meta(post_id)
+        revisions = get_post_store().read_revision_metadata(post_id, include_rejected=include_rejected)
     except FileNotFoundError:
         raise HTTPException(status_code=404, detail="Post not found")
-    revisions = read_revision_metadata(post_id)
     if not isinstance(revisions, list):
         raise HTTPException(status_code=500, detail="Invalid revisions")
     summaries: list[dict[str, object]] = []
@@ -843,7 +1211,10 @@ def list_blog_revisions_for_post(
             "parent_revision_id": entry.get("parent_revision_id"),
             "timestamp": entry.get("timestamp"),
             "delta_type": entry.get("delta_type"),
+            "status": entry.get("status"),
         }
+        if "reason" in entry:
+            summary["reason"] = entry.get("reason")
         if "delta_payload" in entry and entry.get("delta_payload") is not None:
             summary["delta_payload"] = entry.get("delta_payload")
         if "actor" in entry and entry.get("actor") is not None:
@@ -864,13 +1235,30 @@ def save_document(payload: DocumentSaveRequest):
 
 
 @app.get("/blog", response_class=HTMLResponse)
-async def get_blog_index(request: Request, format: str = "html"):
-    posts = list_posts(visibility="public")
+async def get_blog_index(
+    request: Request,
+    format: str = "html",
+    author: str | None = None,
+    cursor: str | None = None,
+    limit: int = Query(POSTS_PAGE_SIZE, ge=1, le=MAX_POSTS_PAGE_SIZE),
+):
+    try:
+        page = get_post_store().list_posts_page(
+            visibility="public", author=author, cursor=cursor, limit=limit
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    posts = page.posts
+    next_url = _next_page_url(request, page.next_cursor)
     if format == "html":
         return templates.TemplateResponse(
             "blog_index.html",
-            {"request": request, "posts": posts, "include_drafts": False},
+            {"request": request, "posts": posts, "include_drafts": False, "next_url": next_url},
         )
+    headers: dict[str, str] = {}
+    if page.next_cursor is not None:
+        headers["X-Next-Cursor"] = page.next_cursor
+        headers["Link"] = f'<{next_url}>; rel="next"'
     result = [
         {
             "post_id": p.post_id,
@@ -880,17 +1268,54 @@ async def get_blog_index(request: Request, format: str = "html"):
         }
         for p in posts
     ]
-    return result
+    return JSONResponse(content=jsonable_encoder(result), headers=headers)
+
+
+@app.get("/blog/search", response_class=HTMLResponse)
+async def search_blog(
+    request: Request,
+    q: str,
+    format: str = "html",
+    limit: int = Query(POSTS_PAGE_SIZE, ge=1, le=MAX_POSTS_PAGE_SIZE),
+):
+    try:
+        results = get_post_store().search_posts(q, limit=limit)
+    except NotImplementedError as exc:
+        raise HTTPException(status_code=501, detail=str(exc))
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    if format == "html":
+        return templates.TemplateResponse(
+            "blog_index.html",
+            {
+                "request": request,
+                "posts": [meta for meta, _score in results],
+                "include_drafts": False,
+                "next_url": None,
+            },
+        )
+    result = [
+        {
+            "post_id": meta.post_id,
+            "title": meta.title,
+            "author": meta.author,
+            "created_at": meta.created_at,
+            "score": score,
+        }
+        for meta, score in results
+    ]
+    return JSONResponse(content=jsonable_encoder(result))
 
 
 @app.get("/blog/{post_id}", response_class=HTMLResponse)
 async def get_blog_post(request: Request, post_id: str, format: str = "html"):
     try:
-        meta = read_post_meta(post_id)
+        bundle = get_post_store().load_post_bundle(post_id, parts=("content", "intent"))
+        meta = bundle.meta
         if meta.status != "published":
             raise HTTPException(status_code=404, detail="Post not found")
-        content = read_post_content(post_id)
-        intent = read_post_intent(post_id)
+        content = bundle.content
+        intent = bundle.intent
     except FileNotFoundError:
         raise HTTPException(status_code=404, detail="Post not found")
     except ValueError as exc:
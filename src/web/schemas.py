@@ -2,6 +2,7 @@ from typing import Literal, Self
 
 from pydantic import BaseModel, Field, model_validator, ConfigDict
 from document_writer.domain.intent.types import IntentEnvelope
+from apps.blog.chunk_patch import ChunkOperation
 from apps.blog.types import PostStatus
 
 class DocumentGenerateRequest(BaseModel):
@@ -89,3 +90,40 @@ class BlogStatusResponse(BaseModel):
     post_id: str
     previous_status: PostStatus
     new_status: PostStatus
+
+
+class ChunkPatchRequest(BaseModel):
+    """
+    Manual edit expressed as chunk operations against base_revision_id.
+    The patch is refused when base_revision_id is not the latest revision.
+    """
+    model_config = ConfigDict(extra="forbid")
+
+    base_revision_id: int | None
+    operations: list[ChunkOperation] = Field(min_length=1)
+
+
+class ChunkPatchResponse(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    post_id: str
+    revision_id: int
+    changed_chunks: list[int]
+
+
+class AutosaveRequest(BaseModel):
+    """Latest editor content; buffered and committed after a quiet window."""
+    model_config = ConfigDict(extra="forbid")
+
+    content: str
+    # Revision the content was edited from: the page's, or the last autosave response's.
+    base_revision_id: int | None = None
+
+
+class AutosaveResponse(BaseModel):
+    """revision_id is the revision a pending draft builds on, or the one holding it once committed."""
+    model_config = ConfigDict(extra="forbid")
+
+    post_id: str
+    pending: bool
+    revision_id: int | None = None
@@ -2,8 +2,8 @@
 // Backend responses and templates are the single source of truth.
 import { initEditorController } from "./editor_controller.js";
 import { initCreateEditorController } from "./create_editor_controller.js";
-
-function initManualEditorPage() {}
+import { initManualEditor } from "./manual_editor.js";
+import { initProgressForm } from "./progress_stream.js";
 
 document.addEventListener("DOMContentLoaded", () => {
   const page = document.body?.dataset?.page;
@@ -15,9 +15,13 @@ document.addEventListener("DOMContentLoaded", () => {
       break;
     case "blog-editor-create":
       initCreateEditorController();
+      initProgressForm("intent-form", "/blog/create/stream", "progress-status");
+      break;
+    case "policy-editor":
+      initProgressForm("policy-edit-form", "/blog/edit/stream", "progress-status");
       break;
     case "manual-editor":
-      initManualEditorPage();
+      initManualEditor();
       break;
   }
 });
@@ -0,0 +1,91 @@
+// Post content arrives a window of chunks at a time; the page never embeds the full document.
+const DOWNLOAD_PAGE_SIZE = 200;
+
+async function fetchChunkPage(postId, offset, limit) {
+  const response = await fetch(
+    `/blog/${encodeURIComponent(postId)}/chunks?offset=${offset}&limit=${limit}`,
+  );
+  if (!response.ok) {
+    throw new Error(`Failed to load content (${response.status}).`);
+  }
+  return response.json();
+}
+
+// Pages carry the hash of the content they were cut from; if it changes mid-way, start over.
+export async function fetchMarkdown(postId) {
+  let parts = [];
+  let contentHash = null;
+  let offset = 0;
+  while (offset !== null) {
+    const page = await fetchChunkPage(postId, offset, DOWNLOAD_PAGE_SIZE);
+    if (contentHash !== null && page.content_hash !== contentHash) {
+      parts = [];
+      contentHash = null;
+      offset = 0;
+      continue;
+    }
+    contentHash = page.content_hash;
+    page.chunks.forEach((chunk) => {
+      parts.push(chunk.leading, chunk.text, chunk.trailing);
+    });
+    offset = page.next_offset;
+  }
+  return parts.join("");
+}
+
+export function initChunkLoader(postId, container, statusEl, pageSize) {
+  let nextOffset = 0;
+  let contentHash = null;
+  let loading = false;
+
+  const isNearViewport = () => statusEl.getBoundingClientRect().top < window.innerHeight * 2;
+
+  const loadMore = async () => {
+    if (loading || nextOffset === null) {
+      return;
+    }
+    loading = true;
+    try {
+      let page = await fetchChunkPage(postId, nextOffset, pageSize);
+      if (contentHash !== null && page.content_hash !== contentHash) {
+        // The post was edited while it was being read; reload it from the top.
+        container.replaceChildren();
+        page = await fetchChunkPage(postId, 0, pageSize);
+      }
+      contentHash = page.content_hash;
+      page.chunks.forEach((chunk) => {
+        const block = document.createElement("div");
+        block.className = "article-chunk";
+        block.dataset.chunkIndex = String(chunk.index);
+        block.dataset.chunkHash = chunk.hash;
+        block.innerHTML = chunk.html;
+        container.appendChild(block);
+      });
+      nextOffset = page.next_offset;
+      statusEl.textContent =
+        nextOffset === null ? "" : `Showing ${nextOffset} of ${page.total} chunks`;
+    } catch (error) {
+      statusEl.textContent = error instanceof Error ? error.message : "Failed to load content.";
+      nextOffset = null;
+    } finally {
+      loading = false;
+    }
+    if (nextOffset === null) {
+      observer.disconnect();
+    } else if (isNearViewport()) {
+      // The observer only fires on changes; keep filling while the status line stays in view.
+      loadMore();
+    }
+  };
+
+  const observer = new IntersectionObserver(
+    (entries) => {
+      if (entries.some((entry) => entry.isIntersecting)) {
+        loadMore();
+      }
+    },
+    { rootMargin: "100% 0px" },
+  );
+  observer.observe(statusEl);
+  loadMore();
+}
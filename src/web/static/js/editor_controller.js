@@ -1,6 +1,7 @@
 import { $ } from "./dom.js";
 import { closeModal, openModal } from "./modals.js";
 import { initHelpPopovers } from "./help_popovers.js";
+import { fetchMarkdown, initChunkLoader } from "./chunk_loader.js";
 
 export function initEditorController() {
   const titleModal = $("edit-title-modal");
@@ -101,8 +102,15 @@ export function initEditorController() {
   $("download-cancel-btn")?.addEventListener("click", () =>
     closeModal("download-modal"),
   );
-  $("download-confirm-btn")?.addEventListener("click", () => {
-    const markdown = $("markdown-source")?.value ?? "";
+  $("download-confirm-btn")?.addEventListener("click", async () => {
+    const postId = document.body?.dataset?.postId ?? "";
+    let markdown;
+    try {
+      markdown = await fetchMarkdown(postId);
+    } catch (error) {
+      alert(error instanceof Error ? error.message : "Failed to download post.");
+      return;
+    }
     const filename = $("download-filename")?.value?.trim() || "post.md";
     const blob = new Blob([markdown], { type: "text/markdown" });
     const url = URL.createObjectURL(blob);
@@ -182,6 +190,17 @@ export function initEditorController() {
     });
   });
 
+  const articleEl = $("article-text");
+  const articleStatusEl = $("article-text-status");
+  if (articleEl && articleStatusEl) {
+    initChunkLoader(
+      document.body?.dataset?.postId ?? "",
+      articleEl,
+      articleStatusEl,
+      Number(document.body?.dataset?.chunksPageSize) || 20,
+    );
+  }
+
   initRevisionHistory();
 }
 
@@ -0,0 +1,259 @@
+// The server re-validates every operation; chunking here only sizes the request.
+import { $ } from "./dom.js";
+
+function isBlankLine(line) {
+  return line.replace(/[\r\n]+$/, "") === "";
+}
+
+function isHardSeparator(line) {
+  return line.replace(/[\r\n]+$/, "") === "---";
+}
+
+// Mirrors document_writer.domain.editor.chunking.split_markdown (chunk text only).
+export function splitMarkdownChunks(text) {
+  if (text === "") {
+    return [];
+  }
+  const lines = text.match(/[^\n]*\n|[^\n]+$/g) ?? [];
+  const chunks = [];
+  let current = [];
+  let leading = "";
+  let trailing = "";
+
+  const flush = () => {
+    chunks.push(current.join(""));
+    current = [];
+    leading = "";
+    trailing = "";
+  };
+
+  lines.forEach((line) => {
+    if (isHardSeparator(line)) {
+      if (current.length) {
+        flush();
+      } else if (leading) {
+        chunks.push("");
+        leading = "";
+      }
+      chunks.push(line);
+      trailing = "";
+      return;
+    }
+    if (isBlankLine(line)) {
+      if (current.length) {
+        trailing += line;
+      } else {
+        leading += line;
+      }
+      return;
+    }
+    if (current.length && trailing) {
+      flush();
+    }
+    current.push(line);
+  });
+  if (current.length) {
+    flush();
+  } else if (leading) {
+    chunks.push("");
+  }
+  return chunks;
+}
+
+const MAX_ALIGNMENT_CELLS = 250000;
+
+// Longest common subsequence of chunk texts; returns matched [baseIndex, editedIndex] pairs.
+function alignChunks(base, edited) {
+  if (base.length * edited.length > MAX_ALIGNMENT_CELLS) {
+    return [];
+  }
+  const width = edited.length + 1;
+  const table = new Uint32Array((base.length + 1) * width);
+  for (let i = base.length - 1; i >= 0; i -= 1) {
+    for (let j = edited.length - 1; j >= 0; j -= 1) {
+      table[i * width + j] =
+        base[i] === edited[j]
+          ? table[(i + 1) * width + j + 1] + 1
+          : Math.max(table[(i + 1) * width + j], table[i * width + j + 1]);
+    }
+  }
+  const pairs = [];
+  let i = 0;
+  let j = 0;
+  while (i < base.length && j < edited.length) {
+    if (base[i] === edited[j]) {
+      pairs.push([i, j]);
+      i += 1;
+      j += 1;
+    } else if (table[(i + 1) * width + j] >= table[i * width + j + 1]) {
+      i += 1;
+    } else {
+      j += 1;
+    }
+  }
+  return pairs;
+}
+
+export function chunkOperations(baseChunks, editedChunks) {
+  const operations = [];
+  const pairs = alignChunks(baseChunks, editedChunks);
+  pairs.push([baseChunks.length, editedChunks.length]);
+  let baseStart = 0;
+  let editedStart = 0;
+  pairs.forEach(([baseEnd, editedEnd]) => {
+    const baseGap = baseEnd - baseStart;
+    const editedGap = editedEnd - editedStart;
+    const paired = Math.min(baseGap, editedGap);
+    for (let k = 0; k < paired; k += 1) {
+      operations.push({
+        op: "replace",
+        index: baseStart + k,
+        text: editedChunks[editedStart + k],
+      });
+    }
+    for (let k = paired; k < baseGap; k += 1) {
+      operations.push({ op: "delete", index: baseStart + k });
+    }
+    for (let k = paired; k < editedGap; k += 1) {
+      operations.push({ op: "insert", index: baseEnd, text: editedChunks[editedStart + k] });
+    }
+    baseStart = baseEnd + 1;
+    editedStart = editedEnd + 1;
+  });
+  return operations;
+}
+
+const AUTOSAVE_DEBOUNCE_MS = 1000;
+
+// The server keeps autosaves in a draft and commits one revision after its quiet window.
+// Saves go out one at a time, each naming the revision it builds on, so the editor always
+// knows which committed revision and content its later edits apply to.
+function initAutosave(postId, textarea, base) {
+  let timer = null;
+  let inflight = Promise.resolve();
+  let lastSent = base.content;
+  let delivered = null;
+  let baseRevisionId = base.revisionId;
+  let conflicted = false;
+  const send = () => {
+    timer = null;
+    if (conflicted || textarea.value === lastSent) {
+      return inflight;
+    }
+    const content = textarea.value;
+    lastSent = content;
+    inflight = inflight.then(async () => {
+      try {
+        const response = await fetch(`/blog/edit/${postId}/autosave`, {
+          method: "POST",
+          headers: { "Content-Type": "application/json" },
+          body: JSON.stringify({ content, base_revision_id: baseRevisionId }),
+          keepalive: true,
+        });
+        if (response.status === 409) {
+          conflicted = true;
+          return;
+        }
+        if (response.ok) {
+          baseRevisionId = (await response.json()).revision_id;
+          delivered = content;
+        }
+      } catch (error) {
+        // A later save or the explicit save carries the text.
+      }
+    });
+    return inflight;
+  };
+  textarea.addEventListener("input", () => {
+    if (timer !== null) {
+      clearTimeout(timer);
+    }
+    timer = setTimeout(send, AUTOSAVE_DEBOUNCE_MS);
+  });
+  // Commit the draft; resolve to the revision and content an explicit save builds on,
+  // or null when the post changed underneath the autosaves.
+  return async () => {
+    if (timer !== null) {
+      clearTimeout(timer);
+      timer = null;
+    }
+    await inflight;
+    if (conflicted) {
+      return null;
+    }
+    if (delivered === null) {
+      return base;
+    }
+    const response = await fetch(`/blog/edit/${postId}/autosave/flush`, { method: "POST" });
+    if (response.status === 409) {
+      return null;
+    }
+    if (!response.ok) {
+      throw new Error(`Failed to save autosaved edits (${response.status}).`);
+    }
+    const flushed = await response.json();
+    return { revisionId: flushed.revision_id, content: delivered };
+  };
+}
+
+export function initManualEditor() {
+  const form = $("manual-edit-form");
+  const textarea = $("manual-edit-content");
+  if (!form || !textarea) {
+    return;
+  }
+  const postId = document.body?.dataset?.postId ?? "";
+  const baseRevisionRaw = document.body?.dataset?.baseRevisionId ?? "";
+  const base = {
+    revisionId: baseRevisionRaw === "" ? null : Number(baseRevisionRaw),
+    content: textarea.value,
+  };
+  const settleAutosave =
+    document.body?.dataset?.autosave === "on" ? initAutosave(postId, textarea, base) : async () => base;
+  const conflictMessage = "This post changed since you opened it. Reload to edit the latest revision.";
+
+  form.addEventListener("submit", async (event) => {
+    event.preventDefault();
+    try {
+      const settled = await settleAutosave();
+      if (settled === null) {
+        alert(conflictMessage);
+        return;
+      }
+      const operations = chunkOperations(
+        splitMarkdownChunks(settled.content),
+        splitMarkdownChunks(textarea.value),
+      );
+      if (!operations.length) {
+        window.location.href = `/blog/editor/${postId}`;
+        return;
+      }
+      if (operations.some((operation) => operation.text !== undefined && !operation.text.trim())) {
+        // Empty chunks cannot be expressed as operations; fall back to a full submit.
+        form.submit();
+        return;
+      }
+      const response = await fetch(`/blog/edit/${postId}/chunks`, {
+        method: "PATCH",
+        headers: { "Content-Type": "application/json" },
+        body: JSON.stringify({ base_revision_id: settled.revisionId, operations }),
+      });
+      if (response.ok) {
+        window.location.href = `/blog/editor/${postId}`;
+        return;
+      }
+      if (response.status === 409) {
+        alert(conflictMessage);
+        return;
+      }
+      if (response.status === 400) {
+        // The server could not apply the chunk delta; submit the full document instead.
+        form.submit();
+        return;
+      }
+      alert(`Failed to save edit (${response.status}).`);
+    } catch (error) {
+      alert(error instanceof Error ? error.message : "Failed to save edit.");
+    }
+  });
+}
@@ -0,0 +1,110 @@
+// Progress streams are advisory; the backend redirect target stays authoritative.
+import { $ } from "./dom.js";
+
+function describeEvent(name, data) {
+  switch (name) {
+    case "post_created":
+      return "Post created, generating content...";
+    case "planned":
+      return "Outline planned, writing sections...";
+    case "section":
+      return `Sections written: ${data.completed}/${data.total}` +
+        (data.rejections ? ` (${data.rejections} rejected drafts)` : "");
+    case "chunk":
+      return `Chunks edited: ${data.completed}/${data.total}`;
+    default:
+      return null;
+  }
+}
+
+function parseEventBlock(block) {
+  let name = "message";
+  const dataLines = [];
+  block.split("\n").forEach((line) => {
+    if (line.startsWith("event: ")) {
+      name = line.slice("event: ".length);
+    } else if (line.startsWith("data: ")) {
+      dataLines.push(line.slice("data: ".length));
+    }
+  });
+  if (!dataLines.length) {
+    return null;
+  }
+  return { name, data: JSON.parse(dataLines.join("\n")) };
+}
+
+async function readEventStream(response, onEvent) {
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = "";
+  for (;;) {
+    const { value, done } = await reader.read();
+    if (done) {
+      return;
+    }
+    buffer += decoder.decode(value, { stream: true });
+    let boundary = buffer.indexOf("\n\n");
+    while (boundary !== -1) {
+      const event = parseEventBlock(buffer.slice(0, boundary));
+      buffer = buffer.slice(boundary + 2);
+      if (event) {
+        onEvent(event);
+      }
+      boundary = buffer.indexOf("\n\n");
+    }
+  }
+}
+
+export function initProgressForm(formId, streamUrl, statusId) {
+  const form = $(formId);
+  const status = $(statusId);
+  if (!form || !status) {
+    return;
+  }
+  form.addEventListener("submit", async (event) => {
+    event.preventDefault();
+    const submitButton = form.querySelector('button[type="submit"]');
+    if (submitButton) {
+      submitButton.disabled = true;
+    }
+    status.textContent = "Starting...";
+    let finished = false;
+    try {
+      const response = await fetch(streamUrl, {
+        method: "POST",
+        body: new FormData(form),
+      });
+      if (!response.ok) {
+        const text = await response.text();
+        throw new Error(text || `Request failed (${response.status})`);
+      }
+      await readEventStream(response, ({ name, data }) => {
+        if (name === "error") {
+          finished = true;
+          status.textContent =
+            typeof data.detail === "string" ? data.detail : JSON.stringify(data.detail);
+          return;
+        }
+        if (name === "done") {
+          finished = true;
+          status.textContent = "Done.";
+          window.location.href = data.redirect || `/blog/editor/${data.post_id}`;
+          return;
+        }
+        const message = describeEvent(name, data);
+        if (message) {
+          status.textContent = message;
+        }
+      });
+      if (!finished) {
+        status.textContent = "Connection closed before the job finished.";
+      }
+    } catch (error) {
+      status.textContent = error instanceof Error ? error.message : "Request failed.";
+    } finally {
+      if (submitButton && !finished) {
+        submitButton.disabled = false;
+      }
+    }
+  });
+}
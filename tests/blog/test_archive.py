@@ -0,0 +1,110 @@
+import io
+import tarfile
+from pathlib import Path
+
+import pytest
+
+from apps.blog import archive as archive_module
+from apps.blog import post_layout, storage
+from apps.blog.archive import export_posts, import_posts
+from apps.blog.storage import (
+    apply_blog_update,
+    create_post,
+    list_posts,
+    read_post_content,
+    read_revision_content,
+)
+
+
+@pytest.fixture()
+def posts_root(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    root = tmp_path / "posts"
+    root.mkdir()
+    monkeypatch.setattr(storage, "POSTS_ROOT", root)
+    return root
+
+
+def _apply(post_id: str, content: str) -> int:
+    return apply_blog_update(
+        post_id=post_id,
+        new_content=content,
+        delta_type="content_free_edit",
+        source="manual",
+        parent_revision_id=None,
+        delta_payload={},
+        actor={"type": "human", "id": "tester"},
+    ).revision_id
+
+
+def test_round_trip_restores_posts_history_and_index(
+    posts_root: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    first_id, _ = create_post(title="First", author="tester", intent={}, content="One.\n\nTwo.")
+    second_id, _ = create_post(title="Second", author="other", intent={}, content="Three.")
+    revision_id = _apply(first_id, "One.\n\nTwo, edited.")
+    archive = tmp_path / "backup.tar.gz"
+
+    exported = export_posts(archive, posts_root=posts_root)
+    assert exported.posts == 2 and exported.blobs > 0
+
+    target = tmp_path / "restored"
+    target.mkdir()
+    post_layout.write_scheme(target, "hash")
+    monkeypatch.setattr(storage, "POSTS_ROOT", target)
+    imported = import_posts(archive, posts_root=target)
+
+    assert (imported.posts, imported.files, imported.blobs) == (2, exported.files, exported.blobs)
+    assert post_layout.post_dir(target, first_id) == post_layout.layout_path(target, first_id, "hash")
+    assert read_post_content(second_id) == "Three."
+    assert read_revision_content(first_id, revision_id) == "One.\n\nTwo, edited."
+    assert {meta.post_id for meta in list_posts(visibility="editor")} == {first_id, second_id}
+    assert not [path for path in target.iterdir() if path.name.startswith(".import-")]
+
+    assert sorted(import_posts(archive, posts_root=target).skipped) == sorted([first_id, second_id])
+
+
+def test_import_rejects_tampered_members(posts_root: Path, tmp_path: Path) -> None:
+    post_id, _ = create_post(title="Post", author="tester", intent={}, content="Body.")
+    archive = tmp_path / "backup.tar"
+    export_posts(archive, post_ids=[post_id], posts_root=posts_root)
+
+    tampered = tmp_path / "tampered.tar"
+    with tarfile.open(archive) as source, tarfile.open(tampered, "w", format=tarfile.PAX_FORMAT) as sink:
+        for member in source:
+            data = source.extractfile(member).read()
+            if member.name.endswith("content.md"):
+                data = b"Changed."
+                member.size = len(data)
+            sink.addfile(member, io.BytesIO(data))
+
+    target = tmp_path / "restored"
+    target.mkdir()
+    with pytest.raises(ValueError, match="Digest mismatch"):
+        import_posts(tampered, posts_root=target)
+    assert not post_layout.post_dir(target, post_id).exists()
+
+
+def test_failed_import_indexes_the_posts_it_moved_in(
+    posts_root: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    first_id, _ = create_post(title="First", author="tester", intent={}, content="One.")
+    second_id, _ = create_post(title="Second", author="tester", intent={}, content="Two.")
+    archive = tmp_path / "backup.tar"
+    export_posts(archive, post_ids=[first_id, second_id], posts_root=posts_root)
+    with tarfile.open(archive, "a") as tar:
+        member = tarfile.TarInfo("unexpected/member")
+        member.size = 1
+        tar.addfile(member, io.BytesIO(b"x"))
+
+    target = tmp_path / "restored"
+    target.mkdir()
+    monkeypatch.setattr(storage, "POSTS_ROOT", target)
+    calls = []
+    monkeypatch.setattr(archive_module.post_index, "rebuild", lambda root: calls.append(("posts", root)))
+    monkeypatch.setattr(archive_module.search_index, "rebuild", lambda root: calls.append(("search", root)))
+    with pytest.raises(ValueError, match="Unexpected archive member"):
+        import_posts(archive, posts_root=target)
+
+    assert post_layout.post_dir(target, first_id).exists()
+    assert not post_layout.post_dir(target, second_id).exists()
+    assert calls == [("posts", target), ("search", target)]
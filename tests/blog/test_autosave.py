@@ -0,0 +1,132 @@
+import hashlib
+import time
+from pathlib import Path
+
+import pytest
+
+from apps.blog import post_revision_writer, storage
+from apps.blog.autosave import AutosaveBuffer
+from apps.blog.post_revision_writer import PostRevisionWriter
+from apps.blog.storage import RevisionConflictError, create_post, read_post_content, read_revision_metadata
+
+ACTOR = {"type": "human", "id": "tester"}
+
+
+@pytest.fixture()
+def posts_root(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    root = tmp_path / "posts"
+    root.mkdir()
+    monkeypatch.setattr(storage, "POSTS_ROOT", root)
+    monkeypatch.setattr(post_revision_writer, "POSTS_ROOT", root)
+    return root
+
+
+def _wait_for(condition, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def test_saves_in_a_quiet_window_become_one_revision(posts_root: Path) -> None:
+    post_id, _ = create_post(title="Post", author="tester", intent={}, content="Draft.")
+    buffer = AutosaveBuffer(quiet_seconds=0.2)
+    texts = [f"Draft.\n\nTyping {'x' * n}" for n in range(30)]
+
+    for text in texts:
+        buffer.save(post_id, text, actor=ACTOR)
+    assert read_revision_metadata(post_id) == []
+    assert buffer.pending(post_id) == texts[-1]
+
+    _wait_for(lambda: buffer.pending(post_id) is None)
+    revisions = read_revision_metadata(post_id)
+    assert len(revisions) == 1
+    assert revisions[0]["delta_payload"]["coalesced_saves"] == 30
+    assert revisions[0]["delta_payload"]["after_hash"] == hashlib.sha256(texts[-1].encode("utf-8")).hexdigest()
+    assert read_post_content(post_id) == texts[-1]
+    buffer.close()
+
+
+def test_flush_commits_now_and_refuses_to_overwrite_other_writers(posts_root: Path) -> None:
+    post_id, _ = create_post(title="Post", author="tester", intent={}, content="Draft.")
+    buffer = AutosaveBuffer(quiet_seconds=60)
+
+    buffer.save(post_id, "Autosaved.", actor=ACTOR)
+    assert buffer.flush(post_id) == 1
+    assert buffer.flush(post_id) is None
+
+    buffer.save(post_id, "Autosaved again.", actor=ACTOR)
+    PostRevisionWriter().apply_delta(
+        post_id,
+        actor=ACTOR,
+        delta_type="content_free_edit",
+        delta_payload={},
+        new_content="Saved elsewhere.",
+    )
+    with pytest.raises(RevisionConflictError):
+        buffer.flush(post_id)
+    assert buffer.pending(post_id) == "Autosaved again."
+    assert read_post_content(post_id) == "Saved elsewhere."
+
+    buffer.discard(post_id)
+    buffer.close()
+    assert len(read_revision_metadata(post_id)) == 2
+
+
+def test_draft_is_shared_across_buffers(posts_root: Path) -> None:
+    post_id, _ = create_post(title="Post", author="tester", intent={}, content="Draft.")
+    first = AutosaveBuffer(quiet_seconds=60)
+    second = AutosaveBuffer(quiet_seconds=60)
+
+    assert first.save(post_id, "From one worker.", actor=ACTOR, base_revision_id=0).pending
+    second.save(post_id, "From another.", actor=ACTOR, base_revision_id=0)
+    assert first.pending(post_id) == "From another."
+    assert first.flush(post_id) == 1
+    assert second.pending(post_id) is None
+    assert read_revision_metadata(post_id)[0]["delta_payload"]["coalesced_saves"] == 2
+    first.close()
+    second.close()
+
+
+def test_save_from_a_stale_revision_reports_a_conflict(posts_root: Path) -> None:
+    post_id, _ = create_post(title="Post", author="tester", intent={}, content="Draft.")
+    buffer = AutosaveBuffer(quiet_seconds=60)
+
+    buffer.save(post_id, "Autosaved.", actor=ACTOR, base_revision_id=0)
+    PostRevisionWriter().apply_delta(
+        post_id,
+        actor=ACTOR,
+        delta_type="content_free_edit",
+        delta_payload={},
+        new_content="Saved elsewhere.",
+    )
+    with pytest.raises(RevisionConflictError):
+        buffer.flush(post_id)
+
+    state = buffer.save(post_id, "Still typing.", actor=ACTOR, base_revision_id=0)
+    assert state.conflict and state.pending
+    assert buffer.pending(post_id) == "Still typing."
+    assert buffer.save(post_id, "Older tab.", actor=ACTOR, base_revision_id=5).conflict
+
+    # A save from the latest revision starts over.
+    state = buffer.save(post_id, "Rebased.", actor=ACTOR, base_revision_id=1)
+    assert (state.base_revision_id, state.pending, state.conflict) == (1, True, False)
+    assert buffer.flush(post_id) == 2
+    assert read_post_content(post_id) == "Rebased."
+    buffer.close()
+
+
+def test_save_from_before_a_commit_continues_the_draft(posts_root: Path) -> None:
+    post_id, _ = create_post(title="Post", author="tester", intent={}, content="Draft.")
+    buffer = AutosaveBuffer(quiet_seconds=60)
+
+    buffer.save(post_id, "First.", actor=ACTOR, base_revision_id=0)
+    assert buffer.flush(post_id) == 1
+    assert buffer.state(post_id).base_revision_id == 1
+
+    # The editor had not seen the commit yet when it sent this.
+    state = buffer.save(post_id, "Second.", actor=ACTOR, base_revision_id=0)
+    assert (state.base_revision_id, state.conflict) == (1, False)
+    assert buffer.flush(post_id) == 2
+    assert read_post_content(post_id) == "Second."
+    buffer.close()
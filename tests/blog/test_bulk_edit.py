@@ -0,0 +1,93 @@
+from pathlib import Path
+
+import pytest
+
+from apps.blog import post_revision_writer, storage
+from apps.blog.bulk_edit import PostFilter, apply_policy_edit_all
+from apps.blog.hashing import text_digest
+from apps.blog.post_revision_writer import PostRevisionWriter
+from apps.blog.storage import (
+    create_post,
+    read_post_content,
+    read_revision_metadata,
+    update_post_status,
+)
+
+
+POLICY = "---\nrules:\n  - literal: colour\n    replace: color\n---\n"
+
+
+@pytest.fixture()
+def posts_root(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    root = tmp_path / "posts"
+    root.mkdir()
+    monkeypatch.setattr(storage, "POSTS_ROOT", root)
+    monkeypatch.setattr(post_revision_writer, "POSTS_ROOT", root)
+    return root
+
+
+def test_edit_all_commits_each_matching_draft(posts_root: Path, tmp_path: Path) -> None:
+    first_id, _ = create_post(
+        title="First",
+        author="alice",
+        intent={},
+        content="A colour.\n\nAnother colour.\n\nPlain.",
+    )
+    second_id, _ = create_post(
+        title="Second",
+        author="alice",
+        intent={},
+        content="No change here.",
+    )
+    other_author_id, _ = create_post(
+        title="Other",
+        author="bob",
+        intent={},
+        content="Bob's colour.",
+    )
+    published_id, _ = create_post(
+        title="Published",
+        author="alice",
+        intent={},
+        content="Published colour.",
+    )
+    update_post_status(published_id, "published")
+    progress_path = tmp_path / "progress.jsonl"
+
+    result = apply_policy_edit_all(
+        POLICY,
+        post_filter=PostFilter(author="alice"),
+        max_workers=3,
+        max_pending=2,
+        progress_path=progress_path,
+    )
+
+    assert [item.post_id for item in result.edited] == [first_id]
+    assert result.edited[0].changed_chunks == [0, 1]
+    assert result.unchanged == [second_id]
+    assert result.failed == {}
+    assert read_post_content(first_id) == "A color.\n\nAnother color.\n\nPlain."
+    assert read_post_content(other_author_id) == "Bob's colour."
+    assert read_post_content(published_id) == "Published colour."
+    assert len(read_revision_metadata(first_id)) == 1
+
+    resumed = apply_policy_edit_all(
+        POLICY,
+        post_filter=PostFilter(author="alice"),
+        progress_path=progress_path,
+    )
+    assert sorted(resumed.resumed) == sorted([first_id, second_id])
+    assert resumed.edited == []
+    assert len(read_revision_metadata(first_id)) == 1
+
+    PostRevisionWriter().apply_delta(
+        second_id,
+        actor={"type": "human", "id": "tester"},
+        delta_type="content_free_edit",
+        delta_payload={"changed_chunks": [0], "after_hash": text_digest("A new colour.")},
+        new_content="A new colour.",
+    )
+    rerun = apply_policy_edit_all(POLICY, post_filter=PostFilter(author="alice"), progress_path=progress_path)
+    assert rerun.resumed == [first_id]
+    assert [item.post_id for item in rerun.edited] == [second_id]
+    assert read_post_content(second_id) == "A new color."
@@ -0,0 +1,54 @@
+from apps.blog.chunk_diff import ChunkMove, diff_markdown
+
+
+def _build_content(chunks: list[str]) -> str:
+    return "\n\n".join(chunks)
+
+
+def test_identical_content_has_empty_diff() -> None:
+    content = _build_content(["Alpha", "Beta", "Gamma"])
+    diff = diff_markdown(content, content)
+    assert diff.is_empty
+    assert diff.changed_chunks == []
+    assert diff.unchanged == ((0, 0), (1, 1), (2, 2))
+
+
+def test_insert_near_top_only_marks_inserted_chunk() -> None:
+    before = _build_content(["Alpha", "Beta", "Gamma", "Delta"])
+    after = _build_content(["Alpha", "New", "Beta", "Gamma", "Delta"])
+    diff = diff_markdown(before, after)
+    assert diff.inserted == (1,)
+    assert diff.deleted == ()
+    assert diff.modified == ()
+    assert diff.changed_chunks == [1]
+
+
+def test_delete_reports_before_index() -> None:
+    before = _build_content(["Alpha", "Beta", "Gamma"])
+    after = _build_content(["Alpha", "Gamma"])
+    diff = diff_markdown(before, after)
+    assert diff.deleted == (1,)
+    assert diff.changed_chunks == []
+    assert not diff.is_empty
+
+
+def test_modified_chunk_is_paired_in_place() -> None:
+    before = _build_content(["Alpha", "Beta", "Gamma"])
+    after = _build_content(["Alpha", "Beta edited", "Gamma"])
+    diff = diff_markdown(before, after)
+    assert diff.modified == ((1, 1),)
+    assert diff.changed_chunks == [1]
+
+
+def test_moved_chunk_is_not_changed() -> None:
+    before = _build_content(["Alpha", "Beta", "Gamma", "Delta"])
+    after = _build_content(["Beta", "Gamma", "Delta", "Alpha"])
+    diff = diff_markdown(before, after)
+    assert diff.moved == (ChunkMove(before_index=0, after_index=3),)
+    assert diff.changed_chunks == []
+
+
+def test_dropping_the_final_line_break_changes_the_last_chunk() -> None:
+    diff = diff_markdown("Alpha.\n\nGamma.\n", "Alpha.\n\nGamma.")
+    assert (diff.modified, diff.changed_chunks) == (((1, 1),), [1])
+    assert diff_markdown("Alpha.\n\nGamma.", "Alpha.\n\nGamma.").is_empty
@@ -0,0 +1,57 @@
+import pytest
+
+from apps.blog.chunk_diff import chunk_hash
+from apps.blog.chunk_patch import ChunkOperation, apply_chunk_operations
+
+
+BASE = "Alpha\n\nBeta\n\nGamma"
+
+
+def test_replace_by_index_keeps_separators() -> None:
+    result = apply_chunk_operations(
+        BASE,
+        [ChunkOperation(op="replace", index=1, text="Beta edited\n")],
+    )
+    assert result.content == "Alpha\n\nBeta edited\n\nGamma"
+    assert result.changed_chunks == [1]
+
+
+def test_insert_and_delete_report_exact_indices() -> None:
+    result = apply_chunk_operations(
+        BASE,
+        [
+            ChunkOperation(op="insert", index=0, text="Intro\n"),
+            ChunkOperation(op="delete", chunk_hash=chunk_hash("Beta\n")),
+            ChunkOperation(op="insert", index=3, text="Outro"),
+        ],
+    )
+    assert result.content == "Intro\n\nAlpha\n\nGamma\n\nOutro"
+    # Gamma gained the line break that separates it from Outro.
+    assert result.changed_chunks == [0, 2, 3]
+    assert result.deleted_chunks == [1]
+
+
+def test_text_without_trailing_newline_gets_a_boundary() -> None:
+    result = apply_chunk_operations(
+        BASE,
+        [ChunkOperation(op="replace", index=0, text="Alpha edited")],
+    )
+    assert result.content == "Alpha edited\n\nBeta\n\nGamma"
+
+
+def test_no_op_replace_changes_nothing() -> None:
+    result = apply_chunk_operations(BASE, [ChunkOperation(op="replace", index=2, text="Gamma")])
+    assert result.content == BASE
+    assert result.changed_chunks == []
+
+
+def test_invalid_operations_rejected() -> None:
+    with pytest.raises(ValueError):
+        apply_chunk_operations(BASE, [ChunkOperation(op="delete", index=5)])
+    with pytest.raises(ValueError):
+        apply_chunk_operations(
+            BASE,
+            [ChunkOperation(op="replace", index=0, chunk_hash=chunk_hash("Beta\n"), text="X")],
+        )
+    with pytest.raises(ValueError):
+        apply_chunk_operations(BASE, [ChunkOperation(op="replace", index=0, text="One\n\nTwo\n")])
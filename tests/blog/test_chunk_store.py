@@ -0,0 +1,79 @@
+from pathlib import Path
+
+import pytest
+
+from apps.blog import chunk_store, storage
+from apps.blog.chunk_diff import chunk_hash
+from apps.blog.storage import (
+    apply_blog_update,
+    create_post,
+    read_post_content,
+    read_revision_content,
+)
+
+
+@pytest.fixture()
+def posts_root(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    root = tmp_path / "posts"
+    root.mkdir()
+    monkeypatch.setattr(storage, "POSTS_ROOT", root)
+    return root
+
+
+def _apply(post_id: str, content: str) -> int:
+    return apply_blog_update(
+        post_id=post_id,
+        new_content=content,
+        delta_type="content_free_edit",
+        source="manual",
+        parent_revision_id=None,
+        delta_payload={},
+        actor={"type": "human", "id": "tester"},
+    ).revision_id
+
+
+def _blob_count(posts_root: Path) -> int:
+    return sum(1 for path in (posts_root / chunk_store.CHUNKS_DIR_NAME).rglob("*") if path.is_file())
+
+
+def test_snapshots_are_deduplicated_and_replayed_exactly(posts_root: Path) -> None:
+    first_id, _ = create_post(title="First", author="tester", intent={}, content="Draft.")
+    second_id, _ = create_post(title="Second", author="tester", intent={}, content="Draft.")
+
+    v1 = "# Title\n\nShared paragraph.\n\n\nOnly here.\n"
+    v2 = "# Title\n\nShared paragraph.\n\n\nChanged here.\n"
+    rev1 = _apply(first_id, v1)
+    assert _blob_count(posts_root) == 3
+    rev2 = _apply(first_id, v2)
+    assert _blob_count(posts_root) == 4
+    _apply(second_id, v1)
+    assert _blob_count(posts_root) == 4
+
+    assert read_revision_content(first_id, rev1) == v1
+    assert read_revision_content(first_id, rev2) == v2
+    assert not list((posts_root / first_id / "revisions").glob("*.md"))
+
+    (posts_root / first_id / "content.md").unlink()
+    assert read_post_content(first_id) == v2
+
+
+def test_corrupt_blob_is_detected(posts_root: Path) -> None:
+    post_id, _ = create_post(title="Post", author="tester", intent={}, content="Draft.")
+    revision_id = _apply(post_id, "Body text.")
+    chunk_store.blob_path(posts_root, chunk_hash("Body text.")).write_text("tampered")
+
+    with pytest.raises(ValueError):
+        read_revision_content(post_id, revision_id)
+
+
+def test_put_blob_rewrites_a_blob_pruned_under_it(posts_root: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    digest = chunk_store.put_blob(posts_root, "Shared.\n")
+    utime = chunk_store.os.utime
+
+    def pruned_first(path, *args, **kwargs):
+        Path(path).unlink(missing_ok=True)
+        return utime(path, *args, **kwargs)
+
+    monkeypatch.setattr(chunk_store.os, "utime", pruned_first)
+    assert chunk_store.put_blob(posts_root, "Shared.\n") == digest
+    assert chunk_store.get_blob(posts_root, digest) == "Shared.\n"
@@ -0,0 +1,75 @@
+from pathlib import Path
+
+import pytest
+
+from apps.blog import chunk_store, revision_pack, storage
+from apps.blog.compaction import collect_garbage
+from apps.blog.storage import (
+    apply_blog_update,
+    create_post,
+    read_post_content,
+    read_revision_content,
+)
+
+
+@pytest.fixture()
+def posts_root(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    root = tmp_path / "posts"
+    root.mkdir()
+    monkeypatch.setattr(storage, "POSTS_ROOT", root)
+    return root
+
+
+def _apply(post_id: str, content: str) -> int:
+    return apply_blog_update(
+        post_id=post_id,
+        new_content=content,
+        delta_type="content_free_edit",
+        source="manual",
+        parent_revision_id=None,
+        delta_payload={},
+        actor={"type": "human", "id": "tester"},
+    ).revision_id
+
+
+@pytest.mark.parametrize("delta", [True, False])
+def test_gc_packs_history_and_prunes_orphans(posts_root: Path, delta: bool) -> None:
+    post_id, _ = create_post(title="Post", author="tester", intent={}, content="Draft.")
+    versions: dict[int, str] = {}
+    for n in range(20):
+        content = f"# Title\n\nParagraph {n}.\n\nStable tail.\n"
+        versions[_apply(post_id, content)] = content
+    latest = max(versions)
+
+    result = collect_garbage(posts_root, delta=delta, grace_seconds=0)
+
+    assert result.revisions_packed == 19
+    assert result.files_removed == 19
+    assert result.blobs_pruned == 19
+    revisions_dir = posts_root / post_id / "revisions"
+    assert sorted(path.name for path in revisions_dir.iterdir()) == [
+        f"{latest}.manifest.json",
+        revision_pack.PACK_NAME,
+    ]
+    for revision_id, content in versions.items():
+        assert read_revision_content(post_id, revision_id) == content
+    (posts_root / post_id / "content.md").unlink()
+    assert read_post_content(post_id) == versions[latest]
+
+    newer = _apply(post_id, "Rewritten.\n")
+    pack_before = (revisions_dir / revision_pack.PACK_NAME).read_bytes()
+    again = collect_garbage(posts_root, delta=delta, grace_seconds=0)
+    assert again.revisions_packed == 1
+    # Packed records are kept as they are; only the newly packed revision is encoded.
+    assert pack_before[-100:] in (revisions_dir / revision_pack.PACK_NAME).read_bytes()
+    assert collect_garbage(posts_root, delta=delta, grace_seconds=0).revisions_packed == 0
+    assert read_revision_content(post_id, latest) == versions[latest]
+    assert read_revision_content(post_id, newer) == "Rewritten.\n"
+
+
+def test_gc_keeps_recent_orphans_within_grace(posts_root: Path) -> None:
+    chunk_store.put_blob(posts_root, "Not referenced yet.")
+
+    result = collect_garbage(posts_root, grace_seconds=3600)
+
+    assert result.blobs_pruned == 0
@@ -0,0 +1,128 @@
+import hashlib
+from pathlib import Path
+
+import markdown
+import pytest
+
+from apps.blog import chunk_blocks, chunk_store, post_revision_writer, storage
+from apps.blog.post_revision_writer import PostRevisionWriter
+from apps.blog.storage import create_post, read_content_chunks, read_post_content
+
+
+@pytest.fixture()
+def posts_root(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    root = tmp_path / "posts"
+    root.mkdir()
+    monkeypatch.setattr(storage, "POSTS_ROOT", root)
+    monkeypatch.setattr(post_revision_writer, "POSTS_ROOT", root)
+    return root
+
+
+def _join(chunks: list[dict]) -> str:
+    return "".join(chunk["leading"] + chunk["text"] + chunk["trailing"] for chunk in chunks)
+
+
+def test_window_is_served_from_the_manifest(posts_root: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    content = "\n\n".join(f"Paragraph {n}." for n in range(100))
+    post_id, _ = create_post(title="Long", author="tester", intent={}, content="Draft.")
+    PostRevisionWriter().apply_delta(
+        post_id,
+        actor={"type": "human", "id": "tester"},
+        delta_type="content_free_edit",
+        delta_payload={"after_hash": hashlib.sha256(content.encode("utf-8")).hexdigest()},
+        new_content=content,
+    )
+    reads: list[str] = []
+    get_blob = chunk_store.get_blob
+    def counting_get_blob(root: Path, digest: str) -> str:
+        reads.append(digest)
+        return get_blob(root, digest)
+
+    monkeypatch.setattr(chunk_store, "get_blob", counting_get_blob)
+    monkeypatch.setattr(storage, "split_markdown", None)
+    monkeypatch.setattr(chunk_blocks, "split_markdown", None)
+    monkeypatch.setattr(storage, "read_post_content", None)
+
+    window = read_content_chunks(post_id, offset=40, limit=10)
+
+    assert window.total == 100
+    assert [chunk["index"] for chunk in window.chunks] == list(range(40, 50))
+    assert window.chunks[0]["text"] == "Paragraph 40.\n"
+    assert len(reads) == 10
+
+
+def test_window_falls_back_to_splitting_content(posts_root: Path) -> None:
+    post_id, _ = create_post(title="Fresh", author="tester", intent={}, content="One.\n\nTwo.\n\nThree.")
+
+    first = read_content_chunks(post_id, limit=2)
+    rest = read_content_chunks(post_id, offset=2, limit=2)
+
+    assert (first.total, len(first.chunks), len(rest.chunks)) == (3, 2, 1)
+    assert _join(first.chunks + rest.chunks) == read_post_content(post_id)
+    with pytest.raises(ValueError):
+        read_content_chunks(post_id, offset=-1)
+
+
+def test_blocks_render_like_the_whole_document(posts_root: Path) -> None:
+    content = (
+        "Title\n=====\n\nIntro with a [link][ref].\n\n"
+        "```python\ndef f():\n\n    return 1\n```\n\n"
+        "- one\n\n- two\n\n    still two\n\n"
+        "Para after.\n\n> quote one\n\n> quote two\n\n"
+        "[ref]: https://example.com\n\nTail with [link][ref].\n"
+    )
+    post_id, _ = create_post(title="Blocks", author="tester", intent={}, content=content)
+
+    window = read_content_chunks(post_id, offset=3, limit=4)
+
+    # The fence started before the window; the list runs past its end.
+    assert sorted(window.blocks) == [4]
+    assert window.blocks[4].startswith("- one\n\n- two\n\n    still two")
+    assert window.content_hash == hashlib.sha256(content.encode("utf-8")).hexdigest()
+    assert window.revision_id is None
+
+    whole = read_content_chunks(post_id, limit=50)
+    rendered = [
+        markdown.markdown(whole.blocks[index], extensions=["fenced_code"]) for index in sorted(whole.blocks)
+    ]
+    expected = markdown.markdown(content, extensions=["fenced_code"])
+    assert "\n".join(html for html in rendered if html) == expected
+
+
+def test_manifest_window_matches_splitting_the_content(
+    posts_root: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    content = (
+        "Intro with a [link][ref].\n\n"
+        "- one\n\n- two\n\n    still two\n\n"
+        "Para after.\n\n[ref]: https://example.com\n"
+    )
+    post_id, _ = create_post(title="Blocks", author="tester", intent={}, content="Draft.")
+    PostRevisionWriter().apply_delta(
+        post_id,
+        actor={"type": "human", "id": "tester"},
+        delta_type="content_free_edit",
+        delta_payload={"after_hash": hashlib.sha256(content.encode("utf-8")).hexdigest()},
+        new_content=content,
+    )
+    with monkeypatch.context() as patched:
+        patched.setattr(storage, "_current_manifest", lambda *_args: None)
+        split = read_content_chunks(post_id, offset=1, limit=2)
+    post_dir = storage.post_layout.post_dir(posts_root, post_id)
+    manifest = chunk_store.read_manifest_payload(post_dir, storage.read_last_revision_id(post_id))
+    assert manifest is not None and manifest["starts"] == [0, 1, 1, 1, 4, 5]
+    reads: list[str] = []
+    get_blob = chunk_store.get_blob
+
+    def counting_get_blob(root: Path, digest: str) -> str:
+        reads.append(digest)
+        return get_blob(root, digest)
+
+    monkeypatch.setattr(chunk_store, "get_blob", counting_get_blob)
+    monkeypatch.setattr(chunk_blocks, "split_markdown", None)
+
+    window = read_content_chunks(post_id, offset=1, limit=2)
+
+    # The list block starting in the window also needs its third chunk.
+    assert len(reads) == 3
+    assert window == split
@@ -0,0 +1,115 @@
+import hashlib
+import json
+from pathlib import Path
+
+import pytest
+
+from apps.blog import post_revision_writer, state_checkpoint, storage
+from apps.blog.post_revision_writer import PostRevisionWriter
+from apps.blog.storage import apply_blog_update, create_post, update_post_status
+
+
+@pytest.fixture()
+def posts_root(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    root = tmp_path / "posts"
+    root.mkdir()
+    monkeypatch.setattr(storage, "POSTS_ROOT", root)
+    monkeypatch.setattr(post_revision_writer, "POSTS_ROOT", root)
+    return root
+
+
+def _hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _apply(post_id: str, content: str, **kwargs) -> int:
+    return apply_blog_update(
+        post_id=post_id,
+        new_content=content,
+        delta_type=kwargs.pop("delta_type", "content_free_edit"),
+        source="manual",
+        parent_revision_id=None,
+        delta_payload=kwargs.pop("delta_payload", {"after_hash": _hash(content)}),
+        actor={"type": "human", "id": "tester"},
+        **kwargs,
+    ).revision_id
+
+
+def test_state_replays_applied_rejected_and_revert_deltas(posts_root: Path) -> None:
+    post_id, _ = create_post(title="Post", author="tester", intent={}, content="Draft.")
+    first = _apply(post_id, "First.")
+    _apply(post_id, "Ignored.", delta_payload={}, status="rejected")
+    _apply(
+        post_id,
+        "First.",
+        delta_type="title_changed",
+        delta_payload={"new_title": "Renamed"},
+        meta_updates={"title": "Renamed"},
+    )
+    reverted = _apply(post_id, "Draft.", delta_type="revert")
+    update_post_status(post_id, "published")
+
+    state = PostRevisionWriter().get_current_state(post_id)
+
+    assert state.title == "Renamed"
+    assert state.author == "tester"
+    assert state.status == "published"
+    assert state.content_ref == _hash("Draft.")
+    assert state.revision_id == reverted > first
+
+
+def test_checkpoint_advances_after_interval(posts_root: Path) -> None:
+    post_id, _ = create_post(title="Post", author="tester", intent={}, content="Draft.")
+    post_dir = posts_root / post_id
+    for n in range(3):
+        last = _apply(post_id, f"Version {n}.")
+
+    state = state_checkpoint.load_derived_state(post_id, posts_root, interval=5)
+    assert state_checkpoint.read_checkpoint(post_dir)[1] == 0
+
+    for n in range(3, 6):
+        last = _apply(post_id, f"Version {n}.")
+    state = state_checkpoint.load_derived_state(post_id, posts_root, interval=5)
+
+    checkpoint_state, through = state_checkpoint.read_checkpoint(post_dir)
+    assert through == last == state.revision_id
+    assert checkpoint_state.content_ref == state.content_ref == _hash("Version 5.")
+
+
+def test_state_for_post_without_checkpoint(posts_root: Path) -> None:
+    post_id, _ = create_post(title="Post", author="tester", intent={}, content="Draft.")
+    revision_id = _apply(post_id, "Edited.")
+    checkpoint = state_checkpoint.checkpoint_path(posts_root / post_id)
+    checkpoint.unlink()
+
+    state = PostRevisionWriter().get_current_state(post_id)
+
+    assert state.content_ref == _hash("Edited.")
+    assert state.revision_id == revision_id
+    assert json.loads(checkpoint.read_text())["through_revision_id"] == revision_id
+    assert [entry["revision_id"] for entry in PostRevisionWriter().get_revision_log(post_id)] == [
+        revision_id
+    ]
+
+
+def test_reader_does_not_replace_a_newer_checkpoint(
+    posts_root: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    post_id, _ = create_post(title="Post", author="tester", intent={}, content="Draft.")
+    post_dir = posts_root / post_id
+    for n in range(3):
+        last = _apply(post_id, f"Version {n}.")
+    newer = state_checkpoint.read_checkpoint(post_dir)[0]
+    replay = state_checkpoint.revision_log.iter_revisions_after
+
+    def racing_replay(directory: Path, after: int):
+        # Another reader checkpoints past this one while it is still replaying.
+        state_checkpoint.write_checkpoint(directory, newer, last + 1)
+        yield from replay(directory, after)
+
+    monkeypatch.setattr(state_checkpoint.revision_log, "iter_revisions_after", racing_replay)
+    state = state_checkpoint.load_derived_state(post_id, posts_root, interval=1)
+
+    assert state.revision_id == last
+    assert state_checkpoint.read_checkpoint(post_dir)[1] == last + 1
+    assert not list(post_dir.glob("*.tmp"))
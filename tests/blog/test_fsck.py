@@ -0,0 +1,120 @@
+import hashlib
+from pathlib import Path
+
+import pytest
+
+from apps.blog import chunk_store, hashing, post_layout, post_revision_writer, revision_log, storage
+from apps.blog.fsck import check_post, fsck
+from apps.blog.post_revision_writer import PostRevisionWriter
+from apps.blog.storage import create_post, read_post_content
+
+
+@pytest.fixture()
+def posts_root(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    root = tmp_path / "posts"
+    root.mkdir()
+    monkeypatch.setattr(storage, "POSTS_ROOT", root)
+    monkeypatch.setattr(post_revision_writer, "POSTS_ROOT", root)
+    return root
+
+
+def _edit(post_id: str, content: str) -> int:
+    return PostRevisionWriter().apply_delta(
+        post_id,
+        actor={"type": "human", "id": "tester"},
+        delta_type="content_free_edit",
+        delta_payload={"after_hash": hashlib.sha256(content.encode("utf-8")).hexdigest()},
+        new_content=content,
+    )
+
+
+def test_clean_corpus_passes_on_a_process_pool(posts_root: Path) -> None:
+    for n in range(4):
+        post_id, _ = create_post(title=f"Post {n}", author="tester", intent={}, content="Draft.")
+        _edit(post_id, f"First {n}.\n\nSecond.")
+        _edit(post_id, f"First {n}.\n\nSecond, edited.")
+
+    result = fsck(posts_root, workers=2)
+
+    assert result.posts_checked == 4
+    assert result.problems == {} and result.repaired == {}
+
+
+def test_reports_damage_and_repairs_content(posts_root: Path) -> None:
+    post_id, _ = create_post(title="Post", author="tester", intent={}, content="Draft.")
+    _edit(post_id, "Alpha.\n\nBeta.")
+    _edit(post_id, "Alpha.\n\nGamma.")
+    content_path = post_layout.post_dir(posts_root, post_id) / "content.md"
+    content_path.write_text("Hand edited.")
+    hashing.clear()
+
+    check = check_post(posts_root, post_id)
+    assert check.problems == ["content.md: does not match revision 2"]
+
+    result = fsck(posts_root, repair=True, workers=1)
+    assert result.repaired == {post_id: 2}
+    assert read_post_content(post_id) == "Alpha.\n\nGamma."
+    assert check_post(posts_root, post_id).problems == []
+
+    entries = chunk_store.read_manifest(post_layout.post_dir(posts_root, post_id), 2)
+    blob = chunk_store.blob_path(posts_root, entries[-1]["hash"])
+    blob.write_text("Corrupted.")
+    problems = check_post(posts_root, post_id).problems
+    assert len(problems) == 1 and problems[0].startswith("revision 2: Chunk blob")
+
+
+def test_repair_moves_rejected_revisions_out_of_the_hot_log(posts_root: Path) -> None:
+    post_id, _ = create_post(title="Post", author="tester", intent={}, content="Draft.")
+    _edit(post_id, "Alpha.")
+    post_dir = post_layout.post_dir(posts_root, post_id)
+    entries = revision_log.read_revisions(post_dir)
+    rejected = {**entries[0], "revision_id": 2, "parent_revision_id": 1, "status": "rejected"}
+    revision_log.create_log(post_dir, [*entries, rejected])
+
+    assert check_post(posts_root, post_id).problems == [
+        "revision log: 1 rejected revisions outside the rejected log"
+    ]
+    result = fsck(posts_root, repair=True, workers=1)
+    assert result.problems == {} and result.moved_rejected == {post_id: 1}
+    assert [entry["revision_id"] for entry in revision_log.read_rejected_revisions(post_dir)] == [2]
+    assert check_post(posts_root, post_id).problems == []
+
+
+def test_repair_skips_content_it_cannot_verify(posts_root: Path) -> None:
+    post_id, _ = create_post(title="Post", author="tester", intent={}, content="Draft.")
+    _edit(post_id, "Alpha.\n\nBeta.")
+    storage.apply_blog_update(
+        post_id=post_id,
+        new_content="Alpha.\n\nUnverified.",
+        delta_type="content_free_edit",
+        source="manual",
+        parent_revision_id=None,
+        delta_payload={},
+        actor={"type": "human", "id": "tester"},
+    )
+    post_dir = post_layout.post_dir(posts_root, post_id)
+    (post_dir / "content.md").write_text("Alpha.\n\nUnverified.")
+    entries = chunk_store.read_manifest(post_dir, 2)
+    chunk_store.blob_path(posts_root, entries[-1]["hash"]).write_text("Corrupted.")
+    hashing.clear()
+
+    result = fsck(posts_root, repair=True, workers=1)
+
+    assert result.repaired == {}
+    assert result.unresolved[post_id][-1].startswith("content.md: cannot be verified")
+    assert read_post_content(post_id) == "Alpha.\n\nUnverified."
+
+
+def test_unresolved_keeps_problems_repair_did_not_fix(posts_root: Path) -> None:
+    post_id, _ = create_post(title="Post", author="tester", intent={}, content="Draft.")
+    _edit(post_id, "Alpha.")
+    post_dir = post_layout.post_dir(posts_root, post_id)
+    (post_dir / "content.md").write_text("Hand edited.")
+    with revision_log.log_path(post_dir).open("a") as log_file:
+        log_file.write('{"revision_id": 2')
+    hashing.clear()
+
+    result = fsck(posts_root, repair=True, workers=1)
+
+    assert result.repaired == {post_id: 1}
+    assert result.unresolved == {post_id: ["revision log: torn final entry"]}
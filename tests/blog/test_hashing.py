@@ -0,0 +1,38 @@
+import hashlib
+import os
+from pathlib import Path
+
+import pytest
+
+from apps.blog import hashing
+
+
+@pytest.fixture(autouse=True)
+def _clear_memos() -> None:
+    hashing.clear()
+
+
+def test_file_digest_rereads_only_changed_files(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    path = tmp_path / "content.md"
+    path.write_text("Body.")
+    reads: list[Path] = []
+    read_bytes = Path.read_bytes
+    monkeypatch.setattr(Path, "read_bytes", lambda self: reads.append(self) or read_bytes(self))
+
+    first = hashing.file_digest(path)
+    assert hashing.file_digest(path) == first == hashlib.sha256(b"Body.").hexdigest()
+    assert len(reads) == 1
+
+    path.write_text("Other")
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+    assert hashing.file_digest(path) == hashlib.sha256(b"Other").hexdigest()
+    assert len(reads) == 2
+
+
+def test_text_digest_memoizes_by_identity() -> None:
+    text = "".join(["Large ", "document."])
+    digest = hashing.text_digest(text)
+
+    assert hashing.text_digest(text) == digest == hashlib.sha256(b"Large document.").hexdigest()
+    assert hashing.text_digest("".join(["Large ", "document!"])) != digest
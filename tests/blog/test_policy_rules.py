@@ -0,0 +1,113 @@
+from dataclasses import replace
+from pathlib import Path
+
+import pytest
+
+from apps.blog import edit_service, post_revision_writer, storage
+from apps.blog.edit_service import apply_policy_edit
+from apps.blog.policy import compile_policy
+from apps.blog.storage import create_post, read_post_content, read_revision_metadata
+
+
+POLICIES_DIR = Path(__file__).resolve().parents[2] / "src" / "apps" / "blog" / "policies"
+
+
+@pytest.fixture()
+def posts_root(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    root = tmp_path / "posts"
+    root.mkdir()
+    monkeypatch.setattr(storage, "POSTS_ROOT", root)
+    monkeypatch.setattr(post_revision_writer, "POSTS_ROOT", root)
+    return root
+
+
+def test_plain_policy_is_all_residual() -> None:
+    policy_text = "Tighten the prose.\nKeep facts."
+    policy = compile_policy(policy_text)
+    assert policy.rules == ()
+    assert policy.residual_text == policy_text
+    assert policy.requires_agent
+
+
+def test_rules_block_splits_rules_and_residual() -> None:
+    policy = compile_policy(
+        "---\n"
+        "rules:\n"
+        "  - literal: 'a+b'\n"
+        "    replace: '\\1'\n"
+        "  - regex: '\\bcolour\\b'\n"
+        "    replace: color\n"
+        "    ignore_case: true\n"
+        "---\n"
+        "Remove hedging.\n"
+    )
+    assert policy.residual_text == "Remove hedging."
+    assert policy.apply_rules("a+b Colour colourful") == "\\1 color colourful"
+
+
+def test_invalid_rules_block_rejected() -> None:
+    with pytest.raises(ValueError):
+        compile_policy("---\nrules:\n  - replace: x\n---\n")
+    with pytest.raises(ValueError):
+        compile_policy("---\nrules:\n  - regex: 'a(b)'\n    replace: '\\2'\n---\n")
+    with pytest.raises(ValueError):
+        compile_policy("---\nrules:\n  - regex: 'a(b)'\n    replace: '\\g<x>'\n---\n")
+
+
+def test_leading_rule_line_without_a_rules_block_is_free_text() -> None:
+    for policy_text in ("---\nrules: []\n", "---\nKeep it short.\n---\nNo hedging."):
+        policy = compile_policy(policy_text)
+        assert policy.rules == () and policy.residual_text == policy_text
+
+
+def test_american_spelling_keeps_the_matched_case() -> None:
+    policy = compile_policy((POLICIES_DIR / "american-spelling.txt").read_text())
+    assert policy.apply_rules("Organise, realised. ORGANISE") == "Organize, realized. ORGANISE"
+
+
+def test_mechanical_policy_skips_editor_agent(
+    posts_root: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    def _fail(*_args, **_kwargs):
+        raise AssertionError("editor agent must not be used for rule-only policies")
+
+    monkeypatch.setattr(edit_service, "make_editor_agent", _fail)
+    monkeypatch.setattr(edit_service, "edit_document", _fail)
+    post_id, _ = create_post(
+        title="Spelling",
+        author="tester",
+        intent={},
+        content="The colour of the centre.\n\nNothing here.",
+    )
+    policy_text = (POLICIES_DIR / "american-spelling.txt").read_text()
+
+    result = apply_policy_edit(post_id, policy_text, actor_id="american-spelling.txt")
+
+    assert result.changed_chunks == [0]
+    assert read_post_content(post_id) == "The color of the center.\n\nNothing here."
+    revisions = read_revision_metadata(post_id)
+    assert [entry["delta_type"] for entry in revisions] == ["content_policy_edit"]
+
+
+def test_line_break_only_and_deletion_edits_are_recorded(posts_root: Path) -> None:
+    content = "Alpha.\n\nBeta.\n\nGamma.\n"
+    post_id, _ = create_post(title="Edits", author="tester", intent={}, content=content)
+    writer = post_revision_writer.PostRevisionWriter()
+
+    target = edit_service.load_policy_edit_target(post_id)
+    trimmed = [*target.chunks[:-1], replace(target.chunks[-1], text="Gamma.")]
+    result = edit_service.commit_policy_edit(target, trimmed, policy_hash="p", actor_id=None, writer=writer)
+    assert (result.revision_id, result.changed_chunks) == (1, [2])
+    assert read_post_content(post_id) == "Alpha.\n\nBeta.\n\nGamma."
+
+    target = edit_service.load_policy_edit_target(post_id)
+    kept = [target.chunks[0], replace(target.chunks[2], index=1)]
+    result = edit_service.commit_policy_edit(target, kept, policy_hash="p", actor_id=None, writer=writer)
+    assert (result.revision_id, result.changed_chunks, result.deleted_chunks) == (2, [], [1])
+    assert read_revision_metadata(post_id)[-1]["delta_payload"]["deleted_chunks"] == [1]
+    assert read_post_content(post_id) == "Alpha.\n\nGamma."
+
+    target = edit_service.load_policy_edit_target(post_id)
+    result = edit_service.commit_policy_edit(target, target.chunks, policy_hash="p", actor_id=None, writer=writer)
+    assert result.revision_id == 0
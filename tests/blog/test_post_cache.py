@@ -0,0 +1,128 @@
+import os
+from pathlib import Path
+
+import pytest
+import yaml
+
+from apps.blog import storage
+from apps.blog.post_cache import StatCache, post_cache
+from apps.blog.storage import (
+    create_post,
+    load_post_bundle,
+    read_post_content,
+    read_post_intent,
+    read_post_meta,
+    update_post_status,
+    write_post_content,
+)
+
+
+@pytest.fixture()
+def posts_root(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    root = tmp_path / "posts"
+    root.mkdir()
+    monkeypatch.setattr(storage, "POSTS_ROOT", root)
+    return root
+
+
+def test_stat_cache_reloads_when_file_changes(tmp_path: Path) -> None:
+    cache = StatCache()
+    path = tmp_path / "value.txt"
+    path.write_text("one")
+    loads: list[str] = []
+
+    def _load(target: Path) -> str:
+        loads.append(target.read_text())
+        return loads[-1]
+
+    assert cache.get(path, _load) == "one"
+    assert cache.get(path, _load) == "one"
+    assert loads == ["one"]
+
+    path.write_text("three")
+    assert cache.get(path, _load) == "three"
+    assert loads == ["one", "three"]
+
+
+def test_storage_reads_are_served_from_cache(posts_root: Path) -> None:
+    post_id, _ = create_post(title="Post", author="tester", intent={"topic": "x"}, content="Body.")
+    hits_before = post_cache.hits
+
+    assert read_post_meta(post_id).title == "Post"
+    assert read_post_content(post_id) == "Body."
+    intent = read_post_intent(post_id)
+    intent["topic"] = "mutated"
+    assert read_post_intent(post_id) == {"topic": "x"}
+    assert post_cache.hits - hits_before == 4
+
+    update_post_status(post_id, "published")
+    write_post_content(post_id, "New body.")
+    assert read_post_meta(post_id).status == "published"
+    assert read_post_content(post_id) == "New body."
+
+
+def test_external_edits_invalidate_cached_entries(posts_root: Path) -> None:
+    post_id, _ = create_post(title="Post", author="tester", intent={}, content="Body.")
+    assert read_post_meta(post_id).title == "Post"
+
+    meta_path = posts_root / post_id / "meta.yaml"
+    meta = yaml.safe_load(meta_path.read_text())
+    meta["title"] = "Edited by hand"
+    temp_path = meta_path.with_suffix(".tmp")
+    temp_path.write_text(yaml.safe_dump(meta))
+    os.replace(temp_path, meta_path)
+
+    assert read_post_meta(post_id).title == "Edited by hand"
+
+
+def test_load_post_bundle_returns_requested_parts(posts_root: Path) -> None:
+    post_id, _ = create_post(title="Post", author="tester", intent={"topic": "x"}, content="Body.")
+    storage.apply_blog_update(
+        post_id=post_id,
+        new_content="Edited.",
+        delta_type="content_free_edit",
+        source="manual",
+        parent_revision_id=None,
+        delta_payload={},
+        actor={"type": "human", "id": "tester"},
+    )
+
+    bundle = load_post_bundle(post_id, parts=("content", "intent", "revisions"))
+    assert bundle.meta.title == "Post"
+    assert bundle.intent == {"topic": "x"}
+    assert [entry["revision_id"] for entry in bundle.revisions] == [1]
+    assert bundle.last_revision_id == 1
+
+    meta_only = load_post_bundle(post_id, parts=("last_revision_id",))
+    assert meta_only.content is None and meta_only.revisions is None
+    assert meta_only.last_revision_id == 1
+
+    (posts_root / post_id / "intent.yaml").unlink()
+    assert load_post_bundle(post_id, parts=("intent",)).intent == {}
+    with pytest.raises(FileNotFoundError):
+        load_post_bundle("missing-post")
+
+
+def test_load_post_bundle_reads_the_given_root(posts_root: Path, tmp_path: Path) -> None:
+    other_root = tmp_path / "other"
+    other_root.mkdir()
+    post_id, _ = create_post(
+        title="Elsewhere", author="tester", intent={}, content="Body.", posts_root=other_root
+    )
+    storage.apply_blog_update(
+        post_id=post_id,
+        new_content="Edited.",
+        delta_type="content_free_edit",
+        source="manual",
+        parent_revision_id=None,
+        delta_payload={},
+        actor={"type": "human", "id": "tester"},
+        posts_root=other_root,
+    )
+
+    bundle = load_post_bundle(post_id, parts=("content", "revisions"), posts_root=other_root)
+    assert (bundle.meta.title, bundle.content, bundle.last_revision_id) == ("Elsewhere", "Body.", 1)
+    assert storage.read_revision_entry(post_id, 1, other_root)["revision_id"] == 1
+    assert storage.read_content_chunks(post_id, posts_root=other_root).revision_id == 1
+    with pytest.raises(FileNotFoundError):
+        load_post_bundle(post_id)
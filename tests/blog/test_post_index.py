@@ -0,0 +1,113 @@
+import shutil
+from pathlib import Path
+
+import pytest
+import yaml
+
+from apps.blog import post_index, storage
+from apps.blog.storage import create_post, list_posts, list_posts_page, update_post_status
+
+
+@pytest.fixture()
+def posts_root(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    root = tmp_path / "posts"
+    root.mkdir()
+    monkeypatch.setattr(storage, "POSTS_ROOT", root)
+    return root
+
+
+def test_index_tracks_storage_writes(posts_root: Path) -> None:
+    post_id, _ = create_post(title="Post", author="tester", intent={}, content="Body.")
+    assert post_index.index_path(posts_root).exists()
+    assert [meta.status for meta in list_posts(visibility="editor")] == ["draft"]
+
+    update_post_status(post_id, "published")
+
+    assert [meta.post_id for meta in list_posts(visibility="public")] == [post_id]
+
+
+def test_index_self_heals_from_filesystem(posts_root: Path) -> None:
+    kept_id, _ = create_post(title="Kept", author="tester", intent={}, content="Body.")
+    removed_id, _ = create_post(title="Removed", author="tester", intent={}, content="Body.")
+    assert len(list_posts(visibility="editor")) == 2
+
+    shutil.rmtree(posts_root / removed_id)
+    external_dir = posts_root / "2001-01-01T00-00-00Z__abcdef"
+    external_dir.mkdir()
+    (external_dir / "meta.yaml").write_text(
+        yaml.safe_dump(
+            {
+                "post_id": external_dir.name,
+                "title": "Copied in",
+                "author": "someone",
+                "created_at": "2001-01-01T00:00:00+00:00",
+                "status": "published",
+            }
+        )
+    )
+    (posts_root / "not-a-post").mkdir()
+
+    editor_ids = [meta.post_id for meta in list_posts(visibility="editor")]
+    assert editor_ids == [kept_id, external_dir.name]
+    assert [meta.post_id for meta in list_posts(visibility="public")] == [external_dir.name]
+
+
+def test_rebuild_picks_up_in_place_meta_edits(posts_root: Path) -> None:
+    post_id, _ = create_post(title="Before", author="tester", intent={}, content="Body.")
+    list_posts(visibility="editor")
+    meta_path = posts_root / post_id / "meta.yaml"
+    meta = yaml.safe_load(meta_path.read_text())
+    meta["title"] = "After"
+    meta_path.write_text(yaml.safe_dump(meta))
+
+    post_index.rebuild(posts_root)
+
+    assert [meta.title for meta in list_posts(visibility="editor")] == ["After"]
+
+
+def test_periodic_sync_picks_up_meta_written_without_index_update(
+    posts_root: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    post_id, _ = create_post(title="Before", author="tester", intent={}, content="Body.")
+    list_posts(visibility="editor")
+    meta_path = posts_root / post_id / "meta.yaml"
+    meta = yaml.safe_load(meta_path.read_text())
+    meta["status"] = "published"
+    meta_path.write_text(yaml.safe_dump(meta))
+    assert list_posts(visibility="public") == []
+
+    monkeypatch.setattr(post_index, "MTIME_RECHECK_SECONDS", 0.0)
+
+    assert [meta.post_id for meta in list_posts(visibility="public")] == [post_id]
+
+
+def test_list_posts_page_walks_keyset_pages_with_filters(posts_root: Path) -> None:
+    ids = []
+    for n in range(5):
+        post_id, _ = create_post(
+            title=f"Post {n}",
+            author="alice" if n % 2 == 0 else "bob",
+            intent={},
+            content="Body.",
+        )
+        ids.append(post_id)
+    newest_first = sorted(ids, reverse=True)
+
+    seen: list[str] = []
+    cursor = None
+    while True:
+        page = list_posts_page(visibility="editor", cursor=cursor, limit=2)
+        seen.extend(meta.post_id for meta in page.posts)
+        if page.next_cursor is None:
+            break
+        cursor = page.next_cursor
+    assert seen == newest_first
+
+    alice = list_posts_page(visibility="editor", author="alice", limit=10)
+    assert [meta.author for meta in alice.posts] == ["alice"] * 3
+    assert alice.next_cursor is None
+    assert list_posts_page(visibility="public", status="draft").posts == []
+
+    with pytest.raises(ValueError):
+        list_posts_page(visibility="editor", cursor="not-a-cursor")
@@ -0,0 +1,99 @@
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from apps.blog import post_layout, storage
+from apps.blog.post_lock import post_locks
+from apps.blog.compaction import collect_garbage
+from apps.blog.storage import (
+    apply_blog_update,
+    create_post,
+    list_posts,
+    read_post_content,
+    read_revision_content,
+    update_post_status,
+)
+
+
+@pytest.fixture()
+def posts_root(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    root = tmp_path / "posts"
+    root.mkdir()
+    monkeypatch.setattr(storage, "POSTS_ROOT", root)
+    return root
+
+
+def _apply(post_id: str, content: str) -> int:
+    return apply_blog_update(
+        post_id=post_id,
+        new_content=content,
+        delta_type="content_free_edit",
+        source="manual",
+        parent_revision_id=None,
+        delta_payload={},
+        actor={"type": "human", "id": "tester"},
+    ).revision_id
+
+
+def test_shard_paths_derive_from_post_id(tmp_path: Path) -> None:
+    post_id = "2024-03-05T10-00-00Z__abcdef"
+
+    assert post_layout.layout_path(tmp_path, post_id, "flat") == tmp_path / post_id
+    assert post_layout.layout_path(tmp_path, post_id, "date") == tmp_path / "2024" / "03" / post_id
+    hashed = post_layout.layout_path(tmp_path, post_id, "hash")
+    assert hashed.parent.parent == tmp_path and len(hashed.parent.name) == 2
+    assert post_layout.layout_path(tmp_path, "not-a-timestamp", "date") == tmp_path / "not-a-timestamp"
+
+
+@pytest.mark.parametrize("scheme", ["date", "hash"])
+def test_migrate_moves_posts_and_storage_follows(posts_root: Path, scheme: str) -> None:
+    old_id, _ = create_post(title="Old", author="tester", intent={}, content="Draft.")
+    revision_id = _apply(old_id, "Edited.")
+    assert list_posts(visibility="editor")[0].post_id == old_id
+
+    assert post_layout.migrate(posts_root, scheme) == 1
+
+    old_dir = post_layout.post_dir(posts_root, old_id)
+    assert old_dir == post_layout.layout_path(posts_root, old_id, scheme) != posts_root / old_id
+    assert read_post_content(old_id) == "Draft."
+    assert read_revision_content(old_id, revision_id) == "Edited."
+
+    new_id, path = create_post(title="New", author="tester", intent={}, content="Fresh.")
+    assert Path(path) == post_layout.layout_path(posts_root, new_id, scheme).resolve()
+    update_post_status(new_id, "published")
+    assert [meta.post_id for meta in list_posts(visibility="public")] == [new_id]
+    assert {meta.post_id for meta in list_posts(visibility="editor")} == {old_id, new_id}
+    assert collect_garbage(posts_root, grace_seconds=0).blobs_pruned == 0
+    assert read_revision_content(old_id, revision_id) == "Edited."
+
+    assert post_layout.migrate(posts_root, "flat") == 2
+    assert sorted(path.name for path in posts_root.iterdir() if not path.name.startswith(".")) == sorted(
+        [old_id, new_id]
+    )
+    assert read_post_content(new_id) == "Fresh."
+
+
+def test_resolver_finds_posts_not_yet_migrated(posts_root: Path) -> None:
+    post_id, _ = create_post(title="Post", author="tester", intent={}, content="Draft.")
+    post_layout.write_scheme(posts_root, "date")
+
+    assert post_layout.post_dir(posts_root, post_id) == posts_root / post_id
+    assert read_post_content(post_id) == "Draft."
+
+
+def test_writer_waiting_on_the_lock_follows_a_migrated_post(posts_root: Path) -> None:
+    post_id, _ = create_post(title="Post", author="tester", intent={}, content="Draft.")
+    results: list[int] = []
+
+    with post_locks.lock_post_dir(posts_root / post_id):
+        writer = threading.Thread(target=lambda: results.append(_apply(post_id, "Edited.")))
+        writer.start()
+        time.sleep(0.2)
+        assert post_layout.migrate(posts_root, "hash") == 1
+    writer.join()
+
+    assert not (posts_root / post_id).exists()
+    assert read_revision_content(post_id, results[0]) == "Edited."
+    assert (post_layout.layout_path(posts_root, post_id, "hash") / "revisions.jsonl").exists()
@@ -0,0 +1,88 @@
+import fcntl
+import hashlib
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from apps.blog import post_revision_writer, storage
+from apps.blog.post_lock import LOCK_FILE_NAME, PostLockManager
+from apps.blog.post_revision_writer import PostRevisionWriter
+from apps.blog.storage import RevisionConflictError, create_post, read_post_content, read_revision_metadata
+
+
+@pytest.fixture()
+def posts_root(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    root = tmp_path / "posts"
+    root.mkdir()
+    monkeypatch.setattr(storage, "POSTS_ROOT", root)
+    monkeypatch.setattr(post_revision_writer, "POSTS_ROOT", root)
+    return root
+
+
+def _hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _edit(post_id: str, content: str, **kwargs) -> int:
+    return PostRevisionWriter().apply_delta(
+        post_id,
+        actor={"type": "human", "id": "tester"},
+        delta_type="content_free_edit",
+        delta_payload={"after_hash": _hash(content)},
+        new_content=content,
+        **kwargs,
+    )
+
+
+def test_concurrent_writers_get_distinct_revisions(posts_root: Path) -> None:
+    post_ids = [
+        create_post(title=f"Post {n}", author="tester", intent={}, content="Draft.")[0] for n in range(2)
+    ]
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda n: _edit(post_ids[n % 2], f"Version {n}."), range(40)))
+
+    for post_id in post_ids:
+        revisions = read_revision_metadata(post_id)
+        assert [entry["revision_id"] for entry in revisions] == list(range(1, 21))
+        assert [entry["parent_revision_id"] for entry in revisions] == [None, *range(1, 20)]
+        assert _hash(read_post_content(post_id)) == revisions[-1]["delta_payload"]["after_hash"]
+
+
+def test_expected_revision_id_rejects_stale_writers(posts_root: Path) -> None:
+    post_id, _ = create_post(title="Post", author="tester", intent={}, content="Draft.")
+    assert _edit(post_id, "First.", expected_revision_id=0) == 1
+
+    with pytest.raises(RevisionConflictError):
+        _edit(post_id, "Stale.", expected_revision_id=0)
+
+    assert read_post_content(post_id) == "First."
+    assert _edit(post_id, "Second.", expected_revision_id=1) == 2
+
+
+def test_lock_is_reentrant_and_excludes_other_holders(tmp_path: Path) -> None:
+    manager = PostLockManager()
+    lock_path = tmp_path / LOCK_FILE_NAME
+    acquired = threading.Event()
+
+    def contend() -> None:
+        with manager.lock("post", lock_path):
+            acquired.set()
+
+    with manager.lock("post", lock_path):
+        with manager.lock("post", lock_path):
+            fd = os.open(lock_path, os.O_RDWR)
+            try:
+                with pytest.raises(BlockingIOError):
+                    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            finally:
+                os.close(fd)
+        thread = threading.Thread(target=contend)
+        thread.start()
+        assert not acquired.wait(0.1)
+
+    thread.join(timeout=5)
+    assert acquired.is_set()
@@ -0,0 +1,156 @@
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from apps.blog import storage
+from apps.blog.post_revision_writer import PostRevisionWriter
+from apps.blog.post_store import STORAGE_BACKEND_ENV, FilesystemPostStore, PostStore, get_post_store
+from apps.blog.sqlite_store import SqlitePostStore, database_path
+
+
+@pytest.fixture(params=["filesystem", "sqlite"])
+def store(request: pytest.FixtureRequest, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> PostStore:
+    root = tmp_path / "posts"
+    root.mkdir()
+    monkeypatch.setattr(storage, "POSTS_ROOT", root)
+    if request.param == "filesystem":
+        return FilesystemPostStore(root)
+    return SqlitePostStore(database_path(root))
+
+
+def _hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _apply(store: PostStore, post_id: str, content: str, **kwargs) -> int:
+    return store.apply_blog_update(
+        post_id=post_id,
+        new_content=content,
+        delta_type=kwargs.pop("delta_type", "content_free_edit"),
+        source="manual",
+        parent_revision_id=kwargs.pop("parent_revision_id", None),
+        delta_payload=kwargs.pop("delta_payload", {"after_hash": _hash(content)}),
+        actor={"type": "human", "id": "tester"},
+        **kwargs,
+    ).revision_id
+
+
+def test_store_round_trips_posts_and_revisions(store: PostStore) -> None:
+    post_id = store.create_post(title="Post", author="tester", intent={"topic": "x"}, content="Draft.")
+    assert store.read_post_meta(post_id).status == "draft"
+    assert store.read_post_intent(post_id) == {"topic": "x"}
+
+    first = _apply(store, post_id, "# Heading\n\nFirst.\n")
+    rejected = _apply(store, post_id, "Ignored.", delta_payload={}, status="rejected", reason="no")
+    renamed = _apply(
+        store,
+        post_id,
+        "# Heading\n\nFirst.\n",
+        delta_type="title_changed",
+        delta_payload={"new_title": "Renamed"},
+        meta_updates={"title": "Renamed"},
+    )
+    assert (first, rejected, renamed) == (1, 2, 3)
+    assert store.update_post_status(post_id, "published") == "published"
+    with pytest.raises(ValueError):
+        store.update_post_status(post_id, "draft")
+
+    assert store.read_post_content(post_id) == "# Heading\n\nFirst.\n"
+    assert store.read_revision_content(post_id, renamed) == "# Heading\n\nFirst.\n"
+    assert [entry["status"] for entry in store.read_revision_metadata(post_id)] == [
+        "applied",
+        "rejected",
+        "applied",
+    ]
+    meta = store.read_post_meta(post_id)
+    assert (meta.title, meta.status) == ("Renamed", "published")
+    state = PostRevisionWriter(store=store).get_current_state(post_id)
+    assert (state.title, state.content_ref, state.revision_id) == ("Renamed", _hash("# Heading\n\nFirst.\n"), 3)
+
+    with pytest.raises(ValueError):
+        _apply(store, post_id, "Bad parent.", parent_revision_id=99)
+    with pytest.raises(FileNotFoundError):
+        store.read_revision_content(post_id, 99)
+    with pytest.raises(FileNotFoundError):
+        store.read_post_meta("missing")
+
+
+def test_store_pages_posts_newest_first(store: PostStore) -> None:
+    ids = [store.create_post(title=f"Post {n}", author="tester", intent={}, content="Body.") for n in range(3)]
+    store.update_post_status(ids[0], "published")
+
+    first = store.list_posts_page(visibility="editor", limit=2)
+    second = store.list_posts_page(visibility="editor", cursor=first.next_cursor, limit=2)
+
+    assert [meta.post_id for meta in first.posts + second.posts] == sorted(ids, reverse=True)
+    assert second.next_cursor is None
+    assert [meta.post_id for meta in store.list_posts_page(visibility="public").posts] == [ids[0]]
+
+
+def test_sqlite_store_serializes_concurrent_revisions(tmp_path: Path) -> None:
+    store = SqlitePostStore(tmp_path / "blog.sqlite3")
+    post_id = store.create_post(title="Post", author="tester", intent={}, content="Draft.")
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda n: _apply(store, post_id, f"Version {n}."), range(40)))
+
+    assert sorted(results) == list(range(1, 41))
+    revisions = store.read_revision_metadata(post_id)
+    assert [entry["parent_revision_id"] for entry in revisions] == [None, *range(1, 40)]
+    assert store.read_derived_state(post_id).revision_id == 40
+
+
+def test_sqlite_store_commits_content_with_the_revision(tmp_path: Path) -> None:
+    store = SqlitePostStore(tmp_path / "blog.sqlite3")
+    post_id = store.create_post(title="Post", author="tester", intent={}, content="Draft.")
+
+    revision_id = _apply(store, post_id, "Edited.")
+
+    assert store.read_post_content(post_id) == store.read_revision_content(post_id, revision_id) == "Edited."
+    _apply(store, post_id, "Ignored.", delta_payload={}, status="rejected")
+    assert store.read_post_content(post_id) == "Edited."
+
+
+def test_store_serves_the_read_paths(store: PostStore) -> None:
+    post_id = store.create_post(title="Tea notes", author="tester", intent={"topic": "tea"}, content="Draft.")
+    first = _apply(store, post_id, "Green tea.\n\nBlack coffee.\n")
+    second = _apply(store, post_id, "Green tea.\n\nOolong tea.\n", parent_revision_id=first)
+    _apply(store, post_id, "Ignored.", delta_payload={}, status="rejected", reason="no")
+    store.update_post_status(post_id, "published")
+
+    bundle = store.load_post_bundle(post_id, parts=("content", "intent", "last_revision_id"))
+    assert (bundle.meta.title, bundle.intent) == ("Tea notes", {"topic": "tea"})
+    assert bundle.content == "Green tea.\n\nOolong tea.\n"
+    assert bundle.last_revision_id == store.read_last_revision_id(post_id) == 3
+    assert store.read_revision_entry(post_id, second)["parent_revision_id"] == first
+    assert store.read_revision_entry(post_id, 99) is None
+    applied = store.read_revision_metadata(post_id, include_rejected=False)
+    assert [entry["revision_id"] for entry in applied] == [1, 2]
+
+    window = store.read_content_chunks(post_id, offset=1, limit=1)
+    assert (window.total, [chunk["text"] for chunk in window.chunks]) == (2, ["Oolong tea.\n"])
+    records = list(store.diff_revisions(post_id, first, second))
+    assert (records[0]["before_chunks"], records[0]["after_chunks"]) == (2, 2)
+    assert [record.get("after_index") for record in records[1:]] == [1]
+
+    hits = store.search_posts("oolong")
+    assert [(meta.post_id, score > 0) for meta, score in hits] == [(post_id, True)]
+    assert store.search_posts('"black coffee"') == []
+
+
+def test_get_post_store_follows_the_backend_setting(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(storage, "POSTS_ROOT", tmp_path)
+    monkeypatch.delenv(STORAGE_BACKEND_ENV, raising=False)
+    assert isinstance(get_post_store(), FilesystemPostStore)
+
+    monkeypatch.setenv(STORAGE_BACKEND_ENV, "sqlite")
+    store = get_post_store()
+    assert isinstance(store, SqlitePostStore) and store is get_post_store()
+    assert store.path == database_path(tmp_path)
+    assert isinstance(PostRevisionWriter().store, SqlitePostStore)
+
+    monkeypatch.setenv(STORAGE_BACKEND_ENV, "memory")
+    with pytest.raises(ValueError):
+        get_post_store()
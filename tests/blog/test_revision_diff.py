@@ -0,0 +1,76 @@
+from pathlib import Path
+
+import pytest
+
+from apps.blog import chunk_store, storage
+from apps.blog.compaction import collect_garbage
+from apps.blog.revision_diff import line_diff
+from apps.blog.storage import apply_blog_update, create_post, diff_revisions
+
+
+@pytest.fixture()
+def posts_root(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    root = tmp_path / "posts"
+    root.mkdir()
+    monkeypatch.setattr(storage, "POSTS_ROOT", root)
+    return root
+
+
+def _apply(post_id: str, content: str) -> int:
+    return apply_blog_update(
+        post_id=post_id,
+        new_content=content,
+        delta_type="content_free_edit",
+        source="manual",
+        parent_revision_id=None,
+        delta_payload={},
+        actor={"type": "human", "id": "tester"},
+    ).revision_id
+
+
+def _paragraphs(count: int, **changes: str) -> str:
+    texts = [changes.get(f"p{n}", f"Paragraph {n}.") for n in range(count)]
+    return "\n\n".join(texts)
+
+
+def test_diff_reads_only_changed_chunks(posts_root: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    post_id, _ = create_post(title="Long", author="tester", intent={}, content="Draft.")
+    first = _apply(post_id, _paragraphs(50))
+    second = _apply(post_id, _paragraphs(50, p3="Paragraph 3.\nWith a new line.") + "\n\nAppendix.")
+    reads: list[str] = []
+    get_blob = chunk_store.get_blob
+    monkeypatch.setattr(chunk_store, "get_blob", lambda root, digest: reads.append(digest) or get_blob(root, digest))
+
+    records = list(diff_revisions(post_id, first, second))
+
+    assert records[0]["type"] == "summary"
+    assert (records[0]["unchanged"], records[0]["modified"], records[0]["inserted"]) == (49, 1, 1)
+    modified, inserted = records[1:]
+    assert (modified["type"], modified["before_index"], modified["after_index"]) == ("modified", 3, 3)
+    assert [op for op in modified["lines"] if op["op"] != "equal"] == [
+        {"op": "insert", "text": "With a new line."}
+    ]
+    assert (inserted["type"], inserted["after_index"], inserted["text"]) == ("inserted", 50, "Appendix.")
+    assert len(reads) == 4
+
+
+def test_diff_handles_packed_revisions_and_missing_ones(posts_root: Path) -> None:
+    post_id, _ = create_post(title="Post", author="tester", intent={}, content="Draft.")
+    first = _apply(post_id, "Alpha.\n\nBeta.")
+    second = _apply(post_id, "Beta.\n\nAlpha.")
+    collect_garbage(posts_root=posts_root, grace_seconds=0)
+
+    records = list(diff_revisions(post_id, first, second))
+    assert records[0]["moved"] + records[0]["unchanged"] == 2
+    assert all(record["type"] in ("summary", "moved") for record in records)
+
+    with pytest.raises(FileNotFoundError):
+        diff_revisions(post_id, first, 99)
+
+
+def test_line_diff_marks_replacements() -> None:
+    assert line_diff("a\nb", "a\nc") == [
+        {"op": "equal", "text": "a"},
+        {"op": "delete", "text": "b"},
+        {"op": "insert", "text": "c"},
+    ]
@@ -0,0 +1,153 @@
+from pathlib import Path
+
+import pytest
+import yaml
+
+from apps.blog import revision_log, storage
+from apps.blog.storage import (
+    apply_blog_update,
+    create_post,
+    read_last_revision_id,
+    read_revision_content,
+    read_revision_entry,
+    read_revision_metadata,
+)
+
+
+@pytest.fixture()
+def posts_root(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    root = tmp_path / "posts"
+    root.mkdir()
+    monkeypatch.setattr(storage, "POSTS_ROOT", root)
+    return root
+
+
+def _apply(post_id: str, content: str, **kwargs) -> int:
+    result = apply_blog_update(
+        post_id=post_id,
+        new_content=content,
+        delta_type=kwargs.pop("delta_type", "content_free_edit"),
+        source="manual",
+        parent_revision_id=None,
+        delta_payload={"changed_chunks": [0]},
+        actor={"type": "human", "id": "tester"},
+        **kwargs,
+    )
+    return result.revision_id
+
+
+def test_revisions_append_to_log_not_meta(posts_root: Path) -> None:
+    post_id, _ = create_post(title="Post", author="tester", intent={}, content="First.")
+    meta_before = (posts_root / post_id / "meta.yaml").read_text()
+
+    assert _apply(post_id, "Second.") == 1
+    assert _apply(post_id, "Third.", status="rejected", reason="nope") == 2
+    assert _apply(post_id, "Fourth.") == 3
+
+    assert (posts_root / post_id / "meta.yaml").read_text() == meta_before
+    assert read_last_revision_id(post_id) == 3
+    assert read_revision_entry(post_id, 2)["status"] == "rejected"
+    assert read_revision_entry(post_id, 4) is None
+    history = read_revision_metadata(post_id, include_rejected=True)
+    assert [entry["parent_revision_id"] for entry in history] == [None, 1, 2]
+    assert read_revision_content(post_id, 2) == "Second."
+    assert read_revision_content(post_id, 3) == "Fourth."
+
+
+def test_meta_updates_still_write_meta(posts_root: Path) -> None:
+    post_id, _ = create_post(title="Post", author="tester", intent={}, content="First.")
+    _apply(post_id, "Second.", delta_type="title_changed", meta_updates={"title": "Renamed"})
+
+    meta = yaml.safe_load((posts_root / post_id / "meta.yaml").read_text())
+    assert meta["title"] == "Renamed"
+    assert "revisions" not in meta
+
+
+def test_legacy_meta_revisions_are_migrated(posts_root: Path) -> None:
+    post_id, _ = create_post(title="Post", author="tester", intent={}, content="First.")
+    post_dir = posts_root / post_id
+    revision_log.log_path(post_dir).unlink()
+    revision_log.index_path(post_dir).unlink()
+    meta_path = post_dir / "meta.yaml"
+    meta = yaml.safe_load(meta_path.read_text())
+    meta["revisions"] = [
+        {
+            "revision_id": 1,
+            "parent_revision_id": None,
+            "delta_type": "title_changed",
+            "delta_payload": {},
+            "status": "applied",
+        }
+    ]
+    meta_path.write_text(yaml.safe_dump(meta, sort_keys=False))
+
+    assert read_last_revision_id(post_id) == 1
+    assert "revisions" not in yaml.safe_load(meta_path.read_text())
+    assert _apply(post_id, "Second.") == 2
+    assert [entry["revision_id"] for entry in read_revision_metadata(post_id)] == [1, 2]
+
+
+def test_stale_index_and_torn_tail_are_repaired(posts_root: Path) -> None:
+    post_id, _ = create_post(title="Post", author="tester", intent={}, content="First.")
+    post_dir = posts_root / post_id
+    _apply(post_id, "Second.")
+    _apply(post_id, "Third.")
+
+    revision_log.index_path(post_dir).write_bytes(b"garbage")
+    with revision_log.log_path(post_dir).open("ab") as handle:
+        handle.write(b'{"revision_id": 3, "trunc')
+
+    assert read_last_revision_id(post_id) == 2
+    assert _apply(post_id, "Fourth.") == 3
+    assert read_revision_entry(post_id, 3)["parent_revision_id"] == 2
+    assert read_revision_content(post_id, 3) == "Fourth."
+
+
+def test_rejected_revisions_go_to_the_cold_log(posts_root: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    post_id, _ = create_post(title="Post", author="tester", intent={}, content="First.")
+    post_dir = posts_root / post_id
+    _apply(post_id, "Second.")
+    assert read_revision_content(post_id, 1) == "Second."
+    for n in range(3):
+        _apply(post_id, f"Rejected {n}.", status="rejected", reason="nope")
+    assert _apply(post_id, "Third.") == 5
+    assert _apply(post_id, "Ignored.", status="rejected") == 6
+
+    assert [entry["revision_id"] for entry in revision_log.read_revisions(post_dir)] == [1, 5]
+    rejected = revision_log.read_rejected_revisions(post_dir)
+    assert [entry["revision_id"] for entry in rejected] == [2, 3, 4, 6]
+    assert [entry["revision_id"] for entry in read_revision_metadata(post_id)] == [1, 5]
+    history = read_revision_metadata(post_id, include_rejected=True)
+    assert [entry["revision_id"] for entry in history] == [1, 2, 3, 4, 5, 6]
+    assert read_last_revision_id(post_id) == 6
+    assert _apply(post_id, "Fourth.") == 7
+    assert read_revision_entry(post_id, 7)["parent_revision_id"] == 6
+
+    def cold_read(_post_dir: Path) -> list[dict]:
+        raise AssertionError("applied lookups must not read the rejected log")
+
+    monkeypatch.setattr(revision_log, "read_rejected_revisions", cold_read)
+    assert read_revision_entry(post_id, 5)["status"] == "applied"
+    assert read_revision_content(post_id, 5) == "Third."
+    assert read_revision_content(post_id, 7) == "Fourth."
+
+
+def test_split_rejected_moves_entries_out_of_an_older_log(posts_root: Path) -> None:
+    post_id, _ = create_post(title="Post", author="tester", intent={}, content="First.")
+    post_dir = posts_root / post_id
+    _apply(post_id, "Second.")
+    _apply(post_id, "Third.")
+    entries = revision_log.read_revisions(post_dir)
+    old_style = [
+        entries[0],
+        {**entries[1], "revision_id": 2, "status": "rejected"},
+        {**entries[1], "revision_id": 3},
+    ]
+    revision_log.create_log(post_dir, old_style)
+
+    assert revision_log.split_rejected(post_dir) == 1
+    assert revision_log.split_rejected(post_dir) == 0
+    assert [entry["revision_id"] for entry in revision_log.read_revisions(post_dir)] == [1, 3]
+    assert read_revision_entry(post_id, 2)["status"] == "rejected"
+    history = read_revision_metadata(post_id, include_rejected=True)
+    assert [entry["revision_id"] for entry in history] == [1, 2, 3]
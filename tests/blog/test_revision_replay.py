@@ -1,8 +1,10 @@
 import hashlib
 from pathlib import Path
 
+import pytest
+
 from apps.blog.post_revision_writer import PostRevisionWriter
-from apps.blog.storage import create_post, read_post_content, _replay_post_content
+from apps.blog.storage import create_post, read_post_content, read_revision_content, _replay_post_content
 
 
 def _hash_text(text: str) -> str:
@@ -157,3 +159,22 @@ def test_read_post_content_replays_and_writes_cache(tmp_path: Path) -> None:
     assert content_path.exists()
     assert replayed == content_v1
     assert _hash_text(replayed) == _hash_text(content_v1)
+
+
+def test_legacy_snapshot_gap_raises_instead_of_truncating(tmp_path: Path) -> None:
+    posts_root = tmp_path / "posts"
+    post_id, _ = create_post(title=None, author="test", intent={}, content="Start", posts_root=str(posts_root))
+    chunks = ["One", "Two", "Three"]
+    content = _build_content(chunks)
+    writer = PostRevisionWriter(posts_root=str(posts_root))
+    revision_id = writer.apply_delta(
+        post_id,
+        actor={"type": "human", "id": "tester"},
+        delta_type="content_chunks_modified",
+        delta_payload={"changed_chunks": [0, 1, 2], "after_hash": _hash_text(content)},
+    )
+    _write_snapshots(posts_root, post_id, revision_id, chunks)
+    (posts_root / post_id / "revisions" / f"{revision_id}_1.md").unlink()
+
+    with pytest.raises(ValueError, match="contiguous"):
+        read_revision_content(post_id, revision_id, posts_root=str(posts_root))
@@ -0,0 +1,206 @@
+import hashlib
+
+import pytest
+
+boto3 = pytest.importorskip("boto3")
+moto = pytest.importorskip("moto")
+
+from apps.blog.s3_store import ObjectCache, S3PostStore  # noqa: E402
+
+
+@pytest.fixture()
+def store():
+    with moto.mock_aws():
+        client = boto3.client("s3", region_name="us-east-1")
+        client.create_bucket(Bucket="blog")
+        yield S3PostStore("blog", prefix="test", client=client)
+
+
+def _hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _apply(store: S3PostStore, post_id: str, content: str, **kwargs) -> int:
+    return store.apply_blog_update(
+        post_id=post_id,
+        new_content=content,
+        delta_type=kwargs.pop("delta_type", "content_free_edit"),
+        source="manual",
+        parent_revision_id=None,
+        delta_payload=kwargs.pop("delta_payload", {"after_hash": _hash(content)}),
+        actor={"type": "human", "id": "tester"},
+        **kwargs,
+    ).revision_id
+
+
+def test_s3_store_round_trips_posts_and_revisions(store: S3PostStore) -> None:
+    post_id = store.create_post(title="Post", author="tester", intent={"topic": "x"}, content="Draft.")
+    first = _apply(store, post_id, "# Heading\n\nFirst.\n\nShared.\n")
+    second = _apply(
+        store,
+        post_id,
+        "",
+        delta_type="title_changed",
+        delta_payload={"new_title": "Renamed"},
+        meta_updates={"title": "Renamed"},
+    )
+    store.update_post_status(post_id, "published")
+
+    meta = store.read_post_meta(post_id)
+    assert (meta.title, meta.status) == ("Renamed", "published")
+    assert store.read_post_intent(post_id) == {"topic": "x"}
+    assert store.read_revision_content(post_id, second) == "# Heading\n\nFirst.\n\nShared.\n"
+    assert [entry["revision_id"] for entry in store.read_revision_metadata(post_id)] == [first, second]
+    state = store.read_derived_state(post_id)
+    assert (state.title, state.revision_id) == ("Renamed", 2)
+    assert [meta.post_id for meta in store.list_posts_page(visibility="public").posts] == [post_id]
+
+
+def test_s3_store_recovers_revisions_committed_without_head_update(store: S3PostStore) -> None:
+    post_id = store.create_post(title="Post", author="tester", intent={}, content="Draft.")
+    store._advance_head = lambda _post_id: store._require_head(_post_id)[1]  # writer dies after commit
+    _apply(store, post_id, "Committed.")
+    del store._advance_head
+
+    assert store.read_derived_state(post_id).content_ref == _hash("Committed.")
+    assert _apply(store, post_id, "Next.") == 2
+    with pytest.raises(ValueError):
+        store.apply_blog_update(
+            post_id=post_id,
+            new_content="Stale.",
+            delta_type="content_free_edit",
+            source="manual",
+            parent_revision_id=5,
+            delta_payload={"after_hash": _hash("Stale.")},
+            actor={"type": "human", "id": "tester"},
+        )
+
+
+def test_object_cache_is_bounded_by_size() -> None:
+    cache = ObjectCache(max_bytes=10)
+    cache.put("a", "1", b"12345")
+    cache.put("b", "2", b"12345")
+    cache.get("a")
+    cache.put("c", "3", b"12345")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == ("1", b"12345")
+
+
+def test_s3_store_content_follows_the_revision_log(store: S3PostStore) -> None:
+    post_id = store.create_post(title="Post", author="tester", intent={}, content="Draft.")
+    assert store.read_post_content(post_id) == "Draft."
+
+    _apply(store, post_id, "Committed.")
+    store.write_post_content(post_id, "Stray write.")
+    _apply(store, post_id, "Ignored.", delta_payload={}, status="rejected")
+
+    assert store.read_post_content(post_id) == "Committed."
+
+
+def test_s3_store_lists_posts_from_the_index(store: S3PostStore) -> None:
+    ids = [store.create_post(title=f"Post {n}", author="tester", intent={}, content="Body.") for n in range(3)]
+    assert len(store.list_posts_page(visibility="editor").posts) == 3
+    store.update_post_status(ids[1], "published")
+    _apply(
+        store,
+        ids[2],
+        "",
+        delta_type="title_changed",
+        delta_payload={"new_title": "Renamed"},
+        meta_updates={"title": "Renamed"},
+    )
+
+    store._advance_head = None  # listing must not read any head
+    public = store.list_posts_page(visibility="public").posts
+    editor = store.list_posts_page(visibility="editor").posts
+    del store._advance_head
+
+    assert [meta.post_id for meta in public] == [ids[1]]
+    assert {meta.post_id: meta.title for meta in editor}[ids[2]] == "Renamed"
+    store.client.delete_object(Bucket="blog", Key=store._listing_key(ids[0]))
+    assert store.rebuild_listing_index() == 3
+    listed = store.list_posts_page(visibility="editor").posts
+    assert [meta.post_id for meta in listed] == sorted(ids, reverse=True)
+
+
+def test_s3_store_pages_posts_newest_first_without_reading_other_posts(store: S3PostStore) -> None:
+    ids = [
+        f"2026-10-{day:02d}T12-00-00Z__{suffix}"
+        for day, suffix in ((1, "0a0a0a"), (1, "ff0000"), (9, "000000"))
+    ]
+    for post_id in ids:
+        store._update_listing(
+            post_id,
+            {"meta": {"post_id": post_id, "author": "tester", "created_at": post_id[:10]}, "version": 0},
+        )
+    read: list[str] = []
+    get_json = store._get_json
+    store._get_json = lambda key, **kwargs: read.append(key) or get_json(key, **kwargs)
+
+    first = store.list_posts_page(visibility="editor", limit=1)
+    second = store.list_posts_page(visibility="editor", cursor=first.next_cursor, limit=1)
+    third = store.list_posts_page(visibility="editor", cursor=second.next_cursor, limit=1)
+
+    assert [page.posts[0].post_id for page in (first, second, third)] == sorted(ids, reverse=True)
+    assert third.next_cursor is None
+    # Each page reads its post plus the one that shows another page follows.
+    assert len(read) == 2 + 2 + 1
+
+
+def test_s3_store_keeps_the_listing_entry_of_the_newest_head(store: S3PostStore) -> None:
+    post_id = store.create_post(title="Post", author="tester", intent={}, content="Draft.")
+    etag, head = store._require_head(post_id)
+    store.update_post_status(post_id, "published")
+
+    store._update_listing(post_id, head)  # a slower writer finishing late
+
+    assert store.list_posts_page(visibility="public").posts[0].status == "published"
+
+
+def test_s3_store_serves_the_read_paths(store: S3PostStore) -> None:
+    post_id = store.create_post(title="Tea", author="tester", intent={"topic": "tea"}, content="Draft.")
+    first = _apply(store, post_id, "Green tea.\n\nBlack coffee.\n")
+    second = _apply(store, post_id, "Green tea.\n\nOolong tea.\n")
+    _apply(store, post_id, "Ignored.", delta_payload={}, status="rejected", reason="no")
+
+    bundle = store.load_post_bundle(post_id, parts=("content", "intent", "last_revision_id"))
+    assert (bundle.content, bundle.intent, bundle.last_revision_id) == (
+        "Green tea.\n\nOolong tea.\n",
+        {"topic": "tea"},
+        3,
+    )
+    assert store.read_last_revision_id(post_id) == 3
+    assert store.read_revision_entry(post_id, second)["parent_revision_id"] == first
+    assert store.read_revision_entry(post_id, 9) is None
+    applied = store.read_revision_metadata(post_id, include_rejected=False)
+    assert [entry["revision_id"] for entry in applied] == [1, 2]
+    window = store.read_content_chunks(post_id, offset=1, limit=1)
+    assert (window.total, window.chunks[0]["text"], window.revision_id) == (2, "Oolong tea.\n", 3)
+    records = list(store.diff_revisions(post_id, first, second))
+    assert [record.get("after_index") for record in records[1:]] == [1]
+    with pytest.raises(FileNotFoundError):
+        store.diff_revisions(post_id, first, 9)
+    with pytest.raises(NotImplementedError):
+        store.search_posts("tea")
+
+
+def test_get_post_store_builds_the_s3_store_from_the_environment(monkeypatch: pytest.MonkeyPatch) -> None:
+    from apps.blog import post_store
+
+    monkeypatch.setattr(post_store, "_stores", {})
+    monkeypatch.setenv(post_store.STORAGE_BACKEND_ENV, "s3")
+    monkeypatch.delenv(post_store.S3_BUCKET_ENV, raising=False)
+    with pytest.raises(ValueError):
+        post_store.get_post_store()
+
+    monkeypatch.setenv(post_store.S3_BUCKET_ENV, "blog")
+    monkeypatch.setenv(post_store.S3_PREFIX_ENV, "site")
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+    with moto.mock_aws():
+        boto3.client("s3", region_name="us-east-1").create_bucket(Bucket="blog")
+        store = post_store.get_post_store()
+        assert isinstance(store, S3PostStore) and store is post_store.get_post_store()
+        post_id = store.create_post(title="Post", author="tester", intent={}, content="Body.")
+        assert store.read_post_meta(post_id).title == "Post"
+        assert store.prefix == "site/"
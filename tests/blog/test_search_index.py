@@ -0,0 +1,120 @@
+from pathlib import Path
+
+import pytest
+
+from apps.blog import search_index, storage
+from apps.blog.storage import create_post, search_posts, update_post_status, write_post_content
+
+
+@pytest.fixture()
+def posts_root(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    root = tmp_path / "posts"
+    root.mkdir()
+    monkeypatch.setattr(storage, "POSTS_ROOT", root)
+    return root
+
+
+def _publish(title: str, content: str) -> str:
+    post_id, _ = create_post(title=title, author="tester", intent={}, content=content)
+    update_post_status(post_id, "published")
+    return post_id
+
+
+def _ids(query: str) -> list[str]:
+    return [meta.post_id for meta, _score in search_posts(query)]
+
+
+def test_index_follows_status_and_content_changes(posts_root: Path) -> None:
+    draft_id, _ = create_post(title="Draft", author="tester", intent={}, content="Secret gardening notes.")
+    published_id = _publish("Gardens", "Gardening in spring.")
+
+    assert _ids("gardening") == [published_id]
+
+    write_post_content(published_id, "Cooking in spring.")
+    assert _ids("gardening") == []
+    assert _ids("cooking") == [published_id]
+
+    update_post_status(draft_id, "published")
+    assert _ids("gardening") == [draft_id]
+    update_post_status(draft_id, "archived")
+    assert _ids("gardening") == []
+
+
+def test_ranking_phrases_and_merges(posts_root: Path) -> None:
+    dense = _publish("Tea", "Tea tea tea, and more green tea.")
+    sparse = _publish("Notes", "Some tea, mostly coffee and green beans.")
+    others = [_publish(f"Other {n}", f"Unrelated post {n}.") for n in range(2 * search_index.MERGE_FACTOR)]
+
+    assert _ids("tea") == [dense, sparse]
+    assert _ids('"green tea"') == [dense]
+    assert _ids("unrelated") and set(_ids("unrelated")) == set(others)
+    manifest = search_index._read_manifest(search_index.index_dir(posts_root))
+    assert len(manifest["segments"]) <= 2 * (search_index.MERGE_FACTOR - 1)
+
+    search_index._snapshots.clear()
+    search_index._segment_cache.clear()
+    assert _ids("tea") == [dense, sparse]
+
+
+def test_sync_picks_up_posts_added_outside_storage(posts_root: Path, tmp_path: Path) -> None:
+    post_id = _publish("Tea", "Green tea.")
+    search_index.rebuild(posts_root)
+    other_root = tmp_path / "other"
+    (posts_root / post_id).rename(other_root)
+
+    assert _ids("tea") == []
+    other_root.rename(posts_root / post_id)
+    assert _ids("tea") == [post_id]
+
+
+def test_listing_change_reads_only_the_added_posts(posts_root: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    existing = [_publish(f"Tea {n}", "Green tea.") for n in range(3)]
+    assert set(_ids("tea")) == set(existing)
+
+    read: list[str] = []
+    published_document = search_index._published_document
+
+    def counting(post_dir: Path, current: dict | None = None):
+        read.append(post_dir.name)
+        return published_document(post_dir, current)
+
+    monkeypatch.setattr(search_index, "_published_document", counting)
+    added = _publish("Coffee", "Black coffee.")
+    create_post(title="Draft", author="tester", intent={}, content="Tea draft.")
+
+    assert _ids("coffee") == [added]
+    assert set(read) == {added}
+
+
+def test_writes_only_mark_posts_for_the_next_search(posts_root: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    post_id = _publish("Notes", "Green tea.")
+    assert _ids("tea") == [post_id]
+
+    def no_index_lock(_root: Path):
+        raise AssertionError("writers must not take the index lock")
+
+    with monkeypatch.context() as patched:
+        patched.setattr(search_index, "_lock", no_index_lock)
+        write_post_content(post_id, "Black coffee.")
+    assert _ids("tea") == []
+    assert _ids("coffee") == [post_id]
+
+    write_post_content(post_id, "Green tea again.")
+    with monkeypatch.context() as patched:
+        patched.setattr(search_index, "_commit", lambda *_args, **_kwargs: 1 / 0)
+        assert _ids("tea") == []
+    assert _ids("tea") == [post_id]
+
+
+def test_search_posts_fills_the_limit_past_unpublished_hits(
+    posts_root: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    drafts = [create_post(title="Tea", author="tester", intent={}, content="Tea.")[0] for _ in range(3)]
+    published = [_publish("Tea", "Tea.") for _ in range(2)]
+    ranked = [*drafts, *published]
+
+    def stale_search(_root: Path, _query: str, *, limit: int) -> list[search_index.SearchHit]:
+        return [search_index.SearchHit(post_id=post_id, score=1.0) for post_id in ranked[:limit]]
+
+    monkeypatch.setattr(search_index, "search", stale_search)
+    assert [meta.post_id for meta, _score in search_posts("tea", limit=2)] == published
@@ -0,0 +1,85 @@
+import os
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+from apps.blog import post_revision_writer, storage
+from apps.blog.autosave import AutosaveBuffer
+from apps.blog.post_revision_writer import PostRevisionWriter
+from apps.blog.storage import create_post, read_post_content, read_revision_metadata
+
+
+def test_autosave_buffers_until_flush_or_editor_reload(tmp_path: Path, monkeypatch) -> None:
+    os.environ["ADMIN_PASSWORD"] = "test-password"
+    os.environ["ADMIN_USERNAME"] = "admin"
+    import web.api
+    from web.api import app
+
+    monkeypatch.setattr(web.api, "require_admin", lambda *_: None)
+    monkeypatch.setattr(web.api, "autosaves", AutosaveBuffer(quiet_seconds=60))
+    posts_root = tmp_path / "posts"
+    posts_root.mkdir()
+    monkeypatch.setattr(storage, "POSTS_ROOT", posts_root)
+    monkeypatch.setattr(post_revision_writer, "POSTS_ROOT", posts_root)
+    post_id, _ = create_post(title="Post", author="tester", intent={}, content="Draft.")
+    client = TestClient(app)
+    auth = ("admin", "test-password")
+
+    for n in range(5):
+        response = client.post(f"/blog/edit/{post_id}/autosave", json={"content": f"Edit {n}."}, auth=auth)
+        assert response.status_code == 202
+        assert response.json()["revision_id"] == 0
+    assert read_revision_metadata(post_id) == []
+
+    flushed = client.post(f"/blog/edit/{post_id}/autosave/flush", auth=auth)
+    assert flushed.json() == {"post_id": post_id, "pending": False, "revision_id": 1}
+    assert read_post_content(post_id) == "Edit 4."
+
+    client.post(f"/blog/edit/{post_id}/autosave", json={"content": "Edit 5."}, auth=auth)
+    page = client.get(f"/blog/edit/{post_id}/manual", auth=auth)
+    assert page.status_code == 200 and 'data-autosave="on"' in page.text
+    assert read_post_content(post_id) == "Edit 5."
+    assert len(read_revision_metadata(post_id)) == 2
+
+
+def test_autosave_from_a_stale_revision_is_a_conflict(tmp_path: Path, monkeypatch) -> None:
+    os.environ["ADMIN_PASSWORD"] = "test-password"
+    os.environ["ADMIN_USERNAME"] = "admin"
+    import web.api
+    from web.api import app
+
+    monkeypatch.setattr(web.api, "require_admin", lambda *_: None)
+    monkeypatch.setattr(web.api, "autosaves", AutosaveBuffer(quiet_seconds=60))
+    posts_root = tmp_path / "posts"
+    posts_root.mkdir()
+    monkeypatch.setattr(storage, "POSTS_ROOT", posts_root)
+    monkeypatch.setattr(post_revision_writer, "POSTS_ROOT", posts_root)
+    post_id, _ = create_post(title="Post", author="tester", intent={}, content="Draft.")
+    client = TestClient(app)
+    auth = ("admin", "test-password")
+
+    client.post(f"/blog/edit/{post_id}/autosave", json={"content": "One.", "base_revision_id": 0}, auth=auth)
+    flushed = client.post(f"/blog/edit/{post_id}/autosave/flush", auth=auth)
+    assert flushed.json()["revision_id"] == 1
+
+    # Sent before the editor saw revision 1.
+    response = client.post(
+        f"/blog/edit/{post_id}/autosave", json={"content": "Two.", "base_revision_id": 0}, auth=auth
+    )
+    assert response.json()["revision_id"] == 1
+    client.post(f"/blog/edit/{post_id}/autosave/flush", auth=auth)
+    PostRevisionWriter().apply_delta(
+        post_id,
+        actor={"type": "human", "id": "other"},
+        delta_type="content_free_edit",
+        delta_payload={},
+        new_content="Saved elsewhere.",
+    )
+
+    stale = client.post(
+        f"/blog/edit/{post_id}/autosave", json={"content": "Three.", "base_revision_id": 2}, auth=auth
+    )
+    assert stale.status_code == 409
+    assert stale.json()["detail"]["last_revision_id"] == 3
+    assert client.post(f"/blog/edit/{post_id}/autosave/flush", auth=auth).status_code == 409
+    assert read_post_content(post_id) == "Saved elsewhere."
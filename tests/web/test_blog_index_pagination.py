@@ -0,0 +1,35 @@
+import os
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+from apps.blog import storage
+from apps.blog.storage import create_post, update_post_status
+
+
+def test_blog_index_json_exposes_next_cursor(tmp_path: Path, monkeypatch) -> None:
+    os.environ["ADMIN_PASSWORD"] = "test-password"
+    os.environ["ADMIN_USERNAME"] = "admin"
+    from web.api import app
+
+    posts_root = tmp_path / "posts"
+    posts_root.mkdir()
+    monkeypatch.setattr(storage, "POSTS_ROOT", posts_root)
+    for n in range(3):
+        post_id, _ = create_post(title=f"Post {n}", author="tester", intent={}, content="Body.")
+        update_post_status(post_id, "published")
+
+    client = TestClient(app)
+    first = client.get("/blog", params={"format": "json", "limit": 2})
+    assert first.status_code == 200
+    assert len(first.json()) == 2
+    cursor = first.headers["x-next-cursor"]
+    assert 'rel="next"' in first.headers["link"]
+
+    second = client.get("/blog", params={"format": "json", "limit": 2, "cursor": cursor})
+    assert len(second.json()) == 1
+    assert "x-next-cursor" not in second.headers
+    titles = {item["title"] for item in first.json() + second.json()}
+    assert titles == {"Post 0", "Post 1", "Post 2"}
+
+    assert client.get("/blog", params={"format": "json", "cursor": "bogus"}).status_code == 400
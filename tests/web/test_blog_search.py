@@ -0,0 +1,31 @@
+import os
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+from apps.blog import storage
+from apps.blog.storage import create_post, update_post_status
+
+
+def test_blog_search_returns_ranked_published_posts(tmp_path: Path, monkeypatch) -> None:
+    os.environ["ADMIN_PASSWORD"] = "test-password"
+    os.environ["ADMIN_USERNAME"] = "admin"
+    from web.api import app
+
+    posts_root = tmp_path / "posts"
+    posts_root.mkdir()
+    monkeypatch.setattr(storage, "POSTS_ROOT", posts_root)
+    best, _ = create_post(title="Kites", author="tester", intent={}, content="Kites and more kites.")
+    other, _ = create_post(title="Weather", author="tester", intent={}, content="Wind for kites.")
+    create_post(title="Draft kites", author="tester", intent={}, content="Unpublished kites.")
+    update_post_status(best, "published")
+    update_post_status(other, "published")
+
+    client = TestClient(app)
+    response = client.get("/blog/search", params={"q": "kites", "format": "json"})
+    assert response.status_code == 200
+    assert [item["post_id"] for item in response.json()] == [best, other]
+    assert response.json()[0]["score"] > response.json()[1]["score"]
+
+    html = client.get("/blog/search", params={"q": "kites"})
+    assert html.status_code == 200 and "Weather" in html.text and "Draft kites" not in html.text
@@ -0,0 +1,57 @@
+import os
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+from apps.blog import post_revision_writer, storage
+from apps.blog.storage import create_post, read_post_content, read_revision_metadata
+
+
+def test_chunk_patch_checks_base_revision(tmp_path: Path, monkeypatch) -> None:
+    os.environ["ADMIN_PASSWORD"] = "test-password"
+    os.environ["ADMIN_USERNAME"] = "admin"
+    import web.api
+    from web.api import app
+
+    monkeypatch.setattr(web.api, "require_admin", lambda *_: None)
+
+    posts_root = tmp_path / "posts"
+    posts_root.mkdir()
+    monkeypatch.setattr(storage, "POSTS_ROOT", posts_root)
+    monkeypatch.setattr(post_revision_writer, "POSTS_ROOT", posts_root)
+
+    post_id, _ = create_post(
+        title="Draft post",
+        author="tester",
+        intent={},
+        content="Alpha\n\nBeta",
+    )
+    client = TestClient(app)
+    operations = [{"op": "replace", "index": 1, "text": "Beta edited"}]
+
+    resp = client.patch(
+        f"/blog/edit/{post_id}/chunks",
+        auth=("admin", "test-password"),
+        json={"base_revision_id": None, "operations": operations},
+    )
+    assert resp.status_code == 200
+    assert resp.json() == {"post_id": post_id, "revision_id": 1, "changed_chunks": [1]}
+    assert read_post_content(post_id) == "Alpha\n\nBeta edited"
+    assert read_revision_metadata(post_id)[-1]["delta_payload"]["changed_chunks"] == [1]
+
+    stale = client.patch(
+        f"/blog/edit/{post_id}/chunks",
+        auth=("admin", "test-password"),
+        json={"base_revision_id": None, "operations": operations},
+    )
+    assert stale.status_code == 409
+    assert stale.json()["detail"]["last_revision_id"] == 1
+    assert len(read_revision_metadata(post_id)) == 1
+
+    no_op = client.patch(
+        f"/blog/edit/{post_id}/chunks",
+        auth=("admin", "test-password"),
+        json={"base_revision_id": 1, "operations": [{"op": "replace", "index": 0, "text": "Alpha\n"}]},
+    )
+    assert no_op.json() == {"post_id": post_id, "revision_id": 1, "changed_chunks": []}
+    assert len(read_revision_metadata(post_id)) == 1
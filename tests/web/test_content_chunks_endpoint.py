@@ -0,0 +1,51 @@
+import os
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+from apps.blog import storage
+from apps.blog.storage import create_post
+
+
+def test_chunks_endpoint_pages_rendered_content(tmp_path: Path, monkeypatch) -> None:
+    os.environ["ADMIN_PASSWORD"] = "test-password"
+    os.environ["ADMIN_USERNAME"] = "admin"
+    import web.api
+    from web.api import app
+
+    monkeypatch.setattr(web.api, "require_admin", lambda *_: None)
+    posts_root = tmp_path / "posts"
+    posts_root.mkdir()
+    monkeypatch.setattr(storage, "POSTS_ROOT", posts_root)
+    content = "\n\n".join(f"Paragraph **{n}**." for n in range(5))
+    post_id, _ = create_post(title="Post", author="tester", intent={}, content=content)
+    client = TestClient(app)
+    auth = ("admin", "test-password")
+
+    first = client.get(f"/blog/{post_id}/chunks", params={"limit": 3}, auth=auth).json()
+    assert (first["total"], first["next_offset"], len(first["chunks"])) == (5, 3, 3)
+    assert first["chunks"][1]["html"] == "<p>Paragraph <strong>1</strong>.</p>"
+    assert first["revision_id"] is None and len(first["content_hash"]) == 64
+    last = client.get(f"/blog/{post_id}/chunks", params={"offset": 3, "limit": 3}, auth=auth).json()
+    assert last["next_offset"] is None and [chunk["index"] for chunk in last["chunks"]] == [3, 4]
+
+    page = client.get(f"/blog/editor/{post_id}", auth=auth, headers={"accept": "text/html"})
+    assert page.status_code == 200 and "Paragraph" not in page.text
+    assert client.get("/blog/missing/chunks", auth=auth).status_code == 404
+
+
+def test_chunks_spanning_a_fence_render_as_one_block(tmp_path: Path, monkeypatch) -> None:
+    os.environ["ADMIN_PASSWORD"] = "test-password"
+    os.environ["ADMIN_USERNAME"] = "admin"
+    import web.api
+    from web.api import app
+
+    monkeypatch.setattr(web.api, "require_admin", lambda *_: None)
+    posts_root = tmp_path / "posts"
+    posts_root.mkdir()
+    monkeypatch.setattr(storage, "POSTS_ROOT", posts_root)
+    post_id, _ = create_post(title="Post", author="tester", intent={}, content="```\none\n\ntwo\n```\n")
+    client = TestClient(app)
+
+    page = client.get(f"/blog/{post_id}/chunks", auth=("admin", "test-password")).json()
+    assert [chunk["html"] for chunk in page["chunks"]] == ["<pre><code>one\n\ntwo\n</code></pre>", ""]
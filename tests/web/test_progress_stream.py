@@ -0,0 +1,139 @@
+import json
+import os
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+from apps.blog import post_revision_writer, storage
+from apps.blog.storage import create_post, read_post_content
+
+
+def _parse_events(body: str) -> list[tuple[str, dict]]:
+    events: list[tuple[str, dict]] = []
+    for block in body.split("\n\n"):
+        lines = [line for line in block.splitlines() if line and not line.startswith(":")]
+        if not lines:
+            continue
+        name = lines[0].removeprefix("event: ")
+        data = json.loads(lines[1].removeprefix("data: "))
+        events.append((name, data))
+    return events
+
+
+def test_policy_edit_stream_reports_chunks_and_revision(tmp_path: Path, monkeypatch) -> None:
+    os.environ["ADMIN_PASSWORD"] = "test-password"
+    os.environ["ADMIN_USERNAME"] = "admin"
+    import web.api
+    from web.api import app
+
+    monkeypatch.setattr(web.api, "require_admin", lambda *_: None)
+
+    posts_root = tmp_path / "posts"
+    posts_root.mkdir()
+    monkeypatch.setattr(storage, "POSTS_ROOT", posts_root)
+    monkeypatch.setattr(post_revision_writer, "POSTS_ROOT", posts_root)
+
+    post_id, _ = create_post(
+        title="Draft post",
+        author="tester",
+        intent={},
+        content="One colour.\n\nTwo.",
+    )
+
+    client = TestClient(app)
+    resp = client.post(
+        "/blog/edit/stream",
+        auth=("admin", "test-password"),
+        json={
+            "post_id": post_id,
+            "policy_text": "---\nrules:\n  - literal: colour\n    replace: color\n---\n",
+        },
+    )
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/event-stream")
+    events = _parse_events(resp.text)
+    chunk_events = [data for name, data in events if name == "chunk"]
+    assert [(data["completed"], data["total"]) for data in chunk_events] == [(1, 2), (2, 2)]
+    assert events[-1][0] == "done"
+    assert events[-1][1]["revision_id"] == 1
+    assert events[-1][1]["changed_chunks"] == [0]
+    assert read_post_content(post_id) == "One color.\n\nTwo."
+
+
+def test_policy_edit_on_unreplayable_history_is_a_conflict(tmp_path: Path, monkeypatch) -> None:
+    os.environ["ADMIN_PASSWORD"] = "test-password"
+    os.environ["ADMIN_USERNAME"] = "admin"
+    import web.api
+    from web.api import app
+
+    monkeypatch.setattr(web.api, "require_admin", lambda *_: None)
+
+    posts_root = tmp_path / "posts"
+    posts_root.mkdir()
+    monkeypatch.setattr(storage, "POSTS_ROOT", posts_root)
+    monkeypatch.setattr(post_revision_writer, "POSTS_ROOT", posts_root)
+
+    post_id, _ = create_post(title="Draft post", author="tester", intent={}, content="One colour.")
+    storage.apply_blog_update(
+        post_id=post_id,
+        new_content="One color.",
+        delta_type="content_free_edit",
+        source="manual",
+        parent_revision_id=None,
+        delta_payload={},
+        actor={"type": "human", "id": "tester"},
+    )
+
+    client = TestClient(app)
+    resp = client.post(
+        "/blog/edit/stream",
+        auth=("admin", "test-password"),
+        json={
+            "post_id": post_id,
+            "policy_text": "---\nrules:\n  - literal: colour\n    replace: color\n---\n",
+        },
+    )
+    assert resp.status_code == 409
+    assert "after_hash" in resp.json()["detail"]
+
+
+def test_stream_stops_the_job_when_the_client_disconnects() -> None:
+    import asyncio
+    import threading
+
+    os.environ["ADMIN_PASSWORD"] = "test-password"
+    os.environ["ADMIN_USERNAME"] = "admin"
+    import web.api
+
+    class _Request:
+        def __init__(self) -> None:
+            self.disconnected = False
+
+        async def is_disconnected(self) -> bool:
+            return self.disconnected
+
+    request = _Request()
+    stopped = threading.Event()
+    reports: list[int] = []
+
+    def work(on_progress) -> dict:
+        try:
+            for n in range(1000):
+                on_progress({"event": "chunk", "completed": n})
+                reports.append(n)
+                threading.Event().wait(0.01)
+        finally:
+            stopped.set()
+        return {}
+
+    async def consume() -> str:
+        response = web.api._stream_progress(request, work)
+        first = await response.body_iterator.__anext__()
+        request.disconnected = True
+        async for _ in response.body_iterator:
+            pass
+        return first
+
+    assert asyncio.run(consume()).startswith("event: chunk")
+    assert stopped.wait(5)
+    assert len(reports) < 1000
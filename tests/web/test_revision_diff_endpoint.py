@@ -0,0 +1,46 @@
+import json
+import os
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+from apps.blog import storage
+from apps.blog.storage import apply_blog_update, create_post
+
+
+def _apply(post_id: str, content: str) -> int:
+    return apply_blog_update(
+        post_id=post_id,
+        new_content=content,
+        delta_type="content_free_edit",
+        source="manual",
+        parent_revision_id=None,
+        delta_payload={},
+        actor={"type": "human", "id": "tester"},
+    ).revision_id
+
+
+def test_revision_diff_streams_ndjson(tmp_path: Path, monkeypatch) -> None:
+    os.environ["ADMIN_PASSWORD"] = "test-password"
+    os.environ["ADMIN_USERNAME"] = "admin"
+    import web.api
+    from web.api import app
+
+    monkeypatch.setattr(web.api, "require_admin", lambda *_: None)
+    posts_root = tmp_path / "posts"
+    posts_root.mkdir()
+    monkeypatch.setattr(storage, "POSTS_ROOT", posts_root)
+    post_id, _ = create_post(title="Post", author="tester", intent={}, content="Draft.")
+    first = _apply(post_id, "Alpha.\n\nBeta.")
+    second = _apply(post_id, "Alpha.\n\nGamma.")
+
+    client = TestClient(app)
+    response = client.get(f"/blog/{post_id}/revisions/{first}/diff/{second}", auth=("admin", "test-password"))
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    records = [json.loads(line) for line in response.text.splitlines()]
+    assert records[0]["modified"] == 1
+    assert records[1]["type"] == "modified" and records[1]["after_index"] == 1
+
+    missing = client.get(f"/blog/{post_id}/revisions/{first}/diff/9", auth=("admin", "test-password"))
+    assert missing.status_code == 404
@@ -0,0 +1,45 @@
+import os
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+from apps.blog import storage
+from apps.blog.storage import apply_blog_update, create_post
+
+
+def _apply(post_id: str, content: str, **kwargs) -> int:
+    return apply_blog_update(
+        post_id=post_id,
+        new_content=content,
+        delta_type="content_free_edit",
+        source="manual",
+        parent_revision_id=None,
+        delta_payload={},
+        actor={"type": "human", "id": "tester"},
+        **kwargs,
+    ).revision_id
+
+
+def test_revision_listings_include_the_cold_rejected_log(tmp_path: Path, monkeypatch) -> None:
+    os.environ["ADMIN_PASSWORD"] = "test-password"
+    os.environ["ADMIN_USERNAME"] = "admin"
+    import web.api
+    from web.api import app
+
+    monkeypatch.setattr(web.api, "require_admin", lambda *_: None)
+    posts_root = tmp_path / "posts"
+    posts_root.mkdir()
+    monkeypatch.setattr(storage, "POSTS_ROOT", posts_root)
+    post_id, _ = create_post(title="Post", author="tester", intent={}, content="Draft.")
+    _apply(post_id, "Applied.")
+    _apply(post_id, "Ignored.", status="rejected", reason="nope")
+    client = TestClient(app)
+    auth = ("admin", "test-password")
+
+    audit = client.get("/blog/revisions", params={"post_id": post_id}, auth=auth).json()
+    assert [(entry["revision_id"], entry["status"]) for entry in audit] == [(1, "applied"), (2, "rejected")]
+    listed = client.get(f"/blog/{post_id}/revisions", auth=auth).json()
+    assert [entry["revision_id"] for entry in listed] == [1, 2]
+    applied = client.get(f"/blog/{post_id}/revisions", params={"include_rejected": False}, auth=auth).json()
+    assert [entry["revision_id"] for entry in applied] == [1]
+    assert client.get("/blog/revisions", params={"post_id": "missing"}, auth=auth).status_code == 404
@@ -0,0 +1,47 @@
+import os
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+from apps.blog import storage
+from apps.blog.post_store import STORAGE_BACKEND_ENV, get_post_store
+from apps.blog.sqlite_store import database_path
+
+
+def test_web_app_serves_posts_from_the_sqlite_store(tmp_path: Path, monkeypatch) -> None:
+    os.environ["ADMIN_PASSWORD"] = "test-password"
+    os.environ["ADMIN_USERNAME"] = "admin"
+    from web.api import app
+
+    posts_root = tmp_path / "posts"
+    posts_root.mkdir()
+    monkeypatch.setattr(storage, "POSTS_ROOT", posts_root)
+    monkeypatch.setenv(STORAGE_BACKEND_ENV, "sqlite")
+    store = get_post_store()
+    post_id = store.create_post(title="Kites", author="tester", intent={}, content="Alpha\n\nBeta")
+    auth = ("admin", "test-password")
+    client = TestClient(app)
+
+    patched = client.patch(
+        f"/blog/edit/{post_id}/chunks",
+        auth=auth,
+        json={"base_revision_id": None, "operations": [{"op": "replace", "index": 1, "text": "Kites"}]},
+    )
+    assert patched.json() == {"post_id": post_id, "revision_id": 1, "changed_chunks": [1]}
+    copied = client.post(f"/blog/{post_id}/revisions/1/copy", auth=auth)
+    assert copied.json() == {"revision_id": 2}
+    published = client.post(
+        "/blog/status", auth=auth, json={"post_id": post_id, "target_status": "published"}
+    )
+    assert published.json()["previous_status"] == "draft"
+
+    chunks = client.get(f"/blog/{post_id}/chunks", params={"offset": 1}, auth=auth).json()
+    assert [chunk["text"] for chunk in chunks["chunks"]] == ["Kites"]
+    revisions = client.get(f"/blog/{post_id}/revisions", auth=auth).json()
+    assert [entry["delta_type"] for entry in revisions] == ["content_chunks_modified", "revert"]
+    diff = client.get(f"/blog/{post_id}/revisions/1/diff/2", auth=auth)
+    assert diff.status_code == 200 and diff.text.count("\n") == 1
+    search = client.get("/blog/search", params={"q": "kites", "format": "json"})
+    assert [item["post_id"] for item in search.json()] == [post_id]
+    assert "Kites" in client.get(f"/blog/{post_id}").text
+    assert not (posts_root / post_id).exists() and database_path(posts_root).exists()